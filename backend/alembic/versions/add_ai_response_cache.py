@@ -0,0 +1,43 @@
+"""Add ai_response_cache table for cached AI generation results
+
+Revision ID: add_ai_response_cache
+Revises: add_item_similarities
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_ai_response_cache'
+down_revision: Union[str, Sequence[str], None] = 'add_item_similarities'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the ai_response_cache table."""
+    op.create_table('ai_response_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('template_type', sa.String(length=100), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('tokens_used', sa.Integer(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_ai_response_cache_expires_at', 'ai_response_cache', ['expires_at'], unique=False)
+    op.create_index('ix_ai_response_cache_last_used_at', 'ai_response_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the ai_response_cache table."""
+    op.drop_index('ix_ai_response_cache_last_used_at', table_name='ai_response_cache')
+    op.drop_index('ix_ai_response_cache_expires_at', table_name='ai_response_cache')
+    op.drop_table('ai_response_cache')
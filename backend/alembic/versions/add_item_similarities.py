@@ -0,0 +1,45 @@
+"""Add item_similarities table for precomputed similar items
+
+Revision ID: add_item_similarities
+Revises: add_jobs_table
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_item_similarities'
+down_revision: Union[str, Sequence[str], None] = 'add_jobs_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the item_similarities table holding each item's top-K neighbours."""
+    op.create_table('item_similarities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('similar_item_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['similar_item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('item_id', 'similar_item_id', name='uq_item_similarities_pair')
+    )
+    op.create_index(op.f('ix_item_similarities_id'), 'item_similarities', ['id'], unique=False)
+    op.create_index('ix_item_similarities_item_rank', 'item_similarities', ['item_id', 'rank'], unique=False)
+    op.create_index('ix_item_similarities_similar_item', 'item_similarities', ['similar_item_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the item_similarities table."""
+    op.drop_index('ix_item_similarities_similar_item', table_name='item_similarities')
+    op.drop_index('ix_item_similarities_item_rank', table_name='item_similarities')
+    op.drop_index(op.f('ix_item_similarities_id'), table_name='item_similarities')
+    op.drop_table('item_similarities')
@@ -0,0 +1,45 @@
+"""Add Weaviate sync outbox table
+
+Revision ID: add_weaviate_sync_outbox
+Revises: partition_movement_history
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_weaviate_sync_outbox'
+down_revision: Union[str, Sequence[str], None] = 'partition_movement_history'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the outbox drained by the Weaviate sync worker."""
+    op.create_table('weaviate_sync_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_weaviate_sync_outbox_id'), 'weaviate_sync_outbox', ['id'], unique=False)
+    op.create_index('ix_weaviate_sync_outbox_status_available', 'weaviate_sync_outbox', ['status', 'available_at'], unique=False)
+    op.create_index('ix_weaviate_sync_outbox_item_id', 'weaviate_sync_outbox', ['item_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the Weaviate sync outbox."""
+    op.drop_index('ix_weaviate_sync_outbox_item_id', table_name='weaviate_sync_outbox')
+    op.drop_index('ix_weaviate_sync_outbox_status_available', table_name='weaviate_sync_outbox')
+    op.drop_index(op.f('ix_weaviate_sync_outbox_id'), table_name='weaviate_sync_outbox')
+    op.drop_table('weaviate_sync_outbox')
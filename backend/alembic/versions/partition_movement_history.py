@@ -0,0 +1,162 @@
+"""Partition item movement history by month with BRIN index and archive manifest
+
+Revision ID: partition_movement_history
+Revises: 37c062614055, add_performance_indexes
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'partition_movement_history'
+down_revision: Union[str, Sequence[str], None] = ('37c062614055', 'add_performance_indexes')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def _month_start(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.month - 1 + months
+    return value.replace(year=value.year + month_index // 12, month=month_index % 12 + 1)
+
+
+def _create_archive_manifest() -> None:
+    op.create_table('movement_history_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('range_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('range_end', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('partition_name', sa.String(length=255), nullable=False),
+    sa.Column('file_path', sa.String(length=1024), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('partition_name')
+    )
+    op.create_index(op.f('ix_movement_history_archives_id'), 'movement_history_archives', ['id'], unique=False)
+    op.create_index('ix_movement_history_archives_range', 'movement_history_archives', ['range_start', 'range_end'], unique=False)
+    op.create_table('movement_history_archive_items',
+    sa.Column('archive_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['archive_id'], ['movement_history_archives.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('archive_id', 'item_id')
+    )
+    op.create_index('ix_movement_history_archive_items_item_id', 'movement_history_archive_items', ['item_id'], unique=False)
+
+
+def upgrade() -> None:
+    """Convert item_movement_history into a monthly range-partitioned table."""
+    _create_archive_manifest()
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # Partitioning and BRIN are PostgreSQL features; other backends keep the plain table
+        return
+
+    # Keep the id sequence alive while the old table is dropped
+    op.execute("ALTER TABLE item_movement_history RENAME TO item_movement_history_legacy")
+    op.execute("ALTER SEQUENCE item_movement_history_id_seq OWNED BY NONE")
+    for index_name in (
+        'ix_item_movement_history_created_at',
+        'ix_item_movement_history_id',
+        'ix_item_movement_history_item_id',
+        'ix_item_movement_history_movement_type',
+        'ix_item_movement_history_timestamp',
+        'ix_item_movement_history_item_timestamp',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+    op.execute("""
+        CREATE TABLE item_movement_history (
+            id INTEGER NOT NULL DEFAULT nextval('item_movement_history_id_seq'),
+            item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+            from_location_id INTEGER REFERENCES locations(id) ON DELETE SET NULL,
+            to_location_id INTEGER REFERENCES locations(id) ON DELETE SET NULL,
+            quantity_moved INTEGER NOT NULL,
+            quantity_before INTEGER,
+            quantity_after INTEGER,
+            movement_type VARCHAR(50) NOT NULL,
+            reason VARCHAR(255),
+            notes TEXT,
+            estimated_value NUMERIC(10, 2),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            user_id VARCHAR(255),
+            system_notes TEXT,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE item_movement_history_id_seq OWNED BY item_movement_history.id")
+    op.execute("CREATE TABLE item_movement_history_default PARTITION OF item_movement_history DEFAULT")
+
+    # One partition per month from the oldest row through a few months ahead
+    earliest = bind.execute(sa.text("SELECT min(created_at) FROM item_movement_history_legacy")).scalar()
+    current = _month_start(datetime.now(timezone.utc))
+    start = _month_start(earliest) if earliest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while start <= last:
+        end = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE item_movement_history_y{start.year:04d}m{start.month:02d} "
+            f"PARTITION OF item_movement_history "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    op.execute("INSERT INTO item_movement_history SELECT * FROM item_movement_history_legacy")
+    op.execute("DROP TABLE item_movement_history_legacy")
+
+    # Partitioned indexes cascade to every current and future partition
+    op.execute("CREATE INDEX ix_item_movement_history_created_at ON item_movement_history USING brin (created_at)")
+    op.create_index('ix_item_movement_history_item_timestamp', 'item_movement_history', ['item_id', 'created_at'])
+    op.create_index(op.f('ix_item_movement_history_item_id'), 'item_movement_history', ['item_id'])
+    op.create_index(op.f('ix_item_movement_history_movement_type'), 'item_movement_history', ['movement_type'])
+
+
+def downgrade() -> None:
+    """Collapse the partitions back into a single table."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("ALTER TABLE item_movement_history RENAME TO item_movement_history_partitioned")
+        op.execute("ALTER SEQUENCE item_movement_history_id_seq OWNED BY NONE")
+        for index_name in (
+            'ix_item_movement_history_created_at',
+            'ix_item_movement_history_item_timestamp',
+            'ix_item_movement_history_item_id',
+            'ix_item_movement_history_movement_type',
+        ):
+            op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+        op.execute("""
+            CREATE TABLE item_movement_history (
+                LIKE item_movement_history_partitioned INCLUDING DEFAULTS
+            )
+        """)
+        op.execute("ALTER TABLE item_movement_history ADD PRIMARY KEY (id)")
+        op.create_foreign_key(None, 'item_movement_history', 'items', ['item_id'], ['id'], ondelete='CASCADE')
+        op.create_foreign_key(None, 'item_movement_history', 'locations', ['from_location_id'], ['id'], ondelete='SET NULL')
+        op.create_foreign_key(None, 'item_movement_history', 'locations', ['to_location_id'], ['id'], ondelete='SET NULL')
+        op.execute("ALTER SEQUENCE item_movement_history_id_seq OWNED BY item_movement_history.id")
+        op.execute("INSERT INTO item_movement_history SELECT * FROM item_movement_history_partitioned")
+        op.execute("DROP TABLE item_movement_history_partitioned CASCADE")
+
+        op.create_index(op.f('ix_item_movement_history_created_at'), 'item_movement_history', ['created_at'])
+        op.create_index(op.f('ix_item_movement_history_id'), 'item_movement_history', ['id'])
+        op.create_index(op.f('ix_item_movement_history_item_id'), 'item_movement_history', ['item_id'])
+        op.create_index(op.f('ix_item_movement_history_movement_type'), 'item_movement_history', ['movement_type'])
+        op.create_index('ix_item_movement_history_item_timestamp', 'item_movement_history', ['item_id', 'created_at'])
+
+    op.drop_index('ix_movement_history_archive_items_item_id', table_name='movement_history_archive_items')
+    op.drop_table('movement_history_archive_items')
+    op.drop_index('ix_movement_history_archives_range', table_name='movement_history_archives')
+    op.drop_index(op.f('ix_movement_history_archives_id'), table_name='movement_history_archives')
+    op.drop_table('movement_history_archives')
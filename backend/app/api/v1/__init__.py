@@ -3,7 +3,7 @@ API v1 router configuration.
 """
 
 from fastapi import APIRouter
-from app.api.v1 import locations, categories, items, inventory, performance, search, ai
+from app.api.v1 import locations, categories, items, inventory, performance, search, ai, jobs
 
 # Create main v1 router
 router = APIRouter(prefix="/v1")
@@ -15,4 +15,5 @@ router.include_router(items.router)
 router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
 router.include_router(performance.router, prefix="/performance", tags=["performance"])
 router.include_router(search.router, tags=["search"])
-router.include_router(ai.router, tags=["ai-generation"])
\ No newline at end of file
+router.include_router(ai.router, tags=["ai-generation"])
+router.include_router(jobs.router)
\ No newline at end of file
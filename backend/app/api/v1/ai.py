@@ -6,12 +6,20 @@ and other content types using OpenAI language models.
 """
 
 import logging
-from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Form
+from typing import Dict, Any, List, Optional, AsyncIterator
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 
+from app.database.base import get_session
+from app.services.ai_enrichment_service import (
+    AI_BATCH_ENRICHMENT_JOB, DEFAULT_ENRICHMENT_FIELDS, ENRICHABLE_FIELDS
+)
 from app.services.ai_service import get_ai_service, AIGenerationResult
+from app.services.job_service import JobService
+from app.services.image_preprocessing import ImagePreprocessorBusy
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +54,19 @@ class ItemDataEnrichmentRequest(BaseModel):
     user_preferences: Optional[Dict[str, Any]] = Field(None, description="User preferences for generation")
 
 
+class BatchEnrichmentRequest(BaseModel):
+    """Request model for enriching existing items in a background job."""
+    item_ids: List[int] = Field(..., description="Items to enrich", min_length=1, max_length=5000)
+    fields: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_ENRICHMENT_FIELDS),
+        description=f"Item fields to fill in ({', '.join(ENRICHABLE_FIELDS)})"
+    )
+    min_confidence: float = Field(0.7, ge=0.0, le=1.0, description="Minimum confidence for a field to be written")
+    overwrite: bool = Field(False, description="Replace fields that already have a value")
+    batch_size: int = Field(20, ge=1, le=200, description="Items written back per transaction")
+    concurrency: Optional[int] = Field(None, ge=1, le=32, description="Generations run at once")
+
+
 class AIGenerationResponse(BaseModel):
     """Response model for AI content generation."""
     content: str = Field(..., description="Generated content")
@@ -54,6 +75,7 @@ class AIGenerationResponse(BaseModel):
     tokens_used: int = Field(..., description="Number of tokens consumed")
     generation_time: float = Field(..., description="Generation time in seconds")
     timestamp: str = Field(..., description="Generation timestamp")
+    cached: bool = Field(False, description="Whether the content was served from the response cache")
 
 
 class ItemDataEnrichmentResponse(BaseModel):
@@ -76,6 +98,14 @@ class AIHealthResponse(BaseModel):
     available_templates: list[str] = Field(..., description="Available content templates")
     model: str = Field(..., description="Default AI model")
     api_connectivity: Optional[bool] = Field(None, description="API connectivity status")
+    rate_limiter: Optional[Dict[str, Any]] = Field(
+        None, description="Shared OpenAI rate limiter queue depths, wait times and remaining budget"
+    )
+    response_cache: Optional[Dict[str, Any]] = Field(None, description="Response cache hit rate and counters")
+    image_preprocessing: Optional[Dict[str, Any]] = Field(None, description="Image preprocessing queue and byte counts")
+    image_analysis_cache: Optional[Dict[str, Any]] = Field(
+        None, description="Near-duplicate image analysis cache hit rate and size"
+    )
     error: Optional[str] = Field(None, description="Error message if any")
 
 
@@ -102,7 +132,8 @@ async def generate_content(request: ContentGenerationRequest) -> AIGenerationRes
             model=result.model,
             tokens_used=result.tokens_used,
             generation_time=result.generation_time,
-            timestamp=result.timestamp.isoformat()
+            timestamp=result.timestamp.isoformat(),
+            cached=result.cached
         )
         
     except ValueError as e:
@@ -142,7 +173,8 @@ async def generate_item_description(request: ItemDescriptionRequest) -> AIGenera
             model=result.model,
             tokens_used=result.tokens_used,
             generation_time=result.generation_time,
-            timestamp=result.timestamp.isoformat()
+            timestamp=result.timestamp.isoformat(),
+            cached=result.cached
         )
         
     except ValueError as e:
@@ -156,6 +188,88 @@ async def generate_item_description(request: ItemDescriptionRequest) -> AIGenera
         raise HTTPException(status_code=500, detail="Failed to generate item description")
 
 
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Encode a generation event as a Server-Sent Events message."""
+    data = {key: value for key, value in event.items() if key != "event"}
+    return f"event: {event['event']}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_generation(events: AsyncIterator[Dict[str, Any]], action: str) -> StreamingResponse:
+    """
+    Send generation events to the client as they are produced.
+    
+    The first event is awaited before the response starts, so invalid requests
+    and an unavailable service still get a 400/503 status. Failures after
+    that are sent as an ``error`` event.
+    """
+    try:
+        first = await events.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except ValueError as e:
+        logger.warning(f"Invalid request to {action}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        logger.error(f"AI service not available: {e}")
+        raise HTTPException(status_code=503, detail="AI service is not available")
+    except Exception as e:
+        logger.error(f"Failed to {action}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to {action}")
+    
+    async def body():
+        if first is not None:
+            yield _format_sse(first)
+        try:
+            async for event in events:
+                yield _format_sse(event)
+        except Exception as e:
+            logger.error(f"Failed to {action} while streaming: {e}")
+            yield _format_sse({"event": "error", "detail": f"Failed to {action}"})
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so tokens reach the client as they arrive
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate/stream")
+async def stream_content(request: ContentGenerationRequest) -> StreamingResponse:
+    """
+    Streaming variant of ``/generate`` using Server-Sent Events.
+    
+    Sends a ``delta`` event with each piece of generated text and a final
+    ``done`` event with the full content, model, token usage and timings.
+    """
+    ai_service = await get_ai_service()
+    events = ai_service.stream_content(
+        template_type=request.template_type,
+        context=request.context,
+        user_preferences=request.user_preferences
+    )
+    return await _stream_generation(events, "generate content")
+
+
+@router.post("/generate-item-description/stream")
+async def stream_item_description(request: ItemDescriptionRequest) -> StreamingResponse:
+    """
+    Streaming variant of ``/generate-item-description`` using Server-Sent Events.
+    
+    Sends the same ``delta`` and ``done`` events as ``/generate/stream``.
+    """
+    ai_service = await get_ai_service()
+    events = ai_service.stream_item_description(
+        name=request.name,
+        category=request.category,
+        item_type=request.item_type,
+        brand=request.brand,
+        model=request.model,
+        user_preferences=request.user_preferences
+    )
+    return await _stream_generation(events, "generate item description")
+
+
 @router.post("/enrich-item-data", response_model=ItemDataEnrichmentResponse)
 async def enrich_item_data(request: ItemDataEnrichmentRequest) -> ItemDataEnrichmentResponse:
     """
@@ -202,6 +316,34 @@ async def enrich_item_data(request: ItemDataEnrichmentRequest) -> ItemDataEnrich
         raise HTTPException(status_code=500, detail="Failed to enrich item data")
 
 
+@router.post("/enrich-items", status_code=202)
+async def enrich_items(
+    request: BatchEnrichmentRequest,
+    session: AsyncSession = Depends(get_session)
+) -> Dict[str, Any]:
+    """
+    Enrich existing items with AI-generated data in a background job.
+    
+    Generations run concurrently under the shared OpenAI rate limit and the
+    results are written back in batches. Follow progress with
+    ``/jobs/{job_id}/events`` (Server-Sent Events) or poll ``/jobs/{job_id}``.
+    """
+    unknown = [field for field in request.fields if field not in ENRICHABLE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Fields cannot be enriched: {', '.join(unknown)}")
+    
+    job = await JobService(session).create_job(AI_BATCH_ENRICHMENT_JOB, request.model_dump())
+    logger.info(f"Started AI enrichment job {job.id} for {len(request.item_ids)} items")
+    
+    return {
+        "message": f"Enrichment started for {len(request.item_ids)} items",
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/v1/jobs/{job.id}",
+        "events_url": f"/api/v1/jobs/{job.id}/events"
+    }
+
+
 @router.post("/analyze-item-image", response_model=ItemDataEnrichmentResponse)
 async def analyze_item_image(
     image: UploadFile = File(..., description="Item image file (JPEG, PNG, WEBP)"),
@@ -283,6 +425,12 @@ async def analyze_item_image(
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
+    except ImagePreprocessorBusy as e:
+        logger.warning(f"Rejected image analysis: {e}")
+        raise HTTPException(
+            status_code=503, detail="Too many images are being processed. Please try again shortly",
+            headers={"Retry-After": "5"}
+        )
     except ValueError as e:
         logger.warning(f"Invalid request for image analysis: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
@@ -362,7 +510,9 @@ async def test_ai_generation() -> AIGenerationResponse:
             category="Electronics",
             item_type="device",
             brand="TestBrand",
-            model="Model123"
+            model="Model123",
+            # Exercise the API, not the response cache
+            user_preferences={"use_cache": False}
         )
         
         return AIGenerationResponse(
@@ -371,7 +521,8 @@ async def test_ai_generation() -> AIGenerationResponse:
             model=result.model,
             tokens_used=result.tokens_used,
             generation_time=result.generation_time,
-            timestamp=result.timestamp.isoformat()
+            timestamp=result.timestamp.isoformat(),
+            cached=result.cached
         )
         
     except Exception as e:
@@ -747,6 +747,56 @@ async def validate_bulk_movement_operation(
         )
 
 
+@router.post("/execute/bulk-movement", response_model=None)
+@invalidate_cache_on_changes("inventory_update")
+async def execute_bulk_movement_operation(
+    movements: List[MovementHistoryCreate],
+    user_id: Optional[str] = Query(None, description="User performing the operation"),
+    reason: Optional[str] = Query(None, description="Reason applied to movements without one"),
+    service: InventoryService = Depends(get_inventory_service),
+    validator: MovementValidator = Depends(get_movement_validator)
+):
+    """
+    Validate and execute a batch of moves in a single transaction.
+    
+    The whole batch is validated first, including cumulative quantity effects.
+    If any movement fails, nothing is applied. Otherwise all inventory changes
+    and movement history entries are written together.
+    """
+    overall_result, individual_results = await validator.validate_bulk_movement(
+        movements,
+        enforce_atomic_validation=True
+    )
+    
+    if not overall_result.is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Bulk movement validation failed",
+                "errors": overall_result.errors,
+                "warnings": overall_result.warnings,
+                "failed_movements": [
+                    {"movement_index": i, "errors": result.errors}
+                    for i, result in enumerate(individual_results)
+                    if not result.is_valid
+                ]
+            }
+        )
+    
+    try:
+        summary = await service.execute_bulk_movements(movements, user_id=user_id, reason=reason)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    summary["warnings"] = overall_result.warnings + [
+        warning for result in individual_results for warning in result.warnings
+    ]
+    return summary
+
+
 @router.get("/validation/report", response_model=None)
 async def get_validation_report(
     item_id: Optional[int] = Query(None, description="Filter report by specific item"),
@@ -5,7 +5,7 @@ Provides comprehensive CRUD operations and advanced functionality for managing i
 """
 
 from typing import List, Optional, Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc, asc, and_, or_
 from sqlalchemy.orm import selectinload
@@ -15,7 +15,10 @@ from datetime import datetime
 from app.database.base import get_session
 from app.models import Item, ItemType, ItemCondition, ItemStatus, Location, Category
 from app.services.inventory_service import InventoryService
-from app.services.item_service import ItemService
+from app.services.item_service import ItemService, WEAVIATE_BULK_SYNC_JOB
+from app.services.job_service import JobService
+from app.services.weaviate_reconciliation_service import start_reconciliation_job
+from app.services.weaviate_sync_service import enqueue_item_sync, get_weaviate_sync_worker
 from app.schemas import (
     ItemCreate, ItemCreateWithLocation, ItemUpdate, ItemResponse, ItemSummary, ItemSearch,
     ItemBulkUpdate, ItemMoveRequest, ItemStatusUpdate, ItemConditionUpdate,
@@ -519,6 +522,7 @@ async def restore_item(
     
     item.restore(new_status)
     session.add(item)
+    enqueue_item_sync(session, [item.id])
     await session.commit()
     await session.refresh(item)
     
@@ -557,6 +561,7 @@ async def bulk_update_items(
         session.add(item)
         updated_items.append(item)
     
+    enqueue_item_sync(session, [item.id for item in updated_items])
     await session.commit()
     
     # Refresh items
@@ -609,6 +614,7 @@ async def move_items(
         session.add(item)
         moved_items.append(item)
     
+    enqueue_item_sync(session, [item.id for item in moved_items])
     await session.commit()
     
     # Refresh items
@@ -632,6 +638,7 @@ async def update_item_status(
     
     item.update_status(status_update.new_status, status_update.notes)
     session.add(item)
+    enqueue_item_sync(session, [item.id])
     await session.commit()
     await session.refresh(item)
     
@@ -652,6 +659,7 @@ async def update_item_condition(
     
     item.update_condition(condition_update.new_condition, condition_update.notes)
     session.add(item)
+    enqueue_item_sync(session, [item.id])
     await session.commit()
     await session.refresh(item)
     
@@ -672,6 +680,7 @@ async def update_item_value(
     
     item.update_value(value_update.new_value, value_update.notes)
     session.add(item)
+    enqueue_item_sync(session, [item.id])
     await session.commit()
     await session.refresh(item)
     
@@ -707,6 +716,7 @@ async def add_item_tag(
     
     item.add_tag(tag)
     session.add(item)
+    enqueue_item_sync(session, [item.id])
     await session.commit()
     
     logger.info(f"Added tag '{tag}' to item {item.name}")
@@ -729,6 +739,7 @@ async def remove_item_tag(
     
     item.remove_tag(tag)
     session.add(item)
+    enqueue_item_sync(session, [item.id])
     await session.commit()
     
     logger.info(f"Removed tag '{tag}' from item {item.name}")
@@ -839,24 +850,52 @@ async def get_item_statistics(
 async def sync_items_to_weaviate(
     item_ids: Optional[List[int]] = None,
     force_update: bool = Query(False, description="Force update existing embeddings"),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
+    batch_size: int = Query(50, ge=1, le=500, description="Items synced per page"),
     session: AsyncSession = Depends(get_session)
 ):
-    """Sync items to Weaviate for semantic search (batch operation)."""
+    """Sync items to Weaviate for semantic search (batch operation).
     
-    item_service = ItemService(session)
-    
-    # Run sync operation in background for better UX
-    async def run_sync():
-        return await item_service.bulk_sync_to_weaviate(item_ids, force_update)
+    A background job queues the items in the Weaviate sync outbox, whose
+    worker applies them with retries; poll /jobs/{job_id} for progress and
+    /items/sync-to-weaviate/status for the outbox. Embeddings are always
+    rewritten, so force_update is implied.
+    """
     
-    background_tasks.add_task(run_sync)
+    job = await JobService(session).create_job(
+        WEAVIATE_BULK_SYNC_JOB,
+        {"item_ids": item_ids, "batch_size": batch_size}
+    )
     
     item_count = len(item_ids) if item_ids else "all active items"
-    logger.info(f"Initiated Weaviate sync for {item_count}")
+    logger.info(f"Started Weaviate sync job {job.id} for {item_count}")
     
     return {
-        "message": f"Sync initiated for {item_count}",
+        "message": f"Sync started for {item_count}",
+        "job_id": job.id,
         "force_update": force_update,
-        "status": "running"
-    }
\ No newline at end of file
+        "status": job.status,
+        "status_url": f"/api/v1/jobs/{job.id}"
+    }
+
+
+@router.get("/sync-to-weaviate/status")
+async def get_weaviate_sync_status():
+    """Get Weaviate sync outbox depth by status and worker counters."""
+    return await get_weaviate_sync_worker().get_status()
+
+
+@router.post("/sync-to-weaviate/reconcile")
+async def reconcile_weaviate_index(
+    dry_run: bool = Query(False, description="Only count drift, do not queue changes"),
+    session: AsyncSession = Depends(get_session)
+):
+    """Start a job diffing items against the Weaviate index and queueing the needed syncs.
+    
+    Returns the running reconciliation job if one is already in progress.
+    """
+    job = await start_reconciliation_job(session, dry_run=dry_run)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/v1/jobs/{job.id}"
+    }
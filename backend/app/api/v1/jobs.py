@@ -0,0 +1,111 @@
+"""
+Job API endpoints for tracking and cancelling background jobs.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.base import get_session
+from app.models.job import JobStatus
+from app.services.job_service import JobService, get_job_runner, watch_job
+from app.core.logging import get_logger
+
+logger = get_logger("api.jobs")
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+async def list_jobs(
+    status: Optional[str] = Query(None, description="Filter by job status"),
+    job_type: Optional[str] = Query(None, description="Filter by job type"),
+    limit: int = Query(50, ge=1, le=500, description="Number of jobs to return"),
+    session: AsyncSession = Depends(get_session)
+):
+    """List recent jobs, newest first."""
+    jobs = await JobService(session).list_jobs(status=status, job_type=job_type, limit=limit)
+    return [job.to_dict() for job in jobs]
+
+
+@router.get("/runner/status", response_model=Dict[str, Any])
+async def get_runner_status():
+    """Get job runner configuration and counters."""
+    return get_job_runner().get_status()
+
+
+@router.get("/{job_id}", response_model=Dict[str, Any])
+async def get_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    """Get a job's status, progress and result."""
+    job = await JobService(session).get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    poll_interval: float = Query(1.0, ge=0.1, le=30, description="Seconds between progress checks")
+):
+    """
+    Follow a job's progress as Server-Sent Events.
+
+    Sends a ``progress`` event with the job whenever its status or progress
+    changes and a final ``done`` event once it has finished.
+    """
+    # No get_session dependency: it would hold a pooled connection until the
+    # stream ends, and watch_job opens a short session per poll instead
+    async with get_job_runner().session_factory() as session:
+        job = await JobService(session).get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def events():
+        async for state in watch_job(job_id, poll_interval=poll_interval):
+            name = "done" if state["status"] in JobStatus.FINISHED else "progress"
+            yield f"event: {name}\ndata: {json.dumps(state, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/{job_id}/cancel", response_model=Dict[str, Any])
+async def cancel_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    """Cancel a queued job, or ask a running job to stop at its next checkpoint."""
+    try:
+        job = await JobService(session).cancel_job(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    logger.info(f"Cancellation requested for job {job_id}")
+    return job.to_dict()
+
+
+@router.post("/{job_id}/retry", response_model=Dict[str, Any])
+async def retry_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    """Re-queue a failed or cancelled job; it resumes from its last checkpoint."""
+    try:
+        job = await JobService(session).retry_job(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    logger.info(f"Job {job_id} re-queued")
+    return job.to_dict()
@@ -4,8 +4,9 @@ Performance monitoring and optimization API endpoints.
 Provides endpoints for query analysis, cache management, and performance metrics.
 """
 
-from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.base import get_session
@@ -14,8 +15,11 @@ from app.performance import (
     OptimizedInventoryService,
     cache,
     warm_cache,
-    get_performance_metrics
+    get_performance_metrics,
+    IndexAdvisor
 )
+from app.services.index_build_service import INDEX_BUILD_JOB  # noqa: F401 - registers the job handler
+from app.performance.query_profiler import get_query_profile_store, query_profiler_enabled
 
 router = APIRouter()
 
@@ -89,24 +93,76 @@ async def analyze_queries(
         )
 
 
-@router.post("/optimize/indexes", response_model=Dict[str, Any])
+class IndexSpec(BaseModel):
+    """Index to build."""
+    table: str = Field(..., description="Table to index")
+    columns: List[str] = Field(..., min_length=1, max_length=8, description="Indexed columns in order")
+
+
+class IndexBuildRequest(BaseModel):
+    """Indexes to build; the current recommendations when omitted."""
+    indexes: Optional[List[IndexSpec]] = None
+
+
+@router.get("/indexes/recommendations", response_model=Dict[str, Any])
+async def get_index_recommendations(
+    top_statements: int = Query(25, ge=1, le=200),
+    min_table_rows: int = Query(1000, ge=0),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Propose indexes from pg_stat_statements, table scan statistics and query plans.
+    
+    Recommendations are ranked by estimated benefit: the time the statements
+    needing them spend in sequential scans that the index would avoid.
+    """
+    try:
+        return await IndexAdvisor(db, top_statements=top_statements, min_table_rows=min_table_rows).recommend()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to recommend indexes: {str(e)}"
+        )
+
+
+@router.post("/optimize/indexes", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
 async def create_indexes(
+    response: Response,
+    request: Optional[IndexBuildRequest] = None,
     db: AsyncSession = Depends(get_session)
 ):
-    """Create recommended database indexes for performance optimization."""
+    """
+    Build recommended indexes with CREATE INDEX CONCURRENTLY in a background job.
+    
+    Follow progress with ``/jobs/{job_id}/events`` (Server-Sent Events) or
+    poll ``/jobs/{job_id}``.
+    """
     try:
         optimizer = QueryOptimizer(db)
-        created_indexes = await optimizer.create_recommended_indexes()
-        return {
-            "status": "success",
-            "created_indexes": created_indexes,
-            "message": f"Successfully created {len(created_indexes)} database indexes"
-        }
+        indexes = [index.model_dump() for index in request.indexes] if request and request.indexes else None
+        job = await optimizer.create_recommended_indexes(indexes)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create indexes: {str(e)}"
         )
+    
+    if job is None:
+        response.status_code = status.HTTP_200_OK
+        return {
+            "status": "success",
+            "job_id": None,
+            "indexes": [],
+            "message": "No indexes are recommended"
+        }
+    return {
+        "status": "accepted",
+        "job_id": job.id,
+        "indexes": job.params["indexes"],
+        "status_url": f"/api/v1/jobs/{job.id}",
+        "events_url": f"/api/v1/jobs/{job.id}/events",
+        "message": f"Building {len(job.params['indexes'])} indexes in the background"
+    }
 
 
 @router.get("/optimized/locations", response_model=List[Dict[str, Any]])
@@ -138,4 +194,24 @@ async def get_optimized_categories(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get optimized categories: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/requests", response_model=Dict[str, Any])
+async def get_request_profiles(
+    limit: int = Query(20, ge=1, le=200),
+    sort: str = Query("db_time", pattern="^(db_time|statements|n_plus_one)$")
+):
+    """Get the endpoints with the most database work from recent request profiles."""
+    return {
+        "enabled": query_profiler_enabled(),
+        "window": get_query_profile_store().window,
+        "endpoints": get_query_profile_store().report(limit=limit, sort=sort)
+    }
+
+
+@router.delete("/requests")
+async def clear_request_profiles():
+    """Discard the recorded request profiles."""
+    get_query_profile_store().clear()
+    return {"status": "success", "message": "Request profiles cleared"}
@@ -6,7 +6,7 @@ for natural language queries and similarity-based item discovery.
 """
 
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
@@ -15,6 +15,8 @@ from sqlalchemy.orm import selectinload
 from app.database.base import get_session
 from app.models import Item, Location, Category, Inventory
 from app.services.weaviate_service import get_weaviate_service, WeaviateService
+from app.services.similar_items_service import SimilarItemsService, SIMILAR_ITEMS_REBUILD_JOB
+from app.services.job_service import JobService
 from app.schemas import (
     SemanticSearchRequest, HybridSearchRequest, SemanticSearchResult,
     SemanticSearchResponse, SimilarItemsRequest, SimilarItemsResponse,
@@ -28,6 +30,16 @@ logger = get_logger("search_api")
 router = APIRouter(prefix="/search", tags=["semantic_search"])
 
 
+def _vector_filters(filters: Optional[ItemSearch]) -> Optional[Dict[str, Any]]:
+    """Get the filters Weaviate can apply during the vector search."""
+    if filters is None:
+        return None
+    return filters.model_dump(
+        include={"item_type", "condition", "status", "category_id", "brand", "min_value", "max_value"},
+        exclude_none=True
+    ) or None
+
+
 def _convert_item_to_response(item: Item) -> ItemResponse:
     """Convert Item model to ItemResponse schema."""
     # Get location names from inventory entries
@@ -196,11 +208,13 @@ async def hybrid_search(
     try:
         # Try semantic search first
         semantic_results = []
-        if await weaviate_service.health_check():
+        if await weaviate_service.search_available():
+            # Filters run inside the vector search, so no over-fetching is needed
             weaviate_results = await weaviate_service.semantic_search(
                 query=request.query,
-                limit=min(request.limit * 2, 100),  # Get more candidates for filtering
-                certainty=request.certainty
+                limit=request.limit,
+                certainty=request.certainty,
+                filters=_vector_filters(request.filters)
             )
             semantic_results = [result.postgres_id for result in weaviate_results]
         else:
@@ -227,7 +241,8 @@ async def hybrid_search(
                 fallback_used=False
             )
         
-        # Apply traditional filters if provided
+        # Apply traditional filters if provided; for semantic results they only
+        # drop objects whose index copy is stale
         if request.filters:
             filters = request.filters
             
@@ -265,6 +280,10 @@ async def hybrid_search(
         query = query.limit(request.limit)
         result = await session.execute(query)
         items = result.scalars().all()
+        if semantic_results:
+            # Keep the vector search ranking
+            rank = {item_id: position for position, item_id in enumerate(semantic_results)}
+            items = sorted(items, key=lambda item: rank[item.id])
         
         # Build response results
         search_results = []
@@ -331,41 +350,26 @@ async def get_similar_items(
         if not source_item:
             raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
         
-        # Find similar items using Weaviate
-        similar_results = []
-        if await weaviate_service.health_check():
-            weaviate_results = await weaviate_service.get_similar_items(item_id, limit)
-            
-            if weaviate_results:
-                # Get the similar items from PostgreSQL
-                similar_ids = [result.postgres_id for result in weaviate_results]
-                
-                similar_query = select(Item).options(
-                    selectinload(Item.category),
-                    selectinload(Item.inventory_entries).selectinload(Inventory.location)
-                ).where(
-                    and_(
-                        Item.id.in_(similar_ids),
-                        Item.is_active == True
-                    )
-                )
-                
-                similar_result = await session.execute(similar_query)
-                similar_items = similar_result.scalars().all()
-                
-                # Create lookup and maintain order
-                item_lookup = {item.id: item for item in similar_items}
-                
-                for weaviate_result in weaviate_results:
-                    if weaviate_result.postgres_id in item_lookup:
-                        item = item_lookup[weaviate_result.postgres_id]
-                        item_response = _convert_item_to_response(item)
-                        
-                        similar_results.append(SemanticSearchResult(
-                            item=item_response,
-                            score=weaviate_result.score,
-                            match_type="similarity"
-                        ))
+        # Serve the precomputed neighbour list; compute it on first request
+        similar_service = SimilarItemsService(session, weaviate_service)
+        similarities = await similar_service.get_similar_items(item_id, limit)
+        if not similarities and await weaviate_service.search_available():
+            try:
+                await similar_service.refresh_item(item_id)
+                similarities = await similar_service.get_similar_items(item_id, limit)
+            except Exception as e:
+                # Serve the empty list; it is computed again on the next request
+                await session.rollback()
+                logger.warning(f"Could not compute similar items for {item_id}: {e}")
+
+        similar_results = [
+            SemanticSearchResult(
+                item=_convert_item_to_response(similarity.similar_item),
+                score=similarity.score,
+                match_type="similarity"
+            )
+            for similarity in similarities
+        ]
         
         source_item_response = _convert_item_to_response(source_item)
         
@@ -384,6 +388,20 @@ async def get_similar_items(
         raise HTTPException(status_code=500, detail="Failed to find similar items")
 
 
+@router.post("/similar/rebuild", status_code=202)
+async def rebuild_similar_items(
+    batch_size: int = Query(50, ge=1, le=500, description="Items per checkpointed batch"),
+    session: AsyncSession = Depends(get_session)
+) -> Dict[str, Any]:
+    """Recompute every item's precomputed similar-items list as a background job."""
+    job = await JobService(session).create_job(SIMILAR_ITEMS_REBUILD_JOB, {"batch_size": batch_size})
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/v1/jobs/{job.id}"
+    }
+
+
 @router.post("/embeddings/batch", response_model=EmbeddingBatchResponse)
 async def create_batch_embeddings(
     request: EmbeddingBatchRequest,
@@ -427,7 +445,14 @@ async def create_batch_embeddings(
             items_data.append((item, category_name, location_names))
         
         # Process embeddings
-        stats = await weaviate_service.batch_create_embeddings(items_data)
+        written_ids: List[int] = []
+        stats = await weaviate_service.batch_create_embeddings(items_data, written_ids)
+        if written_ids:
+            try:
+                await SimilarItemsService(session, weaviate_service).apply_embedding_changes(written_ids, [])
+            except Exception as e:
+                # The embeddings are stored; lists catch up on the next change or rebuild
+                logger.warning(f"Failed to refresh similar items after batch embedding: {e}")
         
         logger.info(f"Batch embedding creation completed: {stats}")
         
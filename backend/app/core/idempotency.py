@@ -0,0 +1,264 @@
+"""
+Idempotency-Key support for inventory mutations.
+
+Clients send an ``Idempotency-Key`` header with a mutation. The first request
+with a given key is executed and its response stored; retries with the same key
+replay the stored response instead of applying the change again. Entries expire
+after a TTL and the store is bounded in size, evicting least recently used keys.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAY_HEADER = "idempotent-replayed"
+
+# Mutation endpoints that honour Idempotency-Key
+IDEMPOTENT_ROUTES: List[Tuple[str, Pattern]] = [
+    ("POST", re.compile(r"^/api/v1/inventory/move/\d+$")),
+    ("POST", re.compile(r"^/api/v1/inventory/items/\d+/split$")),
+    ("POST", re.compile(r"^/api/v1/inventory/items/\d+/merge$")),
+    ("PUT", re.compile(r"^/api/v1/inventory/items/\d+/locations/\d+/quantity$")),
+    ("POST", re.compile(r"^/api/v1/inventory/bulk$")),
+    ("POST", re.compile(r"^/api/v1/inventory/execute/bulk-movement$")),
+]
+
+
+@dataclass
+class StoredResponse:
+    """A completed response kept for replay."""
+
+    fingerprint: str
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+
+
+@dataclass
+class _PendingRequest:
+    """Marker for a key whose first request is still executing."""
+
+    fingerprint: str
+    expires_at: float = field(default=0.0)
+
+
+class IdempotencyStore:
+    """
+    Bounded, TTL-evicting store of responses keyed by idempotency key.
+
+    Lookups and inserts are O(1); expired entries are dropped when touched and
+    the oldest entries are evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400.0, max_entries: int = 10000, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.replays = 0
+
+    def begin(self, key: str, fingerprint: str) -> Tuple[str, Optional[StoredResponse]]:
+        """
+        Claim a key for a new request or find its stored outcome.
+
+        Returns:
+            ("new", None) if the caller should execute the request,
+            ("replay", response) if a stored response should be returned,
+            ("in_progress", None) if the first request has not finished,
+            ("mismatch", None) if the key was used with a different request.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                # Pending claims expire too, so a crashed request cannot block a key forever
+                self._entries[key] = _PendingRequest(fingerprint, now + self.ttl_seconds)
+                self._evict()
+                return "new", None
+
+            self._entries.move_to_end(key)
+            if entry.fingerprint != fingerprint:
+                return "mismatch", None
+            if isinstance(entry, _PendingRequest):
+                return "in_progress", None
+            self.replays += 1
+            return "replay", entry
+
+    def complete(self, key: str, fingerprint: str, status_code: int,
+                 headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        """Store the final response for a claimed key."""
+        with self._lock:
+            self._entries[key] = StoredResponse(
+                fingerprint, status_code, headers, body, self._clock() + self.ttl_seconds
+            )
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def release(self, key: str) -> None:
+        """Forget a claimed key so the request can be retried for real."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if isinstance(entry, _PendingRequest):
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            pending = sum(1 for entry in self._entries.values() if isinstance(entry, _PendingRequest))
+            return {
+                "entries": len(self._entries),
+                "pending": pending,
+                "replays": self.replays,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries
+            }
+
+    def clear(self) -> None:
+        """Drop all stored responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Global store instance
+_idempotency_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get the process-wide idempotency store."""
+    global _idempotency_store
+    if _idempotency_store is None:
+        _idempotency_store = IdempotencyStore(
+            ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+            max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+        )
+    return _idempotency_store
+
+
+def is_idempotent_route(method: str, path: str) -> bool:
+    """Check whether a request targets an endpoint that honours Idempotency-Key."""
+    return any(method == route_method and pattern.match(path) for route_method, pattern in IDEMPOTENT_ROUTES)
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware that replays stored responses for repeated Idempotency-Keys.
+
+    Requests are fingerprinted by method, path, query string and body, so a key
+    reused for a different request is rejected with 422. A retry that arrives
+    while the first request is still running gets 409. Server errors (5xx) are
+    not stored, leaving the client free to retry them.
+    """
+
+    def __init__(self, app: ASGIApp, store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self._store = store
+
+    @property
+    def store(self) -> IdempotencyStore:
+        return self._store or get_idempotency_store()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not is_idempotent_route(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        key = None
+        for name, value in scope.get("headers", []):
+            if name == IDEMPOTENCY_HEADER.encode():
+                key = value.decode("latin-1").strip()
+                break
+        if not key:
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the body so it can be fingerprinted and then replayed to the app
+        body_parts = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body_parts.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(body_parts)
+
+        fingerprint = hashlib.sha256(
+            b"\n".join([scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+
+        outcome, stored = self.store.begin(key, fingerprint)
+        if outcome == "replay":
+            await self._send_response(send, stored.status_code, stored.headers, stored.body, replayed=True)
+            return
+        if outcome == "in_progress":
+            await self._send_error(send, 409, "A request with this Idempotency-Key is still being processed")
+            return
+        if outcome == "mismatch":
+            await self._send_error(send, 422, "Idempotency-Key was already used for a different request")
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response_start: Dict[str, Any] = {}
+        response_body = []
+
+        async def capture_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_start.update(message)
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            self.store.release(key)
+            raise
+
+        status_code = response_start.get("status", 500)
+        if status_code >= 500:
+            self.store.release(key)
+            return
+        headers = [
+            (name, value) for name, value in response_start.get("headers", [])
+            if name.lower() not in (b"content-length", b"set-cookie")
+        ]
+        self.store.complete(key, fingerprint, status_code, headers, b"".join(response_body))
+
+    async def _send_response(self, send: Send, status_code: int, headers: List[Tuple[bytes, bytes]],
+                             body: bytes, replayed: bool = False) -> None:
+        response_headers = list(headers) + [(b"content-length", str(len(body)).encode())]
+        if replayed:
+            response_headers.append((REPLAY_HEADER.encode(), b"true"))
+        await send({"type": "http.response.start", "status": status_code, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _send_error(self, send: Send, status_code: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await self._send_response(send, status_code, [(b"content-type", b"application/json")], body)
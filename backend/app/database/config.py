@@ -14,6 +14,17 @@ class DatabaseConfig:
         default_path = Path(__file__).parent.parent.parent / "data" / "inventory.db"
         return os.getenv("DATABASE_PATH", str(default_path))
 
+    @staticmethod
+    def get_movement_archive_path() -> str:
+        """Get the directory for archived movement history partitions."""
+        default_path = Path(__file__).parent.parent.parent / "data" / "archive" / "movement_history"
+        return os.getenv("MOVEMENT_ARCHIVE_PATH", str(default_path))
+
+    @staticmethod
+    def get_movement_partition_months_ahead() -> int:
+        """Get how many future monthly movement history partitions to keep created."""
+        return int(os.getenv("MOVEMENT_PARTITION_MONTHS_AHEAD", "3"))
+
     @staticmethod
     def get_database_url() -> str:
         """Get database URL based on environment."""
@@ -1,15 +1,25 @@
 from typing import Dict
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
 from app.core.logging import LoggingConfig, get_logger
+from app.core.idempotency import IdempotencyMiddleware
+from app.database.base import engine
+from app.performance.metrics import CONTENT_TYPE, MetricsMiddleware, instrument_engine, metrics_enabled, render_metrics
+from app.performance.query_profiler import QueryProfilerMiddleware, profile_engine, query_profiler_enabled
 from app.api import router as api_router
 from app.services.weaviate_service import get_weaviate_service, close_weaviate_service
+from app.services.movement_archive_service import run_partition_maintenance
+from app.services.weaviate_sync_service import get_weaviate_sync_worker
+from app.services.job_service import get_job_runner
+from app.services.weaviate_reconciliation_service import run_reconciliation_schedule
+from app.services.image_preprocessing import close_image_preprocessor
 
 # Initialize logging
 LoggingConfig.setup_logging()
@@ -31,11 +41,33 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize Weaviate service: {e}")
         logger.info("Application will continue with traditional search only")
     
+    # Keep monthly movement history partitions ahead of the clock
+    partition_task = asyncio.create_task(run_partition_maintenance())
+    
+    # Apply queued item changes to Weaviate off the request path
+    weaviate_sync_worker = get_weaviate_sync_worker()
+    try:
+        await weaviate_sync_worker.start_filter_backfill()
+    except Exception as e:
+        logger.error(f"Failed to queue the Weaviate filter backfill: {e}")
+    weaviate_sync_task = asyncio.create_task(weaviate_sync_worker.run())
+    
+    # Run long operations (bulk syncs, migrations) as durable background jobs
+    job_runner_task = asyncio.create_task(get_job_runner().run())
+    
+    # Periodically diff items against the Weaviate index to repair drift
+    reconcile_task = asyncio.create_task(run_reconciliation_schedule())
+    
     yield
     
     # Shutdown
+    partition_task.cancel()
+    weaviate_sync_task.cancel()
+    job_runner_task.cancel()
+    reconcile_task.cancel()
     logger.info("Shutting down Weaviate service...")
     await close_weaviate_service()
+    close_image_preprocessor()
     logger.info("Application shutdown complete")
 
 
@@ -46,6 +78,19 @@ app: FastAPI = FastAPI(
     lifespan=lifespan
 )
 
+# Replay stored responses for retried inventory mutations (Idempotency-Key)
+app.add_middleware(IdempotencyMiddleware)
+
+# Request latency histograms and SQL timings for /metrics
+if metrics_enabled():
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+
+# Per-request SQL profiles and N+1 detection for /api/v1/performance/requests
+if query_profiler_enabled():
+    app.add_middleware(QueryProfilerMiddleware)
+    profile_engine(engine)
+
 # Configure CORS for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -68,6 +113,12 @@ async def root() -> Dict[str, str]:
     return {"message": "Home Inventory System API"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics in the text exposition format."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check() -> Dict[str, str]:
     """Health check endpoint for monitoring."""
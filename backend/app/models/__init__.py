@@ -9,6 +9,11 @@ from .category import Category
 from .item import Item, ItemType, ItemCondition, ItemStatus
 from .inventory import Inventory
 from .item_movement_history import ItemMovementHistory
+from .movement_history_archive import MovementHistoryArchive, MovementHistoryArchiveItem
+from .weaviate_sync_outbox import WeaviateSyncOutbox
+from .job import Job, JobStatus
+from .item_similarity import ItemSimilarity
+from .ai_response_cache import AIResponseCacheEntry
 
 __all__ = [
     "Location",
@@ -19,5 +24,12 @@ __all__ = [
     "ItemCondition", 
     "ItemStatus",
     "Inventory",
-    "ItemMovementHistory"
+    "ItemMovementHistory",
+    "MovementHistoryArchive",
+    "MovementHistoryArchiveItem",
+    "WeaviateSyncOutbox",
+    "Job",
+    "JobStatus",
+    "ItemSimilarity",
+    "AIResponseCacheEntry"
 ]
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+AI Response Cache model storing generated content for repeated requests.
+
+Generation requests with the same template, model and normalized context
+return the stored content instead of running another chat completion. Entries
+expire after a TTL and the table is trimmed to a maximum size, least recently
+used first.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Integer, String, DateTime, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.database.base import Base
+
+
+class AIResponseCacheEntry(Base):
+    """One cached generation result."""
+    __tablename__ = "ai_response_cache"
+
+    # SHA-256 of template type, model, prompt text and normalized context
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    template_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    tokens_used: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # Expiry sweeps and least-recently-used trimming
+        Index('ix_ai_response_cache_expires_at', 'expires_at'),
+        Index('ix_ai_response_cache_last_used_at', 'last_used_at'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AIResponseCacheEntry(template_type='{self.template_type}', model='{self.model}', hits={self.hit_count})>"
@@ -9,7 +9,7 @@ from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from decimal import Decimal
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Numeric
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Numeric, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -29,6 +29,11 @@ class ItemMovementHistory(Base):
     - Quantity adjustments (increases/decreases)
     - New inventory entries (initial assignments)
     - Inventory removals (item removal from locations)
+    
+    On PostgreSQL the table is range-partitioned by month on ``created_at``
+    (see the ``partition_movement_history`` migration). The primary key there
+    is ``(id, created_at)``; ``id`` remains unique via its sequence, so the ORM
+    keeps mapping ``id`` alone as the identity.
     """
     __tablename__ = "item_movement_history"
 
@@ -58,8 +63,7 @@ class ItemMovementHistory(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
         server_default=func.now(),
-        nullable=False,
-        index=True
+        nullable=False
     )
     user_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # For future user tracking
     system_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # For system-generated notes
@@ -69,6 +73,12 @@ class ItemMovementHistory(Base):
     from_location: Mapped[Optional["Location"]] = relationship("Location", foreign_keys=[from_location_id])
     to_location: Mapped[Optional["Location"]] = relationship("Location", foreign_keys=[to_location_id])
 
+    # Append-only log: BRIN on created_at is tiny and matches insertion order
+    __table_args__ = (
+        Index('ix_item_movement_history_created_at', 'created_at', postgresql_using='brin'),
+        Index('ix_item_movement_history_item_timestamp', 'item_id', 'created_at'),
+    )
+
     def __repr__(self) -> str:
         return f"<ItemMovementHistory(id={self.id}, item_id={self.item_id}, type={self.movement_type}, quantity={self.quantity_moved})>"
 
@@ -0,0 +1,48 @@
+"""
+Item Similarity model storing precomputed nearest neighbours per item.
+
+Each item keeps its top-K most similar items by embedding, so the similar
+items endpoint is one indexed lookup instead of a vector search per request.
+Lists are refreshed incrementally as embeddings change.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Integer, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.database.base import Base
+
+if TYPE_CHECKING:
+    from .item import Item
+
+
+class ItemSimilarity(Base):
+    """One neighbour in an item's precomputed similar-items list."""
+    __tablename__ = "item_similarities"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    similar_item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    similar_item: Mapped["Item"] = relationship("Item", foreign_keys=[similar_item_id])
+
+    __table_args__ = (
+        UniqueConstraint('item_id', 'similar_item_id', name='uq_item_similarities_pair'),
+        # Serves the endpoint lookup (item_id = ? ORDER BY rank)
+        Index('ix_item_similarities_item_rank', 'item_id', 'rank'),
+        # Finds the lists an item appears in when its embedding changes
+        Index('ix_item_similarities_similar_item', 'similar_item_id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ItemSimilarity(item_id={self.item_id}, similar_item_id={self.similar_item_id}, rank={self.rank})>"
@@ -0,0 +1,117 @@
+"""
+Job model for durable background operations.
+
+Long-running work (bulk Weaviate sync, migrations, exports) is recorded as a
+job row so it can be queued, observed, cancelled and resumed after a restart.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Integer, String, DateTime, Text, Boolean, JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.database.base import Base
+
+
+class JobStatus:
+    """Job lifecycle states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job(Base):
+    """
+    A unit of background work with progress and a resumable checkpoint.
+
+    Handlers store whatever they need to continue in ``checkpoint`` (for
+    example the last processed ID). A running job is leased to one runner
+    (``locked_by``), which refreshes ``heartbeat_at`` while it works; once the
+    heartbeat is older than the lease the job is queued again and its handler
+    resumes from the checkpoint.
+    """
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    job_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=JobStatus.QUEUED)
+
+    # Input, resumable state and output
+    params: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    checkpoint: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    result: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Progress reporting
+    progress_current: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    progress_total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    message: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Lease held by the runner executing the job
+    locked_by: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index('ix_jobs_status_created', 'status', 'created_at'),
+        Index('ix_jobs_job_type', 'job_type'),
+    )
+
+    @property
+    def is_finished(self) -> bool:
+        """Check if the job has reached a terminal state."""
+        return self.status in JobStatus.FINISHED
+
+    @property
+    def progress_percent(self) -> Optional[float]:
+        """Progress as a percentage, if the total is known."""
+        if not self.progress_total:
+            return None
+        return round(min(self.progress_current / self.progress_total, 1.0) * 100, 1)
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, type={self.job_type}, status={self.status})>"
+
+    def to_dict(self) -> dict:
+        """Convert job to dictionary for API responses."""
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "params": self.params,
+            "progress": {
+                "current": self.progress_current,
+                "total": self.progress_total,
+                "percent": self.progress_percent,
+                "message": self.message,
+            },
+            "result": self.result,
+            "error": self.error,
+            "cancel_requested": self.cancel_requested,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,82 @@
+"""
+Movement History Archive model for tracking cold movement history partitions.
+
+Each row describes one month of ``item_movement_history`` that has been moved
+out of the live table into a compressed file on disk. The items each archive
+holds are recorded alongside it, so item history reads skip unrelated months.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Integer, String, DateTime, Index, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.database.base import Base
+
+
+class MovementHistoryArchive(Base):
+    """
+    Manifest entry for an archived range of movement history.
+
+    The archived rows live in a gzip-compressed NDJSON file ordered by
+    ``created_at`` descending, so readers can stream it newest-first.
+    """
+    __tablename__ = "movement_history_archives"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    # Half-open time range [range_start, range_end) covered by the archive
+    range_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    range_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # Archive file details
+    partition_name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index('ix_movement_history_archives_range', 'range_start', 'range_end'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MovementHistoryArchive(partition={self.partition_name}, "
+            f"rows={self.row_count}, file={self.file_path})>"
+        )
+
+    def to_dict(self) -> dict:
+        """Convert archive manifest entry to dictionary for API responses."""
+        return {
+            "id": self.id,
+            "partition_name": self.partition_name,
+            "range_start": self.range_start.isoformat() if self.range_start else None,
+            "range_end": self.range_end.isoformat() if self.range_end else None,
+            "file_path": self.file_path,
+            "row_count": self.row_count,
+            "archived_at": self.archived_at.isoformat() if self.archived_at else None,
+        }
+
+
+class MovementHistoryArchiveItem(Base):
+    """Item with at least one movement in an archived range."""
+    __tablename__ = "movement_history_archive_items"
+
+    archive_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("movement_history_archives.id", ondelete="CASCADE"), primary_key=True
+    )
+    # No foreign key: archived history outlives deleted items
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    __table_args__ = (
+        Index('ix_movement_history_archive_items_item_id', 'item_id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<MovementHistoryArchiveItem(archive_id={self.archive_id}, item_id={self.item_id})>"
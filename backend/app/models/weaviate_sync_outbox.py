@@ -0,0 +1,74 @@
+"""
+Weaviate Sync Outbox model for reliable PostgreSQL to Weaviate synchronization.
+
+Item writes add a row here in the same transaction as the item change. A
+background worker drains the table and applies the changes to Weaviate, so
+API requests never wait on embedding generation or the vector store.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, String, DateTime, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.database.base import Base
+
+
+class WeaviateSyncOutbox(Base):
+    """
+    Pending Weaviate change for one item.
+
+    ``operation`` is ``upsert`` or ``delete``. Rows are deleted once applied;
+    rows that keep failing end up with status ``dead`` for inspection.
+    """
+    __tablename__ = "weaviate_sync_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    # No foreign key: delete entries must outlive the item row
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    operation: Mapped[str] = mapped_column(String(20), nullable=False)  # 'upsert', 'delete'
+
+    # Delivery state
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")  # 'pending', 'processing', 'dead'
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    # When a worker took the entry; 'processing' entries claimed too long ago are re-queued
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index('ix_weaviate_sync_outbox_status_available', 'status', 'available_at'),
+        Index('ix_weaviate_sync_outbox_item_id', 'item_id'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<WeaviateSyncOutbox(id={self.id}, item_id={self.item_id}, "
+            f"operation={self.operation}, status={self.status}, attempts={self.attempts})>"
+        )
+
+    def to_dict(self) -> dict:
+        """Convert outbox entry to dictionary for API responses."""
+        return {
+            "id": self.id,
+            "item_id": self.item_id,
+            "operation": self.operation,
+            "status": self.status,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "available_at": self.available_at.isoformat() if self.available_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
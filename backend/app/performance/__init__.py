@@ -14,6 +14,7 @@ from .query_optimizer import (
     warm_cache,
     get_performance_metrics
 )
+from .index_advisor import IndexAdvisor
 
 __all__ = [
     "PerformanceCache",
@@ -23,5 +24,6 @@ __all__ = [
     "cached_query",
     "invalidate_cache_on_changes", 
     "warm_cache",
-    "get_performance_metrics"
+    "get_performance_metrics",
+    "IndexAdvisor"
 ]
\ No newline at end of file
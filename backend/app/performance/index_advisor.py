@@ -0,0 +1,442 @@
+"""
+Index advisor built on PostgreSQL's own statistics.
+
+``IndexAdvisor`` looks at where the database actually spends its time:
+
+* ``pg_stat_statements`` gives the statements with the most total execution
+  time. The extension has to be listed in ``shared_preload_libraries`` and
+  created in the database.
+* ``pg_stat_user_tables`` gives each table's sequential and index scan counts
+  and live row estimate. Partitions are rolled up into their parent table.
+* A generic ``EXPLAIN (FORMAT JSON)`` plan of each top statement shows which
+  tables it reads with a sequential scan, and with which filter or sort.
+
+Each sequential scan over a table of at least ``min_table_rows`` rows becomes
+a candidate index: the filter's equality columns first, then one range or
+sort column. Candidates already covered by the leading columns of a valid
+B-tree index are dropped. A candidate's estimated benefit is the statement's
+total execution time, times the scan's share of the plan cost, times the
+fraction of rows the scan discards, summed over every statement that needs
+it. It ranks recommendations; it does not predict the saving.
+
+Recommendations are applied by the ``index_build`` job in
+``app.services.index_build_service``.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL truncates longer identifiers
+_MAX_IDENTIFIER_LENGTH = 63
+_PARAMETER = re.compile(r"\$(\d+)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+# A column compared with an operator, optionally parenthesized and cast: (status)::text = ...
+_COMPARISON = re.compile(r"(?<![\w.:$\"])([a-z_][a-z0-9_]*)\)?(?:::[a-z ]+(?:\[\])?)?\s*(<>|<=|>=|=|<|>)(?!~)")
+_SCAN_NODES = {"Seq Scan", "Parallel Seq Scan"}
+_PASSTHROUGH_NODES = {"Gather", "Gather Merge", "Append"}
+
+_TOP_STATEMENTS_SQL = r"""
+    SELECT queryid, query, calls, total_exec_time, mean_exec_time, rows
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+      AND query ~* '^\s*(select|with)\s'
+      AND query !~* '(pg_catalog|pg_stat|information_schema)'
+    ORDER BY total_exec_time DESC
+    LIMIT :limit
+"""
+
+_TABLE_STATS_SQL = """
+    SELECT relname, seq_scan, seq_tup_read, COALESCE(idx_scan, 0) AS idx_scan, n_live_tup
+    FROM pg_stat_user_tables
+    WHERE schemaname = current_schema()
+"""
+
+_PARTITIONS_SQL = """
+    SELECT child.relname AS child, parent.relname AS parent
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+    WHERE ns.nspname = current_schema() AND parent.relkind = 'p'
+    ORDER BY child.relname
+"""
+
+_COLUMNS_SQL = """
+    SELECT table_name, column_name
+    FROM information_schema.columns
+    WHERE table_schema = current_schema()
+"""
+
+_INDEXES_SQL = """
+    SELECT tbl.relname AS table_name, idx.relname AS index_name, am.amname AS method,
+           pg_index.indisvalid AS valid,
+           ARRAY(
+               SELECT pg_get_indexdef(pg_index.indexrelid, k, true)
+               FROM generate_series(1, pg_index.indnkeyatts) AS k
+           ) AS columns
+    FROM pg_index
+    JOIN pg_class tbl ON tbl.oid = pg_index.indrelid
+    JOIN pg_class idx ON idx.oid = pg_index.indexrelid
+    JOIN pg_am am ON am.oid = idx.relam
+    JOIN pg_namespace ns ON ns.oid = tbl.relnamespace
+    WHERE ns.nspname = current_schema()
+"""
+
+def index_name(table: str, columns: List[str]) -> str:
+    """Name an index ``ix_<table>_<columns>``, shortened with a hash past PostgreSQL's limit."""
+    name = f"ix_{table}_{'_'.join(columns)}"
+    if len(name) <= _MAX_IDENTIFIER_LENGTH:
+        return name
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    return f"{name[:_MAX_IDENTIFIER_LENGTH - 9]}_{digest}"
+
+
+def filter_columns(expression: str, columns: Set[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split the columns a plan filter compares into equality and range columns.
+
+    Columns inside function calls (``lower(name) = $1``) and ``<>``
+    comparisons are ignored, since a plain index on the column cannot serve them.
+    """
+    expression = _STRING_LITERAL.sub("''", expression)
+    equality: List[str] = []
+    ranges: List[str] = []
+    for match in _COMPARISON.finditer(expression):
+        column, operator = match.groups()
+        prefix = expression[:match.start()].rstrip("(")
+        if column not in columns or operator == "<>" or column in equality or column in ranges:
+            continue
+        if prefix and (prefix[-1].isalnum() or prefix[-1] == "_"):
+            continue
+        (equality if operator == "=" else ranges).append(column)
+    return equality, ranges
+
+
+def _sort_column(key: str) -> str:
+    return key.split()[0].split(".")[-1].strip('()"')
+
+
+def plan_candidates(plan: Dict[str, Any], columns_by_table: Dict[str, Set[str]]) -> List[Dict[str, Any]]:
+    """
+    Candidate indexes for the sequential scans in an ``EXPLAIN (FORMAT JSON)`` plan.
+
+    Args:
+        plan: The plan's top node (``[0]["Plan"]`` of the EXPLAIN output)
+        columns_by_table: Column names of each table that may be indexed
+
+    Returns:
+        Dicts with the scanned table, proposed columns, the scan's estimated
+        row count and its share of the plan's total cost
+    """
+    root_cost = plan.get("Total Cost") or 0.0
+    candidates: List[Dict[str, Any]] = []
+
+    def walk(node: Dict[str, Any], sort_keys: List[str], parent_type: Optional[str]) -> None:
+        node_type = node.get("Node Type")
+        table = node.get("Relation Name")
+        if node_type in _SCAN_NODES and table in columns_by_table:
+            columns = columns_by_table[table]
+            equality, ranges = filter_columns(node.get("Filter", ""), columns)
+            ordering = [column for column in map(_sort_column, sort_keys) if column in columns]
+            proposed = equality + (ranges[:1] or [column for column in ordering if column not in equality][:1])
+            if proposed:
+                cost = node.get("Total Cost") or 0.0
+                candidates.append({
+                    "table": table,
+                    "columns": proposed[:3],
+                    "plan_rows": node.get("Plan Rows", 0),
+                    "cost_share": min(cost / root_cost, 1.0) if root_cost else 1.0,
+                    "filter": node.get("Filter"),
+                })
+
+        if node_type == "Sort" and parent_type == "Limit":
+            # Only a sort feeding a LIMIT can stop early when read from an index
+            child_keys = node.get("Sort Key", [])
+        elif node_type in _PASSTHROUGH_NODES:
+            child_keys = sort_keys
+        else:
+            child_keys = []
+        for child in node.get("Plans", []):
+            walk(child, child_keys, node_type)
+
+    walk(plan, [], None)
+    return candidates
+
+
+def build_recommendations(
+    statements: List[Dict[str, Any]],
+    plans: Dict[Any, Dict[str, Any]],
+    table_stats: Dict[str, Dict[str, Any]],
+    columns_by_table: Dict[str, Set[str]],
+    existing_indexes: Dict[str, List[List[str]]],
+    parent_of: Dict[str, str],
+    min_table_rows: int = 1000
+) -> List[Dict[str, Any]]:
+    """
+    Turn top statements and their plans into ranked index recommendations.
+
+    Args:
+        statements: Rows from ``pg_stat_statements`` (queryid, query, calls, total_exec_time)
+        plans: Top plan node by queryid
+        table_stats: ``pg_stat_user_tables`` row by table, partitions included
+        columns_by_table: Column names by table
+        existing_indexes: Leading columns of valid B-tree indexes by table
+        parent_of: Partitioned parent table by partition
+        min_table_rows: Tables with fewer live rows are never indexed
+
+    Returns:
+        Recommendations ordered by estimated benefit, largest first
+    """
+    partitioned = set(parent_of.values())
+    recommendations: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+
+    for statement in statements:
+        plan = plans.get(statement["queryid"])
+        if plan is None:
+            continue
+        for candidate in plan_candidates(plan, columns_by_table):
+            scanned = candidate["table"]
+            table = parent_of.get(scanned, scanned)
+            columns = candidate["columns"]
+            rows = (table_stats.get(scanned) or {}).get("n_live_tup", 0)
+            total_rows = sum(
+                stats.get("n_live_tup", 0) for name, stats in table_stats.items()
+                if parent_of.get(name, name) == table
+            )
+            if total_rows < min_table_rows:
+                continue
+            if any(existing[:len(columns)] == columns for existing in existing_indexes.get(table, [])):
+                continue
+
+            discarded = max(0.0, 1.0 - candidate["plan_rows"] / rows) if rows else 0.0
+            benefit = float(statement["total_exec_time"]) * candidate["cost_share"] * discarded
+            key = (table, tuple(columns))
+            recommendation = recommendations.get(key)
+            if recommendation is None:
+                stats = table_stats.get(table) or {}
+                scans = stats.get("seq_scan", 0) + stats.get("idx_scan", 0)
+                name = index_name(table, columns)
+                recommendation = recommendations[key] = {
+                    "table": table,
+                    "columns": columns,
+                    "type": "composite" if len(columns) > 1 else "single",
+                    "index_name": name,
+                    "partitioned": table in partitioned,
+                    "statement": (
+                        f"CREATE INDEX {name} ON ONLY {table} ({', '.join(columns)})" if table in partitioned
+                        else f"CREATE INDEX CONCURRENTLY {name} ON {table} ({', '.join(columns)})"
+                    ),
+                    "table_rows": total_rows,
+                    "seq_scan_ratio": round(stats.get("seq_scan", 0) / scans, 3) if scans else None,
+                    "estimated_benefit_ms": 0.0,
+                    "calls": 0,
+                    "queries": [],
+                    "_queryids": set(),
+                }
+            recommendation["estimated_benefit_ms"] += benefit
+            # Partitions of one table show up as separate scans of the same statement
+            if statement["queryid"] not in recommendation["_queryids"]:
+                recommendation["_queryids"].add(statement["queryid"])
+                recommendation["calls"] += int(statement["calls"])
+                if len(recommendation["queries"]) < 3:
+                    recommendation["queries"].append(statement["query"][:300])
+
+    ranked = sorted(recommendations.values(), key=lambda r: r["estimated_benefit_ms"], reverse=True)
+    for recommendation in ranked:
+        statement_count = len(recommendation.pop("_queryids"))
+        recommendation["estimated_benefit_ms"] = round(recommendation["estimated_benefit_ms"], 1)
+        recommendation["reason"] = (
+            f"Sequential scans of {recommendation['table']} ({recommendation['table_rows']} rows) "
+            f"filtered or sorted on {', '.join(recommendation['columns'])} in "
+            f"{statement_count} top statement(s), {recommendation['calls']} calls"
+        )
+    return ranked
+
+
+class IndexAdvisor:
+    """Proposes indexes from PostgreSQL's statement statistics and query plans."""
+
+    def __init__(self, db: AsyncSession, top_statements: int = 25, min_table_rows: int = 1000):
+        self.db = db
+        self.top_statements = top_statements
+        self.min_table_rows = min_table_rows
+        self._server_version: Optional[int] = None
+
+    def is_supported(self) -> bool:
+        """Whether the session is connected to PostgreSQL."""
+        dialect = getattr(getattr(self.db, "bind", None), "dialect", None)
+        return getattr(dialect, "name", None) == "postgresql"
+
+    async def _fetch(self, statement: str, **params: Any) -> Optional[List[Dict[str, Any]]]:
+        """Run a catalog query in a savepoint, returning None if it fails."""
+        try:
+            async with self.db.begin_nested():
+                result = await self.db.execute(text(statement), params)
+                return [dict(row) for row in result.mappings().all()]
+        except Exception as e:
+            logger.warning(f"Index advisor query failed: {e}")
+            return None
+
+    async def top_statements_by_time(self) -> Optional[List[Dict[str, Any]]]:
+        """Statements with the most total execution time, or None without pg_stat_statements."""
+        installed = await self._fetch("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+        if not installed:
+            return None
+        return await self._fetch(_TOP_STATEMENTS_SQL, limit=self.top_statements)
+
+    async def catalog(self) -> Dict[str, Any]:
+        """Table statistics, columns, existing indexes and partitions of the current schema."""
+        table_stats = {row["relname"]: row for row in await self._fetch(_TABLE_STATS_SQL) or []}
+        parent_of = {row["child"]: row["parent"] for row in await self._fetch(_PARTITIONS_SQL) or []}
+        columns_by_table: Dict[str, Set[str]] = {}
+        for row in await self._fetch(_COLUMNS_SQL) or []:
+            columns_by_table.setdefault(row["table_name"], set()).add(row["column_name"])
+        indexes: Dict[str, List[Dict[str, Any]]] = {}
+        for row in await self._fetch(_INDEXES_SQL) or []:
+            indexes.setdefault(row["table_name"], []).append(row)
+        return {
+            "table_stats": table_stats,
+            "parent_of": parent_of,
+            "columns_by_table": columns_by_table,
+            "indexes": indexes,
+        }
+
+    async def explain(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Generic plan of a normalized statement (``$1`` placeholders), or None.
+
+        PostgreSQL 16 plans these directly with ``GENERIC_PLAN``. Older servers
+        prepare the statement and explain an execution with NULL arguments
+        while ``plan_cache_mode`` forces the generic plan, so the arguments
+        never influence it.
+        """
+        query = query.strip().rstrip(";")
+        parameters = max((int(number) for number in _PARAMETER.findall(query)), default=0)
+        connection = await self.db.connection()
+        if self._server_version is None:
+            self._server_version = int((await connection.exec_driver_sql("SHOW server_version_num")).scalar())
+        savepoint = await self.db.begin_nested()
+        prepared = False
+        try:
+            if self._server_version >= 160000:
+                result = await connection.exec_driver_sql(f"EXPLAIN (GENERIC_PLAN, FORMAT JSON) {query}")
+            else:
+                await connection.exec_driver_sql("SET LOCAL plan_cache_mode = force_generic_plan")
+                await connection.exec_driver_sql(f"PREPARE index_advisor_statement AS {query}")
+                prepared = True
+                arguments = f"({', '.join(['NULL'] * parameters)})" if parameters else ""
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) EXECUTE index_advisor_statement{arguments}"
+                )
+            output = result.scalar()
+        except Exception as e:
+            logger.debug(f"Could not explain statement: {e}")
+            output = None
+        finally:
+            await savepoint.rollback()
+            if prepared:
+                await connection.exec_driver_sql("DEALLOCATE index_advisor_statement")
+
+        if isinstance(output, str):
+            output = json.loads(output)
+        return output[0]["Plan"] if output else None
+
+    async def recommend(self) -> Dict[str, Any]:
+        """
+        Analyze the current database and propose indexes.
+
+        Returns:
+            Recommendations with estimated benefit, the slowest statements, the
+            tables read most by sequential scans, and notes on missing inputs
+        """
+        report: Dict[str, Any] = {
+            "supported": self.is_supported(),
+            "pg_stat_statements": False,
+            "analyzed_statements": 0,
+            "unexplained_statements": 0,
+            "recommendations": [],
+            "slow_queries": [],
+            "tables": [],
+            "notes": [],
+        }
+        if not report["supported"]:
+            report["notes"].append("Index advice needs PostgreSQL statistics; the database is not PostgreSQL")
+            return report
+
+        catalog = await self.catalog()
+        parent_of = catalog["parent_of"]
+        table_stats = catalog["table_stats"]
+        report["tables"] = self._scan_heavy_tables(table_stats, parent_of)
+
+        statements = await self.top_statements_by_time()
+        if statements is None:
+            report["notes"].append(
+                "pg_stat_statements is not available: add it to shared_preload_libraries "
+                "and run CREATE EXTENSION pg_stat_statements"
+            )
+            return report
+        report["pg_stat_statements"] = True
+
+        plans: Dict[Any, Dict[str, Any]] = {}
+        for statement in statements:
+            plan = await self.explain(statement["query"])
+            if plan is None:
+                report["unexplained_statements"] += 1
+            else:
+                plans[statement["queryid"]] = plan
+        report["analyzed_statements"] = len(plans)
+        report["slow_queries"] = [
+            {
+                "query": statement["query"][:300],
+                "calls": int(statement["calls"]),
+                "total_ms": round(float(statement["total_exec_time"]), 1),
+                "mean_ms": round(float(statement["mean_exec_time"]), 2),
+                "rows": int(statement["rows"]),
+            }
+            for statement in statements[:10]
+        ]
+
+        existing = {
+            table: [row["columns"] for row in rows if row["valid"] and row["method"] == "btree"]
+            for table, rows in catalog["indexes"].items()
+        }
+        report["recommendations"] = build_recommendations(
+            statements, plans, table_stats, catalog["columns_by_table"], existing, parent_of,
+            min_table_rows=self.min_table_rows
+        )
+        return report
+
+    def _scan_heavy_tables(
+        self,
+        table_stats: Dict[str, Dict[str, Any]],
+        parent_of: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        totals: Dict[str, Dict[str, int]] = {}
+        for name, stats in table_stats.items():
+            table = totals.setdefault(parent_of.get(name, name), {
+                "seq_scan": 0, "seq_tup_read": 0, "idx_scan": 0, "n_live_tup": 0
+            })
+            for key in table:
+                table[key] += int(stats.get(key) or 0)
+
+        tables = [
+            {
+                "table": name,
+                "rows": stats["n_live_tup"],
+                "seq_scans": stats["seq_scan"],
+                "index_scans": stats["idx_scan"],
+                "seq_rows_read": stats["seq_tup_read"],
+                "seq_scan_ratio": round(stats["seq_scan"] / (stats["seq_scan"] + stats["idx_scan"]), 3),
+            }
+            for name, stats in totals.items()
+            if stats["n_live_tup"] >= self.min_table_rows and stats["seq_scan"] + stats["idx_scan"]
+        ]
+        return sorted(tables, key=lambda table: table["seq_rows_read"], reverse=True)[:10]
@@ -12,13 +12,15 @@ import hashlib
 import json
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, Index, select, func
+from sqlalchemy import Index, select, func
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.models.inventory import Inventory
 from app.models.item import Item
 from app.models.location import Location
 from app.models.category import Category
+from app.models.job import Job
+from app.performance.index_advisor import IndexAdvisor
 
 logger = logging.getLogger(__name__)
 
@@ -137,107 +139,53 @@ class QueryOptimizer:
             }
         ]
         
-        # Recommend indexes for common queries
-        analysis["missing_indexes"] = await self._check_missing_indexes()
+        # Indexes proposed from pg_stat_statements and query plans
+        advice = await IndexAdvisor(self.db).recommend()
+        analysis["slow_queries"] = advice["slow_queries"]
+        analysis["missing_indexes"] = advice["recommendations"]
+        analysis["scan_heavy_tables"] = advice["tables"]
         
         # Performance recommendations
         analysis["recommendations"] = [
-            "Add composite index on inventory(item_id, location_id)",
-            "Add index on inventory.updated_at for timeline queries",
-            "Add index on items.item_type for category filtering",
-            "Add index on locations.parent_id for hierarchy queries",
-            "Implement connection pooling for high load",
-            "Add query result caching for frequent lookups"
-        ]
+            f"{index['statement']} (estimated {index['estimated_benefit_ms']} ms saved)"
+            for index in advice["recommendations"]
+        ] + advice["notes"]
         
         return analysis
     
-    async def _check_missing_indexes(self) -> List[Dict[str, str]]:
-        """Check for commonly needed indexes."""
-        # Note: This is simplified - in production you'd check actual index usage
-        missing_indexes = [
-            {
-                "table": "inventory",
-                "columns": ["item_id", "location_id"],
-                "type": "composite",
-                "reason": "Frequent lookups for item-location pairs"
-            },
-            {
-                "table": "inventory", 
-                "columns": ["updated_at"],
-                "type": "single",
-                "reason": "Sorting by update time in search queries"
-            },
-            {
-                "table": "movement_history",
-                "columns": ["item_id", "created_at"],
-                "type": "composite", 
-                "reason": "Movement history queries by item with time sorting"
-            },
-            {
-                "table": "items",
-                "columns": ["item_type"],
-                "type": "single",
-                "reason": "Filtering by item type"
-            },
-            {
-                "table": "locations",
-                "columns": ["parent_id"],
-                "type": "single",
-                "reason": "Location hierarchy traversal"
-            }
-        ]
-        
-        return missing_indexes
+    async def _check_missing_indexes(self) -> List[Dict[str, Any]]:
+        """Check which indexes the slowest statements need, ranked by estimated benefit."""
+        advice = await IndexAdvisor(self.db).recommend()
+        return advice["recommendations"]
     
-    async def create_recommended_indexes(self) -> List[str]:
-        """Create recommended database indexes."""
-        created_indexes = []
+    async def create_recommended_indexes(
+        self,
+        indexes: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Job]:
+        """
+        Queue a background job building indexes with CREATE INDEX CONCURRENTLY.
         
-        try:
-            # Composite index for inventory lookups
-            await self.db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_inventory_item_location 
-                ON inventory(item_id, location_id)
-            """))
-            created_indexes.append("idx_inventory_item_location")
-            
-            # Index for inventory update sorting
-            await self.db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_inventory_updated_at 
-                ON inventory(updated_at DESC)
-            """))
-            created_indexes.append("idx_inventory_updated_at")
-            
-            # Index for movement history queries
-            await self.db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_movement_history_item_time 
-                ON movement_history(item_id, created_at DESC)
-            """))
-            created_indexes.append("idx_movement_history_item_time")
+        Args:
+            indexes: List of {"table", "columns"}; defaults to the current recommendations
             
-            # Index for item type filtering
-            await self.db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_items_type 
-                ON items(item_type)
-            """))
-            created_indexes.append("idx_items_type")
-            
-            # Index for location hierarchy
-            await self.db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_locations_parent 
-                ON locations(parent_id)
-            """))
-            created_indexes.append("idx_locations_parent")
-            
-            await self.db.commit()
-            logger.info(f"Created {len(created_indexes)} database indexes")
-            
-        except Exception as e:
-            logger.error(f"Failed to create indexes: {e}")
-            await self.db.rollback()
-            
-        return created_indexes
+        Returns:
+            The queued job, or None if there is nothing to build
+        """
+        if indexes is None:
+            indexes = [
+                {"table": index["table"], "columns": index["columns"]}
+                for index in await self._check_missing_indexes()
+            ]
+        if not indexes:
+            return None
+        
+        # Imported here: job_service imports the rate limiter, which imports app.performance
+        from app.services.index_build_service import INDEX_BUILD_JOB
+        from app.services.job_service import JobService
+        
+        job = await JobService(self.db).create_job(INDEX_BUILD_JOB, {"indexes": indexes})
+        logger.info(f"Queued index build job {job.id} for {len(indexes)} indexes")
+        return job
 
 
 class OptimizedInventoryService:
@@ -0,0 +1,253 @@
+"""
+Per-request SQL profiler with N+1 detection.
+
+When ``QUERY_PROFILER_ENABLED`` is set, ``QueryProfilerMiddleware`` records
+every SQL statement a request executes. Statements are reduced to a
+fingerprint (literals and bound parameters replaced by ``?``, ``IN`` lists
+collapsed, whitespace normalized), so ``SELECT ... WHERE id = 1`` and
+``... WHERE id = 2`` count as the same query. A fingerprint executed at least
+``QUERY_PROFILER_N_PLUS_ONE_THRESHOLD`` times in one request is flagged as a
+likely N+1 pattern and logged.
+
+Each response carries an ``X-Query-Profile`` header with the statement count,
+total database time and number of flagged fingerprints. Profiles are kept per
+route in a rolling window, and ``/performance/requests`` reports the routes
+with the most database time.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-query-profile"
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("query_profile", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_POSITIONAL_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*(?:\?\s*,\s*)*\?\s*\)", re.IGNORECASE)
+_POSTCOMPILE = re.compile(r"\(\s*__\[POSTCOMPILE_\w+\]\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Replace literals and parameters with ``?`` so repeated queries share one fingerprint."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _POSTCOMPILE.sub("(?)", normalized)
+    normalized = _POSITIONAL_PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    """Short stable ID for a normalized statement."""
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+class RequestProfile:
+    """SQL statements executed while handling one request."""
+
+    def __init__(self, n_plus_one_threshold: int):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.statements = 0
+        self.db_time = 0.0
+        # normalized statement -> [count, total seconds]
+        self.fingerprints: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        normalized = normalize_sql(statement)
+        entry = self.fingerprints.get(normalized)
+        if entry is None:
+            entry = self.fingerprints[normalized] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += duration
+        self.statements += 1
+        self.db_time += duration
+
+    def n_plus_one(self) -> List[Dict[str, Any]]:
+        """Fingerprints repeated at least ``n_plus_one_threshold`` times, most repeated first."""
+        repeated = [
+            {
+                "fingerprint": fingerprint_id(normalized),
+                "statement": normalized[:500],
+                "count": int(count),
+                "db_ms": round(total * 1000, 2),
+            }
+            for normalized, (count, total) in self.fingerprints.items()
+            if count >= self.n_plus_one_threshold
+        ]
+        return sorted(repeated, key=lambda entry: entry["count"], reverse=True)
+
+    def header_value(self) -> str:
+        return (
+            f"statements={self.statements};db_ms={self.db_time * 1000:.1f};"
+            f"n_plus_one={len(self.n_plus_one())}"
+        )
+
+
+class QueryProfileStore:
+    """Rolling window of request profiles per route."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        # "METHOD route" -> recent (statements, db seconds, duration seconds, n+1 findings)
+        self._samples: Dict[str, Deque[Tuple[int, float, float, List[Dict[str, Any]]]]] = {}
+
+    def add(self, endpoint: str, profile: RequestProfile, duration: float) -> None:
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append((profile.statements, profile.db_time, duration, profile.n_plus_one()))
+
+    def report(self, limit: int = 20, sort: str = "db_time") -> List[Dict[str, Any]]:
+        """
+        Summarize the window for each route, worst first.
+
+        Args:
+            limit: Number of routes to return
+            sort: ``db_time`` (total database time), ``statements`` (average
+                statements per request) or ``n_plus_one`` (requests flagged)
+        """
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+
+        rows = []
+        for endpoint, samples in snapshot.items():
+            statements = [sample[0] for sample in samples]
+            db_times = [sample[1] for sample in samples]
+            patterns: Dict[str, Dict[str, Any]] = {}
+            for _, _, _, findings in samples:
+                for finding in findings:
+                    pattern = patterns.setdefault(
+                        finding["fingerprint"],
+                        {"fingerprint": finding["fingerprint"], "statement": finding["statement"],
+                         "requests": 0, "max_count": 0}
+                    )
+                    pattern["requests"] += 1
+                    pattern["max_count"] = max(pattern["max_count"], finding["count"])
+            rows.append({
+                "endpoint": endpoint,
+                "requests": len(samples),
+                "avg_statements": round(sum(statements) / len(samples), 1),
+                "max_statements": max(statements),
+                "total_db_ms": round(sum(db_times) * 1000, 1),
+                "avg_db_ms": round(sum(db_times) * 1000 / len(samples), 2),
+                "max_db_ms": round(max(db_times) * 1000, 2),
+                "avg_duration_ms": round(sum(sample[2] for sample in samples) * 1000 / len(samples), 2),
+                "n_plus_one_requests": sum(1 for sample in samples if sample[3]),
+                "n_plus_one_patterns": sorted(patterns.values(), key=lambda p: p["requests"], reverse=True)[:5],
+            })
+
+        keys = {
+            "db_time": lambda row: row["total_db_ms"],
+            "statements": lambda row: row["avg_statements"],
+            "n_plus_one": lambda row: (row["n_plus_one_requests"], row["total_db_ms"]),
+        }
+        if sort not in keys:
+            raise ValueError(f"Unknown sort '{sort}' (expected one of {', '.join(keys)})")
+        return sorted(rows, key=keys[sort], reverse=True)[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+def query_profiler_enabled() -> bool:
+    """Whether the profiler is switched on (``QUERY_PROFILER_ENABLED``, off by default)."""
+    return os.getenv("QUERY_PROFILER_ENABLED", "false").lower() == "true"
+
+
+# Global store instance
+_query_profile_store: Optional[QueryProfileStore] = None
+
+
+def get_query_profile_store() -> QueryProfileStore:
+    """Get the process-wide store of request profiles."""
+    global _query_profile_store
+    if _query_profile_store is None:
+        _query_profile_store = QueryProfileStore(window=int(os.getenv("QUERY_PROFILER_WINDOW", "200")))
+    return _query_profile_store
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_profile.get() is not None:
+        context._profiler_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profiler_started", None)
+    if profile is not None and started is not None:
+        profile.record(statement, time.perf_counter() - started)
+
+
+def profile_engine(engine) -> None:
+    """Record statements run on a sync or async engine into the current request's profile."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware profiling the SQL executed by each request."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: Optional[QueryProfileStore] = None,
+        n_plus_one_threshold: Optional[int] = None
+    ):
+        self.app = app
+        self._store = store
+        self.n_plus_one_threshold = n_plus_one_threshold or int(
+            os.getenv("QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", "5")
+        )
+
+    @property
+    def store(self) -> QueryProfileStore:
+        return self._store or get_query_profile_store()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(self.n_plus_one_threshold)
+        started = time.perf_counter()
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Statements run while streaming the body are reported in the rolling report only
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_HEADER.encode(), profile.header_value().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            _current_profile.reset(token)
+            route = scope.get("route")
+            endpoint = f"{scope['method']} {getattr(route, 'path', 'unmatched')}"
+            self.store.add(endpoint, profile, time.perf_counter() - started)
+            for finding in profile.n_plus_one():
+                logger.warning(
+                    f"Possible N+1 in {endpoint}: {finding['count']} executions of {finding['statement'][:200]}"
+                )
@@ -0,0 +1,219 @@
+"""
+Batch AI enrichment of existing items, run as a background job.
+
+``run_batch_enrichment_job`` takes a list of item IDs, loads their name,
+category, type, brand and model in one query and runs the
+``item_data_enrichment`` generation for up to ``concurrency`` items at once.
+Every call goes through the shared OpenAI rate limiter at background
+priority, so interactive requests are not starved.
+
+Results are written back one page of ``batch_size`` items per transaction.
+A field is only changed when the model's confidence in it reaches
+``min_confidence``, and fields that already have a value are kept unless
+``overwrite`` is set. Changed items get a new version and a Weaviate sync
+entry, like any other item update. Progress is reported after each page, so
+the job can be followed through the jobs API and resumes after a restart.
+"""
+
+import asyncio
+import logging
+import os
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.models.category import Category
+from app.models.item import Item
+from app.services.ai_service import get_ai_service
+from app.services.job_service import JobContext, job_handler
+from app.services.weaviate_sync_service import enqueue_item_sync, UPSERT
+
+logger = logging.getLogger(__name__)
+
+AI_BATCH_ENRICHMENT_JOB = "ai_batch_enrichment"
+
+# Item columns that can be filled in, and the enrichment field providing each
+ENRICHABLE_FIELDS = {
+    "name": "refined_name",
+    "description": "description",
+    "brand": "brand",
+    "model": "model",
+    "current_value": "estimated_value",
+}
+
+DEFAULT_ENRICHMENT_FIELDS = ["description", "brand", "model"]
+
+# Failures kept in the job result for inspection
+_MAX_REPORTED_FAILURES = 50
+
+
+def _column_length(field: str) -> Optional[int]:
+    return getattr(Item.__table__.columns[field].type, "length", None)
+
+
+def enrichment_updates(
+    item: Item,
+    enriched: Dict[str, Any],
+    fields: List[str],
+    min_confidence: float,
+    overwrite: bool
+) -> Dict[str, Any]:
+    """
+    Choose the item fields to change from an enrichment result.
+
+    Returns:
+        Mapping of item column to new value
+    """
+    confidence = enriched.get("confidence_scores") or {}
+    updates: Dict[str, Any] = {}
+    for field in fields:
+        source = ENRICHABLE_FIELDS[field]
+        value = enriched.get(source)
+        if value in (None, "") or float(confidence.get(source) or 0.0) < min_confidence:
+            continue
+        if getattr(item, field) not in (None, "") and not overwrite:
+            continue
+
+        if field == "current_value":
+            try:
+                value = Decimal(str(value)).quantize(Decimal("0.01"))
+            except (InvalidOperation, ValueError):
+                continue
+            if value < 0:
+                continue
+        else:
+            if not isinstance(value, str):
+                continue
+            value = value.strip()
+            length = _column_length(field)
+            if not value or (length and len(value) > length):
+                continue
+
+        if value != getattr(item, field):
+            updates[field] = value
+    return updates
+
+
+async def _enrich_one(ai_service, item: Dict[str, Any], semaphore: asyncio.Semaphore) -> Tuple[int, Any]:
+    """Run one enrichment, returning the item ID and the result or the exception raised."""
+    async with semaphore:
+        try:
+            return item["id"], await ai_service.generate_item_data_enrichment(
+                name=item["name"],
+                category=item["category"],
+                item_type=item["item_type"],
+                brand=item["brand"],
+                model=item["model"]
+            )
+        except Exception as e:
+            return item["id"], e
+
+
+@job_handler(AI_BATCH_ENRICHMENT_JOB)
+async def run_batch_enrichment_job(context: JobContext) -> Dict[str, Any]:
+    """
+    Job handler enriching items with AI-generated data.
+
+    Params:
+        item_ids: Items to enrich (inactive and unknown IDs are skipped)
+        fields: Item fields to fill in (default description, brand and model)
+        min_confidence: Minimum confidence for a field to be written (default 0.7)
+        overwrite: Replace fields that already have a value (default False)
+        batch_size: Items written back per transaction (default 20)
+        concurrency: Generations run at once (default ``AI_ENRICHMENT_CONCURRENCY`` or 4)
+    """
+    item_ids = sorted({int(item_id) for item_id in context.params.get("item_ids") or []})
+    fields = context.params.get("fields") or DEFAULT_ENRICHMENT_FIELDS
+    unknown = [field for field in fields if field not in ENRICHABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Fields cannot be enriched: {', '.join(unknown)}")
+    min_confidence = float(context.params.get("min_confidence", 0.7))
+    overwrite = bool(context.params.get("overwrite", False))
+    batch_size = int(context.params.get("batch_size") or 20)
+    concurrency = int(context.params.get("concurrency") or os.getenv("AI_ENRICHMENT_CONCURRENCY", "4"))
+
+    last_id = context.checkpoint.get("last_id", 0)
+    processed = context.checkpoint.get("processed", 0)
+    totals = context.checkpoint.get("stats") or {
+        "updated": 0, "unchanged": 0, "failed": 0, "skipped": 0, "tokens_used": 0
+    }
+    failures: List[Dict[str, Any]] = context.checkpoint.get("failures") or []
+
+    # Everything the prompts need, for all remaining items, in one query
+    remaining = [item_id for item_id in item_ids if item_id > last_id]
+    async with context.session_factory() as session:
+        result = await session.execute(
+            select(Item.id, Item.name, Item.item_type, Item.brand, Item.model, Category.name)
+            .outerjoin(Category, Item.category_id == Category.id)
+            .where(Item.id.in_(remaining), Item.is_active == True)
+            .order_by(Item.id)
+        )
+        contexts = [
+            {
+                "id": item_id,
+                "name": name,
+                "item_type": item_type.value if item_type is not None else None,
+                "brand": brand,
+                "model": model,
+                "category": category,
+            }
+            for item_id, name, item_type, brand, model, category in result.all()
+        ]
+    if "stats" not in context.checkpoint:
+        # Counted once; a resumed job has them in its checkpoint already
+        totals["skipped"] = len(remaining) - len(contexts)
+        processed += totals["skipped"]
+    await context.report(
+        processed,
+        len(item_ids),
+        checkpoint={"last_id": last_id, "processed": processed, "stats": totals, "failures": failures}
+    )
+
+    ai_service = await get_ai_service()
+    if contexts and not ai_service._openai_client:
+        raise RuntimeError("AI service is not available")
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    for start in range(0, len(contexts), batch_size):
+        page = contexts[start:start + batch_size]
+        outcomes = dict(await asyncio.gather(*(_enrich_one(ai_service, item, semaphore) for item in page)))
+
+        async with context.session_factory() as session:
+            items = (await session.execute(select(Item).where(Item.id.in_(list(outcomes))))).scalars().all()
+            changed_ids = []
+            for item in items:
+                enriched = outcomes[item.id]
+                if isinstance(enriched, Exception) or "parse_error" in enriched.get("_metadata", {}):
+                    totals["failed"] += 1
+                    if len(failures) < _MAX_REPORTED_FAILURES:
+                        reason = str(enriched) if isinstance(enriched, Exception) else "Unparseable response"
+                        failures.append({"item_id": item.id, "error": reason[:255]})
+                    continue
+
+                totals["tokens_used"] += enriched.get("_metadata", {}).get("tokens_used", 0)
+                updates = enrichment_updates(item, enriched, fields, min_confidence, overwrite)
+                if not updates:
+                    totals["unchanged"] += 1
+                    continue
+                for field, value in updates.items():
+                    setattr(item, field, value)
+                item.version = (item.version or 0) + 1
+                changed_ids.append(item.id)
+                totals["updated"] += 1
+
+            if changed_ids:
+                enqueue_item_sync(session, changed_ids, UPSERT)
+            await session.commit()
+
+        processed += len(page)
+        last_id = page[-1]["id"]
+        await context.report(
+            processed,
+            len(item_ids),
+            checkpoint={"last_id": last_id, "processed": processed, "stats": totals, "failures": failures},
+            message=f"Enriched {processed} of {len(item_ids)} items ({totals['updated']} updated)"
+        )
+
+    logger.info(f"Batch enrichment finished: {totals}")
+    return {**totals, "failures": failures}
@@ -0,0 +1,181 @@
+"""
+AI Response Cache for reusing generated content across identical requests.
+
+Generation results are stored in the ``ai_response_cache`` table under a key
+built from the template type, the model, the template's prompt text and the
+prepared context. The context is normalized first (whitespace collapsed, case
+folded, keys sorted), so re-entering the same product or re-submitting a form
+is served from the table instead of a multi-second chat completion. Editing a
+template changes its prompt text and therefore every key that uses it.
+
+Entries expire after ``AI_RESPONSE_CACHE_TTL_SECONDS`` and the table is
+trimmed to ``AI_RESPONSE_CACHE_MAX_ENTRIES`` rows, least recently used first.
+Cache failures are logged and treated as misses; they never fail a request.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ai_response_cache import AIResponseCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_context(value: Any) -> Any:
+    """Normalize a context value so equivalent inputs hash the same."""
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {str(key): normalize_context(value[key]) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [normalize_context(entry) for entry in value]
+    return value
+
+
+def build_cache_key(template_type: str, model: str, prompt_text: str, context: Dict[str, Any]) -> str:
+    """SHA-256 key for a generation request."""
+    payload = json.dumps(
+        [template_type, model, prompt_text, normalize_context(context)],
+        sort_keys=True,
+        default=str,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache:
+    """Persistent cache of AI generation results with TTL and size bounds."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self._session_factory = session_factory
+        self.ttl_seconds = ttl_seconds or int(os.getenv("AI_RESPONSE_CACHE_TTL_SECONDS", "604800"))
+        self.max_entries = max_entries or int(os.getenv("AI_RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+        if enabled is None:
+            enabled = os.getenv("AI_RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.database.base import async_session
+            self._session_factory = async_session
+        return self._session_factory
+
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an unexpired entry and record the hit.
+
+        Returns:
+            Dict with content, model, tokens_used and created_at, or None on a miss
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            async with self.session_factory() as session:
+                entry = await session.scalar(
+                    select(AIResponseCacheEntry).where(
+                        AIResponseCacheEntry.cache_key == cache_key,
+                        AIResponseCacheEntry.expires_at > now
+                    )
+                )
+                if entry is None:
+                    self.stats["misses"] += 1
+                    return None
+                entry.hit_count += 1
+                entry.last_used_at = now
+                result = {
+                    "content": entry.content,
+                    "model": entry.model,
+                    "tokens_used": entry.tokens_used,
+                    "created_at": entry.created_at,
+                }
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"AI response cache lookup failed: {e}")
+            self.stats["errors"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return result
+
+    async def set(self, cache_key: str, template_type: str, model: str, content: str, tokens_used: int) -> None:
+        """Store a generation result, then drop expired and least recently used entries."""
+        now = datetime.now(timezone.utc)
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    delete(AIResponseCacheEntry)
+                    .where(
+                        (AIResponseCacheEntry.cache_key == cache_key) | (AIResponseCacheEntry.expires_at <= now)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                session.add(AIResponseCacheEntry(
+                    cache_key=cache_key,
+                    template_type=template_type,
+                    model=model,
+                    content=content,
+                    tokens_used=tokens_used,
+                    hit_count=0,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=self.ttl_seconds),
+                    last_used_at=now
+                ))
+                await session.flush()
+
+                overflow = await session.scalar(select(func.count()).select_from(AIResponseCacheEntry)) - self.max_entries
+                if overflow > 0:
+                    oldest = (
+                        select(AIResponseCacheEntry.cache_key)
+                        .order_by(AIResponseCacheEntry.last_used_at)
+                        .limit(overflow)
+                    )
+                    await session.execute(
+                        delete(AIResponseCacheEntry)
+                        .where(AIResponseCacheEntry.cache_key.in_(oldest.scalar_subquery()))
+                        .execution_options(synchronize_session=False)
+                    )
+                await session.commit()
+            self.stats["writes"] += 1
+        except Exception as e:
+            logger.warning(f"AI response cache write failed: {e}")
+            self.stats["errors"] += 1
+
+    async def invalidate(self, cache_key: str) -> None:
+        """Remove one entry, e.g. a result the caller could not use."""
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    delete(AIResponseCacheEntry)
+                    .where(AIResponseCacheEntry.cache_key == cache_key)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"AI response cache invalidation failed: {e}")
+            self.stats["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and counters since the process started."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+        }
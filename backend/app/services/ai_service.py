@@ -8,15 +8,22 @@ content types and contexts.
 
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
 from openai import AsyncOpenAI
+from app.services.ai_response_cache import AIResponseCache, build_cache_key
+from app.services.image_analysis_cache import ImageAnalysisCache
+from app.services.image_preprocessing import get_image_preprocessor
+from app.services.openai_rate_limiter import estimate_tokens, get_openai_rate_limiter
 from app.services.weaviate_service import get_weaviate_service
 
 logger = logging.getLogger(__name__)
 
+# Completion length limit for template generations
+GENERATION_MAX_TOKENS = 1000
+
 
 @dataclass
 class AIGenerationResult:
@@ -28,6 +35,8 @@ class AIGenerationResult:
     tokens_used: int
     generation_time: float
     timestamp: datetime
+    cached: bool = False
+    cache_key: Optional[str] = None
 
 
 class ContentTemplate:
@@ -57,13 +66,15 @@ class AIService:
         self._openai_client: Optional[AsyncOpenAI] = None
         self._model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
         self._templates = self._initialize_templates()
+        self._response_cache = AIResponseCache()
+        self._image_cache = ImageAnalysisCache()
         
     async def initialize(self) -> bool:
         """Initialize the AI service with OpenAI client."""
         try:
             # Get OpenAI client from WeaviateService
             weaviate_service = await get_weaviate_service()
-            if weaviate_service and hasattr(weaviate_service, '_openai_client'):
+            if weaviate_service and getattr(weaviate_service, '_openai_client', None):
                 self._openai_client = weaviate_service._openai_client
                 logger.info("AI service initialized using existing OpenAI client")
                 return True
@@ -185,40 +196,46 @@ class AIService:
         Args:
             template_type: Type of content template to use
             context: Context data for content generation
-            user_preferences: Optional user preferences (model, length, etc.)
+            user_preferences: Optional user preferences (model, length, etc.);
+                ``{"use_cache": False}`` skips the response cache
             
         Returns:
             AIGenerationResult with generated content and metadata
         """
-        if not self._openai_client:
-            raise RuntimeError("AI service not initialized")
-        
-        if template_type not in self._templates:
-            raise ValueError(f"Unknown template type: {template_type}")
-        
-        template = self._templates[template_type]
-        
         start_time = datetime.now()
         
         try:
-            # Prepare context for template
-            formatted_context = self._prepare_context(context, template_type)
-            
-            # Build prompts
-            user_prompt = template.build_prompt(formatted_context)
+            model, messages, cache_key = self._prepare_generation(
+                template_type, context, user_preferences
+            )
             
-            # Apply user preferences
-            model = user_preferences.get("model", self._model) if user_preferences else self._model
+            # Identical requests are answered from the response cache
+            if cache_key:
+                cached = await self._response_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Served {template_type} content from the response cache")
+                    return AIGenerationResult(
+                        content=cached["content"],
+                        template_type=template_type,
+                        context=context,
+                        model=cached["model"],
+                        tokens_used=0,
+                        generation_time=(datetime.now() - start_time).total_seconds(),
+                        timestamp=datetime.now(),
+                        cached=True,
+                        cache_key=cache_key
+                    )
             
             # Generate content
-            response = await self._openai_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": template.system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=1000,  # Adjust based on needs
-                temperature=0.7,  # Balanced creativity
+            response = await get_openai_rate_limiter().call(
+                lambda: self._openai_client.chat.completions.with_raw_response.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=GENERATION_MAX_TOKENS,
+                    temperature=0.7,  # Balanced creativity
+                ),
+                tokens=self._estimate_request_tokens(messages),
+                operation="chat"
             )
             
             generation_time = (datetime.now() - start_time).total_seconds()
@@ -230,9 +247,13 @@ class AIService:
                 model=model,
                 tokens_used=response.usage.total_tokens,
                 generation_time=generation_time,
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                cache_key=cache_key
             )
             
+            if cache_key and result.content:
+                await self._response_cache.set(cache_key, template_type, model, result.content, result.tokens_used)
+            
             logger.info(f"Generated {template_type} content in {generation_time:.2f}s using {result.tokens_used} tokens")
             return result
             
@@ -240,6 +261,160 @@ class AIService:
             logger.error(f"Failed to generate content: {e}")
             raise
     
+    def _prepare_generation(
+        self,
+        template_type: str,
+        context: Dict[str, Any],
+        user_preferences: Optional[Dict[str, Any]]
+    ) -> Tuple[str, List[Dict[str, str]], Optional[str]]:
+        """
+        Build the chat messages for a generation request.
+        
+        Returns:
+            The model to use, the chat messages and the response cache key
+            (None when the cache is disabled or skipped)
+        """
+        if not self._openai_client:
+            raise RuntimeError("AI service not initialized")
+        
+        if template_type not in self._templates:
+            raise ValueError(f"Unknown template type: {template_type}")
+        
+        template = self._templates[template_type]
+        
+        # Prepare context for template and build prompts
+        formatted_context = self._prepare_context(context, template_type)
+        user_prompt = template.build_prompt(formatted_context)
+        
+        # Apply user preferences
+        model = user_preferences.get("model", self._model) if user_preferences else self._model
+        
+        cache_key = None
+        if self._response_cache.enabled and (user_preferences or {}).get("use_cache", True):
+            cache_key = build_cache_key(
+                template_type, model, template.system_prompt + template.user_prompt_template, formatted_context
+            )
+        
+        messages = [
+            {"role": "system", "content": template.system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        return model, messages, cache_key
+    
+    @staticmethod
+    def _estimate_request_tokens(messages: List[Dict[str, str]]) -> int:
+        """Token budget reserved with the rate limiter for a completion."""
+        return estimate_tokens("".join(message["content"] for message in messages)) + GENERATION_MAX_TOKENS
+    
+    async def stream_content(
+        self,
+        template_type: str,
+        context: Dict[str, Any],
+        user_preferences: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate content like ``generate_content``, yielding it as it is produced.
+        
+        Yields ``{"event": "delta", "content": ...}`` for each piece of text the
+        model returns, then one ``{"event": "done", ...}`` with the full
+        content, token usage and timings. A response cache hit is yielded as a
+        single delta. Token usage is reported by the API in the last chunk of
+        the stream and is estimated if it is missing.
+        
+        Args:
+            template_type: Type of content template to use
+            context: Context data for content generation
+            user_preferences: Optional user preferences, as for ``generate_content``
+        """
+        start_time = datetime.now()
+        model, messages, cache_key = self._prepare_generation(template_type, context, user_preferences)
+        
+        if cache_key:
+            cached = await self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Served streamed {template_type} content from the response cache")
+                elapsed = (datetime.now() - start_time).total_seconds()
+                yield {"event": "delta", "content": cached["content"]}
+                yield {
+                    "event": "done",
+                    "content": cached["content"],
+                    "template_type": template_type,
+                    "model": cached["model"],
+                    "tokens_used": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "generation_time": elapsed,
+                    "time_to_first_token": elapsed,
+                    "timestamp": datetime.now().isoformat(),
+                    "cached": True
+                }
+                return
+        
+        limiter = get_openai_rate_limiter()
+        reserved = self._estimate_request_tokens(messages)
+        stream = await limiter.call(
+            lambda: self._openai_client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                max_tokens=GENERATION_MAX_TOKENS,
+                temperature=0.7,
+                stream=True,
+                stream_options={"include_usage": True}
+            ),
+            tokens=reserved,
+            operation="chat_stream"
+        )
+        
+        parts: List[str] = []
+        usage = None
+        time_to_first_token = None
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if time_to_first_token is None:
+                        time_to_first_token = (datetime.now() - start_time).total_seconds()
+                    parts.append(delta)
+                    yield {"event": "delta", "content": delta}
+        finally:
+            # Also reached when the client disconnects mid-stream
+            await stream.close()
+            limiter.record_usage(reserved, usage.total_tokens if usage is not None else None)
+        
+        content = "".join(parts).strip()
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            prompt_tokens = estimate_tokens("".join(message["content"] for message in messages))
+            completion_tokens = estimate_tokens(content)
+        generation_time = (datetime.now() - start_time).total_seconds()
+        
+        if cache_key and content:
+            await self._response_cache.set(cache_key, template_type, model, content, prompt_tokens + completion_tokens)
+        
+        logger.info(
+            f"Streamed {template_type} content in {generation_time:.2f}s "
+            f"(first token after {time_to_first_token or generation_time:.2f}s) "
+            f"using {prompt_tokens + completion_tokens} tokens"
+        )
+        yield {
+            "event": "done",
+            "content": content,
+            "template_type": template_type,
+            "model": model,
+            "tokens_used": prompt_tokens + completion_tokens,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "generation_time": generation_time,
+            "time_to_first_token": time_to_first_token,
+            "timestamp": datetime.now().isoformat(),
+            "cached": False
+        }
+    
     def _prepare_context(self, context: Dict[str, Any], template_type: str) -> Dict[str, Any]:
         """Prepare context data for template formatting."""
         if template_type in ["item_description", "item_data_enrichment"]:
@@ -287,18 +462,41 @@ class AIService:
         Returns:
             AIGenerationResult with generated description
         """
-        context = {
+        context = self._item_context(name, category, item_type, brand, model)
+        
+        # Extract user preferences from kwargs
+        user_preferences = kwargs.get("user_preferences", {})
+        
+        return await self.generate_content("item_description", context, user_preferences)
+    
+    def stream_item_description(
+        self,
+        name: str,
+        category: Optional[str] = None,
+        item_type: Optional[str] = None,
+        brand: Optional[str] = None,
+        model: Optional[str] = None,
+        user_preferences: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of ``generate_item_description``; see ``stream_content``."""
+        context = self._item_context(name, category, item_type, brand, model)
+        return self.stream_content("item_description", context, user_preferences or {})
+    
+    @staticmethod
+    def _item_context(
+        name: str,
+        category: Optional[str],
+        item_type: Optional[str],
+        brand: Optional[str],
+        model: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
             "name": name,
             "category": category or "General",
             "item_type": item_type or "item",
             "brand": brand,
             "model": model
         }
-        
-        # Extract user preferences from kwargs
-        user_preferences = kwargs.get("user_preferences", {})
-        
-        return await self.generate_content("item_description", context, user_preferences)
     
     async def generate_item_data_enrichment(
         self,
@@ -347,7 +545,8 @@ class AIService:
                     "model": result.model,
                     "tokens_used": result.tokens_used,
                     "generation_time": result.generation_time,
-                    "timestamp": result.timestamp.isoformat()
+                    "timestamp": result.timestamp.isoformat(),
+                    "cached": result.cached
                 }
                 
                 return enriched_data
@@ -356,6 +555,10 @@ class AIService:
                 logger.error(f"Failed to parse JSON response from AI: {e}")
                 logger.error(f"Raw response: {result.content}")
                 
+                # Do not keep serving a response that cannot be parsed
+                if result.cache_key:
+                    await self._response_cache.invalidate(result.cache_key)
+                
                 # Fallback: return basic structure with original content as description
                 return {
                     "refined_name": name,
@@ -391,21 +594,31 @@ class AIService:
     
     async def health_check(self) -> Dict[str, Any]:
         """Check health of AI service."""
+        rate_limiter = get_openai_rate_limiter()
         status = {
             "service": "AI Generation",
             "status": "healthy" if self._openai_client else "unavailable",
             "openai_client": self._openai_client is not None,
             "available_templates": self.get_available_templates(),
-            "model": self._model
+            "model": self._model,
+            "rate_limiter": rate_limiter.stats(),
+            "response_cache": self._response_cache.get_stats(),
+            "image_preprocessing": get_image_preprocessor().get_stats(),
+            "image_analysis_cache": self._image_cache.get_stats()
         }
         
         if self._openai_client:
             try:
                 # Test basic API connectivity
-                await self._openai_client.chat.completions.create(
-                    model=self._model,
-                    messages=[{"role": "user", "content": "Test"}],
-                    max_tokens=1
+                await rate_limiter.call(
+                    lambda: self._openai_client.chat.completions.with_raw_response.create(
+                        model=self._model,
+                        messages=[{"role": "user", "content": "Test"}],
+                        max_tokens=1
+                    ),
+                    tokens=2,
+                    max_retries=0,
+                    operation="health"
                 )
                 status["api_connectivity"] = True
             except Exception as e:
@@ -433,6 +646,10 @@ class AIService:
             
         Returns:
             Dictionary containing extracted item data with confidence scores
+            
+        Raises:
+            ImagePreprocessorBusy: If too many images are already being preprocessed
+            ValueError: If the image cannot be decoded
         """
         if not self._openai_client:
             raise RuntimeError("OpenAI client is not available")
@@ -440,6 +657,35 @@ class AIService:
         logger.info(f"Starting image analysis for {len(image_data)} bytes of {image_format}")
         start_time = datetime.now()
         
+        # Downscale and strip the upload so its size does not drive the vision payload
+        original_size = len(image_data)
+        image_data, image_format, preprocessing = await get_image_preprocessor().process(image_data, image_format)
+        logger.info(f"Preprocessed image from {original_size} to {len(image_data)} bytes")
+        
+        # Get model from user preferences - use latest vision model
+        default_vision_model = "gpt-4o"  # Updated to latest vision-capable model
+        model = user_preferences.get("model", default_vision_model) if user_preferences else default_vision_model
+        
+        # A near-duplicate of a recently analysed photo reuses that analysis
+        image_hash = preprocessing.get("dhash")
+        cache_key = None
+        if image_hash and (user_preferences or {}).get("use_cache", True):
+            cache_key = ImageAnalysisCache.context_key(model, context_hints)
+            cached = self._image_cache.lookup(image_hash, cache_key)
+            if cached is not None:
+                result_data, distance = cached
+                result_data["_metadata"].update({
+                    "generation_time": (datetime.now() - start_time).total_seconds(),
+                    "tokens_used": 0,
+                    "preprocessing": preprocessing,
+                    "cached": True,
+                    "hash_distance": distance
+                })
+                logger.info(f"Served image analysis from cache (hash distance {distance})")
+                return result_data
+        
+        logger.info(f"Using vision model: {model} for image analysis")
+        
         try:
             import base64
             
@@ -501,33 +747,32 @@ Focus on:
 
 Return ONLY valid JSON with no additional text."""
 
-            # Get model from user preferences - use latest vision model
-            default_vision_model = "gpt-4o"  # Updated to latest vision-capable model
-            model = user_preferences.get("model", default_vision_model) if user_preferences else default_vision_model
-            
-            logger.info(f"Using vision model: {model} for image analysis")
-            
-            # Create vision API call
-            response = await self._openai_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": user_prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{image_format};base64,{image_base64}",
-                                    "detail": "high"
+            # Create vision API call; a high-detail image costs up to ~1100 prompt tokens
+            max_tokens = 1500
+            response = await get_openai_rate_limiter().call(
+                lambda: self._openai_client.chat.completions.with_raw_response.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": user_prompt},
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"data:{image_format};base64,{image_base64}",
+                                        "detail": "high"
+                                    }
                                 }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1500,
-                temperature=0.3  # Lower temperature for more consistent analysis
+                            ]
+                        }
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=0.3  # Lower temperature for more consistent analysis
+                ),
+                tokens=estimate_tokens(system_prompt + user_prompt) + 1100 + max_tokens,
+                operation="vision"
             )
             
             generation_time = (datetime.now() - start_time).total_seconds()
@@ -557,6 +802,7 @@ Return ONLY valid JSON with no additional text."""
                 "generation_time": generation_time,
                 "image_size": len(image_data),
                 "image_format": image_format,
+                "preprocessing": preprocessing,
                 "analysis_type": "vision"
             }
             
@@ -566,6 +812,9 @@ Return ONLY valid JSON with no additional text."""
                 avg_confidence = sum(confidence_scores.values()) / len(confidence_scores)
                 result_data["_metadata"]["avg_confidence"] = avg_confidence
             
+            if cache_key:
+                self._image_cache.store(image_hash, cache_key, result_data)
+            
             logger.info(f"Completed image analysis in {generation_time:.2f}s using {response.usage.total_tokens} tokens")
             return result_data
             
@@ -0,0 +1,220 @@
+"""
+Embedding providers used to turn item and query text into vectors.
+
+Every provider embeds texts in batches: ``embed_batch`` splits the input into
+requests of at most ``batch_size`` texts, runs up to ``max_concurrency`` of
+them at once and awaits the optional ``rate_limiter`` hook before each
+request with the number of texts it carries.
+
+- ``OpenAIEmbeddingProvider`` calls the OpenAI embeddings API, one request
+  per batch, through the shared ``OpenAIRateLimiter`` when one is given.
+- ``HashingEmbeddingProvider`` runs locally: word tokens and their character
+  trigrams are hashed into signed buckets and the batch is built as one NumPy
+  matrix. Vectors are deterministic, so re-indexing, tests and load tests run
+  offline at CPU speed. They capture wording rather than meaning, so they are
+  not a substitute for a trained model in production search.
+
+The provider is selected with ``EMBEDDING_PROVIDER`` (``openai`` or
+``hashing``). Vectors from different providers are not comparable, so the
+vector index must be rebuilt after switching.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from app.services.openai_rate_limiter import OpenAIRateLimiter, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_PROVIDERS = ("openai", "hashing")
+
+# Awaited before each embedding request with the number of texts in it
+RateLimiter = Callable[[int], Awaitable[None]]
+
+
+class EmbeddingProvider:
+    """Base class batching, bounding and rate limiting embedding requests."""
+
+    name = "base"
+
+    def __init__(
+        self,
+        dimensions: int,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        self.dimensions = dimensions
+        self.batch_size = max(1, batch_size)
+        self.rate_limiter = rate_limiter
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _embed_request(self, texts: List[str], dimensions: int) -> List[List[float]]:
+        """Embed one batch of at most ``batch_size`` texts."""
+        raise NotImplementedError
+
+    async def _run_request(self, texts: List[str], dimensions: int) -> List[List[float]]:
+        async with self._semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter(len(texts))
+            return await self._embed_request(texts, dimensions)
+
+    async def embed_batch(self, texts: Sequence[str], dimensions: Optional[int] = None) -> List[List[float]]:
+        """
+        Embed texts, returning one vector per text in input order.
+
+        Args:
+            texts: Texts to embed
+            dimensions: Vector size, defaulting to the provider's dimensions
+
+        Returns:
+            List of vectors
+        """
+        texts = [text.strip() for text in texts]
+        if not texts:
+            return []
+        dimensions = dimensions or self.dimensions
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self._run_request(batch, dimensions) for batch in batches))
+        return [vector for batch in results for vector in batch]
+
+    async def embed(self, text: str, dimensions: Optional[int] = None) -> List[float]:
+        """Embed a single text."""
+        return (await self.embed_batch([text], dimensions))[0]
+
+    async def close(self) -> None:
+        """Release resources held by the provider."""
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Embeds texts with the OpenAI embeddings API, one request per batch."""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        client,
+        model: str,
+        dimensions: int,
+        limiter: Optional[OpenAIRateLimiter] = None,
+        **kwargs
+    ):
+        super().__init__(dimensions, **kwargs)
+        self.client = client
+        self.model = model
+        self.limiter = limiter
+
+    async def _embed_request(self, texts: List[str], dimensions: int) -> List[List[float]]:
+        request = {"model": self.model, "input": texts, "dimensions": dimensions}
+        if self.limiter is None:
+            response = await self.client.embeddings.create(**request)
+        else:
+            response = await self.limiter.call(
+                lambda: self.client.embeddings.with_raw_response.create(**request),
+                tokens=sum(estimate_tokens(text) for text in texts),
+                operation="embeddings"
+            )
+        return [entry.embedding for entry in sorted(response.data, key=lambda entry: entry.index)]
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Character trigrams let partial and inflected words ("drills", "drilling") match
+_TRIGRAM_WEIGHT = 0.5
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dimensions: int) -> Tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+
+def _features(text: str) -> dict:
+    features: dict = {}
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        features[f"w:{token}"] = features.get(f"w:{token}", 0.0) + 1.0
+        padded = f"#{token}#"
+        for i in range(len(padded) - 2):
+            trigram = f"t:{padded[i:i + 3]}"
+            features[trigram] = features.get(trigram, 0.0) + _TRIGRAM_WEIGHT
+    return features
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Embeds text locally by hashing word and trigram features into a fixed-size vector.
+
+    Requires numpy (the ``local-index`` extra).
+    """
+
+    name = "hashing"
+
+    def __init__(self, dimensions: int = 256, **kwargs):
+        super().__init__(dimensions, **kwargs)
+
+    def embed_many(self, texts: Sequence[str]):
+        """
+        Embed texts synchronously into an L2-normalised float32 matrix.
+
+        Returns:
+            numpy array of shape (len(texts), dimensions)
+        """
+        import numpy as np
+
+        rows, columns, values = [], [], []
+        for row, text in enumerate(texts):
+            for feature, weight in _features(text).items():
+                index, sign = _bucket(feature, self.dimensions)
+                rows.append(row)
+                columns.append(index)
+                # Dampen repeated features so long texts are not dominated by one word
+                values.append(sign * weight ** 0.5)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)),
+                  np.asarray(values, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_sync(self, text: str) -> List[float]:
+        """Embed a single text synchronously."""
+        return self.embed_many([text])[0].tolist()
+
+    async def _embed_request(self, texts: List[str], dimensions: int) -> List[List[float]]:
+        if dimensions != self.dimensions:
+            raise ValueError(f"Provider produces {self.dimensions}-dimension vectors, not {dimensions}")
+        return self.embed_many(texts).tolist()
+
+
+def create_embedding_provider(
+    name: str,
+    dimensions: int,
+    openai_client=None,
+    model: str = "",
+    batch_size: int = 100,
+    max_concurrency: int = 4,
+    rate_limiter: Optional[RateLimiter] = None,
+    openai_limiter: Optional[OpenAIRateLimiter] = None
+) -> EmbeddingProvider:
+    """
+    Create the embedding provider with the given name.
+
+    ``openai_limiter`` is the shared ``OpenAIRateLimiter`` used by the OpenAI
+    provider; ``rate_limiter`` is a generic per-request hook for any provider.
+
+    Raises:
+        ValueError: If the name is unknown or the OpenAI provider has no client
+    """
+    options = {"batch_size": batch_size, "max_concurrency": max_concurrency, "rate_limiter": rate_limiter}
+    if name == "hashing":
+        return HashingEmbeddingProvider(dimensions, **options)
+    if name == "openai":
+        if openai_client is None:
+            raise ValueError("OpenAI API key is required for embeddings")
+        return OpenAIEmbeddingProvider(openai_client, model, dimensions, limiter=openai_limiter, **options)
+    raise ValueError(f"Unknown embedding provider '{name}' (expected one of {', '.join(EMBEDDING_PROVIDERS)})")
@@ -0,0 +1,100 @@
+"""
+Image Analysis Cache returning stored results for near-duplicate photos.
+
+Each analysed image is remembered by the 64-bit difference hash computed
+during preprocessing, together with the model and normalized context hints
+used for the analysis. A new upload whose hash is within
+``AI_IMAGE_CACHE_MAX_DISTANCE`` bits (Hamming distance) of a stored one, for
+the same model and hints, gets the stored result instead of a vision call.
+Re-photographing the same object or retrying an analysis therefore returns in
+milliseconds.
+
+The cache is per process, holds at most ``AI_IMAGE_CACHE_MAX_ENTRIES``
+results (least recently used are evicted) and entries expire after
+``AI_IMAGE_CACHE_TTL_SECONDS``. A lookup compares against every entry, which
+takes well under a millisecond for a thousand entries.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services.ai_response_cache import build_cache_key
+
+
+class ImageAnalysisCache:
+    """Bounded LRU of analysis results matched by perceptual hash distance."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_distance: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries or int(os.getenv("AI_IMAGE_CACHE_MAX_ENTRIES", "1000"))
+        self.max_distance = max_distance if max_distance is not None else int(
+            os.getenv("AI_IMAGE_CACHE_MAX_DISTANCE", "6")
+        )
+        self.ttl_seconds = ttl_seconds or float(os.getenv("AI_IMAGE_CACHE_TTL_SECONDS", "86400"))
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (context key, image hash) -> (stored at, result)
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def context_key(model: str, context_hints: Optional[Dict[str, Any]]) -> str:
+        """Key for the inputs besides the image that shape an analysis."""
+        return build_cache_key("image_analysis", model, "", context_hints or {})
+
+    def lookup(self, image_hash: str, context_key: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Find the closest stored result within the distance threshold.
+
+        Returns:
+            A copy of the stored result and its Hamming distance, or None
+        """
+        target = int(image_hash, 16)
+        now = self._clock()
+        best: Optional[Tuple[int, Tuple[str, int]]] = None
+        with self._lock:
+            for key, (stored_at, _) in list(self._entries.items()):
+                if now - stored_at > self.ttl_seconds:
+                    del self._entries[key]
+                    continue
+                if key[0] != context_key:
+                    continue
+                distance = (key[1] ^ target).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, key)
+
+            if best is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(best[1])
+            self.stats["hits"] += 1
+            return copy.deepcopy(self._entries[best[1]][1]), best[0]
+
+    def store(self, image_hash: str, context_key: str, result: Dict[str, Any]) -> None:
+        """Remember an analysis result, evicting the least recently used beyond the size bound."""
+        with self._lock:
+            key = (context_key, int(image_hash, 16))
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock(), copy.deepcopy(result))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and size since the process started."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_distance": self.max_distance,
+        }
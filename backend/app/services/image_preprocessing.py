@@ -0,0 +1,206 @@
+"""
+Image preprocessing for vision analysis, run in a process pool.
+
+Uploaded photos are decoded, rotated according to their EXIF orientation,
+downscaled and re-encoded as JPEG without metadata before they are sent to
+the vision model. The vision API scales high-detail images to fit 2048x2048
+and then to 768 pixels on the short side, so pixels beyond that only add
+upload size and latency; the defaults resize to exactly that envelope. JPEG
+decoding uses draft mode, which lets the decoder skip most of the work for
+large photos.
+
+The worker also computes a 64-bit difference hash (dHash) of the oriented
+image, which ``ImageAnalysisCache`` uses to recognise near-duplicate photos.
+
+Decoding and resizing are CPU bound, so they run in a ``ProcessPoolExecutor``
+and never block the event loop. At most ``max_pending`` images are queued or
+in progress; further requests fail fast with ``ImagePreprocessorBusy``.
+Without Pillow installed, images are passed through unchanged.
+"""
+
+import asyncio
+import importlib.util
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMAT = "image/jpeg"
+
+# Refuse images that would decode to more pixels than this (decompression bombs)
+MAX_IMAGE_PIXELS = 64_000_000
+
+
+class ImagePreprocessorBusy(RuntimeError):
+    """Raised when the preprocessing queue is full."""
+
+
+def _target_size(width: int, height: int, max_dimension: int, short_side: int) -> Tuple[int, int]:
+    scale = min(1.0, max_dimension / max(width, height), short_side / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def difference_hash(image) -> int:
+    """
+    64-bit dHash: whether each pixel is brighter than its right neighbour in a 9x8 grayscale thumbnail.
+
+    Recompression, resizing and small exposure changes flip few bits, so
+    near-duplicate photos have a small Hamming distance.
+    """
+    from PIL import Image
+
+    pixels = list(image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            bits = (bits << 1) | (left > pixels[row * 9 + column + 1])
+    return bits
+
+
+def preprocess_image(
+    data: bytes,
+    max_dimension: int = 2048,
+    short_side: int = 768,
+    quality: int = 85
+) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Decode, orient, downscale and re-encode an image as a metadata-free JPEG.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+
+    Returns:
+        JPEG bytes and a dict describing the original and processed image
+
+    Raises:
+        ValueError: If the data is not a decodable image or is too large
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        image = Image.open(io.BytesIO(data))
+        original_format = image.format
+        original_size = image.size
+        # Orientation 5-8 swap the axes, so size the draft for the larger side
+        draft_side = max(_target_size(*original_size, max_dimension, short_side))
+        if image.format == "JPEG":
+            image.draft("RGB", (draft_side, draft_side))
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValueError(f"Unsupported or corrupt image: {e}")
+
+    if image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+        # Flatten transparency onto white instead of the black JPEG would give it
+        rgba = image.convert("RGBA")
+        image = Image.new("RGB", rgba.size, (255, 255, 255))
+        image.paste(rgba, mask=rgba.getchannel("A"))
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    size = _target_size(*image.size, max_dimension, short_side)
+    if size != image.size:
+        image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    output = io.BytesIO()
+    # A new save without exif/icc arguments writes no metadata
+    image.save(output, format="JPEG", quality=quality, optimize=True)
+    processed = output.getvalue()
+    return processed, {
+        "original_bytes": len(data),
+        "original_format": original_format,
+        "original_dimensions": list(original_size),
+        "processed_bytes": len(processed),
+        "processed_dimensions": list(image.size),
+        "dhash": f"{difference_hash(image):016x}",
+    }
+
+
+class ImagePreprocessor:
+    """Runs ``preprocess_image`` in a process pool with a bounded queue."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+        short_side: Optional[int] = None,
+        quality: Optional[int] = None
+    ):
+        self.max_workers = max_workers or int(os.getenv("AI_IMAGE_WORKERS", "2"))
+        self.max_pending = max_pending or int(os.getenv("AI_IMAGE_MAX_PENDING", "8"))
+        self.max_dimension = max_dimension or int(os.getenv("AI_IMAGE_MAX_DIMENSION", "2048"))
+        self.short_side = short_side or int(os.getenv("AI_IMAGE_SHORT_SIDE", "768"))
+        self.quality = quality or int(os.getenv("AI_IMAGE_JPEG_QUALITY", "85"))
+        self.available = importlib.util.find_spec("PIL") is not None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.stats = {"processed": 0, "rejected": 0, "bytes_in": 0, "bytes_out": 0}
+        if not self.available:
+            logger.warning("Pillow is not installed - images are sent to the vision model unprocessed")
+
+    async def process(self, data: bytes, image_format: str) -> Tuple[bytes, str, Dict[str, Any]]:
+        """
+        Preprocess an uploaded image off the event loop.
+
+        Returns:
+            Image bytes, their MIME type and a dict describing the processing
+
+        Raises:
+            ImagePreprocessorBusy: If ``max_pending`` images are already queued
+            ValueError: If the data is not a decodable image
+        """
+        if not self.available:
+            return data, image_format, {"original_bytes": len(data), "processed_bytes": len(data)}
+        if self._pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise ImagePreprocessorBusy("Image preprocessing queue is full")
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            processed, info = await loop.run_in_executor(
+                self._executor, preprocess_image, data, self.max_dimension, self.short_side, self.quality
+            )
+        finally:
+            self._pending -= 1
+
+        self.stats["processed"] += 1
+        self.stats["bytes_in"] += len(data)
+        self.stats["bytes_out"] += len(processed)
+        return processed, OUTPUT_FORMAT, info
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and byte counts since the process started."""
+        return {"available": self.available, "pending": self._pending, "max_pending": self.max_pending, **self.stats}
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+_image_preprocessor: Optional[ImagePreprocessor] = None
+
+
+def get_image_preprocessor() -> ImagePreprocessor:
+    """Get the global image preprocessor."""
+    global _image_preprocessor
+    if _image_preprocessor is None:
+        _image_preprocessor = ImagePreprocessor()
+    return _image_preprocessor
+
+
+def close_image_preprocessor() -> None:
+    """Shut down the global image preprocessor's worker processes."""
+    global _image_preprocessor
+    if _image_preprocessor is not None:
+        _image_preprocessor.close()
+        _image_preprocessor = None
@@ -0,0 +1,194 @@
+"""
+Background builds of recommended indexes.
+
+``run_index_build_job`` builds indexes with ``CREATE INDEX CONCURRENTLY``, so
+writes to the table continue while an index builds. Partitioned tables do not
+support concurrent builds, so for them the job creates the index on the parent
+only, builds each partition's index concurrently and attaches it; the parent
+index becomes valid once every partition is attached. While a build runs, its
+phase and percentage from ``pg_stat_progress_create_index`` are reported as the
+job message. A build that fails or is cancelled leaves an invalid index behind,
+which the job drops.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.performance.index_advisor import IndexAdvisor, index_name
+from app.services.job_service import JobCancelled, JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+INDEX_BUILD_JOB = "index_build"
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_BUILD_PROGRESS_SQL = """
+    SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+    FROM pg_stat_progress_create_index
+    WHERE pid = :pid
+"""
+
+
+async def _build_progress(context: JobContext, pid: int, name: str) -> str:
+    async with context.session_factory() as session:
+        row = (await session.execute(text(_BUILD_PROGRESS_SQL), {"pid": pid})).mappings().first()
+    if row is None:
+        return f"Building {name}"
+    done, total = (
+        (row["blocks_done"], row["blocks_total"]) if row["blocks_total"]
+        else (row["tuples_done"], row["tuples_total"])
+    )
+    percent = f" {100 * done // total}%" if total else ""
+    return f"Building {name}: {row['phase']}{percent}"
+
+
+async def _drop_invalid_index(context: JobContext, name: str) -> None:
+    """Drop an index left invalid by an interrupted concurrent build."""
+    async with context.session_factory() as session:
+        connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+        invalid = (await connection.execute(
+            text("""
+                SELECT 1 FROM pg_index JOIN pg_class idx ON idx.oid = pg_index.indexrelid
+                JOIN pg_namespace ns ON ns.oid = idx.relnamespace
+                WHERE idx.relname = :name AND ns.nspname = current_schema() AND NOT pg_index.indisvalid
+            """),
+            {"name": name}
+        )).first()
+        if invalid:
+            logger.warning(f"Dropping invalid index {name} left by an earlier build")
+            await connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+async def _run_build(
+    context: JobContext,
+    statement: str,
+    name: str,
+    progress: Tuple[int, int],
+    poll_interval: float
+) -> None:
+    """Run a DDL statement outside a transaction, reporting build progress until it finishes."""
+    async with context.session_factory() as session:
+        connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+        pid = (await connection.exec_driver_sql("SELECT pg_backend_pid()")).scalar()
+        build = asyncio.create_task(connection.exec_driver_sql(statement))
+        try:
+            while True:
+                done, _ = await asyncio.wait({build}, timeout=poll_interval)
+                if done:
+                    build.result()
+                    return
+                await context.report(progress[0], progress[1], message=await _build_progress(context, pid, name))
+        except BaseException:
+            if not build.done():
+                async with context.session_factory() as control:
+                    await control.execute(text("SELECT pg_cancel_backend(:pid)"), {"pid": pid})
+                await asyncio.gather(build, return_exceptions=True)
+            raise
+
+
+@job_handler(INDEX_BUILD_JOB)
+async def run_index_build_job(context: JobContext) -> Dict[str, Any]:
+    """
+    Build indexes concurrently.
+
+    Params:
+        indexes: List of {"table", "columns"} to build; defaults to the
+            advisor's current recommendations
+        poll_interval: Seconds between progress reports while an index builds
+
+    Each index, or each partition of a partitioned table's index, is one step
+    of progress and is checkpointed once built, so a resumed job continues
+    with the next one. A build that fails is dropped and recorded, and the
+    remaining indexes are still built.
+    """
+    poll_interval = float(context.params.get("poll_interval", 2.0))
+
+    async with context.session_factory() as session:
+        advisor = IndexAdvisor(session)
+        if not advisor.is_supported():
+            raise RuntimeError("Concurrent index builds need PostgreSQL")
+        catalog = await advisor.catalog()
+        requested = context.params.get("indexes")
+        if requested is None:
+            requested = (await advisor.recommend())["recommendations"]
+
+    columns_by_table = catalog["columns_by_table"]
+    partitions: Dict[str, List[str]] = {}
+    for child, parent in catalog["parent_of"].items():
+        partitions.setdefault(parent, []).append(child)
+
+    # (step key, index name, table, statement, attach to) per build step
+    steps: List[Tuple[str, str, str, str, Optional[str]]] = []
+    failures: List[Dict[str, Any]] = []
+    names: List[str] = []
+    for spec in requested:
+        table, columns = spec.get("table", ""), list(spec.get("columns") or [])
+        unknown = [c for c in [table] + columns if not _IDENTIFIER.match(c)]
+        if unknown or table not in columns_by_table or not columns or \
+                any(column not in columns_by_table[table] for column in columns):
+            failures.append({"index": f"{table}({', '.join(columns)})", "error": "Unknown table or column"})
+            continue
+        name = index_name(table, columns)
+        column_list = ", ".join(columns)
+        names.append(name)
+        if table in partitions:
+            steps.append((name, name, table, f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} ({column_list})", None))
+            for partition in sorted(partitions[table]):
+                partition_index = index_name(partition, columns)
+                steps.append((
+                    f"{name}:{partition}", partition_index, partition,
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} ({column_list})",
+                    name
+                ))
+        else:
+            steps.append((
+                name, name, table, f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column_list})", None
+            ))
+
+    completed = list(context.checkpoint.get("completed", []))
+    failures = context.checkpoint.get("failures", failures)
+    failed_indexes = {failure["index"] for failure in failures}
+    await context.report(len(completed), len(steps), message=f"Building {len(names)} index(es)")
+
+    for key, name, table, statement, attach_to in steps:
+        index = key.split(":")[0]
+        if key in completed or index in failed_indexes:
+            continue
+        progress = (len(completed), len(steps))
+        # A partitioned parent's index stays invalid until every partition is attached
+        concurrent = "CONCURRENTLY" in statement
+        try:
+            if concurrent:
+                await _drop_invalid_index(context, name)
+            await _run_build(context, statement, name, progress, poll_interval)
+            if attach_to is not None:
+                await _run_build(context, f"ALTER INDEX {attach_to} ATTACH PARTITION {name}", name, progress, poll_interval)
+        except JobCancelled:
+            if concurrent:
+                await _drop_invalid_index(context, name)
+            raise
+        except Exception as e:
+            logger.error(f"Failed to build index {name} on {table}: {e}")
+            failures.append({"index": index, "error": str(e)[:500]})
+            failed_indexes.add(index)
+            if concurrent:
+                await _drop_invalid_index(context, name)
+        else:
+            completed.append(key)
+            logger.info(f"Built index {name} on {table}")
+        await context.report(
+            len(completed), len(steps),
+            checkpoint={"completed": completed, "failures": failures},
+            message=f"Built {len(completed)} of {len(steps)} index step(s)"
+        )
+
+    return {
+        "created": [name for name in names if name not in failed_indexes],
+        "failed": failures,
+        "steps": len(steps),
+    }
@@ -9,7 +9,7 @@ from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select, func, and_, or_, desc, asc
+from sqlalchemy import select, func, and_, or_, desc, asc, case, delete, insert, update
 from decimal import Decimal
 
 from app.models.inventory import Inventory
@@ -670,13 +670,14 @@ class InventoryService:
             )
             self.db.add(target_entry)
         
-        # Record movement history for each source location
+        # Record movement history for all source locations in one insert
         try:
             from app.services.movement_service import MovementService
             movement_service = MovementService(self.db)
             
+            history_entries = []
             for source_entry in source_entries:
-                await movement_service.record_item_move(
+                history_entries.extend(movement_service.build_item_move_entries(
                     item_id=item_id,
                     from_location_id=source_entry.location_id,
                     to_location_id=target_location_id,
@@ -687,7 +688,8 @@ class InventoryService:
                     quantity_after_to=target_entry.quantity,
                     reason=reason or "Quantity merge operation",
                     user_id=user_id
-                )
+                ))
+            await movement_service.record_movements_batch(history_entries)
         except Exception as e:
             print(f"Warning: Failed to record movement history: {e}")
         
@@ -700,6 +702,135 @@ class InventoryService:
         
         return target_entry
 
+    async def execute_bulk_movements(
+        self,
+        movements: List[MovementHistoryCreate],
+        user_id: Optional[str] = None,
+        reason: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply a batch of moves atomically with set-based statements.
+        
+        Current quantities for every item in the batch are read once and the
+        moves are applied in order in memory. Inventory changes are then written
+        with one DELETE, one UPDATE and one INSERT, and all history rows with a
+        single multi-row INSERT, inside one transaction.
+        
+        Args:
+            movements: Validated movements, each with a source and destination
+            user_id: User performing the operation (used when a movement has none)
+            reason: Reason for the batch (used when a movement has none)
+            
+        Returns:
+            Summary with counts and the final quantity of every touched entry
+            
+        Raises:
+            ValueError: If a movement is malformed or a source lacks quantity
+        """
+        if not movements:
+            raise ValueError("At least one movement must be specified")
+        
+        for index, movement in enumerate(movements, start=1):
+            if movement.movement_type != "move" or not movement.from_location_id or not movement.to_location_id:
+                raise ValueError(f"Movement {index} must be a move with source and destination locations")
+            if movement.from_location_id == movement.to_location_id:
+                raise ValueError(f"Movement {index}: source and destination locations must be different")
+        
+        item_ids = {movement.item_id for movement in movements}
+        result = await self.db.execute(
+            select(Inventory.id, Inventory.item_id, Inventory.location_id, Inventory.quantity)
+            .where(Inventory.item_id.in_(item_ids))
+            .with_for_update()
+        )
+        existing = {(row.item_id, row.location_id): row for row in result}
+        quantities = {key: row.quantity for key, row in existing.items()}
+        
+        from app.services.movement_service import MovementService
+        movement_service = MovementService(self.db)
+        history_entries = []
+        touched = set()
+        
+        for index, movement in enumerate(movements, start=1):
+            source_key = (movement.item_id, movement.from_location_id)
+            dest_key = (movement.item_id, movement.to_location_id)
+            source_before = quantities.get(source_key, 0)
+            dest_before = quantities.get(dest_key, 0)
+            
+            if source_before < movement.quantity_moved:
+                raise ValueError(
+                    f"Movement {index}: insufficient quantity for item {movement.item_id} at location "
+                    f"{movement.from_location_id}. Available: {source_before}, Requested: {movement.quantity_moved}"
+                )
+            
+            quantities[source_key] = source_before - movement.quantity_moved
+            quantities[dest_key] = dest_before + movement.quantity_moved
+            touched.update((source_key, dest_key))
+            
+            history_entries.extend(movement_service.build_item_move_entries(
+                item_id=movement.item_id,
+                from_location_id=movement.from_location_id,
+                to_location_id=movement.to_location_id,
+                quantity=movement.quantity_moved,
+                quantity_before_from=source_before,
+                quantity_after_from=quantities[source_key],
+                quantity_before_to=dest_before,
+                quantity_after_to=quantities[dest_key],
+                reason=movement.reason or reason or "Bulk movement",
+                user_id=movement.user_id or user_id
+            ))
+        
+        now = datetime.now()
+        emptied_ids = [
+            existing[key].id for key, quantity in quantities.items()
+            if key in existing and quantity == 0
+        ]
+        changed = {
+            existing[key].id: quantity for key, quantity in quantities.items()
+            if key in existing and quantity > 0 and quantity != existing[key].quantity
+        }
+        created = [
+            {"item_id": item_id, "location_id": location_id, "quantity": quantity, "updated_at": now}
+            for (item_id, location_id), quantity in quantities.items()
+            if (item_id, location_id) not in existing and quantity > 0
+        ]
+        
+        try:
+            if emptied_ids:
+                await self.db.execute(
+                    delete(Inventory)
+                    .where(Inventory.id.in_(emptied_ids))
+                    .execution_options(synchronize_session=False)
+                )
+            if changed:
+                await self.db.execute(
+                    update(Inventory)
+                    .where(Inventory.id.in_(list(changed)))
+                    .values(quantity=case(changed, value=Inventory.id), updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+            if created:
+                await self.db.execute(insert(Inventory).values(created))
+            
+            await movement_service.record_movements_batch(history_entries)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        
+        # Inventory rows were changed behind the session's back
+        for instance in list(self.db):
+            if isinstance(instance, Inventory):
+                self.db.expire(instance)
+        
+        return {
+            "movements_executed": len(movements),
+            "history_entries_created": len(history_entries),
+            "inventory": [
+                {"item_id": item_id, "location_id": location_id, "quantity": quantities[(item_id, location_id)]}
+                for item_id, location_id in sorted(touched)
+            ]
+        }
+
     async def adjust_item_quantity(
         self, 
         item_id: int, 
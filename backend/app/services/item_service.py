@@ -1,8 +1,9 @@
 """
-Item Service for managing items with dual-write to PostgreSQL and Weaviate.
+Item Service for managing items with PostgreSQL and Weaviate synchronization.
 
-This service implements the dual-write pattern where PostgreSQL is the source of truth
-and Weaviate provides semantic search capabilities.
+PostgreSQL is the source of truth. Every item change queues a Weaviate sync
+entry in the same transaction (transactional outbox); the Weaviate sync worker
+applies it in the background, so requests never wait on embeddings.
 """
 
 import logging
@@ -21,7 +22,9 @@ from app.schemas.item import (
     ItemSearch, ItemBulkUpdate
 )
 from app.services.weaviate_service import get_weaviate_service, WeaviateService
+from app.services.weaviate_sync_service import enqueue_item_sync, enqueue_active_items_sync, UPSERT, DELETE
 from app.services.inventory_service import InventoryService
+from app.services.job_service import JobContext, job_handler
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +43,7 @@ class ItemService:
         quantity: int = 1
     ) -> Item:
         """
-        Create a new item with dual-write to PostgreSQL and Weaviate.
+        Create a new item and queue its Weaviate sync.
         
         Args:
             item_data: Item creation data
@@ -75,6 +78,10 @@ class ItemService:
             )
             
             self.db.add(item)
+            await self.db.flush()
+            
+            # Queue the Weaviate embedding in the same transaction
+            enqueue_item_sync(self.db, [item.id], UPSERT)
             await self.db.commit()
             await self.db.refresh(item, ["category"])
             
@@ -96,9 +103,6 @@ class ItemService:
             result = await self.db.execute(item_query)
             item = result.scalar_one()
             
-            # 4. Create Weaviate embedding (best effort)
-            await self._sync_to_weaviate(item)
-            
             logger.info(f"Created item {item.id}: {item.name}")
             return item
             
@@ -109,7 +113,7 @@ class ItemService:
     
     async def update_item(self, item_id: int, item_data: ItemUpdate) -> Item:
         """
-        Update an item with dual-write to PostgreSQL and Weaviate.
+        Update an item and queue its Weaviate sync.
         
         Args:
             item_id: ID of item to update
@@ -140,12 +144,10 @@ class ItemService:
             item.updated_at = datetime.now()
             item.version = (item.version or 0) + 1
             
+            enqueue_item_sync(self.db, [item.id], UPSERT)
             await self.db.commit()
             await self.db.refresh(item, ["category", "inventory_entries"])
             
-            # Sync to Weaviate
-            await self._sync_to_weaviate(item)
-            
             logger.info(f"Updated item {item.id}: {item.name}")
             return item
             
@@ -156,7 +158,7 @@ class ItemService:
     
     async def delete_item(self, item_id: int, soft_delete: bool = True) -> bool:
         """
-        Delete an item from PostgreSQL and Weaviate.
+        Delete an item and queue its removal from Weaviate.
         
         Args:
             item_id: ID of item to delete
@@ -178,22 +180,16 @@ class ItemService:
                 item.status = ItemStatus.DISPOSED
                 item.updated_at = datetime.now()
                 item.version = (item.version or 0) + 1
+                enqueue_item_sync(self.db, [item_id], DELETE)
                 await self.db.commit()
                 
-                # Remove from Weaviate
-                weaviate_service = await get_weaviate_service()
-                await weaviate_service.delete_item_embedding(item_id)
-                
                 logger.info(f"Soft deleted item {item_id}")
             else:
                 # Hard delete
                 await self.db.delete(item)
+                enqueue_item_sync(self.db, [item_id], DELETE)
                 await self.db.commit()
                 
-                # Remove from Weaviate
-                weaviate_service = await get_weaviate_service()
-                await weaviate_service.delete_item_embedding(item_id)
-                
                 logger.info(f"Hard deleted item {item_id}")
             
             return True
@@ -291,99 +287,68 @@ class ItemService:
         result = await self.db.execute(query)
         return result.scalars().all()
     
-    async def bulk_sync_to_weaviate(
-        self, 
-        item_ids: Optional[List[int]] = None,
-        force_update: bool = False
-    ) -> Dict[str, int]:
+    async def queue_weaviate_sync(self, item_ids: Optional[List[int]] = None) -> int:
         """
-        Bulk sync items to Weaviate for semantic search.
+        Queue Weaviate upserts for active items.
         
         Args:
             item_ids: Specific item IDs to sync (None for all active items)
-            force_update: Whether to force update existing embeddings
             
         Returns:
-            Statistics about the sync operation
-        """
-        try:
-            # Build query for items to sync
-            query = select(Item).options(
-                selectinload(Item.category),
-                selectinload(Item.inventory_entries).selectinload(Inventory.location)
-            ).where(Item.is_active == True)
-            
-            if item_ids:
-                query = query.where(Item.id.in_(item_ids))
-            
-            result = await self.db.execute(query)
-            items = result.scalars().all()
-            
-            if not items:
-                return {"success": 0, "failed": 0, "skipped": 0}
-            
-            # Prepare items data for Weaviate
-            items_data = []
-            for item in items:
-                category_name = item.category.name if item.category else ""
-                location_names = [
-                    entry.location.name for entry in (item.inventory_entries or [])
-                    if entry.location
-                ]
-                items_data.append((item, category_name, location_names))
-            
-            # Sync to Weaviate
-            weaviate_service = await get_weaviate_service()
-            stats = await weaviate_service.batch_create_embeddings(items_data)
-            
-            logger.info(f"Bulk sync completed for {len(items)} items: {stats}")
-            return stats
-            
-        except Exception as e:
-            logger.error(f"Bulk sync to Weaviate failed: {e}")
-            return {"success": 0, "failed": len(items_data) if 'items_data' in locals() else 0, "skipped": 0}
-    
-    async def _sync_to_weaviate(self, item: Item) -> None:
-        """
-        Sync a single item to Weaviate (best effort).
-        
-        Args:
-            item: Item to sync
+            Number of items queued
         """
-        try:
-            weaviate_service = await get_weaviate_service()
-            
-            # Get category name
-            category_name = ""
-            if item.category:
-                category_name = item.category.name
-            elif item.category_id:
-                # Load category if not already loaded
-                result = await self.db.execute(
-                    select(Category).where(Category.id == item.category_id)
-                )
-                category = result.scalar_one_or_none()
-                if category:
-                    category_name = category.name
-            
-            # Get location names
-            location_names = []
-            if hasattr(item, 'inventory_entries') and item.inventory_entries:
-                location_names = [
-                    entry.location.name for entry in item.inventory_entries
-                    if entry.location
-                ]
-            
-            # Create embedding
-            success = await weaviate_service.create_item_embedding(
-                item, category_name, location_names
+        queued = await enqueue_active_items_sync(self.db, item_ids)
+        await self.db.commit()
+        logger.info(f"Queued {queued} items for Weaviate sync")
+        return queued
+
+
+WEAVIATE_BULK_SYNC_JOB = "weaviate_bulk_sync"
+
+
+@job_handler(WEAVIATE_BULK_SYNC_JOB)
+async def run_weaviate_bulk_sync_job(context: JobContext) -> Dict[str, int]:
+    """
+    Job handler queueing active items for Weaviate sync page by page.
+
+    Each page is written to the sync outbox, so the embeddings are applied by
+    the outbox worker with its retries, dead-lettering and similar-items
+    refresh. Items are paged by ID so the job can resume after the last
+    queued page.
+
+    Params:
+        item_ids: Specific item IDs to sync (omit for all active items)
+        batch_size: Items per page (default 50)
+    """
+    item_ids = context.params.get("item_ids") or None
+    batch_size = int(context.params.get("batch_size") or 50)
+    last_id = context.checkpoint.get("last_id", 0)
+    queued = context.checkpoint.get("queued", 0)
+
+    filters = [Item.is_active == True]
+    if item_ids:
+        filters.append(Item.id.in_(item_ids))
+
+    async with context.session_factory() as session:
+        total = (await session.execute(select(func.count(Item.id)).where(*filters))).scalar() or 0
+    await context.report(queued, total)
+
+    while True:
+        async with context.session_factory() as session:
+            result = await session.execute(
+                select(Item.id).where(*filters, Item.id > last_id).order_by(Item.id).limit(batch_size)
             )
-            
-            if success:
-                logger.debug(f"Synced item {item.id} to Weaviate")
-            else:
-                logger.warning(f"Failed to sync item {item.id} to Weaviate")
-                
-        except Exception as e:
-            logger.warning(f"Weaviate sync failed for item {item.id}: {e}")
-            # Don't raise - this is best effort
\ No newline at end of file
+            page_ids = list(result.scalars().all())
+            if not page_ids:
+                break
+            queued += await ItemService(session).queue_weaviate_sync(page_ids)
+
+        last_id = page_ids[-1]
+        await context.report(
+            queued,
+            max(total, queued),
+            checkpoint={"last_id": last_id, "queued": queued},
+            message=f"Queued through item {last_id}"
+        )
+
+    return {"queued": queued}
@@ -0,0 +1,466 @@
+"""
+Job Service providing durable background jobs backed by the jobs table.
+
+Long-running operations register a handler with ``job_handler`` and are
+submitted with ``JobService.create_job``. ``JobRunner`` runs inside the API
+process (or a script), claims queued jobs with bounded concurrency and executes
+their handlers. Handlers report progress and a checkpoint through
+``JobContext.report``; the same call honours cancellation requests.
+
+A claimed job is leased to its runner, which refreshes the job's heartbeat
+while the handler works. Several runners (API workers, scripts) can share the
+table: a running job is only queued again once its heartbeat is older than the
+lease, i.e. its runner died, and the next handler resumes from the stored
+checkpoint.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job, JobStatus
+from app.services.openai_rate_limiter import PRIORITY_BACKGROUND, openai_priority
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job has been cancelled."""
+
+
+class JobLeaseLost(Exception):
+    """Raised inside a handler when another runner has taken over its job."""
+
+
+class JobContext:
+    """Handle passed to job handlers for reading input and reporting progress."""
+
+    def __init__(self, job: Job, session_factory: Callable[[], AsyncSession]):
+        self.job_id = job.id
+        self.worker_id = job.locked_by
+        self.params: Dict[str, Any] = dict(job.params or {})
+        self.checkpoint: Dict[str, Any] = dict(job.checkpoint or {})
+        self.session_factory = session_factory
+
+    async def report(
+        self,
+        current: int,
+        total: Optional[int] = None,
+        checkpoint: Optional[Dict[str, Any]] = None,
+        message: Optional[str] = None
+    ) -> None:
+        """
+        Persist progress and an optional checkpoint, then check for cancellation.
+
+        Handlers should call this after each unit of work they can resume from.
+
+        Raises:
+            JobCancelled: If cancellation was requested for the job
+            JobLeaseLost: If the job's lease expired and it was queued again
+        """
+        values: Dict[str, Any] = {"progress_current": current, "heartbeat_at": datetime.now(timezone.utc)}
+        if total is not None:
+            values["progress_total"] = total
+        if checkpoint is not None:
+            self.checkpoint = checkpoint
+            values["checkpoint"] = checkpoint
+        if message is not None:
+            values["message"] = message[:255]
+
+        async with self.session_factory() as session:
+            updated = await session.execute(
+                update(Job).where(Job.id == self.job_id, Job.locked_by == self.worker_id).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            cancel_requested = (await session.execute(
+                select(Job.cancel_requested).where(Job.id == self.job_id)
+            )).scalar_one_or_none()
+            await session.commit()
+
+        if not updated.rowcount:
+            raise JobLeaseLost(f"Job {self.job_id} is no longer leased to {self.worker_id}")
+        if cancel_requested:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+
+JobHandler = Callable[[JobContext], Awaitable[Optional[Dict[str, Any]]]]
+
+# Registered handlers by job type
+_job_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    """Register a coroutine function as the handler for a job type."""
+    def decorator(func: JobHandler) -> JobHandler:
+        _job_handlers[job_type] = func
+        return func
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[JobHandler]:
+    """Get the handler registered for a job type."""
+    return _job_handlers.get(job_type)
+
+
+class JobService:
+    """Service for submitting and managing jobs."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_job(self, job_type: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        Queue a new job.
+
+        Args:
+            job_type: Registered job type
+            params: JSON-serialisable handler input
+
+        Returns:
+            Created job
+
+        Raises:
+            ValueError: If no handler is registered for the job type
+        """
+        if get_job_handler(job_type) is None:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job = Job(job_type=job_type, status=JobStatus.QUEUED, params=params or {},
+                  progress_current=0, cancel_requested=False, attempts=0)
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+
+        get_job_runner().notify()
+        logger.info(f"Queued job {job.id} ({job_type})")
+        return job
+
+    async def get_job(self, job_id: int) -> Optional[Job]:
+        """Get a job by ID."""
+        result = await self.db.execute(select(Job).where(Job.id == job_id))
+        return result.scalar_one_or_none()
+
+    async def list_jobs(
+        self,
+        status: Optional[str] = None,
+        job_type: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Job]:
+        """List recent jobs, newest first."""
+        query = select(Job)
+        if status:
+            query = query.where(Job.status == status)
+        if job_type:
+            query = query.where(Job.job_type == job_type)
+        result = await self.db.execute(query.order_by(Job.id.desc()).limit(limit))
+        return list(result.scalars().all())
+
+    async def cancel_job(self, job_id: int) -> Optional[Job]:
+        """
+        Cancel a job.
+
+        Queued jobs are cancelled immediately; running jobs stop at their next
+        progress report.
+
+        Returns:
+            Updated job, or None if it does not exist
+
+        Raises:
+            ValueError: If the job has already finished
+        """
+        job = await self.get_job(job_id)
+        if job is None:
+            return None
+        if job.is_finished:
+            raise ValueError(f"Job {job_id} has already finished with status '{job.status}'")
+
+        job.cancel_requested = True
+        if job.status == JobStatus.QUEUED:
+            job.status = JobStatus.CANCELLED
+            job.finished_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def retry_job(self, job_id: int) -> Optional[Job]:
+        """
+        Queue a failed or cancelled job again, resuming from its checkpoint.
+
+        Returns:
+            Updated job, or None if it does not exist
+
+        Raises:
+            ValueError: If the job is not failed or cancelled
+        """
+        job = await self.get_job(job_id)
+        if job is None:
+            return None
+        if job.status not in (JobStatus.FAILED, JobStatus.CANCELLED):
+            raise ValueError(f"Only failed or cancelled jobs can be retried (job {job_id} is '{job.status}')")
+
+        job.status = JobStatus.QUEUED
+        job.cancel_requested = False
+        job.error = None
+        job.finished_at = None
+        await self.db.commit()
+        await self.db.refresh(job)
+
+        get_job_runner().notify()
+        return job
+
+
+class JobRunner:
+    """In-process runner executing queued jobs with bounded concurrency."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        concurrency: int = 2,
+        poll_interval: float = 5.0,
+        lease_seconds: float = 120.0
+    ):
+        self._session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        # Identifies this runner's leases among all processes sharing the jobs table
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wake = asyncio.Event()
+        self.stats = {"succeeded": 0, "failed": 0, "cancelled": 0}
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.database.base import async_session
+            self._session_factory = async_session
+        return self._session_factory
+
+    def notify(self) -> None:
+        """Wake idle workers so a new job starts without waiting for the poll."""
+        self._wake.set()
+
+    async def run(self) -> None:
+        """Run worker loops until cancelled."""
+        workers = [asyncio.create_task(self._worker_loop()) for _ in range(self.concurrency)]
+        workers.append(asyncio.create_task(self._recovery_loop()))
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _worker_loop(self) -> None:
+        while True:
+            try:
+                job = await self.claim_next()
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job = None
+
+            if job is not None:
+                await self.execute(job)
+                continue
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _recovery_loop(self) -> None:
+        while True:
+            try:
+                if await self.recover_interrupted():
+                    self.notify()
+            except Exception as e:
+                logger.error(f"Failed to recover interrupted jobs: {e}")
+            await asyncio.sleep(self.lease_seconds / 2)
+
+    async def recover_interrupted(self) -> int:
+        """
+        Queue running jobs whose lease has expired so they resume from their checkpoint.
+
+        Jobs still heartbeating belong to a live runner in this or another
+        process and are left alone.
+        """
+        expired = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(Job)
+                .where(
+                    Job.status == JobStatus.RUNNING,
+                    or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < expired)
+                )
+                .values(status=JobStatus.QUEUED, locked_by=None, heartbeat_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            recovered = result.rowcount or 0
+        if recovered:
+            logger.info(f"Re-queued {recovered} interrupted jobs")
+        return recovered
+
+    async def claim_next(self, job_id: Optional[int] = None) -> Optional[Job]:
+        """
+        Claim the oldest queued job (or a specific one) and mark it running.
+
+        Returns:
+            Claimed job, or None if nothing is queued
+        """
+        async with self.session_factory() as session:
+            query = select(Job).where(Job.status == JobStatus.QUEUED)
+            if job_id is not None:
+                query = query.where(Job.id == job_id)
+            result = await session.execute(
+                query.order_by(Job.id).limit(1).with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+            if job is None:
+                return None
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_by = self.worker_id
+            job.heartbeat_at = datetime.now(timezone.utc)
+            job.started_at = job.started_at or job.heartbeat_at
+            await session.commit()
+            return job
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Keep a job's lease alive while its handler runs, including long steps between reports."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 4)
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(
+                        update(Job).where(Job.id == job_id, Job.locked_by == self.worker_id)
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Failed to refresh lease of job {job_id}: {e}")
+
+    async def execute(self, job: Job) -> str:
+        """
+        Run a claimed job's handler and record the outcome.
+
+        Returns:
+            Final job status
+        """
+        handler = get_job_handler(job.job_type)
+        context = JobContext(job, self.session_factory)
+        values: Dict[str, Any] = {}
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job type '{job.job_type}'")
+            # Jobs are background work: their OpenAI calls queue behind interactive ones
+            with openai_priority(PRIORITY_BACKGROUND):
+                result = await handler(context)
+            values = {"status": JobStatus.SUCCEEDED, "result": result or {}}
+        except JobCancelled:
+            values = {"status": JobStatus.CANCELLED}
+        except JobLeaseLost as e:
+            # Another runner owns the job now; its outcome is not ours to record
+            logger.warning(str(e))
+            return JobStatus.QUEUED
+        except asyncio.CancelledError:
+            # Runner shutdown: the lease expires and another runner resumes the job
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.job_type}) failed: {e}")
+            values = {"status": JobStatus.FAILED, "error": (str(e) or e.__class__.__name__)[:1000]}
+        finally:
+            heartbeat.cancel()
+
+        values.update(finished_at=datetime.now(timezone.utc), locked_by=None, heartbeat_at=None)
+        async with self.session_factory() as session:
+            updated = await session.execute(
+                update(Job).where(Job.id == job.id, Job.locked_by == self.worker_id).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        if not updated.rowcount:
+            logger.warning(f"Job {job.id} was taken over by another runner; discarding its outcome here")
+            return JobStatus.QUEUED
+
+        status = values["status"]
+        self.stats[status] += 1
+        logger.info(f"Job {job.id} ({job.job_type}) finished: {status}")
+        return status
+
+    async def run_job(self, job_id: int) -> Optional[str]:
+        """
+        Claim and run one specific queued job in the current task.
+
+        Used by scripts that want to do the work themselves while still
+        recording progress in the jobs table.
+
+        Returns:
+            Final job status, or None if the job was not queued
+        """
+        job = await self.claim_next(job_id)
+        if job is None:
+            return None
+        return await self.execute(job)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get runner configuration and counters."""
+        return {
+            "concurrency": self.concurrency,
+            "worker_id": self.worker_id,
+            "lease_seconds": self.lease_seconds,
+            **self.stats
+        }
+
+
+async def watch_job(
+    job_id: int,
+    session_factory: Optional[Callable[[], AsyncSession]] = None,
+    poll_interval: float = 1.0
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield a job's ``to_dict()`` whenever its status or progress changes.
+
+    Polls the jobs table, so it follows jobs run by any process. Stops after
+    yielding the finished job, or immediately if the job does not exist.
+    """
+    session_factory = session_factory or get_job_runner().session_factory
+    last_seen = None
+    while True:
+        async with session_factory() as session:
+            job = (await session.execute(select(Job).where(Job.id == job_id))).scalar_one_or_none()
+            if job is None:
+                return
+            state = job.to_dict()
+        seen = (state["status"], state["progress"], state["cancel_requested"])
+        if seen != last_seen:
+            last_seen = seen
+            yield state
+        if state["status"] in JobStatus.FINISHED:
+            return
+        await asyncio.sleep(poll_interval)
+
+
+# Global runner instance
+_job_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    """Get the process-wide job runner."""
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner(
+            concurrency=int(os.getenv("JOB_RUNNER_CONCURRENCY", "2")),
+            poll_interval=float(os.getenv("JOB_RUNNER_POLL_INTERVAL", "5")),
+            lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", "120"))
+        )
+    return _job_runner
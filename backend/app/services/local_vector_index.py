@@ -0,0 +1,252 @@
+"""
+Local in-process vector index used when Weaviate is unavailable.
+
+Vectors are L2-normalised and stored as a float16 matrix in a memory-mapped
+file next to a small metadata array (postgres_id, updated_at, content_hash).
+Search is an exact cosine top-k computed as batched dot products over the
+matrix, which for a home inventory (thousands of items) takes a few
+milliseconds and needs no external service. The matrix is scored in chunks
+read straight from the memory map, each converted to float32 on its own, so
+a search holds at most one chunk in memory rather than a float32 copy of the
+whole index.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+META_DTYPE = np.dtype([
+    ("postgres_id", "<i8"),
+    ("updated_at", "<f8"),
+    ("content_hash", "S40"),
+])
+
+# Free slots have postgres_id 0 (database IDs start at 1)
+_FREE = 0
+
+
+class LocalVectorIndex:
+    """
+    Memory-mapped float16 vector matrix with exact top-k cosine search.
+
+    Rows are addressed by postgres_id; deleted rows are zeroed and reused.
+    The files grow by doubling when full.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dimensions: int,
+        initial_capacity: int = 1024,
+        chunk_rows: int = 4096
+    ):
+        self.path = path
+        self.dimensions = dimensions
+        self.chunk_rows = chunk_rows
+        self._lock = threading.RLock()
+        self._rows: Dict[int, int] = {}
+        self._free_rows: List[int] = []
+        self._high_water = 0
+
+        os.makedirs(path, exist_ok=True)
+        header = self._read_header()
+        if header and header.get("dimensions") != dimensions:
+            logger.warning(
+                f"Local vector index at {path} has {header.get('dimensions')} dimensions, "
+                f"expected {dimensions}; rebuilding it empty"
+            )
+            header = None
+
+        capacity = header["capacity"] if header else initial_capacity
+        self._open(capacity, create=header is None)
+        self._load_rows()
+
+    @property
+    def _header_path(self) -> str:
+        return os.path.join(self.path, "index.json")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.f16")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.bin")
+
+    def _read_header(self) -> Optional[dict]:
+        try:
+            with open(self._header_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_header(self) -> None:
+        with open(self._header_path, "w") as f:
+            json.dump({"dimensions": self.dimensions, "capacity": self.capacity}, f)
+
+    def _open(self, capacity: int, create: bool) -> None:
+        mode = "w+" if create else "r+"
+        self.capacity = capacity
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float16, mode=mode,
+                                  shape=(capacity, self.dimensions))
+        self._meta = np.memmap(self._meta_path, dtype=META_DTYPE, mode=mode, shape=(capacity,))
+        if create:
+            self._write_header()
+
+    def _load_rows(self) -> None:
+        ids = np.asarray(self._meta["postgres_id"])
+        used = np.nonzero(ids != _FREE)[0]
+        self._rows = {int(ids[row]): int(row) for row in used}
+        self._high_water = int(used[-1]) + 1 if len(used) else 0
+        self._free_rows = [row for row in range(self._high_water) if ids[row] == _FREE]
+
+    def _grow(self) -> None:
+        """Double the capacity, copying the existing rows into larger files."""
+        old_vectors = np.array(self._vectors[:self._high_water])
+        old_meta = np.array(self._meta[:self._high_water])
+        self._vectors.flush()
+        self._meta.flush()
+        del self._vectors, self._meta
+
+        self._open(self.capacity * 2, create=True)
+        self._vectors[:len(old_vectors)] = old_vectors
+        self._meta[:len(old_meta)] = old_meta
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._high_water >= self.capacity:
+            self._grow()
+        row = self._high_water
+        self._high_water += 1
+        return row
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, postgres_id: int) -> bool:
+        return postgres_id in self._rows
+
+    def upsert(
+        self,
+        postgres_id: int,
+        vector: Iterable[float],
+        content_hash: Optional[str] = None,
+        updated_at: Optional[datetime] = None
+    ) -> None:
+        """Insert or replace the vector for an item."""
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dimensions,):
+            raise ValueError(f"Expected a {self.dimensions}-dimension vector, got {vector.shape}")
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+
+        with self._lock:
+            row = self._rows.get(postgres_id)
+            if row is None:
+                row = self._allocate_row()
+                self._rows[postgres_id] = row
+            self._vectors[row] = vector.astype(np.float16)
+            self._meta[row] = (
+                postgres_id,
+                updated_at.replace(tzinfo=updated_at.tzinfo or timezone.utc).timestamp() if updated_at else 0.0,
+                (content_hash or "").encode("ascii")
+            )
+
+    def delete(self, postgres_id: int) -> bool:
+        """Remove an item's vector; returns False if it was not indexed."""
+        with self._lock:
+            row = self._rows.pop(postgres_id, None)
+            if row is None:
+                return False
+            self._vectors[row] = 0
+            self._meta[row] = (_FREE, 0.0, b"")
+            self._free_rows.append(row)
+            return True
+
+    def get_vector(self, postgres_id: int) -> Optional[np.ndarray]:
+        """Get the stored (normalised) vector for an item."""
+        row = self._rows.get(postgres_id)
+        if row is None:
+            return None
+        return np.asarray(self._vectors[row], dtype=np.float32)
+
+    def search(
+        self,
+        vector: Iterable[float],
+        limit: int = 10,
+        exclude_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the nearest items by cosine similarity.
+
+        Returns:
+            (postgres_id, certainty) pairs, best first. Certainty uses Weaviate's
+            scale, (1 + cosine) / 2, so existing thresholds keep their meaning.
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0 or limit <= 0:
+            return []
+        query = query / norm
+
+        with self._lock:
+            high_water = self._high_water
+            best_scores = np.empty(0, dtype=np.float32)
+            best_rows = np.empty(0, dtype=np.int64)
+
+            for start in range(0, high_water, self.chunk_rows):
+                stop = min(start + self.chunk_rows, high_water)
+                scores = self._vectors[start:stop].astype(np.float32) @ query
+                ids = np.asarray(self._meta["postgres_id"][start:stop])
+                scores[ids == _FREE] = -np.inf
+                if exclude_id is not None:
+                    scores[ids == exclude_id] = -np.inf
+
+                # Keep a running top-k across chunks
+                candidates = np.concatenate([best_scores, scores])
+                rows = np.concatenate([best_rows, np.arange(start, stop)])
+                if len(candidates) > limit:
+                    keep = np.argpartition(-candidates, limit - 1)[:limit]
+                    candidates, rows = candidates[keep], rows[keep]
+                best_scores, best_rows = candidates, rows
+
+            order = np.argsort(-best_scores)
+            return [
+                (int(self._meta["postgres_id"][best_rows[i]]), float((1.0 + best_scores[i]) / 2.0))
+                for i in order if np.isfinite(best_scores[i])
+            ]
+
+    def iter_states(self) -> Iterator[Tuple[int, Optional[str], Optional[datetime]]]:
+        """Yield (postgres_id, content_hash, updated_at) in postgres_id order."""
+        with self._lock:
+            items = sorted(self._rows.items())
+        for postgres_id, row in items:
+            meta = self._meta[row]
+            content_hash = meta["content_hash"].decode("ascii") or None
+            timestamp = float(meta["updated_at"])
+            updated_at = datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp else None
+            yield postgres_id, content_hash, updated_at
+
+    def flush(self) -> None:
+        """Write pending changes to disk."""
+        with self._lock:
+            self._vectors.flush()
+            self._meta.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Get index size information."""
+        return {
+            "items": len(self._rows),
+            "capacity": self.capacity,
+            "dimensions": self.dimensions,
+            "size_bytes": self.capacity * (self.dimensions * 2 + META_DTYPE.itemsize),
+        }
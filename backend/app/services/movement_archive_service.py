@@ -0,0 +1,496 @@
+"""
+Movement Archive Service for time-partitioned movement history storage.
+
+Manages the monthly PostgreSQL range partitions of ``item_movement_history``,
+moves cold months into gzip-compressed NDJSON files, and reads archived rows
+back when a history query reaches past the data still held in the database.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import select, delete, func, insert, text, and_, desc
+
+from app.database.config import DatabaseConfig
+from app.models.item_movement_history import ItemMovementHistory
+from app.models.movement_history_archive import MovementHistoryArchive, MovementHistoryArchiveItem
+from app.models.item import Item
+from app.models.location import Location
+from app.schemas.movement_history import MovementHistorySearch
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "item_movement_history"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+# Advisory lock key serialising partition maintenance across API processes
+PARTITION_MAINTENANCE_LOCK_KEY = 7_304_118_501
+
+
+def month_start(value: datetime) -> datetime:
+    """Truncate a datetime to the first instant of its month in UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month-start datetime by a number of months."""
+    month_index = value.month - 1 + months
+    return value.replace(year=value.year + month_index // 12, month=month_index % 12 + 1)
+
+
+def partition_name(start: datetime) -> str:
+    """Name of the monthly partition that starts at ``start``."""
+    return f"{PARENT_TABLE}_y{start.year:04d}m{start.month:02d}"
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize naive datetimes to UTC so archived and live rows compare."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _serialize_value(value: Any) -> Any:
+    """Convert a column value to its JSON representation."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _deserialize_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore column types for a row read back from an archive file."""
+    if data.get("created_at"):
+        data["created_at"] = as_utc(datetime.fromisoformat(data["created_at"]))
+    if data.get("estimated_value") is not None:
+        data["estimated_value"] = Decimal(data["estimated_value"])
+    return data
+
+
+def row_matches_search(data: Dict[str, Any], search_params: MovementHistorySearch) -> bool:
+    """Apply the MovementHistorySearch filters to an archived row in memory."""
+    if search_params.item_id and data["item_id"] != search_params.item_id:
+        return False
+    if search_params.location_id and search_params.location_id not in (
+        data["from_location_id"], data["to_location_id"]
+    ):
+        return False
+    if search_params.from_location_id and data["from_location_id"] != search_params.from_location_id:
+        return False
+    if search_params.to_location_id and data["to_location_id"] != search_params.to_location_id:
+        return False
+    if search_params.movement_type and data["movement_type"] != search_params.movement_type:
+        return False
+    if search_params.user_id and data["user_id"] != search_params.user_id:
+        return False
+    if search_params.start_date and data["created_at"] < as_utc(search_params.start_date):
+        return False
+    if search_params.end_date and data["created_at"] > as_utc(search_params.end_date):
+        return False
+    if search_params.min_quantity and data["quantity_moved"] < search_params.min_quantity:
+        return False
+    if search_params.max_quantity and data["quantity_moved"] > search_params.max_quantity:
+        return False
+    return True
+
+
+def scan_archive_file(
+    file_path: str,
+    search_params: MovementHistorySearch,
+    skip: int,
+    limit: int
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Stream one archive file and collect a page of matching rows.
+
+    Args:
+        file_path: Path to the gzip NDJSON archive
+        search_params: Filters to apply
+        skip: Number of matching rows to skip
+        limit: Maximum number of rows to collect
+
+    Returns:
+        Tuple of (collected rows, number of matching rows skipped)
+    """
+    rows: List[Dict[str, Any]] = []
+    skipped = 0
+    with gzip.open(file_path, "rt", encoding="utf-8") as archive_file:
+        for line in archive_file:
+            if not line.strip():
+                continue
+            data = _deserialize_row(json.loads(line))
+            if not row_matches_search(data, search_params):
+                continue
+            if skipped < skip:
+                skipped += 1
+                continue
+            rows.append(data)
+            if len(rows) >= limit:
+                break
+    return rows, skipped
+
+
+class MovementArchiveService:
+    """Service for movement history partitioning and archival."""
+
+    def __init__(self, db: AsyncSession, archive_path: Optional[str] = None):
+        self.db = db
+        self.archive_path = Path(archive_path or DatabaseConfig.get_movement_archive_path())
+
+    def _is_postgres(self) -> bool:
+        """Check whether the session is bound to PostgreSQL."""
+        return self.db.bind.dialect.name == "postgresql"
+
+    async def is_partitioned(self) -> bool:
+        """Check whether item_movement_history is a partitioned table."""
+        if not self._is_postgres():
+            return False
+        result = await self.db.execute(
+            text("SELECT relkind FROM pg_class WHERE relname = :name"),
+            {"name": PARENT_TABLE}
+        )
+        return result.scalar() == "p"
+
+    async def list_partitions(self) -> List[str]:
+        """List the partitions currently attached to item_movement_history."""
+        if not await self.is_partitioned():
+            return []
+        result = await self.db.execute(
+            text("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+                JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+                WHERE parent.relname = :name
+                ORDER BY child.relname
+            """),
+            {"name": PARENT_TABLE}
+        )
+        return [row[0] for row in result.fetchall()]
+
+    async def ensure_partitions(
+        self,
+        months_ahead: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create monthly partitions for the current month and the months ahead.
+
+        Rows that already landed in the default partition for a new month are
+        moved into the new partition before it is attached. Runs under a
+        transaction-level advisory lock; when another process holds it, this
+        call does nothing and leaves the work to that process.
+
+        Args:
+            months_ahead: Number of future months to prepare
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            Names of partitions that were created
+        """
+        if not await self.is_partitioned():
+            return []
+
+        if months_ahead is None:
+            months_ahead = DatabaseConfig.get_movement_partition_months_ahead()
+
+        locked = await self.db.scalar(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": PARTITION_MAINTENANCE_LOCK_KEY}
+        )
+        if not locked:
+            logger.info("Movement history partition maintenance is running in another process")
+            return []
+
+        existing = set(await self.list_partitions())
+        current = month_start(now or datetime.now(timezone.utc))
+        created = []
+
+        for offset in range(months_ahead + 1):
+            start = add_months(current, offset)
+            name = partition_name(start)
+            if name in existing:
+                continue
+            await self._create_month_partition(start, add_months(start, 1), name)
+            created.append(name)
+
+        # Committing also releases the advisory lock
+        await self.db.commit()
+        if created:
+            logger.info(f"Created movement history partitions: {', '.join(created)}")
+
+        return created
+
+    async def _create_month_partition(self, start: datetime, end: datetime, name: str) -> None:
+        """Create, backfill from the default partition, and attach one month."""
+        bounds = {"start": start, "end": end}
+        await self.db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} "
+            f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await self.db.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= :start AND created_at < :end
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """),
+            bounds
+        )
+        await self.db.execute(text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+    async def get_archives(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        item_id: Optional[int] = None
+    ) -> List[MovementHistoryArchive]:
+        """Get archive manifest entries overlapping a date range, newest first.
+
+        With ``item_id``, only archives holding movements of that item are returned.
+        """
+        query = select(MovementHistoryArchive)
+        if start_date:
+            query = query.where(MovementHistoryArchive.range_end > start_date)
+        if end_date:
+            query = query.where(MovementHistoryArchive.range_start <= end_date)
+        if item_id is not None:
+            query = query.where(
+                select(MovementHistoryArchiveItem.archive_id)
+                .where(
+                    MovementHistoryArchiveItem.archive_id == MovementHistoryArchive.id,
+                    MovementHistoryArchiveItem.item_id == item_id
+                )
+                .exists()
+            )
+        query = query.order_by(desc(MovementHistoryArchive.range_start))
+
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def archive_before(self, cutoff: datetime) -> List[MovementHistoryArchive]:
+        """
+        Archive every full month of movement history older than ``cutoff``.
+
+        Each month is exported to ``<archive_path>/<partition>.ndjson.gz`` and
+        recorded in ``movement_history_archives``. On a partitioned table the
+        month's partition is detached and dropped; otherwise the rows are
+        deleted from the live table.
+
+        Args:
+            cutoff: Months ending on or before this month's start are archived
+
+        Returns:
+            Manifest entries created by this run
+        """
+        cutoff_month = month_start(cutoff)
+
+        result = await self.db.execute(select(func.min(ItemMovementHistory.created_at)))
+        earliest = result.scalar()
+        if earliest is None:
+            return []
+
+        self.archive_path.mkdir(parents=True, exist_ok=True)
+        partitions = set(await self.list_partitions())
+        archived_names = {archive.partition_name for archive in await self.get_archives()}
+
+        created = []
+        start = month_start(earliest)
+        while start < cutoff_month:
+            end = add_months(start, 1)
+            name = partition_name(start)
+            if name not in archived_names:
+                archive = await self._archive_month(start, end, name, name in partitions)
+                if archive:
+                    created.append(archive)
+            start = end
+
+        logger.info(f"Archived {len(created)} month(s) of movement history before {cutoff_month.date()}")
+        return created
+
+    async def _archive_month(
+        self,
+        start: datetime,
+        end: datetime,
+        name: str,
+        is_partition: bool
+    ) -> Optional[MovementHistoryArchive]:
+        """Export one month to disk, record it, and remove it from the live table."""
+        file_path = self.archive_path / f"{name}.ndjson.gz"
+        row_count, item_ids = await self._export_range(start, end, file_path)
+
+        archive = None
+        if row_count:
+            archive = MovementHistoryArchive(
+                range_start=start,
+                range_end=end,
+                partition_name=name,
+                file_path=str(file_path),
+                row_count=row_count
+            )
+            self.db.add(archive)
+            await self.db.flush()
+            await self.db.execute(insert(MovementHistoryArchiveItem).values([
+                {"archive_id": archive.id, "item_id": item_id} for item_id in sorted(item_ids)
+            ]))
+        elif file_path.exists():
+            file_path.unlink()
+
+        if is_partition:
+            await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            await self.db.execute(text(f"DROP TABLE {name}"))
+
+        # Catches rows outside a dedicated partition (default partition, unpartitioned table)
+        await self.db.execute(
+            delete(ItemMovementHistory).where(
+                and_(
+                    ItemMovementHistory.created_at >= start,
+                    ItemMovementHistory.created_at < end
+                )
+            ).execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+
+        if archive:
+            logger.info(f"Archived {row_count} movement history rows to {file_path}")
+        return archive
+
+    async def _export_range(self, start: datetime, end: datetime, file_path: Path) -> Tuple[int, Set[int]]:
+        """Stream a month of rows into a gzip NDJSON file, newest first.
+
+        Returns:
+            Rows written and the IDs of the items they belong to
+        """
+        table = ItemMovementHistory.__table__
+        query = (
+            select(table)
+            .where(and_(table.c.created_at >= start, table.c.created_at < end))
+            .order_by(desc(table.c.created_at), desc(table.c.id))
+        )
+
+        tmp_path = file_path.with_suffix(".tmp")
+        row_count = 0
+        item_ids: Set[int] = set()
+        stream = await self.db.stream(query)
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as archive_file:
+            async for row in stream.mappings():
+                record = {key: _serialize_value(value) for key, value in row.items()}
+                archive_file.write(json.dumps(record) + "\n")
+                row_count += 1
+                item_ids.add(row["item_id"])
+
+        os.replace(tmp_path, file_path)
+        return row_count, item_ids
+
+    async def read_archived(
+        self,
+        search_params: MovementHistorySearch,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[ItemMovementHistory]:
+        """
+        Read archived movements matching the search, newest first.
+
+        Archive files are opened only when their range overlaps the requested
+        dates (every range, when none is given) and, for item searches, when
+        the manifest lists the item. Reading stops as soon as the page is filled.
+
+        Args:
+            search_params: Search and filter parameters
+            skip: Number of matching archived rows to skip
+            limit: Maximum number of rows to return
+
+        Returns:
+            Detached movement history entries with item and locations attached
+        """
+        if limit <= 0:
+            return []
+
+        archives = await self.get_archives(
+            search_params.start_date, search_params.end_date, search_params.item_id
+        )
+        if not archives:
+            return []
+
+        loop = asyncio.get_running_loop()
+        rows: List[Dict[str, Any]] = []
+        remaining_skip = skip
+
+        for archive in archives:
+            if not os.path.exists(archive.file_path):
+                logger.warning(f"Archive file missing for {archive.partition_name}: {archive.file_path}")
+                continue
+            page, skipped = await loop.run_in_executor(
+                None, scan_archive_file, archive.file_path, search_params,
+                remaining_skip, limit - len(rows)
+            )
+            remaining_skip -= skipped
+            rows.extend(page)
+            if len(rows) >= limit:
+                break
+
+        movements = [ItemMovementHistory(**row) for row in rows]
+        await self._attach_relationships(movements)
+        return movements
+
+    async def _attach_relationships(self, movements: List[ItemMovementHistory]) -> None:
+        """Load items and locations for archived rows with two IN queries."""
+        if not movements:
+            return
+
+        item_ids = {m.item_id for m in movements}
+        location_ids = {
+            location_id
+            for m in movements
+            for location_id in (m.from_location_id, m.to_location_id)
+            if location_id
+        }
+
+        result = await self.db.execute(select(Item).where(Item.id.in_(item_ids)))
+        items = {item.id: item for item in result.scalars().all()}
+
+        locations: Dict[int, Location] = {}
+        if location_ids:
+            result = await self.db.execute(select(Location).where(Location.id.in_(location_ids)))
+            locations = {location.id: location for location in result.scalars().all()}
+
+        # set_committed_value avoids back-populating Item.movement_history
+        for movement in movements:
+            set_committed_value(movement, "item", items.get(movement.item_id))
+            set_committed_value(movement, "from_location", locations.get(movement.from_location_id))
+            set_committed_value(movement, "to_location", locations.get(movement.to_location_id))
+
+
+async def run_partition_maintenance(interval_hours: float = 24.0) -> None:
+    """
+    Keep future movement history partitions created while the app runs.
+
+    Intended to run as a background task from the application lifespan.
+    """
+    from app.database.base import async_session
+
+    while True:
+        try:
+            async with async_session() as session:
+                await MovementArchiveService(session).ensure_partitions()
+        except Exception as e:
+            logger.error(f"Movement history partition maintenance failed: {e}")
+        await asyncio.sleep(interval_hours * 3600)
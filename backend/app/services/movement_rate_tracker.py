@@ -0,0 +1,159 @@
+"""
+Movement Rate Tracker for answering recent-movement checks from memory.
+
+Keeps sliding windows of recently recorded movements so the duplicate and
+high-frequency checks in MovementValidator do not have to query
+item_movement_history on every validation. The tracker is per process and is
+fed from MovementService through ``record_after_commit``, so only movements
+whose transaction committed are counted; until it has observed a full window
+it reports itself as cold and callers fall back to the database.
+"""
+
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+MovementSignature = Tuple[int, str, Optional[int], Optional[int], int]
+
+# Session.info key holding signatures of movements awaiting commit
+_PENDING_KEY = "movement_rate_tracker_pending"
+
+
+def movement_signature(movement: Any) -> MovementSignature:
+    """Fields that identify a duplicate movement."""
+    return (
+        movement.item_id,
+        movement.movement_type,
+        movement.from_location_id,
+        movement.to_location_id,
+        movement.quantity_moved
+    )
+
+
+class MovementRateTracker:
+    """
+    Sliding-window counters keyed by item and movement signature.
+
+    Each item keeps a deque of timestamps inside the frequency window, and each
+    signature keeps only its latest timestamp in an insertion-ordered map, so
+    recording and both lookups are amortized O(1).
+    """
+
+    def __init__(
+        self,
+        duplicate_window_seconds: float = 300.0,
+        frequency_window_seconds: float = 60.0,
+        clock=time.monotonic
+    ):
+        self.duplicate_window_seconds = duplicate_window_seconds
+        self.frequency_window_seconds = frequency_window_seconds
+        self._clock = clock
+        self._started_at = clock()
+        self._lock = threading.Lock()
+        self._item_events: Dict[int, Deque[float]] = {}
+        # Ordered oldest first so expired signatures are evicted from the front
+        self._signatures: "OrderedDict[MovementSignature, float]" = OrderedDict()
+
+    def is_warm(self, window_seconds: float) -> bool:
+        """Whether the tracker has observed every movement in the given window."""
+        return self._clock() - self._started_at >= window_seconds
+
+    def record(self, movement: Any) -> None:
+        """Record a movement that was just committed."""
+        self.record_signature(movement_signature(movement))
+
+    def record_signature(self, signature: MovementSignature) -> None:
+        """Record a committed movement by its signature (the item ID comes first)."""
+        now = self._clock()
+        item_id = signature[0]
+        with self._lock:
+            events = self._item_events.setdefault(item_id, deque())
+            events.append(now)
+            self._evict_item(item_id, events, now)
+
+            self._signatures.pop(signature, None)
+            self._signatures[signature] = now
+            self._evict_signatures(now)
+
+    def has_recent_duplicate(self, movement: Any, window_seconds: Optional[float] = None) -> bool:
+        """Check whether an identical movement was recorded within the window."""
+        window = window_seconds if window_seconds is not None else self.duplicate_window_seconds
+        with self._lock:
+            last_seen = self._signatures.get(movement_signature(movement))
+        return last_seen is not None and self._clock() - last_seen <= window
+
+    def recent_count(self, item_id: int) -> int:
+        """Count movements recorded for an item within the frequency window."""
+        now = self._clock()
+        with self._lock:
+            events = self._item_events.get(item_id)
+            if not events:
+                return 0
+            self._evict_item(item_id, events, now)
+            return len(events)
+
+    def reset(self) -> None:
+        """Forget all recorded movements and start a new cold period."""
+        with self._lock:
+            self._item_events.clear()
+            self._signatures.clear()
+            self._started_at = self._clock()
+
+    def _evict_item(self, item_id: int, events: Deque[float], now: float) -> None:
+        cutoff = now - self.frequency_window_seconds
+        while events and events[0] < cutoff:
+            events.popleft()
+        if not events:
+            del self._item_events[item_id]
+
+    def _evict_signatures(self, now: float) -> None:
+        cutoff = now - self.duplicate_window_seconds
+        while self._signatures:
+            signature, seen_at = next(iter(self._signatures.items()))
+            if seen_at >= cutoff:
+                break
+            self._signatures.popitem(last=False)
+
+
+# Global tracker instance
+_movement_rate_tracker: Optional[MovementRateTracker] = None
+
+
+def get_movement_rate_tracker() -> MovementRateTracker:
+    """Get the process-wide movement rate tracker."""
+    global _movement_rate_tracker
+    if _movement_rate_tracker is None:
+        _movement_rate_tracker = MovementRateTracker()
+    return _movement_rate_tracker
+
+
+def record_after_commit(db: AsyncSession, movements: Iterable[Any]) -> None:
+    """
+    Record movements in the tracker once the session's transaction commits.
+
+    Signatures are captured now, since ORM rows are expired by the commit.
+    A rollback drops them, so movements that never persisted do not count
+    towards the duplicate and frequency windows.
+    """
+    pending: List[MovementSignature] = db.info.setdefault(_PENDING_KEY, [])
+    pending.extend(movement_signature(movement) for movement in movements)
+
+
+@event.listens_for(Session, "after_commit")
+def _record_pending_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        tracker = get_movement_rate_tracker()
+        for signature in pending:
+            tracker.record_signature(signature)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -9,7 +9,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select, func, and_, or_, desc, asc
+from sqlalchemy import select, func, and_, or_, desc, asc, insert
 from decimal import Decimal
 
 from app.models.item_movement_history import ItemMovementHistory
@@ -23,6 +23,8 @@ from app.schemas.movement_history import (
 )
 from app.schemas.item import ItemSummary
 from app.schemas.location import LocationSummary
+from app.services.movement_archive_service import MovementArchiveService
+from app.services.movement_rate_tracker import record_after_commit
 
 
 class MovementService:
@@ -167,6 +169,8 @@ class MovementService:
         )
         
         self.db.add(movement_entry)
+        # Feed the validator's duplicate/frequency windows once the movement commits
+        record_after_commit(self.db, [movement_entry])
         
         if auto_commit:
             await self.db.commit()
@@ -198,7 +202,7 @@ class MovementService:
         
         return await self.record_movement(movement_data)
 
-    async def record_item_move(
+    def build_item_move_entries(
         self,
         item_id: int,
         from_location_id: int,
@@ -210,11 +214,8 @@ class MovementService:
         quantity_after_to: int,
         reason: Optional[str] = None,
         user_id: Optional[str] = None
-    ) -> List[ItemMovementHistory]:
-        """Record movement for item relocation."""
-        movements = []
-        
-        # Record removal from source location
+    ) -> List[MovementHistoryCreate]:
+        """Build the removal and addition history entries for an item relocation."""
         removal_data = MovementHistoryCreate(
             item_id=item_id,
             from_location_id=from_location_id,
@@ -228,10 +229,6 @@ class MovementService:
             system_notes=f"Moved {quantity} items to location {to_location_id}"
         )
         
-        removal = await self.record_movement(removal_data, auto_commit=False)
-        movements.append(removal)
-        
-        # Record addition to destination location
         addition_data = MovementHistoryCreate(
             item_id=item_id,
             from_location_id=None,
@@ -245,8 +242,32 @@ class MovementService:
             system_notes=f"Received {quantity} items from location {from_location_id}"
         )
         
-        addition = await self.record_movement(addition_data, auto_commit=False)
-        movements.append(addition)
+        return [removal_data, addition_data]
+
+    async def record_item_move(
+        self,
+        item_id: int,
+        from_location_id: int,
+        to_location_id: int,
+        quantity: int,
+        quantity_before_from: int,
+        quantity_after_from: int,
+        quantity_before_to: int,
+        quantity_after_to: int,
+        reason: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> List[ItemMovementHistory]:
+        """Record movement for item relocation."""
+        movements = []
+        
+        # Record removal from source location, then addition to destination
+        for movement_data in self.build_item_move_entries(
+            item_id, from_location_id, to_location_id, quantity,
+            quantity_before_from, quantity_after_from,
+            quantity_before_to, quantity_after_to,
+            reason=reason, user_id=user_id
+        ):
+            movements.append(await self.record_movement(movement_data, auto_commit=False))
         
         await self.db.commit()
         for movement in movements:
@@ -254,6 +275,29 @@ class MovementService:
         
         return movements
 
+    async def record_movements_batch(self, movements: List[MovementHistoryCreate]) -> int:
+        """
+        Record many movements with a single multi-row INSERT.
+        
+        Referenced items and locations are not re-checked here; callers pass
+        movements that were already validated. The caller owns the transaction.
+        
+        Args:
+            movements: Movement data to record
+            
+        Returns:
+            Number of history rows written
+        """
+        if not movements:
+            return 0
+        
+        rows = [movement.model_dump() for movement in movements]
+        await self.db.execute(insert(ItemMovementHistory).values(rows))
+        
+        record_after_commit(self.db, movements)
+        
+        return len(rows)
+
     async def record_quantity_adjustment(
         self,
         item_id: int,
@@ -297,6 +341,9 @@ class MovementService:
             
         Returns:
             List of movement history entries with related data
+
+        Archived months are only read when the live table cannot fill the
+        requested page, since archived rows are always older than live ones.
         """
         query = select(ItemMovementHistory).options(
             selectinload(ItemMovementHistory.item),
@@ -342,12 +389,33 @@ class MovementService:
         
         # Order by most recent first
         query = query.order_by(desc(ItemMovementHistory.created_at))
-        
+
         # Apply pagination
-        query = query.offset(skip).limit(limit)
-        
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        paged_query = query.offset(skip).limit(limit)
+
+        result = await self.db.execute(paged_query)
+        movements = list(result.scalars().all())
+
+        if len(movements) < limit:
+            # Live rows are exhausted; continue the page from archived months
+            if movements:
+                archive_skip = 0
+            elif skip:
+                live_count_result = await self.db.execute(
+                    select(func.count()).select_from(query.order_by(None).subquery())
+                )
+                archive_skip = max(0, skip - (live_count_result.scalar() or 0))
+            else:
+                archive_skip = 0
+
+            archive_service = MovementArchiveService(self.db)
+            movements.extend(
+                await archive_service.read_archived(
+                    search_params, skip=archive_skip, limit=limit - len(movements)
+                )
+            )
+
+        return movements
 
     async def get_item_movement_timeline(self, item_id: int) -> ItemMovementTimeline:
         """
@@ -9,8 +9,8 @@ Provides comprehensive validation for all types of item movements including:
 - Conflict prevention
 """
 
-from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, Union
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select, func, and_, or_
@@ -23,6 +23,10 @@ from app.models.inventory import Inventory
 from app.models.item_movement_history import ItemMovementHistory
 from app.schemas.movement_history import MovementHistoryCreate
 from app.schemas.inventory import InventoryCreate
+from app.services.movement_archive_service import as_utc
+from app.services.movement_rate_tracker import (
+    MovementRateTracker, get_movement_rate_tracker, movement_signature
+)
 
 logger = logging.getLogger(__name__)
 
@@ -68,11 +72,161 @@ class MovementValidationResult:
         self.business_rules_applied.append(rule)
 
 
+class DatabaseMovementState:
+    """
+    Reads the state movement rules check from the database.
+    
+    Duplicate and frequency checks are answered by the in-memory rate tracker
+    once it has observed their whole window, and by movement history before.
+    """
+    
+    def __init__(self, db: AsyncSession, rate_tracker: MovementRateTracker):
+        self.db = db
+        self.rate_tracker = rate_tracker
+    
+    async def get_item(self, item_id: int) -> Optional[Item]:
+        result = await self.db.execute(select(Item).where(Item.id == item_id))
+        return result.scalar_one_or_none()
+    
+    async def get_location(self, location_id: int) -> Optional[Location]:
+        result = await self.db.execute(select(Location).where(Location.id == location_id))
+        return result.scalar_one_or_none()
+    
+    async def has_inventory(self, item_id: int) -> bool:
+        result = await self.db.execute(
+            select(Inventory.id).where(Inventory.item_id == item_id).limit(1)
+        )
+        return result.first() is not None
+    
+    async def quantity_at(self, item_id: int, location_id: int) -> Optional[int]:
+        result = await self.db.execute(
+            select(Inventory.quantity).where(
+                and_(
+                    Inventory.item_id == item_id,
+                    Inventory.location_id == location_id
+                )
+            )
+        )
+        return result.scalar_one_or_none()
+    
+    async def count_recent(self, item_id: int, window: timedelta) -> int:
+        if window.total_seconds() <= self.rate_tracker.frequency_window_seconds and \
+                self.rate_tracker.is_warm(self.rate_tracker.frequency_window_seconds):
+            return self.rate_tracker.recent_count(item_id)
+        result = await self.db.execute(
+            select(func.count()).where(
+                and_(
+                    ItemMovementHistory.item_id == item_id,
+                    ItemMovementHistory.created_at >= datetime.now(timezone.utc) - window
+                )
+            )
+        )
+        return result.scalar()
+    
+    async def has_similar(self, movement: MovementHistoryCreate, window: timedelta) -> bool:
+        window_seconds = window.total_seconds()
+        if (
+            window_seconds <= self.rate_tracker.duplicate_window_seconds
+            and self.rate_tracker.is_warm(window_seconds)
+        ):
+            return self.rate_tracker.has_recent_duplicate(movement, window_seconds)
+        # Cold start: the tracker has not seen the whole window yet
+        result = await self.db.execute(
+            select(ItemMovementHistory.id).where(
+                and_(
+                    ItemMovementHistory.item_id == movement.item_id,
+                    ItemMovementHistory.movement_type == movement.movement_type,
+                    ItemMovementHistory.from_location_id == movement.from_location_id,
+                    ItemMovementHistory.to_location_id == movement.to_location_id,
+                    ItemMovementHistory.quantity_moved == movement.quantity_moved,
+                    ItemMovementHistory.created_at >= datetime.now(timezone.utc) - window
+                )
+            ).limit(1)
+        )
+        return result.first() is not None
+
+
+class BulkValidationContext:
+    """
+    Prefetched state for validating a batch of movements in memory.
+    
+    Answers the same lookups as DatabaseMovementState from the items,
+    locations, inventory quantities and recent movements referenced by a
+    batch, plus the running effects of movements already accepted earlier in
+    the same batch.
+    """
+    
+    def __init__(
+        self,
+        items: Dict[int, Item],
+        locations: Dict[int, Location],
+        inventory: Dict[Tuple[int, int], int],
+        recent_movements: List[Any],
+        now: datetime
+    ):
+        self.items = items
+        self.locations = locations
+        self.inventory = inventory
+        self.recent_movements = recent_movements
+        self.now = now
+        # Movements accepted earlier in the batch, as (item_id, signature) tuples
+        self.batch_movements: List[Tuple[int, Tuple]] = []
+    
+    async def get_item(self, item_id: int) -> Optional[Item]:
+        return self.items.get(item_id)
+    
+    async def get_location(self, location_id: int) -> Optional[Location]:
+        return self.locations.get(location_id)
+    
+    async def has_inventory(self, item_id: int) -> bool:
+        return any(entry_item_id == item_id for entry_item_id, _ in self.inventory)
+    
+    async def quantity_at(self, item_id: int, location_id: int) -> Optional[int]:
+        """Current simulated quantity of an item at a location (None if no entry)."""
+        return self.inventory.get((item_id, location_id))
+    
+    async def count_recent(self, item_id: int, window: timedelta) -> int:
+        """Count stored plus in-batch movements for an item within the window."""
+        since = self.now - window
+        stored = sum(
+            1 for row in self.recent_movements
+            if row.item_id == item_id and as_utc(row.created_at) >= since
+        )
+        return stored + sum(1 for batch_item_id, _ in self.batch_movements if batch_item_id == item_id)
+    
+    async def has_similar(self, movement: MovementHistoryCreate, window: timedelta) -> bool:
+        """Check for a stored or in-batch movement with the same signature."""
+        signature = movement_signature(movement)
+        if any(sig == signature for _, sig in self.batch_movements):
+            return True
+        since = self.now - window
+        return any(
+            movement_signature(row) == signature and as_utc(row.created_at) >= since
+            for row in self.recent_movements
+        )
+    
+    def apply(self, movement: MovementHistoryCreate) -> None:
+        """Apply an accepted movement's quantity effects to the simulated state."""
+        quantity = movement.quantity_moved or 0
+        if movement.from_location_id:
+            key = (movement.item_id, movement.from_location_id)
+            self.inventory[key] = self.inventory.get(key, 0) - quantity
+        if movement.to_location_id:
+            key = (movement.item_id, movement.to_location_id)
+            self.inventory[key] = self.inventory.get(key, 0) + quantity
+        self.batch_movements.append((movement.item_id, movement_signature(movement)))
+
+
+# Where the validation rules read item, location, inventory and history state from
+MovementState = Union[DatabaseMovementState, BulkValidationContext]
+
+
 class MovementValidator:
     """Service for validating movement operations and enforcing business rules."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, rate_tracker: Optional[MovementRateTracker] = None):
         self.db = db
+        self.rate_tracker = rate_tracker or get_movement_rate_tracker()
         self.business_rules = self._initialize_business_rules()
 
     def _initialize_business_rules(self) -> Dict[str, Dict[str, Any]]:
@@ -132,39 +286,9 @@ class MovementValidator:
         Returns:
             Validation result with errors, warnings, and applied rules
         """
-        result = MovementValidationResult(is_valid=True)
-        
-        try:
-            # Basic data validation
-            await self._validate_basic_movement_data(movement_data, result)
-            
-            # Entity existence validation
-            await self._validate_entities_exist(movement_data, result)
-            
-            # Business rules validation
-            if enforce_strict_validation:
-                await self._validate_business_rules(movement_data, result)
-            
-            # Movement type specific validation
-            await self._validate_movement_type_rules(movement_data, result)
-            
-            # Quantity and inventory validation
-            await self._validate_quantity_constraints(movement_data, result)
-            
-            # Location validation
-            await self._validate_location_constraints(movement_data, result)
-            
-            # Duplicate detection
-            await self._validate_duplicate_prevention(movement_data, result)
-            
-            # Performance and conflict validation
-            await self._validate_performance_constraints(movement_data, result)
-            
-        except Exception as e:
-            logger.error(f"Validation error: {str(e)}")
-            result.add_error(f"Validation system error: {str(e)}")
-        
-        return result
+        return await self._validate_movement(
+            movement_data, self._database_state(), enforce_strict_validation
+        )
 
     async def validate_bulk_movement(
         self, 
@@ -188,11 +312,17 @@ class MovementValidator:
             overall_result.add_error("No movements provided for bulk validation")
             return overall_result, individual_results
         
-        # Validate each movement individually
+        # Load everything the batch touches up front, then validate in memory
+        context = await self._prefetch_bulk_context(movements)
+        
         for i, movement in enumerate(movements):
-            individual_result = await self.validate_movement_create(movement)
+            individual_result = await self._validate_movement_in_context(movement, context)
             individual_results.append(individual_result)
             
+            # Later movements see the cumulative effect of earlier valid ones
+            if individual_result.is_valid:
+                context.apply(movement)
+            
             if not individual_result.is_valid:
                 overall_result.add_error(f"Movement {i+1} failed validation: {'; '.join(individual_result.errors)}")
                 if enforce_atomic_validation:
@@ -203,6 +333,117 @@ class MovementValidator:
         
         return overall_result, individual_results
 
+    def _database_state(self) -> DatabaseMovementState:
+        return DatabaseMovementState(self.db, self.rate_tracker)
+
+    async def _prefetch_bulk_context(self, movements: List[MovementHistoryCreate]) -> BulkValidationContext:
+        """Load items, locations, inventory and recent movements for a batch in four queries."""
+        item_ids = {m.item_id for m in movements if m.item_id}
+        location_ids = {
+            location_id
+            for m in movements
+            for location_id in (m.from_location_id, m.to_location_id)
+            if location_id
+        }
+        now = datetime.now(timezone.utc)
+        
+        items: Dict[int, Item] = {}
+        inventory: Dict[Tuple[int, int], int] = {}
+        recent_movements: List[Any] = []
+        if item_ids:
+            items_result = await self.db.execute(select(Item).where(Item.id.in_(item_ids)))
+            items = {item.id: item for item in items_result.scalars().all()}
+            
+            inventory_result = await self.db.execute(
+                select(Inventory.item_id, Inventory.location_id, Inventory.quantity)
+                .where(Inventory.item_id.in_(item_ids))
+            )
+            inventory = {
+                (row.item_id, row.location_id): row.quantity
+                for row in inventory_result
+            }
+            
+            # One hour covers both the concurrency limit and the duplicate window
+            window_minutes = max(60, self.business_rules["duplicate_movement_prevention"]["time_window_minutes"])
+            recent_result = await self.db.execute(
+                select(
+                    ItemMovementHistory.item_id,
+                    ItemMovementHistory.movement_type,
+                    ItemMovementHistory.from_location_id,
+                    ItemMovementHistory.to_location_id,
+                    ItemMovementHistory.quantity_moved,
+                    ItemMovementHistory.created_at
+                ).where(
+                    and_(
+                        ItemMovementHistory.item_id.in_(item_ids),
+                        ItemMovementHistory.created_at >= now - timedelta(minutes=window_minutes)
+                    )
+                )
+            )
+            recent_movements = list(recent_result)
+        
+        locations: Dict[int, Location] = {}
+        if location_ids:
+            locations_result = await self.db.execute(select(Location).where(Location.id.in_(location_ids)))
+            locations = {location.id: location for location in locations_result.scalars().all()}
+        
+        return BulkValidationContext(items, locations, inventory, recent_movements, now)
+
+    async def _validate_movement_in_context(
+        self,
+        movement_data: MovementHistoryCreate,
+        context: BulkValidationContext,
+        enforce_strict_validation: bool = True
+    ) -> MovementValidationResult:
+        """
+        Validate one movement against prefetched batch state.
+        
+        Quantity checks use the simulated inventory, so a batch that overdraws
+        a location across several movements is rejected.
+        """
+        return await self._validate_movement(movement_data, context, enforce_strict_validation)
+
+    async def _validate_movement(
+        self,
+        movement_data: MovementHistoryCreate,
+        state: MovementState,
+        enforce_strict_validation: bool
+    ) -> MovementValidationResult:
+        """Run every rule against the given state."""
+        result = MovementValidationResult(is_valid=True)
+        
+        try:
+            # Basic data validation
+            await self._validate_basic_movement_data(movement_data, result)
+            
+            # Entity existence validation
+            await self._validate_entities_exist(movement_data, result, state)
+            
+            # Business rules validation
+            if enforce_strict_validation:
+                await self._validate_business_rules(movement_data, result, state)
+            
+            # Movement type specific validation
+            await self._validate_movement_type_rules(movement_data, result, state)
+            
+            # Quantity and inventory validation
+            await self._validate_quantity_constraints(movement_data, result, state)
+            
+            # Location validation
+            await self._validate_location_constraints(movement_data, result)
+            
+            # Duplicate detection
+            await self._validate_duplicate_prevention(movement_data, result, state)
+            
+            # Performance and conflict validation
+            await self._validate_performance_constraints(movement_data, result, state)
+            
+        except Exception as e:
+            logger.error(f"Validation error: {str(e)}")
+            result.add_error(f"Validation system error: {str(e)}")
+        
+        return result
+
     async def _validate_basic_movement_data(
         self, 
         movement_data: MovementHistoryCreate, 
@@ -248,15 +489,14 @@ class MovementValidator:
     async def _validate_entities_exist(
         self, 
         movement_data: MovementHistoryCreate, 
-        result: MovementValidationResult
+        result: MovementValidationResult,
+        state: Optional[MovementState] = None
     ) -> None:
-        """Validate that referenced entities exist in the database."""
+        """Validate that referenced entities exist."""
+        state = state or self._database_state()
         
         # Validate item exists
-        item_result = await self.db.execute(
-            select(Item).where(Item.id == movement_data.item_id)
-        )
-        item = item_result.scalar_one_or_none()
+        item = await state.get_item(movement_data.item_id)
         if not item:
             result.add_error(f"Item with ID {movement_data.item_id} does not exist")
             return
@@ -266,10 +506,7 @@ class MovementValidator:
         
         # Validate from_location exists
         if movement_data.from_location_id:
-            from_location_result = await self.db.execute(
-                select(Location).where(Location.id == movement_data.from_location_id)
-            )
-            from_location = from_location_result.scalar_one_or_none()
+            from_location = await state.get_location(movement_data.from_location_id)
             if not from_location:
                 result.add_error(f"From location with ID {movement_data.from_location_id} does not exist")
             else:
@@ -277,10 +514,7 @@ class MovementValidator:
         
         # Validate to_location exists
         if movement_data.to_location_id:
-            to_location_result = await self.db.execute(
-                select(Location).where(Location.id == movement_data.to_location_id)
-            )
-            to_location = to_location_result.scalar_one_or_none()
+            to_location = await state.get_location(movement_data.to_location_id)
             if not to_location:
                 result.add_error(f"To location with ID {movement_data.to_location_id} does not exist")
             else:
@@ -289,9 +523,11 @@ class MovementValidator:
     async def _validate_business_rules(
         self, 
         movement_data: MovementHistoryCreate, 
-        result: MovementValidationResult
+        result: MovementValidationResult,
+        state: Optional[MovementState] = None
     ) -> None:
         """Apply and validate business rules."""
+        state = state or self._database_state()
         
         item = result.validation_metadata.get("item")
         if not item:
@@ -307,17 +543,7 @@ class MovementValidator:
         # Concurrent movements limit
         if self.business_rules["max_concurrent_movements"]["enabled"]:
             limit = self.business_rules["max_concurrent_movements"]["limit"]
-            hour_ago = datetime.now() - timedelta(hours=1)
-            
-            recent_movements_result = await self.db.execute(
-                select(func.count()).where(
-                    and_(
-                        ItemMovementHistory.item_id == movement_data.item_id,
-                        ItemMovementHistory.created_at >= hour_ago
-                    )
-                )
-            )
-            recent_count = recent_movements_result.scalar()
+            recent_count = await state.count_recent(movement_data.item_id, timedelta(hours=1))
             
             if recent_count >= limit:
                 result.add_error(f"Too many movements for this item in the last hour: {recent_count}/{limit}")
@@ -326,44 +552,35 @@ class MovementValidator:
     async def _validate_movement_type_rules(
         self, 
         movement_data: MovementHistoryCreate, 
-        result: MovementValidationResult
+        result: MovementValidationResult,
+        state: Optional[MovementState] = None
     ) -> None:
         """Validate rules specific to movement types."""
+        state = state or self._database_state()
         
         if movement_data.movement_type == "create":
             # For create operations, verify item doesn't already exist in inventory
-            existing_inventory_result = await self.db.execute(
-                select(Inventory).where(Inventory.item_id == movement_data.item_id)
-            )
-            existing_inventory = existing_inventory_result.scalars().all()
-            
-            if existing_inventory:
+            if await state.has_inventory(movement_data.item_id):
                 result.add_warning("Item already exists in inventory - this may create duplicates")
         
         elif movement_data.movement_type == "move":
             # For move operations, verify item exists in from_location
             if movement_data.from_location_id:
-                from_inventory_result = await self.db.execute(
-                    select(Inventory).where(
-                        and_(
-                            Inventory.item_id == movement_data.item_id,
-                            Inventory.location_id == movement_data.from_location_id
-                        )
-                    )
-                )
-                from_inventory = from_inventory_result.scalar_one_or_none()
+                available = await state.quantity_at(movement_data.item_id, movement_data.from_location_id)
                 
-                if not from_inventory:
+                if available is None:
                     result.add_error("Item not found in source location")
-                elif movement_data.quantity_moved and from_inventory.quantity < movement_data.quantity_moved:
-                    result.add_error(f"Insufficient quantity in source location: {from_inventory.quantity} < {movement_data.quantity_moved}")
+                elif movement_data.quantity_moved and available < movement_data.quantity_moved:
+                    result.add_error(f"Insufficient quantity in source location: {available} < {movement_data.quantity_moved}")
 
     async def _validate_quantity_constraints(
         self, 
         movement_data: MovementHistoryCreate, 
-        result: MovementValidationResult
+        result: MovementValidationResult,
+        state: Optional[MovementState] = None
     ) -> None:
         """Validate quantity-related constraints."""
+        state = state or self._database_state()
         
         if not self.business_rules["quantity_consistency"]["enabled"]:
             return
@@ -371,15 +588,9 @@ class MovementValidator:
         # Negative inventory prevention
         if not self.business_rules["quantity_consistency"]["allow_negative_inventory"]:
             if movement_data.from_location_id and movement_data.quantity_moved:
-                current_inventory_result = await self.db.execute(
-                    select(Inventory.quantity).where(
-                        and_(
-                            Inventory.item_id == movement_data.item_id,
-                            Inventory.location_id == movement_data.from_location_id
-                        )
-                    )
-                )
-                current_quantity = current_inventory_result.scalar() or 0
+                current_quantity = await state.quantity_at(
+                    movement_data.item_id, movement_data.from_location_id
+                ) or 0
                 
                 if current_quantity < movement_data.quantity_moved:
                     result.add_error(f"Movement would create negative inventory: {current_quantity} - {movement_data.quantity_moved}")
@@ -407,32 +618,18 @@ class MovementValidator:
     async def _validate_duplicate_prevention(
         self, 
         movement_data: MovementHistoryCreate, 
-        result: MovementValidationResult
+        result: MovementValidationResult,
+        state: Optional[MovementState] = None
     ) -> None:
         """Prevent duplicate movements within time window."""
+        state = state or self._database_state()
         
         if not self.business_rules["duplicate_movement_prevention"]["enabled"]:
             return
         
         time_window = self.business_rules["duplicate_movement_prevention"]["time_window_minutes"]
-        cutoff_time = datetime.now() - timedelta(minutes=time_window)
-        
-        # Look for similar movements in the time window
-        similar_movements_result = await self.db.execute(
-            select(ItemMovementHistory).where(
-                and_(
-                    ItemMovementHistory.item_id == movement_data.item_id,
-                    ItemMovementHistory.movement_type == movement_data.movement_type,
-                    ItemMovementHistory.from_location_id == movement_data.from_location_id,
-                    ItemMovementHistory.to_location_id == movement_data.to_location_id,
-                    ItemMovementHistory.quantity_moved == movement_data.quantity_moved,
-                    ItemMovementHistory.created_at >= cutoff_time
-                )
-            )
-        )
-        similar_movements = similar_movements_result.scalars().all()
         
-        if similar_movements:
+        if await state.has_similar(movement_data, timedelta(minutes=time_window)):
             result.add_warning(f"Similar movement detected within {time_window} minutes - possible duplicate")
         
         result.add_business_rule("duplicate_movement_prevention")
@@ -440,20 +637,14 @@ class MovementValidator:
     async def _validate_performance_constraints(
         self, 
         movement_data: MovementHistoryCreate, 
-        result: MovementValidationResult
+        result: MovementValidationResult,
+        state: Optional[MovementState] = None
     ) -> None:
         """Validate performance-related constraints."""
+        state = state or self._database_state()
         
         # Check for high-frequency movements that might indicate system issues
-        recent_movements_result = await self.db.execute(
-            select(func.count()).where(
-                and_(
-                    ItemMovementHistory.item_id == movement_data.item_id,
-                    ItemMovementHistory.created_at >= datetime.now() - timedelta(minutes=1)
-                )
-            )
-        )
-        recent_count = recent_movements_result.scalar()
+        recent_count = await state.count_recent(movement_data.item_id, timedelta(minutes=1))
         
         if recent_count > 10:
             result.add_warning("High frequency movements detected - possible system issue")
@@ -517,7 +708,7 @@ class MovementValidator:
         # System health checks
         recent_failures = await self.db.execute(
             select(func.count()).where(
-                ItemMovementHistory.created_at >= datetime.now() - timedelta(hours=24)
+                ItemMovementHistory.created_at >= datetime.now(timezone.utc) - timedelta(hours=24)
             )
         )
         
@@ -0,0 +1,337 @@
+"""
+Process-wide rate limiter shared by every OpenAI call.
+
+Chat completions, vision analysis and embeddings all draw from the same
+request and token budgets, each a token bucket refilled continuously at the
+configured per-minute rate. Callers wait in a priority queue, so interactive
+requests are served before background work such as outbox syncs and bulk
+re-indexing jobs; within a priority the queue is first come, first served.
+
+Token costs are estimated before a request and corrected with the usage the
+API reports afterwards. The ``x-ratelimit-*`` response headers pull the
+buckets down to what OpenAI says is left, and a 429 pauses the whole queue
+for the ``retry-after`` time or an exponential backoff.
+
+Background code marks its calls with ``openai_priority(PRIORITY_BACKGROUND)``;
+everything else is interactive.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import os
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Mapping, Optional
+
+import openai
+
+from app.performance.metrics import OPENAI_QUEUE_WAIT, OPENAI_REQUEST_DURATION, OPENAI_TOKENS
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+_current_priority: ContextVar[int] = ContextVar("openai_priority", default=PRIORITY_INTERACTIVE)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Wait times kept per priority for the percentile metrics
+_WAIT_SAMPLES = 500
+
+
+@contextmanager
+def openai_priority(priority: int) -> Iterator[None]:
+    """Run the enclosed OpenAI calls at the given priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset header such as ``"1s"``, ``"6m0s"`` or ``"20ms"``.
+
+    Returns:
+        Seconds, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    tokens: int = field(compare=False)
+    wake: Optional[asyncio.Future] = field(default=None, compare=False)
+
+
+class _Bucket:
+    """Token bucket holding up to ``capacity`` units, refilled per minute."""
+
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = now
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available."""
+        if not self.enabled or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class OpenAIRateLimiter:
+    """Async request and token rate limiter with priority queueing and adaptive backoff."""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200000,
+        max_backoff_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._clock = clock
+        now = clock()
+        self._requests = _Bucket(requests_per_minute, now)
+        self._tokens = _Bucket(tokens_per_minute, now)
+        self.max_backoff_seconds = max_backoff_seconds
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._blocked_until = 0.0
+        self._consecutive_rate_limits = 0
+        self._waits: Dict[int, Deque[float]] = {p: deque(maxlen=_WAIT_SAMPLES) for p in PRIORITY_NAMES}
+        self._granted: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self._rate_limited = 0
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        return now
+
+    def _delay(self, tokens: int) -> float:
+        now = self._refill()
+        return max(self._blocked_until - now, self._requests.delay(1), self._tokens.delay(tokens))
+
+    def _wake_head(self) -> None:
+        if self._waiters:
+            wake = self._waiters[0].wake
+            if wake is not None and not wake.done():
+                wake.set_result(None)
+
+    async def acquire(self, tokens: int = 0, priority: Optional[int] = None) -> int:
+        """
+        Wait until one request and ``tokens`` tokens may be spent, then spend them.
+
+        Args:
+            tokens: Estimated tokens the request will use
+            priority: Queue priority, defaulting to the current ``openai_priority``
+
+        Returns:
+            Tokens reserved; pass it to ``record_usage`` once the real usage is known
+        """
+        priority = _current_priority.get() if priority is None else priority
+        if self._tokens.enabled:
+            # A request larger than the bucket would never fit; let it through on a full bucket
+            tokens = min(tokens, int(self._tokens.capacity))
+        waiter = _Waiter(priority, next(self._sequence), tokens)
+        heapq.heappush(self._waiters, waiter)
+        started = self._clock()
+
+        try:
+            while True:
+                if self._waiters[0] is waiter:
+                    delay = self._delay(tokens)
+                    if delay <= 0:
+                        break
+                else:
+                    delay = None
+                waiter.wake = asyncio.get_running_loop().create_future()
+                try:
+                    await asyncio.wait_for(waiter.wake, timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+            self._wake_head()
+            raise
+
+        heapq.heappop(self._waiters)
+        self._requests.level -= 1
+        self._tokens.level -= tokens
+        self._granted[priority] = self._granted.get(priority, 0) + 1
+        waited = self._clock() - started
+        self._waits.setdefault(priority, deque(maxlen=_WAIT_SAMPLES)).append(waited)
+        OPENAI_QUEUE_WAIT.observe(waited, priority=PRIORITY_NAMES.get(priority, str(priority)))
+        self._wake_head()
+        return tokens
+
+    def record_usage(self, reserved: int, used: Optional[int]) -> None:
+        """Correct the token bucket once a request reports its actual usage."""
+        if used is None or not self._tokens.enabled:
+            return
+        self._refill()
+        self._tokens.level = min(self._tokens.capacity, self._tokens.level + reserved - used)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Align the buckets with the remaining budget reported by the API."""
+        now = self._refill()
+        self._consecutive_rate_limits = 0
+        for bucket, kind in ((self._requests, "requests"), (self._tokens, "tokens")):
+            remaining = _header_int(headers, f"x-ratelimit-remaining-{kind}")
+            if remaining is None or not bucket.enabled:
+                continue
+            bucket.level = min(bucket.level, float(remaining))
+            reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            if remaining <= 0 and reset:
+                self._blocked_until = max(self._blocked_until, now + reset)
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """
+        Pause the queue after a 429 response.
+
+        Uses ``retry-after-ms``/``retry-after`` when present, otherwise an
+        exponential backoff that grows with consecutive rate-limit errors.
+
+        Returns:
+            Seconds the queue is paused for
+        """
+        headers = headers or {}
+        now = self._refill()
+        self._rate_limited += 1
+        self._consecutive_rate_limits += 1
+
+        retry_after = parse_reset_duration(headers.get("retry-after-ms"))
+        if retry_after is not None:
+            retry_after /= 1000.0
+        else:
+            retry_after = parse_reset_duration(headers.get("retry-after"))
+        if retry_after is None:
+            retry_after = min(self.max_backoff_seconds, 2.0 ** (self._consecutive_rate_limits - 1))
+
+        self._blocked_until = max(self._blocked_until, now + retry_after)
+        logger.warning(f"OpenAI rate limit hit; pausing requests for {retry_after:.1f}s")
+        return retry_after
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        tokens: int = 0,
+        priority: Optional[int] = None,
+        max_retries: int = 3,
+        operation: str = "request"
+    ) -> Any:
+        """
+        Run a raw-response OpenAI request under the limiter.
+
+        ``request`` must return an ``APIResponse`` (``.with_raw_response``) so
+        its rate-limit headers can be read. Requests rejected with a 429 are
+        queued again, up to ``max_retries`` times. ``operation`` labels the
+        call's latency and token metrics.
+
+        Returns:
+            The parsed response
+        """
+        for attempt in range(max_retries + 1):
+            reserved = await self.acquire(tokens, priority)
+            started = time.perf_counter()
+            try:
+                raw = await request()
+            except openai.RateLimitError as e:
+                OPENAI_REQUEST_DURATION.observe(time.perf_counter() - started, operation=operation, outcome="rate_limited")
+                self.record_usage(reserved, 0)
+                self.on_rate_limited(e.response.headers if e.response is not None else None)
+                if attempt == max_retries:
+                    raise
+                continue
+            except Exception:
+                OPENAI_REQUEST_DURATION.observe(time.perf_counter() - started, operation=operation, outcome="error")
+                self.record_usage(reserved, 0)
+                raise
+
+            OPENAI_REQUEST_DURATION.observe(time.perf_counter() - started, operation=operation, outcome="ok")
+            self.update_from_headers(raw.headers)
+            response = raw.parse()
+            used = getattr(getattr(response, "usage", None), "total_tokens", None)
+            self.record_usage(reserved, used)
+            if used is not None:
+                OPENAI_TOKENS.inc(used, operation=operation)
+            return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait times and remaining budget."""
+        now = self._refill()
+        queues = {}
+        for priority, name in PRIORITY_NAMES.items():
+            waits = sorted(self._waits.get(priority, ()))
+            queues[name] = {
+                "depth": sum(1 for waiter in self._waiters if waiter.priority == priority),
+                "granted": self._granted.get(priority, 0),
+                "wait_avg_ms": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                "wait_p95_ms": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1) if waits else 0.0,
+            }
+        return {
+            "queues": queues,
+            "requests_available": round(self._requests.level, 1) if self._requests.enabled else None,
+            "tokens_available": round(self._tokens.level) if self._tokens.enabled else None,
+            "paused_seconds": round(max(0.0, self._blocked_until - now), 2),
+            "rate_limited": self._rate_limited,
+        }
+
+
+# Global instance
+_openai_rate_limiter: Optional[OpenAIRateLimiter] = None
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """Get the process-wide OpenAI rate limiter."""
+    global _openai_rate_limiter
+    if _openai_rate_limiter is None:
+        _openai_rate_limiter = OpenAIRateLimiter(
+            requests_per_minute=int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500")),
+            tokens_per_minute=int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000"))
+        )
+    return _openai_rate_limiter
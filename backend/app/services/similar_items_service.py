@@ -0,0 +1,252 @@
+"""
+Similar Items Service maintaining precomputed nearest-neighbour lists.
+
+Each item's top-K similar items are stored in ``item_similarities`` so the
+similar items endpoint is a single indexed lookup. Lists are refreshed
+incrementally when embeddings change:
+
+- the changed item's own list is recomputed with one vector query;
+- cosine similarity is symmetric, so the item is merged into each new
+  neighbour's stored list using the score already known (a full list where
+  the item's score dropped is recomputed instead);
+- lists that contained the item but are not among its new neighbours may have
+  lost it from their top-K, so only those are recomputed.
+"""
+
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+
+from app.models.item import Item
+from app.models.inventory import Inventory
+from app.models.item_similarity import ItemSimilarity
+from app.services.job_service import JobContext, job_handler
+from app.services.weaviate_service import get_weaviate_service, WeaviateService
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_ITEMS_REBUILD_JOB = "similar_items_rebuild"
+
+Neighbour = Tuple[int, float]
+
+
+class SimilarItemsService:
+    """Service for reading and refreshing precomputed similar-items lists."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        weaviate_service: Optional[WeaviateService] = None,
+        k: Optional[int] = None
+    ):
+        self.db = db
+        self._weaviate_service = weaviate_service
+        self.k = k or int(os.getenv("SIMILAR_ITEMS_K", "20"))
+
+    async def _get_weaviate_service(self) -> WeaviateService:
+        if self._weaviate_service is None:
+            self._weaviate_service = await get_weaviate_service()
+        return self._weaviate_service
+
+    async def get_similar_items(self, item_id: int, limit: int = 5) -> List[ItemSimilarity]:
+        """
+        Get an item's stored similar items, best first.
+
+        Loads the similar items with their category and locations in one query.
+        Lists hold at most K rows, so the limit is applied after loading.
+        """
+        query = (
+            select(ItemSimilarity)
+            .join(Item, Item.id == ItemSimilarity.similar_item_id)
+            .options(
+                contains_eager(ItemSimilarity.similar_item).joinedload(Item.category),
+                contains_eager(ItemSimilarity.similar_item)
+                .joinedload(Item.inventory_entries)
+                .joinedload(Inventory.location)
+            )
+            .where(ItemSimilarity.item_id == item_id, Item.is_active == True)
+            .order_by(ItemSimilarity.rank)
+        )
+        result = await self.db.execute(query)
+        return list(result.unique().scalars().all())[:limit]
+
+    async def _query_neighbours(self, item_id: int) -> List[Neighbour]:
+        """
+        Run a vector query for an item's top-K active neighbours.
+
+        Query failures propagate, so an index outage leaves the stored lists
+        untouched instead of replacing them with empty ones.
+        """
+        weaviate_service = await self._get_weaviate_service()
+        results = await weaviate_service.find_similar_items(item_id, self.k)
+
+        scores: Dict[int, float] = {}
+        for result in results:
+            if result.postgres_id != item_id and result.postgres_id not in scores:
+                scores[result.postgres_id] = float(result.score)
+        if not scores:
+            return []
+
+        # The index can briefly hold items that were deleted or deactivated
+        active = await self.db.execute(
+            select(Item.id).where(Item.id.in_(list(scores)), Item.is_active == True)
+        )
+        active_ids = set(active.scalars().all())
+        ranked = sorted(
+            ((neighbour_id, score) for neighbour_id, score in scores.items() if neighbour_id in active_ids),
+            key=lambda entry: entry[1],
+            reverse=True
+        )
+        return ranked[:self.k]
+
+    async def _load_lists(self, owner_ids: Iterable[int]) -> Dict[int, List[Neighbour]]:
+        owner_ids = list(owner_ids)
+        if not owner_ids:
+            return {}
+        result = await self.db.execute(
+            select(ItemSimilarity.item_id, ItemSimilarity.similar_item_id, ItemSimilarity.score)
+            .where(ItemSimilarity.item_id.in_(owner_ids))
+            .order_by(ItemSimilarity.item_id, ItemSimilarity.rank)
+        )
+        lists: Dict[int, List[Neighbour]] = {}
+        for owner_id, neighbour_id, score in result:
+            lists.setdefault(owner_id, []).append((neighbour_id, score))
+        return lists
+
+    async def _replace_list(self, owner_id: int, neighbours: List[Neighbour]) -> None:
+        await self.db.execute(
+            delete(ItemSimilarity)
+            .where(ItemSimilarity.item_id == owner_id)
+            .execution_options(synchronize_session=False)
+        )
+        if neighbours:
+            await self.db.execute(insert(ItemSimilarity).values([
+                {"item_id": owner_id, "similar_item_id": neighbour_id, "rank": rank, "score": score}
+                for rank, (neighbour_id, score) in enumerate(neighbours, start=1)
+            ]))
+
+    async def _owners_containing(self, item_id: int) -> Set[int]:
+        result = await self.db.execute(
+            select(ItemSimilarity.item_id).where(ItemSimilarity.similar_item_id == item_id).distinct()
+        )
+        return set(result.scalars().all())
+
+    async def refresh_item(self, item_id: int, commit: bool = True) -> int:
+        """
+        Recompute an item's list and update the lists affected by its new embedding.
+
+        Raises if a vector query fails; nothing is committed in that case.
+
+        Returns:
+            Number of lists written
+        """
+        neighbours = await self._query_neighbours(item_id)
+        previous_owners = await self._owners_containing(item_id)
+        await self._replace_list(item_id, neighbours)
+        updated = 1
+
+        # Symmetric scores let the item be merged into its neighbours' lists directly.
+        # Items without a stored list are skipped; they are computed in full on first use.
+        neighbour_scores = dict(neighbours)
+        stored_lists = await self._load_lists(neighbour_scores)
+        for neighbour_id, stored in stored_lists.items():
+            score = neighbour_scores[neighbour_id]
+            previous = dict(stored).get(item_id)
+            if previous is not None and score < previous and len(stored) >= self.k:
+                # A lower score may let an unlisted item outrank it; only a query can tell
+                await self._replace_list(neighbour_id, await self._query_neighbours(neighbour_id))
+                updated += 1
+                continue
+            merged = [entry for entry in stored if entry[0] != item_id]
+            merged.append((item_id, score))
+            merged.sort(key=lambda entry: entry[1], reverse=True)
+            merged = merged[:self.k]
+            if merged != stored:
+                await self._replace_list(neighbour_id, merged)
+                updated += 1
+
+        # Lists the item may have dropped out of need a fresh query
+        for owner_id in previous_owners - set(neighbour_scores) - {item_id}:
+            await self._replace_list(owner_id, await self._query_neighbours(owner_id))
+            updated += 1
+
+        if commit:
+            await self.db.commit()
+        return updated
+
+    async def remove_item(self, item_id: int, commit: bool = True) -> int:
+        """
+        Drop a deleted item's list and recompute the lists that contained it.
+
+        Returns:
+            Number of lists recomputed
+        """
+        owners = await self._owners_containing(item_id) - {item_id}
+        await self.db.execute(
+            delete(ItemSimilarity)
+            .where((ItemSimilarity.item_id == item_id) | (ItemSimilarity.similar_item_id == item_id))
+            .execution_options(synchronize_session=False)
+        )
+        for owner_id in owners:
+            await self._replace_list(owner_id, await self._query_neighbours(owner_id))
+
+        if commit:
+            await self.db.commit()
+        return len(owners)
+
+    async def apply_embedding_changes(self, upserted_ids: List[int], deleted_ids: List[int]) -> int:
+        """
+        Update stored lists after embeddings were written or removed.
+
+        Returns:
+            Number of lists written
+        """
+        updated = 0
+        for item_id in deleted_ids:
+            updated += await self.remove_item(item_id, commit=False)
+        for item_id in upserted_ids:
+            updated += await self.refresh_item(item_id, commit=False)
+        await self.db.commit()
+        return updated
+
+
+@job_handler(SIMILAR_ITEMS_REBUILD_JOB)
+async def run_similar_items_rebuild_job(context: JobContext) -> Dict[str, int]:
+    """
+    Job handler recomputing every active item's similar-items list.
+
+    Items are processed in ID order and checkpointed, so the job can resume.
+    """
+    last_id = context.checkpoint.get("last_id", 0)
+    processed = context.checkpoint.get("processed", 0)
+    batch_size = int(context.params.get("batch_size") or 50)
+
+    async with context.session_factory() as session:
+        total = await session.scalar(select(func.count(Item.id)).where(Item.is_active == True))
+    await context.report(processed, total)
+
+    while True:
+        async with context.session_factory() as session:
+            result = await session.execute(
+                select(Item.id)
+                .where(Item.is_active == True, Item.id > last_id)
+                .order_by(Item.id)
+                .limit(batch_size)
+            )
+            page_ids = list(result.scalars().all())
+            if not page_ids:
+                break
+            service = SimilarItemsService(session)
+            for item_id in page_ids:
+                await service._replace_list(item_id, await service._query_neighbours(item_id))
+            await session.commit()
+
+        processed += len(page_ids)
+        last_id = page_ids[-1]
+        await context.report(processed, checkpoint={"last_id": last_id, "processed": processed})
+
+    return {"lists_rebuilt": processed}
@@ -0,0 +1,226 @@
+"""
+Recall and latency benchmark for vector index settings.
+
+Each setting (dimensions, quantization) is loaded into a temporary Weaviate
+collection built from the vectors already stored in the Item collection,
+truncated to the setting's dimensions, so no item is re-embedded. Queries are
+embedded once at the stored size and truncated the same way. Per setting the
+benchmark reports:
+
+- recall@k against labeled relevant items, when the query set has labels;
+- recall@k against exact search at the stored dimensions, which isolates the
+  loss from dimension reduction, quantization and the approximate index;
+- median and p95 query latency, and the raw vector memory where it is known.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import weaviate
+
+from app.services.weaviate_service import QUANTIZATION_OPTIONS, WeaviateService
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_COLLECTION_PREFIX = "ItemBenchmark"
+
+Setting = Tuple[int, str]
+
+
+class LabeledQuery:
+    """A benchmark query with the item IDs a good search should return."""
+
+    def __init__(self, query: str, relevant_ids: Optional[List[int]] = None):
+        self.query = query
+        self.relevant_ids = relevant_ids or []
+
+
+def load_labeled_queries(path: str) -> List[LabeledQuery]:
+    """
+    Load queries from a JSON file.
+
+    The file holds a list of ``{"query": "...", "relevant_ids": [1, 2]}``
+    objects; ``relevant_ids`` may be omitted to measure recall against exact
+    search only.
+    """
+    with open(path) as f:
+        entries = json.load(f)
+    return [LabeledQuery(entry["query"], [int(i) for i in entry.get("relevant_ids", [])]) for entry in entries]
+
+
+def parse_settings(spec: str) -> List[Setting]:
+    """
+    Parse settings such as ``"1536:none,512:pq,256:bq"``.
+
+    Raises:
+        ValueError: If a setting is malformed or names an unknown quantization
+    """
+    settings = []
+    for part in spec.split(","):
+        dimensions, _, quantization = part.strip().partition(":")
+        quantization = (quantization or "none").lower()
+        if quantization not in QUANTIZATION_OPTIONS:
+            raise ValueError(f"Unknown quantization '{quantization}' in '{part}'")
+        settings.append((int(dimensions), quantization))
+    return settings
+
+
+def recall_at_k(retrieved: Sequence[int], relevant: Iterable[int], k: int) -> Optional[float]:
+    """
+    Fraction of the relevant items found in the top k results.
+
+    The denominator is capped at k so a perfect top-k scores 1.0 even when more
+    than k items are relevant. Returns None when nothing is relevant.
+    """
+    relevant = set(relevant)
+    if not relevant:
+        return None
+    return len(set(retrieved[:k]) & relevant) / min(k, len(relevant))
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return float(np.mean(values)) if values else None
+
+
+class VectorIndexBenchmark:
+    """Measures recall@k and latency of index settings on the stored vectors."""
+
+    def __init__(
+        self,
+        weaviate_service: WeaviateService,
+        k: int = 10,
+        runs: int = 3,
+        pq_settle_seconds: float = 5.0
+    ):
+        self.weaviate_service = weaviate_service
+        self.k = k
+        self.runs = runs
+        self.pq_settle_seconds = pq_settle_seconds
+
+    def _export_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        collection = self.weaviate_service._client.collections.get("Item")
+        ids, vectors = [], []
+        for obj in collection.iterator(include_vector=True, return_properties=["postgres_id"]):
+            vector = obj.vector.get("default") if isinstance(obj.vector, dict) else obj.vector
+            if vector:
+                ids.append(obj.properties["postgres_id"])
+                vectors.append(vector)
+        return np.asarray(ids, dtype=np.int64), np.asarray(vectors, dtype=np.float32)
+
+    async def run(self, queries: List[LabeledQuery], settings: List[Setting]) -> List[Dict[str, Any]]:
+        """
+        Benchmark each setting.
+
+        Returns:
+            One result dict per setting, in the given order
+
+        Raises:
+            ValueError: If the Item collection is empty
+        """
+        loop = asyncio.get_event_loop()
+        executor = self.weaviate_service._executor
+        ids, matrix = await loop.run_in_executor(executor, self._export_vectors)
+        if not len(ids):
+            raise ValueError("The Item collection has no vectors to benchmark")
+        stored_dimensions = matrix.shape[1]
+
+        query_matrix = np.asarray([
+            await self.weaviate_service._create_embedding(query.query, dimensions=stored_dimensions)
+            for query in queries
+        ], dtype=np.float32)
+
+        # Exact top-k at the stored size is the reference every setting is measured against
+        scores = _normalize_rows(query_matrix) @ _normalize_rows(matrix).T
+        exact = [ids[np.argsort(-row)[:self.k]].tolist() for row in scores]
+
+        results = []
+        for dimensions, quantization in settings:
+            if dimensions > stored_dimensions:
+                results.append({
+                    "dimensions": dimensions, "quantization": quantization,
+                    "error": f"stored vectors have only {stored_dimensions} dimensions"
+                })
+                continue
+            results.append(await loop.run_in_executor(
+                executor, self._measure, ids, matrix, query_matrix, exact, queries, dimensions, quantization
+            ))
+        return results
+
+    def _measure(
+        self,
+        ids: np.ndarray,
+        matrix: np.ndarray,
+        query_matrix: np.ndarray,
+        exact: List[List[int]],
+        queries: List[LabeledQuery],
+        dimensions: int,
+        quantization: str
+    ) -> Dict[str, Any]:
+        client = self.weaviate_service._client
+        name = f"{BENCHMARK_COLLECTION_PREFIX}{dimensions}{quantization.capitalize()}"
+        if client.collections.exists(name):
+            client.collections.delete(name)
+
+        client.collections.create(
+            name=name,
+            vectorizer_config=weaviate.classes.config.Configure.Vectorizer.none(),
+            # Train PQ on the whole set so it is compressed before querying
+            vector_index_config=self.weaviate_service._vector_index_config(quantization, pq_training_limit=len(ids)),
+            properties=[weaviate.classes.config.Property(
+                name="postgres_id", data_type=weaviate.classes.config.DataType.INT
+            )]
+        )
+        try:
+            collection = client.collections.get(name)
+            vectors = _normalize_rows(matrix[:, :dimensions])
+            for start in range(0, len(ids), 500):
+                collection.data.insert_many([
+                    weaviate.classes.data.DataObject(
+                        properties={"postgres_id": int(postgres_id)}, vector=vector.tolist()
+                    )
+                    for postgres_id, vector in zip(ids[start:start + 500], vectors[start:start + 500])
+                ])
+            if quantization == "pq":
+                time.sleep(self.pq_settle_seconds)
+
+            query_vectors = _normalize_rows(query_matrix[:, :dimensions])
+            latencies: List[float] = []
+            retrieved: List[List[int]] = []
+            for run in range(self.runs):
+                for query_vector in query_vectors:
+                    started = time.perf_counter()
+                    response = collection.query.near_vector(
+                        near_vector=query_vector.tolist(),
+                        limit=self.k,
+                        return_properties=["postgres_id"]
+                    )
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if run == 0:
+                        retrieved.append([obj.properties["postgres_id"] for obj in response.objects])
+        finally:
+            client.collections.delete(name)
+
+        bytes_per_vector = {"none": dimensions * 4, "bq": dimensions / 8}.get(quantization)
+        return {
+            "dimensions": dimensions,
+            "quantization": quantization,
+            "recall_vs_exact": _mean([recall_at_k(r, e, self.k) for r, e in zip(retrieved, exact)]),
+            "recall_vs_labels": _mean([
+                recall_at_k(r, q.relevant_ids, self.k) for r, q in zip(retrieved, queries)
+            ]),
+            "latency_p50_ms": float(np.percentile(latencies, 50)),
+            "latency_p95_ms": float(np.percentile(latencies, 95)),
+            # Weaviate picks the PQ segment count, so its size is not known here
+            "vector_memory_mb": bytes_per_vector * len(ids) / 1e6 if bytes_per_vector is not None else None,
+        }
@@ -0,0 +1,286 @@
+"""
+Weaviate Reconciliation Service detecting drift between items and the Weaviate index.
+
+Active items are streamed from the database in ID order through a server-side
+cursor, and Weaviate objects are paged in postgres_id order. The two ordered
+streams are merge-joined, so memory stays constant regardless of catalogue
+size. Only the items that differ are queued in the Weaviate sync outbox:
+missing or stale objects get an upsert, objects without an active item get a
+delete.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.inventory import Inventory
+from app.models.item import Item
+from app.models.job import Job, JobStatus
+from app.models.location import Location
+from app.services.job_service import JobContext, JobService, job_handler
+from app.services.weaviate_service import get_weaviate_service, item_content_hash
+from app.services.weaviate_sync_service import enqueue_item_sync, UPSERT, DELETE
+
+logger = logging.getLogger(__name__)
+
+WEAVIATE_RECONCILE_JOB = "weaviate_reconcile"
+
+# Weaviate stores dates with second precision
+_UPDATED_AT_TOLERANCE_SECONDS = 1.0
+
+ItemState = Tuple[int, Optional[str], Optional[datetime]]
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_stale(db_state: ItemState, index_state: ItemState) -> bool:
+    """Check whether an indexed object no longer matches its database row."""
+    _, db_hash, db_updated = db_state
+    _, index_hash, index_updated = index_state
+    if db_hash != index_hash:
+        return True
+    db_updated, index_updated = _as_utc(db_updated), _as_utc(index_updated)
+    if db_updated and index_updated:
+        return (db_updated - index_updated).total_seconds() > _UPDATED_AT_TOLERANCE_SECONDS
+    return False
+
+
+class WeaviateReconciler:
+    """Merge-joins database and Weaviate item states and queues the differences."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        page_size: int = 500,
+        flush_size: int = 500,
+        weaviate_service_getter: Callable = get_weaviate_service
+    ):
+        self._session_factory = session_factory
+        self.page_size = page_size
+        self.flush_size = flush_size
+        self._get_weaviate_service = weaviate_service_getter
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.database.base import async_session
+            self._session_factory = async_session
+        return self._session_factory
+
+    async def _location_names(self, item_ids: List[int]) -> Dict[int, List[str]]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Inventory.item_id, Location.name)
+                .join(Location, Location.id == Inventory.location_id)
+                .where(Inventory.item_id.in_(item_ids))
+            )
+            names: Dict[int, List[str]] = {}
+            for item_id, name in result:
+                names.setdefault(item_id, []).append(name)
+        return names
+
+    async def stream_database_states(self) -> AsyncIterator[ItemState]:
+        """
+        Stream (id, content_hash, updated_at) for active items in ID order.
+
+        Category names come from the streamed join; location names are looked
+        up once per page of items.
+        """
+        query = (
+            select(
+                Item.id, Item.updated_at, Item.name, Item.description, Item.item_type,
+                Item.brand, Item.model, Item.tags, Item.notes,
+                Item.condition, Item.status, Item.category_id, Item.current_value,
+                Category.name.label("category_name")
+            )
+            .outerjoin(Category, Category.id == Item.category_id)
+            .where(Item.is_active == True)
+            .order_by(Item.id)
+            .execution_options(yield_per=self.page_size)
+        )
+        async with self.session_factory() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                location_names = await self._location_names([row.id for row in rows])
+                for row in rows:
+                    content_hash = item_content_hash(row, row.category_name, location_names.get(row.id))
+                    yield row.id, content_hash, row.updated_at
+
+    async def reconcile(
+        self,
+        dry_run: bool = False,
+        progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """
+        Diff the database against the index and queue the needed changes.
+
+        Args:
+            dry_run: Count drift without queueing anything
+            progress: Awaited with the running counts after every page of items
+
+        Returns:
+            Counts of checked, in-sync, missing, stale, orphaned and duplicate
+            objects plus the upserts and deletes queued
+
+        Raises:
+            RuntimeError: If Weaviate is unavailable
+        """
+        weaviate_service = await self._get_weaviate_service()
+        if not await weaviate_service.health_check():
+            raise RuntimeError("Weaviate is unavailable")
+
+        counts = {
+            "database_items": 0, "index_objects": 0, "in_sync": 0,
+            "missing": 0, "stale": 0, "orphaned": 0, "duplicates": 0,
+            "upserts_queued": 0, "deletes_queued": 0
+        }
+        pending: Dict[str, List[int]] = {UPSERT: [], DELETE: []}
+
+        async def flush(force: bool = False) -> None:
+            for operation, ids in pending.items():
+                if ids and (force or len(ids) >= self.flush_size):
+                    if not dry_run:
+                        async with self.session_factory() as session:
+                            enqueue_item_sync(session, ids, operation)
+                            await session.commit()
+                    counts["upserts_queued" if operation == UPSERT else "deletes_queued"] += len(ids)
+                    pending[operation] = []
+
+        db_states = self.stream_database_states()
+        index_states = weaviate_service.iter_item_states(page_size=self.page_size)
+
+        async def next_or_none(stream: AsyncIterator[ItemState]) -> Optional[ItemState]:
+            try:
+                return await stream.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        try:
+            db_state = await next_or_none(db_states)
+            index_state = await next_or_none(index_states)
+            last_index_id = None
+            next_report = self.page_size
+
+            while db_state is not None or index_state is not None:
+                if index_state is not None and index_state[0] == last_index_id:
+                    # Extra copies of an already matched object
+                    counts["index_objects"] += 1
+                    counts["duplicates"] += 1
+                    index_state = await next_or_none(index_states)
+                    continue
+
+                if index_state is None or (db_state is not None and db_state[0] < index_state[0]):
+                    counts["database_items"] += 1
+                    counts["missing"] += 1
+                    pending[UPSERT].append(db_state[0])
+                    db_state = await next_or_none(db_states)
+                elif db_state is None or index_state[0] < db_state[0]:
+                    counts["index_objects"] += 1
+                    counts["orphaned"] += 1
+                    pending[DELETE].append(index_state[0])
+                    last_index_id = index_state[0]
+                    index_state = await next_or_none(index_states)
+                else:
+                    counts["database_items"] += 1
+                    counts["index_objects"] += 1
+                    if is_stale(db_state, index_state):
+                        counts["stale"] += 1
+                        pending[UPSERT].append(db_state[0])
+                    else:
+                        counts["in_sync"] += 1
+                    last_index_id = index_state[0]
+                    db_state = await next_or_none(db_states)
+                    index_state = await next_or_none(index_states)
+
+                await flush()
+                if progress is not None and counts["database_items"] >= next_report:
+                    next_report += self.page_size
+                    await progress(counts)
+
+            await flush(force=True)
+        finally:
+            await db_states.aclose()
+
+        logger.info(f"Weaviate reconciliation {'(dry run) ' if dry_run else ''}finished: {counts}")
+        return counts
+
+
+@job_handler(WEAVIATE_RECONCILE_JOB)
+async def run_weaviate_reconcile_job(context: JobContext) -> Dict[str, int]:
+    """
+    Job handler reconciling the Weaviate index with the items table.
+
+    Params:
+        dry_run: Count drift without queueing changes
+        page_size: Rows per database and Weaviate page (default 500)
+    """
+    reconciler = WeaviateReconciler(
+        session_factory=context.session_factory,
+        page_size=int(context.params.get("page_size") or 500)
+    )
+
+    async def progress(counts: Dict[str, int]) -> None:
+        await context.report(
+            counts["database_items"],
+            message=f"{counts['missing'] + counts['stale']} to upsert, {counts['orphaned']} to delete"
+        )
+
+    counts = await reconciler.reconcile(dry_run=bool(context.params.get("dry_run")), progress=progress)
+    await context.report(counts["database_items"], counts["database_items"])
+    return counts
+
+
+async def start_reconciliation_job(db: AsyncSession, dry_run: bool = False) -> Job:
+    """
+    Queue a reconciliation job unless one is already queued or running.
+
+    Returns:
+        The new job, or the one already in progress
+    """
+    result = await db.execute(
+        select(Job)
+        .where(Job.job_type == WEAVIATE_RECONCILE_JOB, Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+        .order_by(Job.id)
+        .limit(1)
+    )
+    existing = result.scalar_one_or_none()
+    if existing is not None:
+        return existing
+    return await JobService(db).create_job(WEAVIATE_RECONCILE_JOB, {"dry_run": dry_run})
+
+
+async def run_reconciliation_schedule(interval_hours: Optional[float] = None) -> None:
+    """
+    Queue a reconciliation job at startup and then every interval while the app runs.
+
+    Intended to run as a background task from the application lifespan, so
+    drift left by a previous process is repaired without waiting an interval.
+    The interval comes from WEAVIATE_RECONCILE_INTERVAL_HOURS; 0 disables it.
+    """
+    from app.database.base import async_session
+
+    if interval_hours is None:
+        interval_hours = float(os.getenv("WEAVIATE_RECONCILE_INTERVAL_HOURS", "24"))
+    if interval_hours <= 0:
+        return
+
+    while True:
+        try:
+            async with async_session() as session:
+                job = await start_reconciliation_job(session)
+            logger.info(f"Scheduled Weaviate reconciliation job {job.id}")
+        except Exception as e:
+            logger.error(f"Failed to schedule Weaviate reconciliation: {e}")
+        await asyncio.sleep(interval_hours * 3600)
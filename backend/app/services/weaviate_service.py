@@ -5,25 +5,192 @@ This service manages the connection to Weaviate vector database and provides
 semantic search capabilities for inventory items using Weaviate v4 client.
 """
 
+import hashlib
 import logging
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import time
+import uuid
+from typing import List, Dict, Any, Callable, Optional, Set, Tuple, AsyncIterator, Iterable
 from datetime import datetime
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
 import weaviate
-from weaviate.exceptions import WeaviateConnectionError
+from weaviate.exceptions import WeaviateConnectionError, UnexpectedStatusCodeError
 import openai
 from openai import AsyncOpenAI
 
 from app.models.item import Item
 from app.models.location import Location
 from app.models.category import Category
+from app.performance.metrics import WEAVIATE_REQUEST_DURATION
+from app.services.embedding_providers import EMBEDDING_PROVIDERS, EmbeddingProvider, create_embedding_provider
+from app.services.openai_rate_limiter import get_openai_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
+# Namespace for deterministic Item object UUIDs; changing it orphans every stored object
+ITEM_UUID_NAMESPACE = uuid.UUID("6f1f6a2e-3c59-5b8e-9d3a-2f7d1c4e8b10")
+
+
+def item_object_uuid(postgres_id: int) -> uuid.UUID:
+    """Get the Weaviate object UUID for an item, derived from its database ID."""
+    return uuid.uuid5(ITEM_UUID_NAMESPACE, f"item:{postgres_id}")
+
+
+QUANTIZATION_OPTIONS = ("none", "pq", "bq")
+
+# Collection holding objects while migrate_vector_index rebuilds the Item collection
+MIGRATION_STAGING_COLLECTION = "ItemMigrationStaging"
+
+
+def truncate_embedding(vector: List[float], dimensions: int) -> List[float]:
+    """
+    Shorten an embedding to its first dimensions and re-normalise it.
+
+    OpenAI text-embedding-3 vectors are trained so that this equals asking the
+    API for the smaller size, which lets stored vectors be reduced without
+    re-embedding.
+    """
+    if dimensions > len(vector):
+        raise ValueError(f"Cannot truncate a {len(vector)}-dimension vector to {dimensions}")
+    head = list(vector[:dimensions])
+    norm = sum(value * value for value in head) ** 0.5
+    return [value / norm for value in head] if norm > 0 else head
+
+
+def _enum_value(value: Any) -> str:
+    return value.value if hasattr(value, "value") else (value or "")
+
+
+def item_content_hash(
+    item: Any,
+    category_name: str = "",
+    location_names: Optional[Iterable[str]] = None
+) -> str:
+    """
+    Hash the item fields that feed its embedding text and filterable properties.
+
+    Accepts an Item or any row exposing the same attributes, so reconciliation
+    can hash rows streamed from the database without loading full items. The
+    category and location names are part of the embedding text too, so
+    renaming a category or moving an item changes the hash; location order
+    does not.
+    """
+    parts = [
+        item.name or "", item.description or "", _enum_value(item.item_type),
+        item.brand or "", item.model or "", item.tags or "", item.notes or "",
+        _enum_value(item.condition), _enum_value(item.status),
+        str(item.category_id or ""),
+        str(float(item.current_value)) if item.current_value is not None else "",
+        category_name or "", "\x1e".join(sorted(location_names or []))
+    ]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _filterable_properties() -> List[Any]:
+    """
+    Properties indexed for filtering inside the vector search.
+
+    Filters on these are applied while HNSW is traversed, so selective filters
+    still return a full page instead of whatever survives post-filtering.
+    Missing ones are added to existing collections by ``_ensure_schema``.
+    """
+    config = weaviate.classes.config
+    return [
+        config.Property(
+            name="condition",
+            data_type=config.DataType.TEXT,
+            description="Item condition",
+            index_filterable=True,
+            index_searchable=False,
+            skip_vectorization=True,
+            tokenization=config.Tokenization.FIELD
+        ),
+        config.Property(
+            name="status",
+            data_type=config.DataType.TEXT,
+            description="Item status",
+            index_filterable=True,
+            index_searchable=False,
+            skip_vectorization=True,
+            tokenization=config.Tokenization.FIELD
+        ),
+        config.Property(
+            name="category_id",
+            data_type=config.DataType.INT,
+            description="PostgreSQL category ID",
+            index_filterable=True,
+            skip_vectorization=True
+        ),
+        config.Property(
+            name="brand_key",
+            data_type=config.DataType.TEXT,
+            description="Lowercased brand for filtering",
+            index_filterable=True,
+            index_searchable=False,
+            skip_vectorization=True,
+            tokenization=config.Tokenization.FIELD
+        ),
+        config.Property(
+            name="current_value",
+            data_type=config.DataType.NUMBER,
+            description="Current item value",
+            index_filterable=True,
+            index_range_filters=True,
+            skip_vectorization=True
+        ),
+    ]
+
+
+def quantization_name(quantizer: Any) -> str:
+    """
+    Name the quantization of a stored vector index config.
+
+    Uses the public config fields: only product quantization has centroids and
+    only binary quantization has a cache setting.
+    """
+    if quantizer is None:
+        return "none"
+    if getattr(quantizer, "centroids", None) is not None:
+        return "pq"
+    if getattr(quantizer, "cache", None) is not None:
+        return "bq"
+    return "other"
+
+
+def build_item_filters(filters: Optional[Dict[str, Any]]) -> Optional[Any]:
+    """
+    Build a Weaviate filter from item search filters.
+
+    Supports item_type, condition, status, category_id, brand (case-insensitive
+    substring, like the database search), min_value and max_value.
+
+    Returns:
+        Filter for ``near_vector``, or None when nothing is filtered
+    """
+    if not filters:
+        return None
+    Filter = weaviate.classes.query.Filter
+    conditions = []
+    for name in ("item_type", "condition", "status"):
+        if filters.get(name):
+            conditions.append(Filter.by_property(name).equal(_enum_value(filters[name])))
+    if filters.get("category_id"):
+        conditions.append(Filter.by_property("category_id").equal(int(filters["category_id"])))
+    if filters.get("brand"):
+        conditions.append(Filter.by_property("brand_key").like(f"*{filters['brand'].strip().lower()}*"))
+    if filters.get("min_value") is not None:
+        conditions.append(Filter.by_property("current_value").greater_or_equal(float(filters["min_value"])))
+    if filters.get("max_value") is not None:
+        conditions.append(Filter.by_property("current_value").less_or_equal(float(filters["max_value"])))
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else Filter.all_of(conditions)
+
+
 class WeaviateConfig:
     """Configuration for Weaviate connection."""
     
@@ -51,9 +218,27 @@ class WeaviateConfig:
         self.embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
         self.embedding_dimensions = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
         
+        # Embedding provider: "openai" or "hashing" (local, deterministic, for offline use)
+        self.embedding_provider = os.getenv("EMBEDDING_PROVIDER", "openai").strip().lower()
+        if self.embedding_provider not in EMBEDDING_PROVIDERS:
+            logger.warning(f"Unknown EMBEDDING_PROVIDER '{self.embedding_provider}', using 'openai'")
+            self.embedding_provider = "openai"
+        self.embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+        self.embedding_concurrency = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+        
+        # Vector index compression: "none", "pq" (product) or "bq" (binary)
+        self.quantization = os.getenv("WEAVIATE_QUANTIZATION", "none").strip().lower()
+        if self.quantization not in QUANTIZATION_OPTIONS:
+            logger.warning(f"Unknown WEAVIATE_QUANTIZATION '{self.quantization}', using 'none'")
+            self.quantization = "none"
+        self.pq_training_limit = int(os.getenv("WEAVIATE_PQ_TRAINING_LIMIT", "10000"))
+        
         # Search configuration
         self.default_limit = int(os.getenv("WEAVIATE_DEFAULT_LIMIT", "50"))
         self.default_certainty = float(os.getenv("WEAVIATE_DEFAULT_CERTAINTY", "0.7"))
+        
+        # Optional local vector index used while Weaviate is unreachable
+        self.local_index_path = os.getenv("LOCAL_VECTOR_INDEX_PATH", "")
 
 
 class WeaviateSearchResult:
@@ -75,19 +260,26 @@ class WeaviateService:
         self.config = config or WeaviateConfig()
         self._client: Optional[weaviate.WeaviateClient] = None
         self._openai_client: Optional[AsyncOpenAI] = None
+        self._embedding_provider: Optional[EmbeddingProvider] = None
+        self._local_index = None
         self._executor = ThreadPoolExecutor(max_workers=4)
+        # Set while existing objects lack newly added filterable properties;
+        # until then filters are applied by the caller instead of the index
+        self.filter_backfill_pending = False
         
         logger.info(f"Initializing Weaviate service with URL: {self.config.url}")
-        logger.info(f"Using OpenAI embedding model: {self.config.embedding_model}")
+        logger.info(f"Using {self.config.embedding_provider} embeddings ({self.config.embedding_dimensions} dimensions)")
     
     async def initialize(self) -> bool:
         """Initialize Weaviate connection and OpenAI client."""
+        self._open_local_index()
+        
         try:
             # Initialize Weaviate client
             await self._connect()
             
-            # Initialize OpenAI client
-            self._initialize_openai_client()
+            # Initialize the embedding provider
+            self._initialize_embedding_provider()
             
             # Ensure schema exists
             await self._ensure_schema()
@@ -97,8 +289,51 @@ class WeaviateService:
             
         except Exception as e:
             logger.error(f"Failed to initialize Weaviate service: {e}")
+            if self._local_index is not None and self._embedding_provider is None:
+                # The local index still needs query embeddings while Weaviate is down
+                try:
+                    self._initialize_embedding_provider()
+                except ValueError as provider_error:
+                    logger.error(f"Failed to initialize embedding provider: {provider_error}")
             return False
     
+    def _open_local_index(self) -> None:
+        """Open the local vector index if LOCAL_VECTOR_INDEX_PATH is configured."""
+        if not self.config.local_index_path or self._local_index is not None:
+            return
+        try:
+            from app.services.local_vector_index import LocalVectorIndex
+            self._local_index = LocalVectorIndex(
+                self.config.local_index_path,
+                self.config.embedding_dimensions
+            )
+            logger.info(f"Opened local vector index at {self.config.local_index_path} ({len(self._local_index)} items)")
+        except ImportError:
+            logger.warning("numpy is not installed - local vector index disabled")
+        except Exception as e:
+            logger.error(f"Failed to open local vector index: {e}")
+    
+    def _local_index_ready(self) -> bool:
+        return self._local_index is not None and len(self._local_index) > 0
+    
+    async def search_available(self) -> bool:
+        """Check if semantic search can be served, by Weaviate or the local index."""
+        return await self.health_check() or self._local_index_ready()
+    
+    def _local_search(
+        self, 
+        vector: List[float], 
+        limit: int, 
+        certainty: float = 0.0,
+        exclude_id: Optional[int] = None
+    ) -> List[WeaviateSearchResult]:
+        """Search the local vector index, returning Weaviate-shaped results."""
+        return [
+            WeaviateSearchResult(postgres_id=postgres_id, score=score, item_data={"postgres_id": postgres_id})
+            for postgres_id, score in self._local_index.search(vector, limit, exclude_id=exclude_id)
+            if score >= certainty
+        ]
+    
     async def _connect(self) -> None:
         """Establish connection to Weaviate."""
         def _create_client():
@@ -128,22 +363,56 @@ class WeaviateService:
         self._openai_client = AsyncOpenAI(api_key=self.config.openai_api_key)
         logger.info(f"Initialized OpenAI client with model: {self.config.embedding_model}")
     
-    async def _create_embedding(self, text: str) -> List[float]:
-        """Create embedding using OpenAI API."""
-        if not self._openai_client:
-            raise ValueError("OpenAI client not initialized")
+    def _initialize_embedding_provider(self) -> None:
+        """Create the configured embedding provider."""
+        if self.config.embedding_provider == "openai" and not self._openai_client:
+            self._initialize_openai_client()
+        
+        self._embedding_provider = create_embedding_provider(
+            self.config.embedding_provider,
+            self.config.embedding_dimensions,
+            openai_client=self._openai_client,
+            model=self.config.embedding_model,
+            batch_size=self.config.embedding_batch_size,
+            max_concurrency=self.config.embedding_concurrency,
+            openai_limiter=get_openai_rate_limiter()
+        )
+        logger.info(f"Initialized {self._embedding_provider.name} embedding provider")
+    
+    async def _create_embedding(self, text: str, dimensions: Optional[int] = None) -> List[float]:
+        """Create an embedding with the configured provider."""
+        if not self._embedding_provider:
+            raise ValueError("Embedding provider not initialized")
         
         try:
-            response = await self._openai_client.embeddings.create(
-                model=self.config.embedding_model,
-                input=text.strip(),
-                dimensions=self.config.embedding_dimensions
-            )
-            return response.data[0].embedding
+            return await self._embedding_provider.embed(text, dimensions)
+        except Exception as e:
+            logger.error(f"Failed to create {self._embedding_provider.name} embedding: {e}")
+            raise
+    
+    async def _create_embeddings(self, texts: List[str], dimensions: Optional[int] = None) -> List[List[float]]:
+        """Create embeddings for several texts, batched by the provider."""
+        if not self._embedding_provider:
+            raise ValueError("Embedding provider not initialized")
+        
+        try:
+            return await self._embedding_provider.embed_batch(texts, dimensions)
         except Exception as e:
-            logger.error(f"Failed to create OpenAI embedding: {e}")
+            logger.error(f"Failed to create {self._embedding_provider.name} embeddings: {e}")
             raise
     
+    async def _run_client_call(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking Weaviate client call in the executor, recording its latency."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(self._executor, func, *args)
+            outcome = "ok"
+            return result
+        finally:
+            WEAVIATE_REQUEST_DURATION.observe(time.perf_counter() - started, operation=operation, outcome=outcome)
+    
     async def health_check(self) -> bool:
         """Check if Weaviate is healthy and accessible."""
         try:
@@ -152,8 +421,7 @@ class WeaviateService:
                     return False
                 return self._client.is_ready()
             
-            loop = asyncio.get_event_loop()
-            is_ready = await loop.run_in_executor(self._executor, _check_health)
+            is_ready = await self._run_client_call("health", _check_health)
             
             if is_ready:
                 logger.debug("Weaviate health check passed")
@@ -166,6 +434,116 @@ class WeaviateService:
             logger.error(f"Weaviate health check failed: {e}")
             return False
     
+    def _vector_index_config(self, quantization: Optional[str] = None, pq_training_limit: Optional[int] = None):
+        """
+        Build the HNSW index config with the configured quantization.
+
+        Product quantization trains its codebook once the collection holds
+        ``pq_training_limit`` objects and stays uncompressed until then. Binary
+        quantization applies immediately and rescores candidates with the
+        original vectors.
+        """
+        quantization = quantization or self.config.quantization
+        Quantizer = weaviate.classes.config.Configure.VectorIndex.Quantizer
+        quantizer = None
+        if quantization == "pq":
+            quantizer = Quantizer.pq(training_limit=pq_training_limit or self.config.pq_training_limit)
+        elif quantization == "bq":
+            quantizer = Quantizer.bq()
+        return weaviate.classes.config.Configure.VectorIndex.hnsw(
+            distance_metric=weaviate.classes.config.VectorDistances.COSINE,
+            quantizer=quantizer
+        )
+    
+    def _create_item_collection(self, name: str = "Item", vector_index_config: Any = None) -> None:
+        """Create a collection with the Item schema (call from the executor)."""
+        # Embeddings are supplied by us; dimensions follow EMBEDDING_DIMENSIONS
+        self._client.collections.create(
+            name=name,
+            description="Inventory items with semantic search capabilities using OpenAI embeddings",
+            vectorizer_config=weaviate.classes.config.Configure.Vectorizer.none(),
+            vector_index_config=vector_index_config or self._vector_index_config(),
+            properties=[
+                weaviate.classes.config.Property(
+                    name="postgres_id",
+                    data_type=weaviate.classes.config.DataType.INT,
+                    description="PostgreSQL item ID for reference"
+                ),
+                weaviate.classes.config.Property(
+                    name="name",
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Item name"
+                ),
+                weaviate.classes.config.Property(
+                    name="description", 
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Item description"
+                ),
+                weaviate.classes.config.Property(
+                    name="combined_text",
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Combined searchable text for vectorization"
+                ),
+                weaviate.classes.config.Property(
+                    name="item_type",
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Item type/category"
+                ),
+                weaviate.classes.config.Property(
+                    name="category_name",
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Category name"
+                ),
+                weaviate.classes.config.Property(
+                    name="location_names",
+                    data_type=weaviate.classes.config.DataType.TEXT_ARRAY,
+                    description="Array of location names where item is stored"
+                ),
+                weaviate.classes.config.Property(
+                    name="tags",
+                    data_type=weaviate.classes.config.DataType.TEXT_ARRAY,
+                    description="Item tags for enhanced search"
+                ),
+                weaviate.classes.config.Property(
+                    name="brand",
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Item brand"
+                ),
+                weaviate.classes.config.Property(
+                    name="model",
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Item model"
+                ),
+                weaviate.classes.config.Property(
+                    name="created_at",
+                    data_type=weaviate.classes.config.DataType.DATE,
+                    description="Creation timestamp"
+                ),
+                weaviate.classes.config.Property(
+                    name="updated_at",
+                    data_type=weaviate.classes.config.DataType.DATE,
+                    description="Last update timestamp"
+                ),
+                weaviate.classes.config.Property(
+                    name="content_hash",
+                    data_type=weaviate.classes.config.DataType.TEXT,
+                    description="Hash of the item fields stored in the index, for drift detection"
+                ),
+                *_filterable_properties()
+            ]
+        )
+    
+    def _stored_dimensions(self, name: str = "Item") -> Optional[int]:
+        """Get the vector length of a stored object, or None if the collection is empty."""
+        collection = self._client.collections.get(name)
+        response = collection.query.fetch_objects(limit=1, include_vector=True, return_properties=[])
+        if not response.objects:
+            return None
+        vector = response.objects[0].vector
+        if isinstance(vector, dict):
+            vector = vector.get("default")
+        return len(vector) if vector else None
+    
     async def _ensure_schema(self) -> None:
         """Ensure the Item schema exists in Weaviate."""
         def _create_schema():
@@ -175,82 +553,35 @@ class WeaviateService:
             # Check if collection already exists
             if self._client.collections.exists("Item"):
                 logger.info("Item collection already exists in Weaviate")
+                collection = self._client.collections.get("Item")
+                collection_config = collection.config.get()
+                existing = {prop.name for prop in collection_config.properties}
+                for prop in _filterable_properties():
+                    if prop.name not in existing:
+                        # Existing objects lack the value until the sync worker backfills them
+                        collection.config.add_property(prop)
+                        self.filter_backfill_pending = True
+                        logger.info(f"Added filterable property '{prop.name}' to Item collection")
+                
+                stored = self._stored_dimensions()
+                if stored is not None and stored != self.config.embedding_dimensions:
+                    logger.error(
+                        f"Item collection holds {stored}-dimension vectors but EMBEDDING_DIMENSIONS is "
+                        f"{self.config.embedding_dimensions}; run scripts/migrate_vector_index.py"
+                    )
+                current = quantization_name(getattr(collection_config.vector_index_config, "quantizer", None))
+                if current != self.config.quantization:
+                    logger.warning(
+                        f"Item collection uses quantization '{current}' but WEAVIATE_QUANTIZATION is "
+                        f"'{self.config.quantization}'; run scripts/migrate_vector_index.py"
+                    )
                 return
             
-            # Create Item collection without vectorizer (we handle embeddings manually)
-            # Using OpenAI text-embedding-3-small dimensions (1536)
-            self._client.collections.create(
-                name="Item",
-                description="Inventory items with semantic search capabilities using OpenAI embeddings",
-                vectorizer_config=weaviate.classes.config.Configure.Vectorizer.none(),
-                vector_index_config=weaviate.classes.config.Configure.VectorIndex.hnsw(
-                    distance_metric=weaviate.classes.config.VectorDistances.COSINE
-                ),
-                properties=[
-                    weaviate.classes.config.Property(
-                        name="postgres_id",
-                        data_type=weaviate.classes.config.DataType.INT,
-                        description="PostgreSQL item ID for reference"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="name",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Item name"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="description", 
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Item description"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="combined_text",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Combined searchable text for vectorization"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="item_type",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Item type/category"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="category_name",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Category name"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="location_names",
-                        data_type=weaviate.classes.config.DataType.TEXT_ARRAY,
-                        description="Array of location names where item is stored"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="tags",
-                        data_type=weaviate.classes.config.DataType.TEXT_ARRAY,
-                        description="Item tags for enhanced search"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="brand",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Item brand"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="model",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Item model"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="created_at",
-                        data_type=weaviate.classes.config.DataType.DATE,
-                        description="Creation timestamp"
-                    ),
-                    weaviate.classes.config.Property(
-                        name="updated_at",
-                        data_type=weaviate.classes.config.DataType.DATE,
-                        description="Last update timestamp"
-                    )
-                ]
+            self._create_item_collection()
+            logger.info(
+                f"Created Item collection in Weaviate ({self.config.embedding_dimensions} dimensions, "
+                f"quantization: {self.config.quantization})"
             )
-            
-            logger.info("Created Item collection in Weaviate")
         
         loop = asyncio.get_event_loop()
         await loop.run_in_executor(self._executor, _create_schema)
@@ -287,52 +618,88 @@ class WeaviateService:
         
         return " | ".join(parts)
     
+    def _build_item_properties(
+        self, 
+        item: Item, 
+        category_name: str = "", 
+        location_names: List[str] = None
+    ) -> Dict[str, Any]:
+        """Build the stored Weaviate properties for an item."""
+        properties = {
+            "postgres_id": item.id,
+            "name": item.name or "",
+            "description": item.description or "",
+            "combined_text": self._build_combined_text(item, category_name, location_names or []),
+            "item_type": item.item_type.value if item.item_type else "",
+            "category_name": category_name,
+            "location_names": location_names or [],
+            "tags": item.tags.split(",") if item.tags else [],
+            "brand": item.brand or "",
+            "model": item.model or "",
+            "created_at": item.created_at or datetime.now(),
+            "updated_at": item.updated_at or datetime.now(),
+            "content_hash": item_content_hash(item, category_name, location_names),
+            "condition": _enum_value(item.condition),
+            "status": _enum_value(item.status),
+            "brand_key": (item.brand or "").strip().lower(),
+        }
+        # Unset numbers are left out rather than stored as null
+        if item.category_id is not None:
+            properties["category_id"] = item.category_id
+        if item.current_value is not None:
+            properties["current_value"] = float(item.current_value)
+        return properties
+    
     async def create_item_embedding(
         self, 
         item: Item, 
         category_name: str = "", 
         location_names: List[str] = None
     ) -> bool:
-        """Create or update an item embedding in Weaviate."""
+        """Create or update an item embedding in Weaviate.
+        
+        The object UUID is derived from the item ID, so repeated syncs replace
+        the existing object instead of adding duplicates.
+        """
         try:
-            if not await self.health_check():
+            weaviate_available = await self.health_check()
+            if not weaviate_available and self._local_index is None:
                 logger.warning("Weaviate not available, skipping embedding creation")
                 return False
             
-            # Build combined text for embedding
-            combined_text = self._build_combined_text(item, category_name, location_names or [])
-            
-            # Prepare item data
-            item_data = {
-                "postgres_id": item.id,
-                "name": item.name or "",
-                "description": item.description or "",
-                "combined_text": combined_text,
-                "item_type": item.item_type.value if item.item_type else "",
-                "category_name": category_name,
-                "location_names": location_names or [],
-                "tags": item.tags.split(",") if item.tags else [],
-                "brand": item.brand or "",
-                "model": item.model or "",
-                "created_at": item.created_at or datetime.now(),
-                "updated_at": item.updated_at or datetime.now()
-            }
-            
-            # Generate embedding using OpenAI API
-            embedding = await self._create_embedding(combined_text)
-            
-            def _insert_embedding():
+            item_data = self._build_item_properties(item, category_name, location_names)
+            object_uuid = item_object_uuid(item.id)
+            
+            # Changes to filterable properties alone keep the stored vector
+            embedding = None
+            if weaviate_available:
+                embedding = await self._stored_vector_if_unchanged(item.id, item_data["combined_text"])
+            if embedding is None:
+                # Generate embedding using OpenAI API
+                embedding = await self._create_embedding(item_data["combined_text"])
+            
+            if self._local_index is not None:
+                self._local_index.upsert(item.id, embedding, item_data["content_hash"], item.updated_at)
+            if not weaviate_available:
+                # Weaviate still needs this write; report failure so it is retried
+                logger.warning(f"Weaviate not available, stored item {item.id} in the local index only")
+                return False
+            
+            def _upsert_embedding():
                 if not self._client:
                     raise WeaviateConnectionError("Client not initialized")
                 
                 collection = self._client.collections.get("Item")
                 
-                # Create new embedding (simpler approach - no deduplication for now)
-                collection.data.insert(properties=item_data, vector=embedding)
-                logger.debug(f"Created Weaviate embedding for item {item.id}")
+                try:
+                    collection.data.replace(uuid=object_uuid, properties=item_data, vector=embedding)
+                except UnexpectedStatusCodeError as e:
+                    if e.status_code != 404:
+                        raise
+                    collection.data.insert(properties=item_data, uuid=object_uuid, vector=embedding)
+                logger.debug(f"Upserted Weaviate embedding for item {item.id}")
             
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(self._executor, _insert_embedding)
+            await self._run_client_call("upsert", _upsert_embedding)
             
             return True
             
@@ -340,15 +707,49 @@ class WeaviateService:
             logger.error(f"Failed to create embedding for item {item.id}: {e}")
             return False
     
+    async def _stored_vector_if_unchanged(self, item_id: int, combined_text: str) -> Optional[List[float]]:
+        """Get an item's stored vector if it was built from the same text."""
+        def _fetch():
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
+            
+            collection = self._client.collections.get("Item")
+            obj = collection.query.fetch_object_by_id(
+                item_object_uuid(item_id),
+                include_vector=True,
+                return_properties=["combined_text"]
+            )
+            if obj is None or obj.properties.get("combined_text") != combined_text:
+                return None
+            vector = obj.vector
+            if isinstance(vector, dict):
+                vector = vector.get("default")
+            return list(vector) if vector else None
+        
+        try:
+            return await self._run_client_call("fetch_object", _fetch)
+        except Exception as e:
+            logger.debug(f"Could not reuse stored vector for item {item_id}: {e}")
+            return None
+    
     async def semantic_search(
         self, 
         query: str, 
         limit: int = None,
-        certainty: float = None
+        certainty: float = None,
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[WeaviateSearchResult]:
-        """Perform semantic search for items."""
+        """Perform semantic search for items.
+        
+        Filters (see ``build_item_filters``) are applied by Weaviate during the
+        vector search. Falls back to the local vector index when Weaviate is
+        unavailable; it cannot filter, so callers must still filter its results.
+        The same applies while ``filter_backfill_pending`` is set, because
+        objects without the new properties would never match a filter.
+        """
         try:
-            if not await self.health_check():
+            weaviate_available = await self.health_check()
+            if not weaviate_available and not self._local_index_ready():
                 logger.warning("Weaviate not available for semantic search")
                 return []
             
@@ -358,6 +759,17 @@ class WeaviateService:
             # Generate query embedding using OpenAI API
             query_embedding = await self._create_embedding(query)
             
+            if not weaviate_available:
+                # Over-fetch so the caller's filtering still leaves a page
+                results = self._local_search(query_embedding, limit * 10 if filters else limit, certainty)
+                logger.info(f"Local semantic search for '{query}' returned {len(results)} results")
+                return results
+            
+            if filters and self.filter_backfill_pending:
+                # Leave filtering to the caller until every object has the properties
+                filters = None
+                limit *= 10
+            
             def _search():
                 if not self._client:
                     raise WeaviateConnectionError("Client not initialized")
@@ -371,7 +783,8 @@ class WeaviateService:
                     return_properties=[
                         "postgres_id", "name", "description", "item_type",
                         "category_name", "location_names", "brand", "model"
-                    ]
+                    ],
+                    filters=build_item_filters(filters)
                 )
                 
                 search_results = []
@@ -385,8 +798,7 @@ class WeaviateService:
                 
                 return search_results
             
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(self._executor, _search)
+            results = await self._run_client_call("search", _search)
             
             logger.info(f"Semantic search for '{query}' returned {len(results)} results")
             return results
@@ -400,63 +812,83 @@ class WeaviateService:
         item_id: int, 
         limit: int = 5
     ) -> List[WeaviateSearchResult]:
-        """Find items similar to the given item."""
+        """Find items similar to the given item.
+        
+        Falls back to the local vector index when Weaviate is unavailable.
+        Errors are logged and return no results; use ``find_similar_items``
+        to tell a failed query from an item without neighbours.
+        """
         try:
-            if not await self.health_check():
+            return await self.find_similar_items(item_id, limit)
+        except Exception as e:
+            logger.error(f"Failed to find similar items for {item_id}: {e}")
+            return []
+    
+    async def find_similar_items(self, item_id: int, limit: int = 5) -> List[WeaviateSearchResult]:
+        """Find items similar to the given item, raising when the query cannot run.
+        
+        Raises:
+            WeaviateConnectionError: If neither Weaviate nor the local index is available
+        """
+        if not await self.health_check():
+            if not self._local_index_ready():
+                raise WeaviateConnectionError("Weaviate and the local vector index are unavailable")
+            target_vector = self._local_index.get_vector(item_id)
+            if target_vector is None:
                 return []
+            return self._local_search(target_vector, limit, exclude_id=item_id)
+        
+        def _find_similar():
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
             
-            def _find_similar():
-                if not self._client:
-                    raise WeaviateConnectionError("Client not initialized")
-                
-                collection = self._client.collections.get("Item")
-                
-                # First get the target item
-                target_objects = collection.query.fetch_objects(
-                    where=weaviate.classes.query.Filter.by_property("postgres_id").equal(item_id),
-                    limit=1,
-                    include_vector=True
-                )
-                
-                if not target_objects.objects:
-                    return []
-                
-                target_vector = target_objects.objects[0].vector
-                
-                # Find similar items using the vector
-                response = collection.query.near_vector(
-                    near_vector=target_vector,
-                    limit=limit + 1,  # +1 to exclude the original item
-                    return_metadata=weaviate.classes.query.MetadataQuery(certainty=True),
-                    return_properties=[
-                        "postgres_id", "name", "description", "item_type",
-                        "category_name", "location_names", "brand", "model"
-                    ],
-                    where=weaviate.classes.query.Filter.by_property("postgres_id").not_equal(item_id)
-                )
-                
-                return [
-                    WeaviateSearchResult(
-                        postgres_id=obj.properties["postgres_id"],
-                        score=obj.metadata.certainty,
-                        item_data=obj.properties
-                    )
-                    for obj in response.objects
-                ]
+            collection = self._client.collections.get("Item")
             
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(self._executor, _find_similar)
+            # First get the target item
+            target_object = collection.query.fetch_object_by_id(
+                item_object_uuid(item_id),
+                include_vector=True
+            )
             
-            logger.info(f"Found {len(results)} similar items for item {item_id}")
-            return results
+            if target_object is None:
+                return []
             
-        except Exception as e:
-            logger.error(f"Failed to find similar items for {item_id}: {e}")
-            return []
+            target_vector = target_object.vector
+            if isinstance(target_vector, dict):
+                target_vector = target_vector.get("default")
+            
+            # Find similar items using the vector
+            response = collection.query.near_vector(
+                near_vector=target_vector,
+                limit=limit + 1,  # +1 to exclude the original item
+                return_metadata=weaviate.classes.query.MetadataQuery(certainty=True),
+                return_properties=[
+                    "postgres_id", "name", "description", "item_type",
+                    "category_name", "location_names", "brand", "model"
+                ],
+                filters=weaviate.classes.query.Filter.by_property("postgres_id").not_equal(item_id)
+            )
+            
+            return [
+                WeaviateSearchResult(
+                    postgres_id=obj.properties["postgres_id"],
+                    score=obj.metadata.certainty,
+                    item_data=obj.properties
+                )
+                for obj in response.objects
+            ]
+        
+        results = await self._run_client_call("similar", _find_similar)
+        
+        logger.info(f"Found {len(results)} similar items for item {item_id}")
+        return results
     
     async def delete_item_embedding(self, item_id: int) -> bool:
         """Delete an item's embedding from Weaviate."""
         try:
+            if self._local_index is not None:
+                self._local_index.delete(item_id)
+            
             if not await self.health_check():
                 return False
             
@@ -465,32 +897,88 @@ class WeaviateService:
                     raise WeaviateConnectionError("Client not initialized")
                 
                 collection = self._client.collections.get("Item")
-                
-                # Find and delete the item
-                objects = collection.query.fetch_objects(
-                    where=weaviate.classes.query.Filter.by_property("postgres_id").equal(item_id),
-                    limit=1
-                )
-                
-                if objects.objects:
-                    collection.data.delete_by_id(objects.objects[0].uuid)
+                deleted = collection.data.delete_by_id(item_object_uuid(item_id))
+                if deleted:
                     logger.debug(f"Deleted Weaviate embedding for item {item_id}")
-                    return True
-                
-                return False
+                return deleted
             
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(self._executor, _delete)
+            return await self._run_client_call("delete", _delete)
             
         except Exception as e:
             logger.error(f"Failed to delete embedding for item {item_id}: {e}")
             return False
     
+    async def iter_item_states(
+        self,
+        page_size: int = 500
+    ) -> AsyncIterator[Tuple[int, Optional[str], Optional[datetime]]]:
+        """
+        Stream (postgres_id, content_hash, updated_at) for every indexed item.
+
+        Objects are paged with a postgres_id keyset cursor, sorted ascending, so
+        callers can merge the stream against an ID-ordered database cursor while
+        holding only one page in memory. Pages start at the last ID seen, not
+        after it, so duplicate objects of one item split across a page boundary
+        are all returned; copies already yielded are skipped by UUID and the
+        page is widened by their number.
+        """
+        def _fetch_page(from_id: int, inclusive: bool, limit: int):
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
+            
+            collection = self._client.collections.get("Item")
+            id_filter = weaviate.classes.query.Filter.by_property("postgres_id")
+            response = collection.query.fetch_objects(
+                filters=id_filter.greater_or_equal(from_id) if inclusive else id_filter.greater_than(from_id),
+                sort=weaviate.classes.query.Sort.by_property("postgres_id", ascending=True),
+                limit=limit,
+                return_properties=["postgres_id", "content_hash", "updated_at"]
+            )
+            return [
+                (
+                    str(obj.uuid),
+                    (
+                        obj.properties["postgres_id"],
+                        obj.properties.get("content_hash"),
+                        obj.properties.get("updated_at")
+                    )
+                )
+                for obj in response.objects
+            ]
+        
+        from_id, inclusive = -1, False
+        boundary_uuids: Set[str] = set()
+        while True:
+            limit = page_size + len(boundary_uuids)
+            page = await self._run_client_call("fetch_page", _fetch_page, from_id, inclusive, limit)
+            new_objects = [(uuid, state) for uuid, state in page if uuid not in boundary_uuids]
+            for _, state in new_objects:
+                yield state
+            if len(page) < limit:
+                return
+            
+            last_id = page[-1][1][0]
+            if last_id != from_id:
+                boundary_uuids = set()
+            boundary_uuids.update(uuid for uuid, state in page if state[0] == last_id)
+            # Only seen copies came back: step past this ID rather than loop on it
+            inclusive = bool(new_objects)
+            from_id = last_id
+    
     async def batch_create_embeddings(
         self, 
-        items_data: List[Tuple[Item, str, List[str]]]
+        items_data: List[Tuple[Item, str, List[str]]],
+        written_ids: Optional[List[int]] = None
     ) -> Dict[str, int]:
-        """Batch create embeddings for multiple items."""
+        """Batch create embeddings for multiple items.
+        
+        Objects are written with one batch request keyed by the deterministic
+        item UUIDs, which overwrites existing objects instead of duplicating them.
+        
+        Args:
+            items_data: (item, category name, location names) tuples
+            written_ids: Optional list extended with the IDs of the stored items
+        """
         stats = {"success": 0, "failed": 0, "skipped": 0}
         
         if not await self.health_check():
@@ -500,24 +988,308 @@ class WeaviateService:
         
         logger.info(f"Starting batch embedding creation for {len(items_data)} items")
         
+        prepared = []
         for item, category_name, location_names in items_data:
             try:
-                success = await self.create_item_embedding(item, category_name, location_names)
-                if success:
-                    stats["success"] += 1
-                else:
-                    stats["failed"] += 1
+                prepared.append((item, self._build_item_properties(item, category_name, location_names)))
             except Exception as e:
-                logger.error(f"Failed to create embedding for item {item.id}: {e}")
+                logger.error(f"Failed to build properties for item {item.id}: {e}")
                 stats["failed"] += 1
         
+        objects = []
+        if prepared:
+            try:
+                embeddings = await self._create_embeddings(
+                    [properties["combined_text"] for _, properties in prepared]
+                )
+            except Exception as e:
+                logger.error(f"Failed to create embeddings for {len(prepared)} items: {e}")
+                stats["failed"] += len(prepared)
+                embeddings = []
+            
+            for (item, properties), embedding in zip(prepared, embeddings):
+                if self._local_index is not None:
+                    self._local_index.upsert(item.id, embedding, properties["content_hash"], item.updated_at)
+                objects.append(weaviate.classes.data.DataObject(
+                    properties=properties,
+                    uuid=item_object_uuid(item.id),
+                    vector=embedding
+                ))
+        
+        if objects:
+            def _insert_batch():
+                if not self._client:
+                    raise WeaviateConnectionError("Client not initialized")
+                
+                collection = self._client.collections.get("Item")
+                return collection.data.insert_many(objects)
+            
+            try:
+                response = await self._run_client_call("batch_insert", _insert_batch)
+                for index, error in response.errors.items():
+                    logger.error(f"Failed to store embedding for item {objects[index].properties['postgres_id']}: {error.message}")
+                stats["failed"] += len(response.errors)
+                stats["success"] += len(objects) - len(response.errors)
+                if written_ids is not None:
+                    written_ids.extend(
+                        obj.properties["postgres_id"] for index, obj in enumerate(objects)
+                        if index not in response.errors
+                    )
+            except Exception as e:
+                logger.error(f"Batch embedding insert failed: {e}")
+                stats["failed"] += len(objects)
+        
+        if self._local_index is not None:
+            self._local_index.flush()
+        
         logger.info(f"Batch embedding completed: {stats}")
         return stats
     
+    async def rebuild_local_index(self) -> int:
+        """
+        Copy every vector from Weaviate into the local index.
+        
+        Reuses the stored embeddings, so no embedding API calls are made.
+        
+        Returns:
+            Number of vectors copied
+        
+        Raises:
+            ValueError: If the local index is not configured
+        """
+        self._open_local_index()
+        if self._local_index is None:
+            raise ValueError("LOCAL_VECTOR_INDEX_PATH is not configured")
+        
+        def _copy():
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
+            
+            collection = self._client.collections.get("Item")
+            copied = 0
+            for obj in collection.iterator(
+                include_vector=True,
+                return_properties=["postgres_id", "content_hash", "updated_at"]
+            ):
+                vector = obj.vector.get("default") if isinstance(obj.vector, dict) else obj.vector
+                if not vector:
+                    continue
+                self._local_index.upsert(
+                    obj.properties["postgres_id"],
+                    vector,
+                    obj.properties.get("content_hash"),
+                    obj.properties.get("updated_at")
+                )
+                copied += 1
+            self._local_index.flush()
+            return copied
+        
+        loop = asyncio.get_event_loop()
+        copied = await loop.run_in_executor(self._executor, _copy)
+        logger.info(f"Copied {copied} vectors from Weaviate into the local index")
+        return copied
+    
+    async def migration_in_progress(self) -> bool:
+        """
+        Check whether ``migrate_vector_index`` is rebuilding the Item collection.
+        
+        The staging collection exists for the whole copy, in whichever process
+        runs the migration, so sync workers use it to hold writes back.
+        """
+        def _exists():
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
+            return self._client.collections.exists(MIGRATION_STAGING_COLLECTION)
+        
+        return await self._run_client_call("migration_check", _exists)
+    
+    async def migrate_vector_index(self, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Rebuild the Item collection with the configured dimensions and quantization.
+        
+        Stored vectors are truncated to EMBEDDING_DIMENSIONS (see
+        ``truncate_embedding``), so no embedding API calls are made. Objects are
+        first copied into a staging collection, the Item collection is recreated
+        and the objects are copied back. A staging collection that was fully
+        written survives an interrupted run, and running again resumes from it.
+        Sync workers leave the outbox queued while the staging collection
+        exists (see ``migration_in_progress``); writes made outside the outbox
+        in that window are repaired by the reconciliation run afterwards.
+        
+        Returns:
+            Objects copied and the stored and target dimensions
+        
+        Raises:
+            ValueError: If the target is larger than the stored vectors; those
+                must be re-embedded with ``recreate_item_collection``
+        """
+        target = self.config.embedding_dimensions
+        staged_marker = "staged"
+        
+        def _copy(source_name: str, target_name: str, transform) -> int:
+            source = self._client.collections.get(source_name)
+            destination = self._client.collections.get(target_name)
+            batch: List[Any] = []
+            copied = 0
+            for obj in source.iterator(include_vector=True):
+                vector = obj.vector.get("default") if isinstance(obj.vector, dict) else obj.vector
+                if not vector:
+                    continue
+                batch.append(weaviate.classes.data.DataObject(
+                    properties=obj.properties, uuid=obj.uuid, vector=transform(vector)
+                ))
+                if len(batch) >= 200:
+                    destination.data.insert_many(batch)
+                    copied += len(batch)
+                    batch = []
+            if batch:
+                destination.data.insert_many(batch)
+                copied += len(batch)
+            return copied
+        
+        def _migrate():
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
+            client = self._client
+            
+            staging_ready = (
+                client.collections.exists(MIGRATION_STAGING_COLLECTION)
+                and client.collections.get(MIGRATION_STAGING_COLLECTION).config.get().description == staged_marker
+            )
+            if staging_ready:
+                stored = self._stored_dimensions(MIGRATION_STAGING_COLLECTION)
+                logger.info("Resuming vector index migration from the staging collection")
+            else:
+                stored = self._stored_dimensions()
+                if stored is not None and target > stored:
+                    raise ValueError(
+                        f"Stored vectors have {stored} dimensions; {target} needs re-embedding"
+                    )
+                if dry_run:
+                    count = client.collections.get("Item").aggregate.over_all(total_count=True).total_count
+                    return {"objects": count, "stored_dimensions": stored, "target_dimensions": target}
+                
+                if client.collections.exists(MIGRATION_STAGING_COLLECTION):
+                    # A partial staging copy from an interrupted run
+                    client.collections.delete(MIGRATION_STAGING_COLLECTION)
+                self._create_item_collection(
+                    MIGRATION_STAGING_COLLECTION,
+                    weaviate.classes.config.Configure.VectorIndex.flat()
+                )
+                _copy("Item", MIGRATION_STAGING_COLLECTION, lambda vector: truncate_embedding(vector, target))
+                client.collections.get(MIGRATION_STAGING_COLLECTION).config.update(description=staged_marker)
+            
+            if dry_run:
+                count = client.collections.get(MIGRATION_STAGING_COLLECTION).aggregate.over_all(
+                    total_count=True
+                ).total_count
+                return {"objects": count, "stored_dimensions": stored, "target_dimensions": target}
+            
+            if client.collections.exists("Item"):
+                client.collections.delete("Item")
+            self._create_item_collection()
+            copied = _copy(MIGRATION_STAGING_COLLECTION, "Item", lambda vector: vector)
+            client.collections.delete(MIGRATION_STAGING_COLLECTION)
+            return {"objects": copied, "stored_dimensions": stored, "target_dimensions": target}
+        
+        loop = asyncio.get_event_loop()
+        stats = await loop.run_in_executor(self._executor, _migrate)
+        logger.info(f"Vector index migration {'(dry run) ' if dry_run else ''}finished: {stats}")
+        return stats
+    
+    async def recreate_item_collection(self) -> None:
+        """Drop and recreate an empty Item collection with the current configuration."""
+        def _recreate():
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
+            if self._client.collections.exists("Item"):
+                self._client.collections.delete("Item")
+            self._create_item_collection()
+        
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self._executor, _recreate)
+        logger.warning("Recreated an empty Item collection; all items must be synced again")
+    
+    async def migrate_to_deterministic_uuids(self, dry_run: bool = False) -> Dict[str, int]:
+        """
+        One-time migration removing duplicate objects and re-keying the rest.
+        
+        Objects created before UUIDs were derived from postgres_id have random
+        UUIDs, and repeated syncs left several objects per item. For each item
+        the most recently updated object is kept, stored under the item's
+        deterministic UUID, and every other copy is deleted.
+        
+        Args:
+            dry_run: Only count what would change
+            
+        Returns:
+            Counts of scanned objects, items, duplicates removed and objects re-keyed
+        """
+        def _migrate():
+            if not self._client:
+                raise WeaviateConnectionError("Client not initialized")
+            
+            collection = self._client.collections.get("Item")
+            stats = {"objects": 0, "items": 0, "duplicates_removed": 0, "rekeyed": 0}
+            
+            # Only UUIDs and timestamps are held in memory, not vectors
+            copies: Dict[int, List[Tuple[uuid.UUID, Optional[datetime]]]] = {}
+            for obj in collection.iterator(return_properties=["postgres_id", "updated_at"]):
+                stats["objects"] += 1
+                copies.setdefault(obj.properties["postgres_id"], []).append(
+                    (obj.uuid, obj.properties.get("updated_at"))
+                )
+            stats["items"] = len(copies)
+            
+            for postgres_id, objects in copies.items():
+                target = item_object_uuid(postgres_id)
+                newest_first = sorted(
+                    objects,
+                    key=lambda entry: (entry[1] is not None, entry[1] or datetime.min, entry[0] == target),
+                    reverse=True
+                )
+                keep_uuid = newest_first[0][0]
+                stale = [obj_uuid for obj_uuid, _ in newest_first[1:] if obj_uuid != target]
+                
+                if keep_uuid != target:
+                    stats["rekeyed"] += 1
+                    if not dry_run:
+                        keep = collection.query.fetch_object_by_id(keep_uuid, include_vector=True)
+                        vector = keep.vector.get("default") if isinstance(keep.vector, dict) else keep.vector
+                        try:
+                            collection.data.replace(uuid=target, properties=keep.properties, vector=vector)
+                        except UnexpectedStatusCodeError as e:
+                            if e.status_code != 404:
+                                raise
+                            collection.data.insert(properties=keep.properties, uuid=target, vector=vector)
+                    stale.append(keep_uuid)
+                
+                stats["duplicates_removed"] += len(objects) - 1
+                if not dry_run:
+                    for obj_uuid in stale:
+                        collection.data.delete_by_id(obj_uuid)
+            
+            return stats
+        
+        loop = asyncio.get_event_loop()
+        stats = await loop.run_in_executor(self._executor, _migrate)
+        logger.info(f"Weaviate UUID migration {'(dry run) ' if dry_run else ''}completed: {stats}")
+        return stats
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Get Weaviate statistics."""
         try:
             if not await self.health_check():
+                if self._local_index_ready():
+                    return {
+                        "status": "degraded",
+                        "item_count": len(self._local_index),
+                        "embedding_model": self.config.embedding_model,
+                        "embedding_dimensions": self.config.embedding_dimensions,
+                        "weaviate_url": self.config.url,
+                        "embedding_provider": self.config.embedding_provider,
+                        "local_index": self._local_index.stats()
+                    }
                 return {"status": "unavailable"}
             
             def _get_stats():
@@ -529,17 +1301,20 @@ class WeaviateService:
                 count_result = collection.aggregate.over_all(total_count=True)
                 item_count = count_result.total_count or 0
                 
-                return {
+                stats = {
                     "status": "healthy",
                     "item_count": item_count,
                     "embedding_model": self.config.embedding_model,
                     "embedding_dimensions": self.config.embedding_dimensions,
+                    "quantization": self.config.quantization,
                     "weaviate_url": self.config.url,
-                    "embedding_provider": "openai"
+                    "embedding_provider": self.config.embedding_provider
                 }
+                if self._local_index is not None:
+                    stats["local_index"] = self._local_index.stats()
+                return stats
             
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(self._executor, _get_stats)
+            return await self._run_client_call("stats", _get_stats)
             
         except Exception as e:
             logger.error(f"Failed to get Weaviate stats: {e}")
@@ -555,6 +1330,12 @@ class WeaviateService:
                 loop = asyncio.get_event_loop()
                 await loop.run_in_executor(self._executor, _close_client)
             
+            if self._local_index is not None:
+                self._local_index.flush()
+            
+            if self._embedding_provider:
+                await self._embedding_provider.close()
+            
             # Close OpenAI client if it exists
             if self._openai_client:
                 await self._openai_client.close()
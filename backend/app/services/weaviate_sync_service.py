@@ -0,0 +1,387 @@
+"""
+Weaviate Sync Service implementing a transactional outbox for item embeddings.
+
+Item writes call ``enqueue_item_sync`` before committing, so the outbox row is
+stored atomically with the change. ``WeaviateSyncWorker`` runs inside the API
+process, drains the outbox in batches, applies upserts and deletes to Weaviate
+with bounded concurrency, retries failures with exponential backoff and
+dead-letters entries that keep failing. Entries claimed by a worker that died
+(in any API process) are queued again once their claim is older than the claim
+timeout.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, update, delete, func, insert, literal, event, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.item import Item
+from app.models.inventory import Inventory
+from app.models.weaviate_sync_outbox import WeaviateSyncOutbox
+from app.services.openai_rate_limiter import PRIORITY_BACKGROUND, openai_priority
+from app.services.weaviate_service import get_weaviate_service
+
+logger = logging.getLogger(__name__)
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Session.info flag marking a transaction that queued outbox entries
+_PENDING_FLAG = "weaviate_sync_pending"
+
+
+def enqueue_item_sync(db: AsyncSession, item_ids: Iterable[int], operation: str = UPSERT) -> None:
+    """
+    Add outbox entries for items to the current transaction.
+
+    Call before committing the item change so both are stored together.
+
+    Args:
+        db: Session holding the item change
+        item_ids: IDs of the changed items
+        operation: 'upsert' or 'delete'
+    """
+    if operation not in (UPSERT, DELETE):
+        raise ValueError(f"Unknown Weaviate sync operation: {operation}")
+    for item_id in item_ids:
+        db.add(WeaviateSyncOutbox(item_id=item_id, operation=operation, status="pending", attempts=0))
+    db.sync_session.info[_PENDING_FLAG] = True
+
+
+async def enqueue_active_items_sync(db: AsyncSession, item_ids: Optional[List[int]] = None) -> int:
+    """
+    Queue upserts for active items (all of them, or the given IDs) with one INSERT ... SELECT.
+
+    Returns:
+        Number of outbox entries queued
+    """
+    query = select(Item.id, literal(UPSERT), literal("pending"), literal(0)).where(Item.is_active == True)
+    if item_ids:
+        query = query.where(Item.id.in_(item_ids))
+    result = await db.execute(
+        insert(WeaviateSyncOutbox).from_select(["item_id", "operation", "status", "attempts"], query)
+    )
+    db.sync_session.info[_PENDING_FLAG] = True
+    return result.rowcount or 0
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_worker_after_commit(session: Session) -> None:
+    """Wake the worker once queued entries are visible to other sessions."""
+    if session.info.pop(_PENDING_FLAG, False):
+        get_weaviate_sync_worker().notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_pending_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_FLAG, None)
+
+
+class WeaviateSyncWorker:
+    """In-process worker draining the Weaviate sync outbox."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: int = 50,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        backoff_seconds: float = 5.0,
+        poll_interval: float = 5.0,
+        claim_timeout_seconds: float = 600.0,
+        weaviate_service_getter: Callable = get_weaviate_service
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_interval = poll_interval
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self._get_weaviate_service = weaviate_service_getter
+        self._wake = asyncio.Event()
+        self.stats = {"processed": 0, "failed": 0, "dead_lettered": 0, "batches": 0}
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.database.base import async_session
+            self._session_factory = async_session
+        return self._session_factory
+
+    def notify(self) -> None:
+        """Wake the worker so new entries are picked up without waiting for the poll."""
+        self._wake.set()
+
+    async def run(self) -> None:
+        """Drain the outbox until cancelled."""
+        next_recovery = 0.0
+        while True:
+            if time.monotonic() >= next_recovery:
+                next_recovery = time.monotonic() + self.claim_timeout_seconds / 2
+                try:
+                    await self.recover_stale()
+                except Exception as e:
+                    logger.error(f"Failed to recover stale Weaviate sync entries: {e}")
+            try:
+                # Embedding calls from the sync queue behind interactive OpenAI requests
+                with openai_priority(PRIORITY_BACKGROUND):
+                    processed = await self.process_batch()
+            except Exception as e:
+                logger.error(f"Weaviate sync batch failed: {e}")
+                processed = 0
+
+            if processed < self.batch_size:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def recover_stale(self) -> int:
+        """
+        Return entries stuck in 'processing' to the queue.
+
+        Only claims older than ``claim_timeout_seconds`` are taken back, so
+        batches another live worker is still applying are left alone.
+        """
+        expired = datetime.now(timezone.utc) - timedelta(seconds=self.claim_timeout_seconds)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(WeaviateSyncOutbox)
+                .where(
+                    WeaviateSyncOutbox.status == "processing",
+                    or_(WeaviateSyncOutbox.claimed_at.is_(None), WeaviateSyncOutbox.claimed_at < expired)
+                )
+                .values(status="pending", claimed_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        recovered = result.rowcount or 0
+        if recovered:
+            logger.info(f"Re-queued {recovered} Weaviate sync entries with expired claims")
+        return recovered
+
+    async def process_batch(self) -> int:
+        """
+        Claim and apply one batch of outbox entries.
+
+        Returns:
+            Number of outbox entries handled (applied, retried or dead-lettered)
+        """
+        weaviate_service = await self._get_weaviate_service()
+        if not await weaviate_service.health_check():
+            logger.debug("Weaviate unavailable, leaving sync outbox queued")
+            return 0
+        if await weaviate_service.migration_in_progress():
+            # Writes to the Item collection would be lost when it is recreated
+            logger.debug("Vector index migration in progress, leaving sync outbox queued")
+            return 0
+
+        entries = await self._claim_batch()
+        if not entries:
+            if weaviate_service.filter_backfill_pending:
+                await self._finish_filter_backfill(weaviate_service)
+            return 0
+        self.stats["batches"] += 1
+
+        # Several changes to one item collapse into its latest operation
+        latest: Dict[int, WeaviateSyncOutbox] = {}
+        for entry in entries:
+            latest[entry.item_id] = entry
+
+        async with self.session_factory() as session:
+            upsert_ids = [item_id for item_id, entry in latest.items() if entry.operation == UPSERT]
+            items: Dict[int, Item] = {}
+            if upsert_ids:
+                result = await session.execute(
+                    select(Item).options(
+                        selectinload(Item.category),
+                        selectinload(Item.inventory_entries).selectinload(Inventory.location)
+                    ).where(Item.id.in_(upsert_ids))
+                )
+                items = {item.id: item for item in result.scalars().all()}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def apply(item_id: int, entry: WeaviateSyncOutbox) -> Optional[str]:
+            async with semaphore:
+                try:
+                    item = items.get(item_id)
+                    if entry.operation == UPSERT and item is not None and item.is_active:
+                        category_name = item.category.name if item.category else ""
+                        location_names = [
+                            inv.location.name for inv in (item.inventory_entries or []) if inv.location
+                        ]
+                        if not await weaviate_service.create_item_embedding(item, category_name, location_names):
+                            return "Embedding creation failed"
+                    else:
+                        # Deleted or deactivated items are removed from the index
+                        await weaviate_service.delete_item_embedding(item_id)
+                    return None
+                except Exception as e:
+                    return str(e) or e.__class__.__name__
+
+        errors = await asyncio.gather(*(apply(item_id, entry) for item_id, entry in latest.items()))
+        outcome = dict(zip(latest.keys(), errors))
+        await self._record_outcomes(entries, outcome)
+
+        applied = [item_id for item_id in latest if outcome[item_id] is None]
+        if applied:
+            upserted = [item_id for item_id in applied if item_id in items and items[item_id].is_active
+                        and latest[item_id].operation == UPSERT]
+            deleted = [item_id for item_id in applied if item_id not in upserted]
+            await self._refresh_similar_items(upserted, deleted, weaviate_service)
+        return len(entries)
+
+    async def start_filter_backfill(self) -> int:
+        """
+        Queue every active item when the index gained filterable properties.
+
+        Search keeps filtering in SQL until the outbox drains. After a restart
+        the properties already exist, so unfinished entries left by an earlier
+        backfill keep that mode on as well.
+
+        Returns:
+            Number of items queued
+        """
+        weaviate_service = await self._get_weaviate_service()
+        if not weaviate_service.filter_backfill_pending:
+            if await self._count_unfinished():
+                weaviate_service.filter_backfill_pending = True
+            return 0
+
+        async with self.session_factory() as session:
+            queued = await enqueue_active_items_sync(session)
+            await session.commit()
+        logger.info(f"Queued {queued} items to backfill new filterable properties")
+        return queued
+
+    async def _count_unfinished(self) -> int:
+        async with self.session_factory() as session:
+            return await session.scalar(
+                select(func.count())
+                .select_from(WeaviateSyncOutbox)
+                .where(WeaviateSyncOutbox.status.in_(["pending", "processing"]))
+            )
+
+    async def _finish_filter_backfill(self, weaviate_service) -> None:
+        # Entries waiting out a retry backoff still count as unfinished
+        if not await self._count_unfinished():
+            weaviate_service.filter_backfill_pending = False
+            logger.info("Filterable property backfill finished; filters run inside the vector search again")
+
+    async def _refresh_similar_items(self, upserted: List[int], deleted: List[int], weaviate_service) -> None:
+        """Update precomputed similar-items lists for the embeddings just written."""
+        from app.services.similar_items_service import SimilarItemsService
+
+        try:
+            async with self.session_factory() as session:
+                await SimilarItemsService(session, weaviate_service).apply_embedding_changes(upserted, deleted)
+        except Exception as e:
+            # Lists are refreshed again on the next change or rebuild; never fail the sync
+            logger.warning(f"Failed to refresh similar items for {len(upserted) + len(deleted)} items: {e}")
+
+    async def _claim_batch(self) -> List[WeaviateSyncOutbox]:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(WeaviateSyncOutbox)
+                .where(
+                    WeaviateSyncOutbox.status == "pending",
+                    WeaviateSyncOutbox.available_at <= now
+                )
+                .order_by(WeaviateSyncOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            entries = list(result.scalars().all())
+            if entries:
+                await session.execute(
+                    update(WeaviateSyncOutbox)
+                    .where(WeaviateSyncOutbox.id.in_([entry.id for entry in entries]))
+                    .values(status="processing", claimed_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+            return entries
+
+    async def _record_outcomes(self, entries: List[WeaviateSyncOutbox], outcome: Dict[int, Optional[str]]) -> None:
+        now = datetime.now(timezone.utc)
+        done_ids = [entry.id for entry in entries if outcome[entry.item_id] is None]
+
+        async with self.session_factory() as session:
+            if done_ids:
+                await session.execute(
+                    delete(WeaviateSyncOutbox)
+                    .where(WeaviateSyncOutbox.id.in_(done_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                self.stats["processed"] += len(done_ids)
+
+            for entry in entries:
+                error = outcome[entry.item_id]
+                if error is None:
+                    continue
+                attempts = entry.attempts + 1
+                if attempts >= self.max_attempts:
+                    values: Dict[str, Any] = {"status": "dead"}
+                    self.stats["dead_lettered"] += 1
+                    logger.error(f"Weaviate sync for item {entry.item_id} dead-lettered after {attempts} attempts: {error}")
+                else:
+                    delay = self.backoff_seconds * (2 ** (attempts - 1))
+                    values = {"status": "pending", "claimed_at": None, "available_at": now + timedelta(seconds=delay)}
+                    self.stats["failed"] += 1
+                    logger.warning(f"Weaviate sync for item {entry.item_id} failed (attempt {attempts}): {error}")
+                await session.execute(
+                    update(WeaviateSyncOutbox)
+                    .where(WeaviateSyncOutbox.id == entry.id)
+                    .values(attempts=attempts, last_error=error[:1000], **values)
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Get outbox depth by status plus worker counters."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(WeaviateSyncOutbox.status, func.count()).group_by(WeaviateSyncOutbox.status)
+            )
+            by_status = {status: count for status, count in result}
+        return {"queue": by_status, "worker": dict(self.stats)}
+
+    async def retry_dead_letters(self) -> int:
+        """Put dead-lettered entries back in the queue with a fresh attempt budget."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(WeaviateSyncOutbox)
+                .where(WeaviateSyncOutbox.status == "dead")
+                .values(status="pending", attempts=0, available_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        self.notify()
+        return result.rowcount or 0
+
+
+# Global worker instance
+_weaviate_sync_worker: Optional[WeaviateSyncWorker] = None
+
+
+def get_weaviate_sync_worker() -> WeaviateSyncWorker:
+    """Get the process-wide Weaviate sync worker."""
+    global _weaviate_sync_worker
+    if _weaviate_sync_worker is None:
+        _weaviate_sync_worker = WeaviateSyncWorker(
+            batch_size=int(os.getenv("WEAVIATE_SYNC_BATCH_SIZE", "50")),
+            concurrency=int(os.getenv("WEAVIATE_SYNC_CONCURRENCY", "4")),
+            max_attempts=int(os.getenv("WEAVIATE_SYNC_MAX_ATTEMPTS", "5")),
+            claim_timeout_seconds=float(os.getenv("WEAVIATE_SYNC_CLAIM_TIMEOUT_SECONDS", "600"))
+        )
+    return _weaviate_sync_worker
@@ -0,0 +1,8 @@
+"""
+Offline benchmarks for the inventory backend.
+
+The search evaluation harness (``python -m benchmarks.search_eval``) runs the
+semantic and hybrid search endpoints against a synthetic inventory with a
+deterministic local embedding provider, so it needs no network access,
+Weaviate instance or API key.
+"""
@@ -0,0 +1,256 @@
+"""
+Synthetic inventory corpus and labeled queries for search evaluation.
+
+Items are generated from product concepts, each with several names, brands
+and description phrasings, so items of one concept share meaning without
+sharing exact text. Queries are labeled with the concept they target: every
+active item of that concept (and, for filtered queries, matching the filters)
+is relevant. Generation is seeded, so a given seed always yields the same
+corpus and labels.
+"""
+
+import random
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from app.models.item import ItemType, ItemCondition
+
+LOCATIONS = ["Garage", "Kitchen", "Basement", "Office", "Bedroom Closet", "Attic", "Living Room", "Shed"]
+
+# Product concepts; every item generated from a concept is relevant to its queries
+CONCEPTS: List[Dict[str, Any]] = [
+    {"key": "drill", "type": ItemType.TOOLS, "names": ["Cordless Drill", "Hammer Drill", "Drill Driver"],
+     "brands": ["DeWalt", "Makita", "Bosch"],
+     "descriptions": ["Battery powered drill for driving screws and boring holes",
+                      "18V drill with two batteries and charger", "Compact drill driver with keyless chuck"],
+     "tags": "power tool,drill", "value": (60, 250),
+     "queries": ["cordless drill", "battery drill for screws", "drill driver"]},
+    {"key": "saw", "type": ItemType.TOOLS, "names": ["Circular Saw", "Jigsaw", "Miter Saw"],
+     "brands": ["DeWalt", "Ryobi", "Skil"],
+     "descriptions": ["Saw for cutting plywood and lumber", "Corded saw with laser guide",
+                      "Power saw for straight and bevel cuts in wood"],
+     "tags": "power tool,saw,woodworking", "value": (50, 400),
+     "queries": ["circular saw", "saw for cutting wood", "miter saw"]},
+    {"key": "hand_tools", "type": ItemType.TOOLS, "names": ["Claw Hammer", "Screwdriver Set", "Adjustable Wrench"],
+     "brands": ["Stanley", "Craftsman", "Klein"],
+     "descriptions": ["Steel hand tool for household repairs", "Hand tool set in a plastic case",
+                      "Basic repair tool with rubber grip"],
+     "tags": "hand tool,repair", "value": (10, 60),
+     "queries": ["hammer", "screwdriver set", "hand tools for repairs"]},
+    {"key": "laptop", "type": ItemType.ELECTRONICS, "names": ["Laptop", "Notebook Computer", "Ultrabook"],
+     "brands": ["Dell", "Lenovo", "Apple"],
+     "descriptions": ["Portable computer with 16GB RAM and SSD", "14 inch laptop for work and school",
+                      "Lightweight notebook computer with long battery life"],
+     "tags": "computer,laptop", "value": (400, 2200),
+     "queries": ["laptop", "portable computer for work", "notebook computer"]},
+    {"key": "headphones", "type": ItemType.ELECTRONICS,
+     "names": ["Noise Cancelling Headphones", "Wireless Earbuds", "Studio Headphones"],
+     "brands": ["Sony", "Bose", "Sennheiser"],
+     "descriptions": ["Bluetooth headphones with active noise cancelling", "Wireless earbuds with charging case",
+                      "Over-ear headphones for music and calls"],
+     "tags": "audio,headphones", "value": (50, 400),
+     "queries": ["noise cancelling headphones", "wireless earbuds", "headphones for music"]},
+    {"key": "camera", "type": ItemType.ELECTRONICS, "names": ["Mirrorless Camera", "DSLR Camera", "Action Camera"],
+     "brands": ["Canon", "Nikon", "GoPro"],
+     "descriptions": ["Digital camera with interchangeable lens", "Camera body with 24MP sensor and kit lens",
+                      "Waterproof camera for recording video outdoors"],
+     "tags": "camera,photography", "value": (200, 1800),
+     "queries": ["digital camera", "camera with lens", "action camera for video"]},
+    {"key": "router", "type": ItemType.ELECTRONICS, "names": ["WiFi Router", "Mesh Network Node", "Network Switch"],
+     "brands": ["Netgear", "TP-Link", "Ubiquiti"],
+     "descriptions": ["Wireless router for home internet", "Mesh WiFi node for whole home coverage",
+                      "Gigabit ethernet switch with 8 ports"],
+     "tags": "networking,wifi", "value": (30, 300),
+     "queries": ["wifi router", "home network equipment", "ethernet switch"]},
+    {"key": "sofa", "type": ItemType.FURNITURE, "names": ["Sofa", "Sectional Couch", "Loveseat"],
+     "brands": ["IKEA", "West Elm", "Ashley"],
+     "descriptions": ["Three seat sofa with fabric upholstery", "L-shaped sectional couch with chaise",
+                      "Small two seat loveseat for the living room"],
+     "tags": "seating,living room", "value": (300, 2500),
+     "queries": ["sofa", "couch for living room", "sectional couch"]},
+    {"key": "desk", "type": ItemType.FURNITURE, "names": ["Standing Desk", "Writing Desk", "Computer Desk"],
+     "brands": ["IKEA", "Uplift", "Fully"],
+     "descriptions": ["Height adjustable desk with electric motor", "Wooden desk with two drawers",
+                      "Desk for home office with cable tray"],
+     "tags": "office,desk", "value": (120, 900),
+     "queries": ["standing desk", "desk for home office", "adjustable desk"]},
+    {"key": "bookshelf", "type": ItemType.FURNITURE, "names": ["Bookshelf", "Bookcase", "Storage Shelf Unit"],
+     "brands": ["IKEA", "Sauder", "Wayfair"],
+     "descriptions": ["Five shelf bookcase in white finish", "Wooden shelving unit for books and decor",
+                      "Tall bookshelf with adjustable shelves"],
+     "tags": "shelving,books", "value": (40, 300),
+     "queries": ["bookshelf", "shelves for books", "bookcase"]},
+    {"key": "jacket", "type": ItemType.CLOTHING, "names": ["Winter Jacket", "Rain Jacket", "Down Parka"],
+     "brands": ["Patagonia", "North Face", "Columbia"],
+     "descriptions": ["Insulated jacket for cold weather", "Waterproof shell with hood",
+                      "Warm down parka for snow"],
+     "tags": "outerwear,winter", "value": (80, 450),
+     "queries": ["winter jacket", "waterproof rain jacket", "warm coat for snow"]},
+    {"key": "boots", "type": ItemType.CLOTHING, "names": ["Hiking Boots", "Snow Boots", "Work Boots"],
+     "brands": ["Merrell", "Salomon", "Timberland"],
+     "descriptions": ["Waterproof leather boots with ankle support", "Insulated boots for snow and ice",
+                      "Steel toe boots for job sites"],
+     "tags": "footwear,boots", "value": (60, 250),
+     "queries": ["hiking boots", "boots for snow", "work boots"]},
+    {"key": "cookbook", "type": ItemType.BOOKS, "names": ["Cookbook", "Baking Book", "Recipe Collection"],
+     "brands": ["Penguin", "Clarkson Potter", "Ten Speed"],
+     "descriptions": ["Hardcover cookbook with weeknight recipes", "Baking book for bread and pastry",
+                      "Collection of family dinner recipes"],
+     "tags": "cooking,recipes", "value": (15, 45),
+     "queries": ["cookbook", "recipe book", "baking book"]},
+    {"key": "novel", "type": ItemType.BOOKS, "names": ["Science Fiction Novel", "Mystery Novel", "Fantasy Paperback"],
+     "brands": ["Tor", "Vintage", "Orbit"],
+     "descriptions": ["Paperback novel set on a distant planet", "Detective mystery novel, first edition",
+                      "Fantasy paperback, book one of a trilogy"],
+     "tags": "fiction,novel", "value": (8, 40),
+     "queries": ["science fiction novel", "mystery book", "fantasy paperback"]},
+    {"key": "passport", "type": ItemType.DOCUMENTS, "names": ["Passport", "Birth Certificate", "Social Security Card"],
+     "brands": ["Government"],
+     "descriptions": ["Identity document kept in the fire safe", "Original certificate in a document folder",
+                      "Official identity card, keep secure"],
+     "tags": "identity,important", "value": (0, 1),
+     "queries": ["passport", "identity documents", "birth certificate"]},
+    {"key": "tax_records", "type": ItemType.DOCUMENTS, "names": ["Tax Returns", "Insurance Policy", "Property Deed"],
+     "brands": ["Records"],
+     "descriptions": ["Filed tax returns for the last seven years", "Home insurance policy documents",
+                      "Signed deed and closing papers for the house"],
+     "tags": "financial,records", "value": (0, 1),
+     "queries": ["tax returns", "insurance papers", "house deed"]},
+    {"key": "cookware", "type": ItemType.KITCHEN, "names": ["Cast Iron Skillet", "Dutch Oven", "Stock Pot"],
+     "brands": ["Lodge", "Le Creuset", "All-Clad"],
+     "descriptions": ["Pre-seasoned cast iron pan for frying", "Enameled pot for braising and stews",
+                      "Large stainless pot for soup and pasta"],
+     "tags": "cookware,pots", "value": (25, 400),
+     "queries": ["cast iron skillet", "pot for soup", "dutch oven"]},
+    {"key": "mixer", "type": ItemType.KITCHEN, "names": ["Stand Mixer", "Blender", "Food Processor"],
+     "brands": ["KitchenAid", "Vitamix", "Cuisinart"],
+     "descriptions": ["Countertop mixer with dough hook and whisk", "High speed blender for smoothies",
+                      "Food processor with slicing discs"],
+     "tags": "appliance,kitchen", "value": (60, 600),
+     "queries": ["stand mixer", "blender for smoothies", "kitchen appliance for dough"]},
+    {"key": "lamp", "type": ItemType.DECOR, "names": ["Floor Lamp", "Table Lamp", "Desk Lamp"],
+     "brands": ["IKEA", "Target", "CB2"],
+     "descriptions": ["Lamp with linen shade and brass base", "Dimmable LED lamp", "Arc lamp for reading corner"],
+     "tags": "lighting,lamp", "value": (20, 250),
+     "queries": ["floor lamp", "reading light", "table lamp"]},
+    {"key": "artwork", "type": ItemType.DECOR, "names": ["Framed Print", "Canvas Painting", "Wall Mirror"],
+     "brands": ["Society6", "Etsy", "Pottery Barn"],
+     "descriptions": ["Framed art print for the hallway", "Original acrylic painting on canvas",
+                      "Round mirror with wooden frame"],
+     "tags": "wall art,decor", "value": (30, 800),
+     "queries": ["framed print", "painting for wall", "wall mirror"]},
+    {"key": "coins", "type": ItemType.COLLECTIBLES, "names": ["Silver Coin Set", "Stamp Album", "Baseball Card Lot"],
+     "brands": ["US Mint", "Topps", "Collector"],
+     "descriptions": ["Proof silver coins in display case", "Album of vintage postage stamps",
+                      "Graded baseball cards in sleeves"],
+     "tags": "collectible,vintage", "value": (50, 3000),
+     "queries": ["silver coins", "stamp collection", "baseball cards"]},
+    {"key": "camping", "type": ItemType.HOBBY, "names": ["Camping Tent", "Sleeping Bag", "Backpacking Stove"],
+     "brands": ["REI", "Coleman", "MSR"],
+     "descriptions": ["Two person tent for backpacking", "Sleeping bag rated to 20 degrees",
+                      "Compact camp stove with fuel canister"],
+     "tags": "camping,outdoors", "value": (40, 450),
+     "queries": ["camping tent", "sleeping bag", "gear for camping trip"]},
+    {"key": "guitar", "type": ItemType.HOBBY, "names": ["Acoustic Guitar", "Electric Guitar", "Ukulele"],
+     "brands": ["Fender", "Yamaha", "Taylor"],
+     "descriptions": ["Six string guitar with gig bag", "Electric guitar with practice amplifier",
+                      "Concert ukulele with tuner"],
+     "tags": "music,instrument", "value": (80, 1500),
+     "queries": ["acoustic guitar", "musical instrument", "electric guitar with amp"]},
+    {"key": "decorations", "type": ItemType.SEASONAL,
+     "names": ["Christmas Lights", "Halloween Decorations", "Artificial Christmas Tree"],
+     "brands": ["GE", "Holiday Time", "Balsam Hill"],
+     "descriptions": ["Strands of LED holiday lights", "Box of spooky props and costumes",
+                      "Pre-lit seven foot artificial tree"],
+     "tags": "holiday,seasonal", "value": (15, 400),
+     "queries": ["christmas lights", "holiday decorations", "halloween props"]},
+    {"key": "bins", "type": ItemType.STORAGE, "names": ["Storage Bins", "Tool Chest", "Vacuum Storage Bags"],
+     "brands": ["Sterilite", "Husky", "Rubbermaid"],
+     "descriptions": ["Stackable plastic bins with lids", "Rolling tool chest with drawers",
+                      "Space saving bags for seasonal clothes"],
+     "tags": "storage,organization", "value": (10, 350),
+     "queries": ["storage bins", "tool chest", "bags for storing clothes"]},
+]
+
+CONDITIONS = [ItemCondition.EXCELLENT, ItemCondition.GOOD, ItemCondition.FAIR, ItemCondition.POOR]
+
+
+class SyntheticItem:
+    """A generated item and the concept it belongs to."""
+
+    def __init__(self, concept: str, fields: Dict[str, Any], location: str):
+        self.concept = concept
+        self.fields = fields
+        self.location = location
+        self.id: Optional[int] = None
+
+
+class LabeledSearchQuery:
+    """A query with its filters and the synthetic items that should be found."""
+
+    def __init__(self, text: str, concept: str, filters: Optional[Dict[str, Any]] = None):
+        self.text = text
+        self.concept = concept
+        self.filters = filters or {}
+        self.relevant: List[SyntheticItem] = []
+
+    @property
+    def relevant_ids(self) -> List[int]:
+        return [item.id for item in self.relevant]
+
+
+def generate_items(seed: int = 7, items_per_concept: int = 6) -> List[SyntheticItem]:
+    """Generate a deterministic set of items across all concepts."""
+    rng = random.Random(seed)
+    items = []
+    for concept in CONCEPTS:
+        for i in range(items_per_concept):
+            brand = concept["brands"][i % len(concept["brands"])]
+            name = concept["names"][rng.randrange(len(concept["names"]))]
+            low, high = concept["value"]
+            items.append(SyntheticItem(
+                concept["key"],
+                {
+                    "name": f"{brand} {name}",
+                    "description": concept["descriptions"][rng.randrange(len(concept["descriptions"]))],
+                    "item_type": concept["type"],
+                    "condition": CONDITIONS[rng.randrange(len(CONDITIONS))],
+                    "brand": brand,
+                    "model": f"{brand[:3].upper()}-{rng.randint(100, 999)}",
+                    "tags": concept["tags"],
+                    "current_value": Decimal(rng.randint(low, high)),
+                },
+                LOCATIONS[rng.randrange(len(LOCATIONS))]
+            ))
+    return items
+
+
+def generate_queries(items: List[SyntheticItem], filtered: bool = False) -> List[LabeledSearchQuery]:
+    """
+    Build labeled queries for the generated items.
+
+    Args:
+        items: Items from ``generate_items``
+        filtered: Add hybrid filters (item type and a brand present in the concept)
+    """
+    by_concept: Dict[str, List[SyntheticItem]] = {}
+    for item in items:
+        by_concept.setdefault(item.concept, []).append(item)
+
+    queries = []
+    for concept in CONCEPTS:
+        members = by_concept.get(concept["key"], [])
+        for i, text in enumerate(concept["queries"]):
+            filters: Dict[str, Any] = {}
+            if filtered:
+                filters["item_type"] = concept["type"].value
+                if len(concept["brands"]) > 1:
+                    filters["brand"] = concept["brands"][i % len(concept["brands"])]
+            query = LabeledSearchQuery(text, concept["key"], filters)
+            query.relevant = [
+                item for item in members
+                if not filters.get("brand") or item.fields["brand"] == filters["brand"]
+            ]
+            if query.relevant:
+                queries.append(query)
+    return queries
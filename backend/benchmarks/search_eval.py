@@ -0,0 +1,222 @@
+"""
+Offline relevance and latency evaluation for the search endpoints.
+
+Usage:
+    python -m benchmarks.search_eval [--items-per-concept 6] [-k 10] [--certainty 0.6] [--json]
+
+The harness loads a synthetic inventory (``benchmarks.corpus``) into an
+in-memory SQLite database and embeds each item's combined text, built by
+``WeaviateService._build_combined_text``, with the deterministic hashing
+embedding provider (``EMBEDDING_PROVIDER=hashing``) into a temporary local
+vector index. Every labeled query is then sent
+in-process through ``POST /api/v1/search/semantic`` and, with filters, through
+``POST /api/v1/search/hybrid``. Weaviate is never contacted: the service
+answers from the local vector index, the path it uses during Weaviate outages.
+
+Reported per endpoint: recall@k, MRR, zero-result rate and p50/p95 latency.
+Run it before and after a change to the text format, thresholds or hybrid
+logic and compare.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Sequence
+
+# Use the in-memory SQLite database and keep SQL logging off
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+import httpx
+import numpy as np
+
+from app.database.base import async_session, create_tables, drop_tables
+from app.main import app
+from app.models import Category, Inventory, Item, Location, LocationType
+from app.services.vector_index_benchmark import recall_at_k
+from app.services.weaviate_service import WeaviateConfig, WeaviateService, get_weaviate_service
+from benchmarks.corpus import LOCATIONS, LabeledSearchQuery, SyntheticItem, generate_items, generate_queries
+
+
+def reciprocal_rank(retrieved: Sequence[int], relevant: Sequence[int]) -> float:
+    """1/rank of the first relevant result, or 0 if none was returned."""
+    relevant = set(relevant)
+    for rank, item_id in enumerate(retrieved, start=1):
+        if item_id in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+async def _load_corpus(items: List[SyntheticItem], service: WeaviateService) -> None:
+    """Insert the synthetic items and index their embeddings."""
+    texts = []
+    async with async_session() as session:
+        locations = {name: Location(name=name, location_type=LocationType.ROOM) for name in LOCATIONS}
+        categories = {
+            item_type: Category(name=item_type.value.title())
+            for item_type in {item.fields["item_type"] for item in items}
+        }
+        session.add_all([*locations.values(), *categories.values()])
+        await session.flush()
+
+        for synthetic in items:
+            category = categories[synthetic.fields["item_type"]]
+            item = Item(category_id=category.id, **synthetic.fields)
+            session.add(item)
+            await session.flush()
+            synthetic.id = item.id
+            session.add(Inventory(item_id=item.id, location_id=locations[synthetic.location].id, quantity=1))
+
+            texts.append(service._build_combined_text(item, category.name, [synthetic.location]))
+        await session.commit()
+
+    for synthetic, embedding in zip(items, await service._create_embeddings(texts)):
+        service._local_index.upsert(synthetic.id, embedding)
+
+
+def _build_service(dimensions: int, index_path: str) -> WeaviateService:
+    """A search service with no Weaviate connection, answering from a local index."""
+    config = WeaviateConfig()
+    config.embedding_provider = "hashing"
+    config.embedding_dimensions = dimensions
+    config.local_index_path = index_path
+    service = WeaviateService(config)
+    service._initialize_embedding_provider()
+    service._open_local_index()
+    if service._local_index is None:
+        raise RuntimeError("The local vector index could not be opened (is numpy installed?)")
+    return service
+
+
+async def _evaluate_endpoint(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    queries: List[LabeledSearchQuery],
+    k: int,
+    certainty: float,
+    runs: int
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    recalls, reciprocal_ranks, empty = [], [], 0
+
+    for run in range(runs):
+        for query in queries:
+            payload: Dict[str, Any] = {"query": query.text, "limit": k, "certainty": certainty}
+            if endpoint == "hybrid" and query.filters:
+                payload["filters"] = query.filters
+
+            started = time.perf_counter()
+            response = await client.post(f"/api/v1/search/{endpoint}", json=payload)
+            latencies.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+
+            if run == 0:
+                retrieved = [result["item"]["id"] for result in response.json()["results"]]
+                recalls.append(recall_at_k(retrieved, query.relevant_ids, k))
+                reciprocal_ranks.append(reciprocal_rank(retrieved, query.relevant_ids))
+                empty += not retrieved
+
+    return {
+        "endpoint": endpoint,
+        "queries": len(queries),
+        "recall_at_k": float(np.mean(recalls)),
+        "mrr": float(np.mean(reciprocal_ranks)),
+        "zero_result_rate": empty / len(queries),
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+async def run_evaluation(
+    seed: int = 7,
+    items_per_concept: int = 6,
+    k: int = 10,
+    certainty: float = 0.6,
+    runs: int = 3,
+    dimensions: int = 256
+) -> Dict[str, Any]:
+    """
+    Build the corpus, run every labeled query through both endpoints and score them.
+
+    Returns:
+        Corpus sizes, the settings used and one report per endpoint
+    """
+    items = generate_items(seed, items_per_concept)
+
+    await create_tables()
+    try:
+        with tempfile.TemporaryDirectory() as index_path:
+            service = _build_service(dimensions, index_path)
+            await _load_corpus(items, service)
+
+            async def override_weaviate_service() -> WeaviateService:
+                return service
+
+            app.dependency_overrides[get_weaviate_service] = override_weaviate_service
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                    reports = [
+                        await _evaluate_endpoint(client, "semantic", generate_queries(items), k, certainty, runs),
+                        await _evaluate_endpoint(
+                            client, "hybrid", generate_queries(items, filtered=True), k, certainty, runs
+                        ),
+                    ]
+            finally:
+                app.dependency_overrides.pop(get_weaviate_service, None)
+                service._local_index = None
+    finally:
+        await drop_tables()
+
+    return {
+        "corpus": {"items": len(items), "seed": seed},
+        "settings": {"k": k, "certainty": certainty, "runs": runs, "dimensions": dimensions},
+        "endpoints": reports,
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    settings = report["settings"]
+    print(
+        f"Search evaluation: {report['corpus']['items']} items, k={settings['k']}, "
+        f"certainty={settings['certainty']}, {settings['runs']} runs"
+    )
+    print(f"\n{'endpoint':>9} {'queries':>8} {'recall@k':>9} {'MRR':>6} {'empty':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in report["endpoints"]:
+        print(
+            f"{row['endpoint']:>9} {row['queries']:>8} {row['recall_at_k']:>9.3f} {row['mrr']:>6.3f} "
+            f"{row['zero_result_rate']:>6.1%} {row['latency_p50_ms']:>8.1f} {row['latency_p95_ms']:>8.1f}"
+        )
+
+
+def main() -> None:
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(description="Offline search relevance and latency evaluation")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus generation seed (default: 7)")
+    parser.add_argument("--items-per-concept", type=int, default=6, help="Items per product concept (default: 6)")
+    parser.add_argument("-k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument("--certainty", type=float, default=0.6, help="Minimum certainty sent with each query")
+    parser.add_argument("--runs", type=int, default=3, help="Timed passes over the queries (default: 3)")
+    parser.add_argument("--dimensions", type=int, default=256, help="Embedding dimensions (default: 256)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    # Per-request logging would swamp the report
+    logging.disable(logging.INFO)
+    report = asyncio.run(run_evaluation(
+        args.seed, args.items_per_concept, args.k, args.certainty, args.runs, args.dimensions
+    ))
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,8 @@ from app.database.base import get_session
 from app.models.item import Item
 from app.models.location import Location
 from app.models.category import Category
+from app.services.embedding_providers import EmbeddingProvider, create_embedding_provider
+from app.services.openai_rate_limiter import PRIORITY_BACKGROUND, get_openai_rate_limiter, openai_priority
 from app.services.weaviate_service import WeaviateConfig
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -51,6 +53,7 @@ class OpenAIEmbeddingMigrator:
         
         self.weaviate_client: Optional[weaviate.WeaviateClient] = None
         self.openai_client: Optional[AsyncOpenAI] = None
+        self.embedding_provider: Optional[EmbeddingProvider] = None
         self.backup_data: List[Dict[str, Any]] = []
         
     async def initialize(self):
@@ -74,6 +77,15 @@ class OpenAIEmbeddingMigrator:
         # Initialize OpenAI client if API key is provided
         if self.config.openai_api_key:
             self.openai_client = AsyncOpenAI(api_key=self.config.openai_api_key)
+            self.embedding_provider = create_embedding_provider(
+                "openai",
+                self.config.embedding_dimensions,
+                openai_client=self.openai_client,
+                model=self.config.embedding_model,
+                batch_size=self.config.embedding_batch_size,
+                max_concurrency=self.config.embedding_concurrency,
+                openai_limiter=get_openai_rate_limiter()
+            )
             logger.info("Initialized OpenAI client")
     
     async def backup_existing_collection(self) -> bool:
@@ -199,20 +211,16 @@ class OpenAIEmbeddingMigrator:
             logger.error(f"Failed to recreate collection: {e}")
             return False
     
-    async def create_openai_embedding(self, text: str) -> List[float]:
-        """Create embedding using OpenAI API."""
-        if not self.openai_client:
+    async def create_openai_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Create embeddings using OpenAI API, several texts per request."""
+        if not self.embedding_provider:
             raise ValueError("OpenAI client not initialized")
         
         try:
-            response = await self.openai_client.embeddings.create(
-                model=self.config.embedding_model,
-                input=text.strip(),
-                dimensions=self.config.embedding_dimensions
-            )
-            return response.data[0].embedding
+            with openai_priority(PRIORITY_BACKGROUND):
+                return await self.embedding_provider.embed_batch(texts)
         except Exception as e:
-            logger.error(f"Failed to create OpenAI embedding: {e}")
+            logger.error(f"Failed to create OpenAI embeddings: {e}")
             raise
     
     def build_combined_text(self, item: Item, category_name: str = "", location_names: List[str] = None) -> str:
@@ -269,18 +277,16 @@ class OpenAIEmbeddingMigrator:
             processed = 0
             failed = 0
             
-            for item in items:
+            # Simple approach for migration - just use basic item data
+            category_name = ""  # Skip for now
+            location_names = []  # Skip for now
+            
+            # Create OpenAI embeddings in batched requests
+            texts = [self.build_combined_text(item, category_name, location_names) for item in items]
+            embeddings = await self.create_openai_embeddings(texts)
+            
+            for item, combined_text, embedding in zip(items, texts, embeddings):
                 try:
-                    # Simple approach for migration - just use basic item data
-                    category_name = ""  # Skip for now
-                    location_names = []  # Skip for now
-                    
-                    # Build combined text
-                    combined_text = self.build_combined_text(item, category_name, location_names)
-                    
-                    # Create OpenAI embedding
-                    embedding = await self.create_openai_embedding(combined_text)
-                    
                     # Prepare item data
                     item_data = {
                         "postgres_id": item.id,
@@ -12,7 +12,13 @@ import sys
 from typing import Optional
 from datetime import datetime
 
-from app.services.item_service import ItemService
+from sqlalchemy import select, func
+
+from app.models.item import Item
+from app.models.job import JobStatus
+from app.services.item_service import WEAVIATE_BULK_SYNC_JOB
+from app.services.job_service import JobService, JobRunner
+from app.services.weaviate_sync_service import WeaviateSyncWorker
 from app.database.base import async_session
 from app.core.logging import LoggingConfig
 
@@ -24,20 +30,28 @@ logger = logging.getLogger("weaviate_migration")
 async def migrate_items_to_weaviate(
     batch_size: int = 50,
     dry_run: bool = False,
-    item_ids: Optional[list] = None
+    item_ids: Optional[list] = None,
+    resume_job_id: Optional[int] = None
 ) -> dict:
     """
     Migrate existing items to Weaviate.
     
+    The migration is recorded as a weaviate_bulk_sync job that queues the items
+    in the Weaviate sync outbox, so progress is visible at /api/v1/jobs/{id} and
+    an interrupted run can be resumed from its last checkpoint with
+    resume_job_id. The queued entries are then applied in this process.
+    
     Args:
         batch_size: Number of items to process in each batch
         dry_run: If True, only report what would be done without making changes
         item_ids: Specific item IDs to migrate (None for all items)
+        resume_job_id: Failed or cancelled migration job to resume
         
     Returns:
         Migration statistics
     """
     stats = {
+        "job_id": None,
         "total_items": 0,
         "success": 0,
         "failed": 0,
@@ -49,29 +63,66 @@ async def migrate_items_to_weaviate(
     logger.info(f"Starting Weaviate migration (dry_run={dry_run})")
     
     try:
+        if dry_run:
+            logger.info("DRY RUN: No actual changes will be made")
+            async with async_session() as session:
+                query = select(func.count(Item.id)).where(Item.is_active == True)
+                if item_ids:
+                    query = query.where(Item.id.in_(item_ids))
+                stats["total_items"] = (await session.execute(query)).scalar() or 0
+                stats["skipped"] = stats["total_items"]
+            return stats
+        
         async with async_session() as session:
-            item_service = ItemService(session)
-            
-            if dry_run:
-                logger.info("DRY RUN: No actual changes will be made")
-            
-            # Perform bulk sync
-            logger.info(f"Syncing items to Weaviate (batch_size={batch_size})")
-            sync_stats = await item_service.bulk_sync_to_weaviate(
-                item_ids=item_ids,
-                force_update=True
-            )
-            
-            stats.update(sync_stats)
-            stats["total_items"] = sum([sync_stats.get("success", 0), 
-                                      sync_stats.get("failed", 0), 
-                                      sync_stats.get("skipped", 0)])
+            job_service = JobService(session)
+            if resume_job_id:
+                job = await job_service.retry_job(resume_job_id)
+                if job is None:
+                    raise ValueError(f"Job {resume_job_id} not found")
+                logger.info(f"Resuming job {job.id} from checkpoint {job.checkpoint}")
+            else:
+                job = await job_service.create_job(
+                    WEAVIATE_BULK_SYNC_JOB,
+                    {"item_ids": item_ids, "batch_size": batch_size}
+                )
+            job_id = job.id
+        stats["job_id"] = job_id
+        
+        logger.info(f"Syncing items to Weaviate as job {job_id} (batch_size={batch_size})")
+        if await JobRunner().run_job(job_id) is None:
+            # The API's job runner claimed it first; follow its progress instead
+            logger.info(f"Job {job_id} is being run by the API server, waiting for it to finish")
+        
+        while True:
+            async with async_session() as session:
+                job = await JobService(session).get_job(job_id)
+            if job.is_finished:
+                break
+            logger.info(f"Progress: {job.progress_current}/{job.progress_total}")
+            await asyncio.sleep(2)
+        
+        if job.status != JobStatus.SUCCEEDED:
+            raise RuntimeError(f"Job {job_id} ended with status '{job.status}': {job.error or ''}")
+        
+        stats["total_items"] = (job.result or {}).get("queued", 0)
+        
+        # Apply the queued outbox entries here instead of waiting for the API's
+        # sync worker; both can drain the outbox at the same time
+        worker = WeaviateSyncWorker(batch_size=batch_size)
+        while await worker.process_batch():
+            logger.info(f"Applied: {worker.stats['processed']}/{stats['total_items']}")
+        stats["success"] = worker.stats["processed"]
+        stats["failed"] = worker.stats["dead_lettered"]
+        # Entries waiting for a retry are applied later by the API's sync worker
+        stats["skipped"] = max(stats["total_items"] - stats["success"] - stats["failed"], 0)
             
     except Exception as e:
         logger.error(f"Migration failed: {e}")
+        if stats["job_id"]:
+            logger.info(f"Resume with: --resume-job {stats['job_id']}")
         import traceback
         traceback.print_exc()
-        stats["failed"] = stats.get("total_items", 0)
+        stats["failed"] = max(stats["failed"], 1)
     
     finally:
         stats["end_time"] = datetime.now()
@@ -142,6 +193,11 @@ def main():
         action="store_true",
         help="Only check Weaviate health and exit"
     )
+    parser.add_argument(
+        "--resume-job",
+        type=int,
+        help="Resume a failed or cancelled migration job from its last checkpoint"
+    )
     
     args = parser.parse_args()
     
@@ -161,7 +217,8 @@ def main():
         stats = await migrate_items_to_weaviate(
             batch_size=args.batch_size,
             dry_run=args.dry_run,
-            item_ids=args.item_ids
+            item_ids=args.item_ids,
+            resume_job_id=args.resume_job
         )
         
         # Return success status
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Movement History Archive Script
+
+Maintains the time-partitioned item_movement_history table:
+- Creating upcoming monthly partitions
+- Archiving cold months into gzip NDJSON files
+- Listing archived months
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add the parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.database.base import async_session
+from app.services.movement_archive_service import MovementArchiveService, month_start, add_months
+
+
+async def ensure_partitions(months_ahead: int) -> None:
+    """Create partitions for the current month and the months ahead."""
+    print(f"🔧 Ensuring movement history partitions ({months_ahead} months ahead)...")
+    async with async_session() as session:
+        service = MovementArchiveService(session)
+        if not await service.is_partitioned():
+            print("⚠️  item_movement_history is not partitioned (PostgreSQL migration not applied)")
+            return
+        created = await service.ensure_partitions(months_ahead=months_ahead)
+    if created:
+        for name in created:
+            print(f"✅ Created {name}")
+    else:
+        print("✅ All partitions already exist")
+
+
+async def archive(older_than_months: int, archive_path: str = None) -> None:
+    """Archive every month older than the given number of months."""
+    cutoff = add_months(month_start(datetime.now(timezone.utc)), -older_than_months)
+    print(f"🔧 Archiving movement history before {cutoff.date()}...")
+    async with async_session() as session:
+        service = MovementArchiveService(session, archive_path=archive_path)
+        archives = await service.archive_before(cutoff)
+    if archives:
+        for entry in archives:
+            print(f"✅ {entry.partition_name}: {entry.row_count} rows -> {entry.file_path}")
+    else:
+        print("✅ Nothing to archive")
+
+
+async def list_archives() -> None:
+    """List archived months."""
+    async with async_session() as session:
+        archives = await MovementArchiveService(session).get_archives()
+    if not archives:
+        print("📭 No archived movement history")
+        return
+    print("📦 Archived movement history:")
+    for entry in archives:
+        print(
+            f"  {entry.partition_name}: {entry.range_start.date()} - {entry.range_end.date()} "
+            f"({entry.row_count} rows) {entry.file_path}"
+        )
+
+
+def main() -> None:
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(
+        description="Movement History Archive Tool",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s ensure-partitions                # Create partitions for the next 3 months
+  %(prog)s ensure-partitions --months 6     # Create partitions for the next 6 months
+  %(prog)s archive --older-than-months 12   # Archive months older than a year
+  %(prog)s list                             # List archived months
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    ensure_parser = subparsers.add_parser("ensure-partitions", help="Create upcoming monthly partitions")
+    ensure_parser.add_argument("--months", type=int, default=3, help="Months ahead to create (default: 3)")
+
+    archive_parser = subparsers.add_parser("archive", help="Archive cold months to compressed files")
+    archive_parser.add_argument("--older-than-months", type=int, default=12, help="Keep this many months live (default: 12)")
+    archive_parser.add_argument("--path", help="Archive directory (default: MOVEMENT_ARCHIVE_PATH)")
+
+    subparsers.add_parser("list", help="List archived months")
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    if args.command == "ensure-partitions":
+        asyncio.run(ensure_partitions(args.months))
+    elif args.command == "archive":
+        asyncio.run(archive(args.older_than_months, args.path))
+    elif args.command == "list":
+        asyncio.run(list_archives())
+
+
+if __name__ == "__main__":
+    main()
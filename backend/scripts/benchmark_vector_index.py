@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Vector Index Benchmark Script
+
+Compares recall@k and query latency of embedding dimensions and quantization
+settings on the vectors stored in Weaviate, to choose EMBEDDING_DIMENSIONS and
+WEAVIATE_QUANTIZATION from measurements. Each setting is loaded into a
+temporary collection that is deleted afterwards. Requires numpy.
+
+The query file is a JSON list of {"query": "...", "relevant_ids": [...]}
+objects; without relevant_ids only recall against exact search is reported.
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.weaviate_service import get_weaviate_service, close_weaviate_service
+
+
+def _format(value, pattern: str) -> str:
+    return pattern.format(value) if value is not None else "-"
+
+
+async def benchmark(queries_path: str, settings_spec: str, k: int, runs: int) -> int:
+    """Run the benchmark and print a results table."""
+    try:
+        from app.services.vector_index_benchmark import (
+            VectorIndexBenchmark, load_labeled_queries, parse_settings
+        )
+    except ImportError:
+        print("❌ numpy is required: pip install numpy")
+        return 1
+
+    try:
+        queries = load_labeled_queries(queries_path)
+        settings = parse_settings(settings_spec)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Invalid input: {e}")
+        return 1
+
+    print(f"🔧 Benchmarking {len(settings)} settings with {len(queries)} queries (k={k}, {runs} runs)...")
+    try:
+        weaviate_service = await get_weaviate_service()
+        if not await weaviate_service.health_check():
+            print("❌ Weaviate is unavailable")
+            return 1
+        results = await VectorIndexBenchmark(weaviate_service, k=k, runs=runs).run(queries, settings)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        await close_weaviate_service()
+
+    print(f"\n{'dims':>6} {'quant':>6} {'recall/exact':>13} {'recall/labels':>14} {'p50 ms':>8} {'p95 ms':>8} {'vectors MB':>11}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['dimensions']:>6} {result['quantization']:>6}  skipped: {result['error']}")
+            continue
+        print(
+            f"{result['dimensions']:>6} {result['quantization']:>6} "
+            f"{_format(result['recall_vs_exact'], '{:.3f}'):>13} "
+            f"{_format(result['recall_vs_labels'], '{:.3f}'):>14} "
+            f"{result['latency_p50_ms']:>8.1f} {result['latency_p95_ms']:>8.1f} "
+            f"{_format(result['vector_memory_mb'], '{:.1f}'):>11}"
+        )
+    return 0
+
+
+def main() -> None:
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(
+        description="Vector Index Benchmark Tool",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --queries queries.json
+  %(prog)s --queries queries.json --settings 1536:none,512:none,512:bq -k 5
+        """
+    )
+    parser.add_argument("--queries", required=True, help="JSON file of labeled queries")
+    parser.add_argument("--settings", default="1536:none,512:none,256:none,1536:bq,512:pq",
+                        help="Comma-separated dimensions:quantization pairs")
+    parser.add_argument("-k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed passes over the queries (default: 3)")
+
+    args = parser.parse_args()
+    sys.exit(asyncio.run(benchmark(args.queries, args.settings, args.k, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
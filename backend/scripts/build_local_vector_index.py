@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Local Vector Index Build Script
+
+Fills the local vector index (LOCAL_VECTOR_INDEX_PATH) with the vectors
+already stored in Weaviate, so semantic search keeps working during a Weaviate
+outage. No embedding API calls are made.
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.weaviate_service import get_weaviate_service, close_weaviate_service
+
+
+async def build() -> int:
+    """Copy all Weaviate vectors into the local index."""
+    print("🔧 Building local vector index from Weaviate...")
+    try:
+        weaviate_service = await get_weaviate_service()
+        if not await weaviate_service.health_check():
+            print("❌ Weaviate is unavailable")
+            return 1
+        copied = await weaviate_service.rebuild_local_index()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        await close_weaviate_service()
+
+    print(f"✅ Copied {copied} vectors into {os.getenv('LOCAL_VECTOR_INDEX_PATH')}")
+    return 0
+
+
+def main() -> None:
+    """Main CLI interface."""
+    argparse.ArgumentParser(description="Local Vector Index Build Tool").parse_args()
+    sys.exit(asyncio.run(build()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Weaviate Deduplication Script
+
+One-time migration for collections populated before Item objects used
+deterministic UUIDs. Keeps the most recently updated object per item under the
+UUID derived from its postgres_id and deletes every other copy.
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.weaviate_service import get_weaviate_service, close_weaviate_service
+
+
+async def dedupe(dry_run: bool) -> int:
+    """Run the UUID migration and print the counts."""
+    mode = " (dry run)" if dry_run else ""
+    print(f"🔧 Re-keying Weaviate Item objects to deterministic UUIDs{mode}...")
+    try:
+        weaviate_service = await get_weaviate_service()
+        if not await weaviate_service.health_check():
+            print("❌ Weaviate is unavailable")
+            return 1
+        stats = await weaviate_service.migrate_to_deterministic_uuids(dry_run=dry_run)
+    finally:
+        await close_weaviate_service()
+
+    print(f"📊 Scanned {stats['objects']} objects for {stats['items']} items")
+    print(f"  Duplicates removed: {stats['duplicates_removed']}")
+    print(f"  Objects re-keyed:   {stats['rekeyed']}")
+    print("✅ Dry run complete, nothing changed" if dry_run else "✅ Migration complete")
+    return 0
+
+
+def main() -> None:
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(description="Weaviate Deduplication Tool")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without modifying Weaviate")
+
+    args = parser.parse_args()
+    sys.exit(asyncio.run(dedupe(args.dry_run)))
+
+
+if __name__ == "__main__":
+    main()
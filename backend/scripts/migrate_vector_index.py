@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Vector Index Migration Script
+
+Rebuilds the Weaviate Item collection after EMBEDDING_DIMENSIONS or
+WEAVIATE_QUANTIZATION changed. Reducing dimensions truncates the stored
+text-embedding-3 vectors, so no embedding API calls are made. Increasing them
+needs --reembed, which recreates the collection empty and queues a sync job.
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.database.base import async_session
+from app.services.item_service import WEAVIATE_BULK_SYNC_JOB
+from app.services.job_service import JobService
+from app.services.weaviate_reconciliation_service import start_reconciliation_job
+from app.services.weaviate_service import get_weaviate_service, close_weaviate_service
+
+
+async def migrate(dry_run: bool, reembed: bool) -> int:
+    """Run the migration and print the counts."""
+    try:
+        weaviate_service = await get_weaviate_service()
+        if not await weaviate_service.health_check():
+            print("❌ Weaviate is unavailable")
+            return 1
+        config = weaviate_service.config
+        print(
+            f"🔧 Rebuilding Item collection for {config.embedding_dimensions} dimensions, "
+            f"quantization '{config.quantization}'{' (dry run)' if dry_run else ''}..."
+        )
+
+        if reembed:
+            if dry_run:
+                print("✅ Dry run: the collection would be recreated and every item re-embedded")
+                return 0
+            await weaviate_service.recreate_item_collection()
+            async with async_session() as session:
+                job = await JobService(session).create_job(WEAVIATE_BULK_SYNC_JOB, {})
+            print(f"✅ Collection recreated; sync job {job.id} will re-embed all items (/api/v1/jobs/{job.id})")
+            return 0
+
+        stats = await weaviate_service.migrate_vector_index(dry_run=dry_run)
+        if not dry_run:
+            # Catch writes that bypassed the paused sync workers during the copy
+            async with async_session() as session:
+                reconcile_job = await start_reconciliation_job(session)
+    except ValueError as e:
+        print(f"❌ {e}; rerun with --reembed")
+        return 1
+    finally:
+        await close_weaviate_service()
+
+    print(f"📊 {stats['objects']} objects: {stats['stored_dimensions']} -> {stats['target_dimensions']} dimensions")
+    if dry_run:
+        print("✅ Dry run complete, nothing changed")
+    else:
+        print(f"🔄 Reconciliation job {reconcile_job.id} queued to repair writes made during the migration")
+        print("✅ Migration complete; rebuild the local vector index if LOCAL_VECTOR_INDEX_PATH is set")
+    return 0
+
+
+def main() -> None:
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(description="Weaviate Vector Index Migration Tool")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without modifying Weaviate")
+    parser.add_argument("--reembed", action="store_true",
+                        help="Recreate the collection empty and re-embed every item (needed to add dimensions)")
+
+    args = parser.parse_args()
+    sys.exit(asyncio.run(migrate(args.dry_run, args.reembed)))
+
+
+if __name__ == "__main__":
+    main()
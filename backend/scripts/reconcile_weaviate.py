@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Weaviate Reconciliation Script
+
+Diffs active items in the database against the Weaviate Item collection and
+queues upserts for missing or stale objects and deletes for orphaned ones in
+the Weaviate sync outbox. The running API's sync worker applies them.
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.database.base import async_session
+from app.services.weaviate_reconciliation_service import WeaviateReconciler, start_reconciliation_job
+
+
+async def reconcile(dry_run: bool, page_size: int) -> int:
+    """Run a reconciliation in this process and print the counts."""
+    mode = " (dry run)" if dry_run else ""
+    print(f"🔧 Reconciling items with Weaviate{mode}...")
+
+    async def progress(counts):
+        print(f"  ... {counts['database_items']} items checked")
+
+    try:
+        counts = await WeaviateReconciler(page_size=page_size).reconcile(dry_run=dry_run, progress=progress)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"📊 Database items: {counts['database_items']}, index objects: {counts['index_objects']}")
+    print(f"  In sync:    {counts['in_sync']}")
+    print(f"  Missing:    {counts['missing']}")
+    print(f"  Stale:      {counts['stale']}")
+    print(f"  Orphaned:   {counts['orphaned']}")
+    print(f"  Duplicates: {counts['duplicates']}")
+    if dry_run:
+        print("✅ Dry run complete, nothing queued")
+    else:
+        print(f"✅ Queued {counts['upserts_queued']} upserts and {counts['deletes_queued']} deletes")
+    return 0
+
+
+async def submit(dry_run: bool) -> int:
+    """Queue a reconciliation job for the API's job runner."""
+    async with async_session() as session:
+        job = await start_reconciliation_job(session, dry_run=dry_run)
+    print(f"✅ Reconciliation job {job.id} is {job.status}; follow it at /api/v1/jobs/{job.id}")
+    return 0
+
+
+def main() -> None:
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(
+        description="Weaviate Reconciliation Tool",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                  # Reconcile now and queue the differences
+  %(prog)s --dry-run        # Only report drift
+  %(prog)s --submit         # Queue a job for the API server instead
+        """
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without queueing changes")
+    parser.add_argument("--page-size", type=int, default=500, help="Rows per database/Weaviate page (default: 500)")
+    parser.add_argument("--submit", action="store_true", help="Queue a background job instead of running here")
+
+    args = parser.parse_args()
+
+    if args.submit:
+        sys.exit(asyncio.run(submit(args.dry_run)))
+    sys.exit(asyncio.run(reconcile(args.dry_run, args.page_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ This file provides common fixtures and configuration for all tests.
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
@@ -27,7 +28,7 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def test_session() -> AsyncGenerator[AsyncSession, None]:
     """Create a test database session."""
     # Create tables
@@ -43,7 +44,7 @@ async def test_session() -> AsyncGenerator[AsyncSession, None]:
         await drop_tables()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def sample_location(test_session: AsyncSession) -> Location:
     """Create a sample location for testing."""
     location = Location(
@@ -57,7 +58,7 @@ async def sample_location(test_session: AsyncSession) -> Location:
     return location
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def sample_category(test_session: AsyncSession) -> Category:
     """Create a sample category for testing."""
     category = Category(
@@ -71,7 +72,7 @@ async def sample_category(test_session: AsyncSession) -> Category:
     return category
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def sample_item(test_session: AsyncSession, sample_category: Category) -> Item:
     """Create a sample item for testing."""
     item = Item(
@@ -88,7 +89,7 @@ async def sample_item(test_session: AsyncSession, sample_category: Category) ->
     return item
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def sample_inventory(
     test_session: AsyncSession, 
     sample_item: Item, 
@@ -106,7 +107,7 @@ async def sample_inventory(
     return inventory
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def inventory_service(test_session: AsyncSession) -> InventoryService:
     """Create an InventoryService instance for testing."""
     return InventoryService(test_session)
@@ -0,0 +1,88 @@
+"""
+Tests for the batch AI enrichment job.
+"""
+
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock, patch
+
+from sqlalchemy import select
+
+from app.models.item import Item, ItemType
+from app.models.job import JobStatus
+from app.models.weaviate_sync_outbox import WeaviateSyncOutbox
+from app.services.ai_enrichment_service import AI_BATCH_ENRICHMENT_JOB, enrichment_updates
+from app.services.job_service import JobRunner, JobService, watch_job
+
+
+def enrichment(brand="DeWalt", description="A cordless drill.", confidence=0.9):
+    return {
+        "brand": brand,
+        "model": "DCD771",
+        "description": description,
+        "estimated_value": "89.999",
+        "confidence_scores": {"brand": confidence, "model": 0.4, "description": confidence, "estimated_value": 0.8},
+        "_metadata": {"tokens_used": 100},
+    }
+
+
+def test_updates_respect_confidence_and_existing_values():
+    """Only confident values are used, and existing values are kept unless overwriting."""
+    item = Item(name="Drill", brand="Makita", description=None, model=None, current_value=None)
+    fields = ["brand", "model", "description", "current_value"]
+
+    assert enrichment_updates(item, enrichment(), fields, 0.7, overwrite=False) == {
+        "description": "A cordless drill.", "current_value": Decimal("90.00")
+    }
+    assert enrichment_updates(item, enrichment(), ["brand"], 0.7, overwrite=True) == {"brand": "DeWalt"}
+    assert enrichment_updates(item, enrichment(confidence=0.5), fields, 0.7, overwrite=True) == {
+        "current_value": Decimal("90.00")
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_job_enriches_items_and_reports_progress(test_session):
+    """Items are enriched concurrently, written back per page and failures are recorded."""
+    items = [
+        Item(name="Drill", item_type=ItemType.TOOLS),
+        Item(name="Saw", item_type=ItemType.TOOLS, brand="Bosch", description="Mine"),
+        Item(name="Broken", item_type=ItemType.TOOLS),
+        Item(name="Retired", item_type=ItemType.TOOLS, is_active=False),
+    ]
+    test_session.add_all(items)
+    await test_session.commit()
+    ids = [item.id for item in items]
+
+    async def generate(name, **kwargs):
+        if name == "Broken":
+            raise RuntimeError("model unavailable")
+        return enrichment()
+
+    ai_service = Mock(_openai_client=Mock())
+    ai_service.generate_item_data_enrichment = AsyncMock(side_effect=generate)
+    job = await JobService(test_session).create_job(
+        AI_BATCH_ENRICHMENT_JOB, {"item_ids": ids + [99999], "batch_size": 2, "concurrency": 2}
+    )
+    job_id = job.id
+
+    with patch("app.services.ai_enrichment_service.get_ai_service", AsyncMock(return_value=ai_service)):
+        assert await JobRunner().run_job(job_id) == JobStatus.SUCCEEDED
+
+    assert ai_service.generate_item_data_enrichment.await_count == 3
+    test_session.expire_all()
+    job = await JobService(test_session).get_job(job_id)
+    assert (job.progress_current, job.progress_total) == (5, 5)
+    assert {key: job.result[key] for key in ("updated", "unchanged", "failed", "skipped", "tokens_used")} == {
+        "updated": 1, "unchanged": 1, "failed": 1, "skipped": 2, "tokens_used": 200
+    }
+    assert job.result["failures"] == [{"item_id": ids[2], "error": "model unavailable"}]
+
+    drill = await test_session.get(Item, ids[0])
+    saw = await test_session.get(Item, ids[1])
+    assert (drill.brand, drill.model, drill.description) == ("DeWalt", None, "A cordless drill.")
+    assert drill.version == 2 and (saw.brand, saw.description) == ("Bosch", "Mine")
+    outbox = (await test_session.execute(select(WeaviateSyncOutbox.item_id))).scalars().all()
+    assert outbox == [ids[0]]
+
+    states = [state async for state in watch_job(job_id)]
+    assert [state["status"] for state in states] == [JobStatus.SUCCEEDED]
@@ -0,0 +1,79 @@
+"""
+Tests for the AI response cache and its use in AIService.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.services.ai_response_cache import AIResponseCache, build_cache_key
+from app.services.ai_service import AIService
+
+
+def fake_client(content="A sturdy cordless drill."):
+    raw = Mock(headers={}, parse=Mock(return_value=Mock(
+        choices=[Mock(message=Mock(content=content))], usage=Mock(total_tokens=120)
+    )))
+    client = Mock()
+    client.chat.completions.with_raw_response.create = AsyncMock(return_value=raw)
+    return client
+
+
+def test_cache_key_normalizes_context():
+    """Whitespace, case and key order do not change the key; the model and template do."""
+    key = build_cache_key("item_description", "gpt", "prompt", {"name": "Cordless  Drill", "brand": "DeWalt"})
+    assert key == build_cache_key("item_description", "gpt", "prompt", {"brand": "dewalt ", "name": "cordless drill"})
+    assert key != build_cache_key("item_description", "gpt-4o", "prompt", {"name": "cordless drill", "brand": "dewalt"})
+    assert key != build_cache_key("item_description", "gpt", "prompt v2", {"name": "cordless drill", "brand": "dewalt"})
+
+
+@pytest.mark.asyncio
+async def test_generation_is_served_from_cache(test_session):
+    """A repeated request skips the completion; use_cache=False bypasses the cache."""
+    service = AIService()
+    service._openai_client = fake_client()
+    service._response_cache = AIResponseCache(enabled=True)
+    create = service._openai_client.chat.completions.with_raw_response.create
+
+    first = await service.generate_item_description(name="Cordless Drill", brand="DeWalt")
+    second = await service.generate_item_description(name="cordless drill ", brand="DEWALT")
+    assert not first.cached and second.cached
+    assert second.content == first.content and second.tokens_used == 0
+    assert create.await_count == 1
+
+    await service.generate_item_description(
+        name="Cordless Drill", brand="DeWalt", user_preferences={"use_cache": False}
+    )
+    assert create.await_count == 2
+
+    stats = (await service.health_check())["response_cache"]
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_and_stays_within_size(test_session):
+    """Expired entries miss and the least recently used entries are trimmed."""
+    cache = AIResponseCache(max_entries=2, ttl_seconds=60, enabled=True)
+    for key in ("a", "b"):
+        await cache.set(key, "item_description", "gpt", f"content {key}", 10)
+    assert (await cache.get("a"))["content"] == "content a"
+
+    await cache.set("c", "item_description", "gpt", "content c", 10)
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None and await cache.get("c") is not None
+
+    cache.ttl_seconds = -1
+    await cache.set("d", "item_description", "gpt", "content d", 10)
+    assert await cache.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_unparseable_enrichment_is_not_kept(test_session):
+    """An enrichment response that is not JSON is dropped from the cache."""
+    service = AIService()
+    service._openai_client = fake_client("not json")
+    service._response_cache = AIResponseCache(enabled=True)
+
+    result = await service.generate_item_data_enrichment(name="Drill")
+    assert result["description"] == "not json"
+    await service.generate_item_data_enrichment(name="Drill")
+    assert service._openai_client.chat.completions.with_raw_response.create.await_count == 2
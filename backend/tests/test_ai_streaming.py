@@ -0,0 +1,88 @@
+"""
+Tests for streamed AI content generation.
+"""
+
+import pytest
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.ai_response_cache import AIResponseCache
+from app.services.ai_service import AIService
+
+
+class FakeStream:
+    """Async iterable of chat completion chunks, as returned for ``stream=True``."""
+
+    def __init__(self, pieces, usage=None):
+        self.chunks = [Mock(choices=[Mock(delta=Mock(content=piece))], usage=None) for piece in pieces]
+        self.chunks.append(Mock(choices=[], usage=usage))
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def streaming_service(pieces=("A sturdy", " cordless", " drill. "), cache_enabled=False):
+    stream = FakeStream(pieces, usage=Mock(prompt_tokens=90, completion_tokens=30, total_tokens=120))
+    service = AIService()
+    service._openai_client = Mock()
+    service._openai_client.chat.completions.with_raw_response.create = AsyncMock(
+        return_value=Mock(headers={}, parse=Mock(return_value=stream))
+    )
+    service._response_cache = AIResponseCache(enabled=cache_enabled)
+    return service, stream
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_deltas_then_usage(test_session):
+    """Text arrives in pieces, the done event carries usage, and a repeat is served from the cache."""
+    service, stream = streaming_service(cache_enabled=True)
+
+    events = [event async for event in service.stream_item_description(name="Cordless Drill")]
+    assert [event["content"] for event in events[:-1]] == ["A sturdy", " cordless", " drill. "]
+    done = events[-1]
+    assert done["event"] == "done" and done["content"] == "A sturdy cordless drill."
+    assert (done["tokens_used"], done["prompt_tokens"], done["completion_tokens"]) == (120, 90, 30)
+    assert done["time_to_first_token"] is not None and not done["cached"]
+    assert stream.closed
+
+    create = service._openai_client.chat.completions.with_raw_response.create
+    assert create.await_args.kwargs["stream"] is True
+    assert create.await_args.kwargs["stream_options"] == {"include_usage": True}
+
+    cached = [event async for event in service.stream_item_description(name="cordless drill")]
+    assert [event["event"] for event in cached] == ["delta", "done"]
+    assert cached[-1]["cached"] and cached[-1]["tokens_used"] == 0
+    assert create.await_count == 1
+
+
+def test_stream_endpoint_sends_server_sent_events():
+    """The endpoint forwards events as SSE and maps setup errors to status codes."""
+    service, _ = streaming_service()
+    client = TestClient(app)
+
+    with patch("app.api.v1.ai.get_ai_service", AsyncMock(return_value=service)):
+        response = client.post("/api/v1/ai/generate-item-description/stream", json={"name": "Cordless Drill"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = [message for message in response.text.split("\n\n") if message]
+        names = [message.split("\n")[0] for message in messages]
+        assert names == ["event: delta"] * 3 + ["event: done"]
+        assert json.loads(messages[-1].split("data: ", 1)[1])["tokens_used"] == 120
+
+        response = client.post("/api/v1/ai/generate/stream", json={"template_type": "unknown", "context": {}})
+        assert response.status_code == 400
+
+        service._openai_client = None
+        response = client.post("/api/v1/ai/generate/stream", json={"template_type": "item_description", "context": {}})
+        assert response.status_code == 503
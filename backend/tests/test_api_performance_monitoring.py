@@ -189,13 +189,13 @@ class TestPerformanceAPIOptimization:
             # Should not return 404 for endpoint
             assert response.status_code != 404
             
-            if response.status_code == 200:
+            if response.status_code in (200, 202):
                 data = response.json()
                 assert "status" in data
-                assert "created_indexes" in data
+                assert "job_id" in data
                 assert "message" in data
-                assert data["status"] == "success"
-                assert isinstance(data["created_indexes"], list)
+                assert data["status"] in ("success", "accepted")
+                assert isinstance(data["indexes"], list)
 
 
 class TestPerformanceAPIOptimizedData:
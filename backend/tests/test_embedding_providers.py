@@ -0,0 +1,73 @@
+"""
+Tests for the embedding providers.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from app.services.embedding_providers import (
+    EmbeddingProvider, HashingEmbeddingProvider, OpenAIEmbeddingProvider, create_embedding_provider
+)
+
+
+def test_hashing_embeddings_are_deterministic_and_lexical():
+    """Same text gives the same unit vector; shared words raise similarity."""
+    provider = HashingEmbeddingProvider(dimensions=64)
+    drill = provider.embed_sync("Cordless Drill with battery")
+    assert drill == provider.embed_sync("Cordless Drill with battery")
+    assert sum(v * v for v in drill) == pytest.approx(1.0, abs=1e-5)
+
+    matrix = provider.embed_many(["Cordless Drill with battery", "drill", "sofa", ""])
+    assert matrix.shape == (4, 64)
+    assert np.allclose(matrix[0], drill)
+    assert matrix[0] @ matrix[1] > matrix[0] @ matrix[2]
+    assert not matrix[3].any()
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_splits_requests_bounds_concurrency_and_rate_limits():
+    """Batches keep input order, run at most max_concurrency at once and pass through the hook."""
+    active, peak, costs = 0, 0, []
+
+    class RecordingProvider(EmbeddingProvider):
+        async def _embed_request(self, texts, dimensions):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return [[float(text), float(dimensions)] for text in texts]
+
+    async def rate_limiter(cost):
+        costs.append(cost)
+
+    provider = RecordingProvider(2, batch_size=3, max_concurrency=2, rate_limiter=rate_limiter)
+    vectors = await provider.embed_batch([str(i) for i in range(10)])
+
+    assert [vector[0] for vector in vectors] == list(range(10))
+    assert sorted(costs) == [1, 3, 3, 3]
+    assert peak == 2
+    assert await provider.embed_batch([]) == []
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_sends_one_request_per_batch():
+    """Inputs are sent as lists and results reordered by their index."""
+    client = Mock()
+    client.embeddings.create = AsyncMock(side_effect=lambda model, input, dimensions: Mock(data=[
+        Mock(index=i, embedding=[float(len(text))]) for i, text in reversed(list(enumerate(input)))
+    ]))
+    provider = create_embedding_provider("openai", 8, openai_client=client, model="m", batch_size=2)
+
+    assert isinstance(provider, OpenAIEmbeddingProvider)
+    assert await provider.embed_batch([" a ", "bb", "ccc"]) == [[1.0], [2.0], [3.0]]
+    assert client.embeddings.create.await_count == 2
+    assert client.embeddings.create.await_args_list[0].kwargs == {"model": "m", "input": ["a", "bb"], "dimensions": 8}
+
+    with pytest.raises(ValueError):
+        create_embedding_provider("openai", 8)
+    with pytest.raises(ValueError):
+        create_embedding_provider("unknown", 8)
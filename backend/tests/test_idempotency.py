@@ -0,0 +1,99 @@
+"""
+Tests for Idempotency-Key handling on inventory mutations.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.idempotency import IdempotencyMiddleware, IdempotencyStore, is_idempotent_route
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(ttl_seconds=60, max_entries=3, clock=FakeClock())
+
+
+@pytest.fixture
+def client(store):
+    """App with a counting move endpoint behind the idempotency middleware."""
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/api/v1/inventory/move/{item_id}")
+    async def move(item_id: int, payload: dict):
+        app.state.calls += 1
+        return {"item_id": item_id, "quantity": payload["quantity"], "call": app.state.calls}
+
+    app.add_middleware(IdempotencyMiddleware, store=store)
+    return TestClient(app)
+
+
+def test_route_matching():
+    """Only the inventory mutation endpoints honour the header."""
+    assert is_idempotent_route("POST", "/api/v1/inventory/move/3")
+    assert is_idempotent_route("PUT", "/api/v1/inventory/items/3/locations/4/quantity")
+    assert is_idempotent_route("POST", "/api/v1/inventory/execute/bulk-movement")
+    assert not is_idempotent_route("GET", "/api/v1/inventory/move/3")
+    assert not is_idempotent_route("POST", "/api/v1/items/")
+
+
+def test_retry_replays_stored_response(client):
+    """A retry with the same key returns the first response without re-executing."""
+    headers = {"Idempotency-Key": "abc"}
+    first = client.post("/api/v1/inventory/move/1", json={"quantity": 2}, headers=headers)
+    retry = client.post("/api/v1/inventory/move/1", json={"quantity": 2}, headers=headers)
+
+    assert first.status_code == 200
+    assert retry.json() == first.json() == {"item_id": 1, "quantity": 2, "call": 1}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert client.app.state.calls == 1
+
+
+def test_requests_without_key_always_execute(client):
+    """The header is opt-in."""
+    client.post("/api/v1/inventory/move/1", json={"quantity": 2})
+    client.post("/api/v1/inventory/move/1", json={"quantity": 2})
+    assert client.app.state.calls == 2
+
+
+def test_key_reuse_with_different_body_is_rejected(client):
+    """Reusing a key for a different request is a client error."""
+    headers = {"Idempotency-Key": "abc"}
+    client.post("/api/v1/inventory/move/1", json={"quantity": 2}, headers=headers)
+    response = client.post("/api/v1/inventory/move/1", json={"quantity": 5}, headers=headers)
+
+    assert response.status_code == 422
+    assert client.app.state.calls == 1
+
+
+def test_store_ttl_and_size_bounds(store):
+    """Entries expire after the TTL and the oldest are evicted past the size limit."""
+    for key in ["a", "b", "c", "d"]:
+        assert store.begin(key, "fp")[0] == "new"
+        store.complete(key, "fp", 200, [], b"{}")
+
+    assert store.stats()["entries"] == 3
+    assert store.begin("a", "fp")[0] == "new"  # evicted
+
+    assert store.begin("d", "fp")[0] == "replay"
+    store._clock.now += 61
+    assert store.begin("d", "fp")[0] == "new"
+
+
+def test_pending_key_reports_in_progress(store):
+    """A concurrent retry is told the first attempt is still running."""
+    store.begin("k", "fp")
+    assert store.begin("k", "fp")[0] == "in_progress"
+    store.release("k")
+    assert store.begin("k", "fp")[0] == "new"
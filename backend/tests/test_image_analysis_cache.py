@@ -0,0 +1,68 @@
+"""
+Tests for the near-duplicate image analysis cache.
+"""
+
+import io
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.ai_service import AIService
+from app.services.image_analysis_cache import ImageAnalysisCache
+
+
+def test_lookup_matches_within_hamming_distance():
+    """The closest hash within the threshold wins; other contexts and expired entries miss."""
+    now = [0.0]
+    cache = ImageAnalysisCache(max_entries=2, max_distance=4, ttl_seconds=100, clock=lambda: now[0])
+    context = cache.context_key("gpt-4o", {"location": "Garage"})
+    cache.store("ff00ff00ff00ff00", context, {"brand": "A"})
+    cache.store("00ff00ff00ff00ff", context, {"brand": "B"})
+
+    assert cache.lookup("ff00ff00ff00ff01", context) == ({"brand": "A"}, 1)
+    assert cache.lookup("0f0f0f0f0f0f0f0f", context) is None
+    assert cache.lookup("ff00ff00ff00ff00", cache.context_key("gpt-4o", {"location": "Kitchen"})) is None
+    assert cache.context_key("gpt-4o", {"location": " garage"}) == context
+
+    # Least recently used entries are evicted; entries expire
+    cache.store("0000000000000000", context, {"brand": "C"})
+    assert cache.lookup("00ff00ff00ff00ff", context) is None
+    now[0] = 200
+    assert cache.lookup("0000000000000000", context) is None
+    assert cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_photo_skips_the_vision_call():
+    """Re-uploading a recompressed, resized photo returns the stored analysis."""
+    Image = pytest.importorskip("PIL.Image")
+
+    def photo(size, quality, flip=False):
+        horizontal = Image.linear_gradient("L").rotate(90).resize(size)
+        image = Image.merge("RGB", [horizontal, horizontal, Image.radial_gradient("L").resize(size)])
+        if flip:
+            image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=quality)
+        return output.getvalue()
+
+    raw = Mock(headers={}, parse=Mock(return_value=Mock(
+        choices=[Mock(message=Mock(content=json.dumps({"refined_name": "Lamp", "confidence_scores": {"brand": 0.5}})))],
+        usage=Mock(total_tokens=900)
+    )))
+    service = AIService()
+    service._openai_client = Mock()
+    create = service._openai_client.chat.completions.with_raw_response.create = AsyncMock(return_value=raw)
+
+    first = await service.analyze_item_from_image(photo((1600, 1200), 90), "image/jpeg")
+    second = await service.analyze_item_from_image(photo((1200, 900), 60), "image/jpeg")
+    assert create.await_count == 1
+    assert second["refined_name"] == first["refined_name"] == "Lamp"
+    assert second["_metadata"]["cached"] is True and second["_metadata"]["tokens_used"] == 0
+
+    await service.analyze_item_from_image(photo((1600, 1200), 90, flip=True), "image/jpeg")
+    await service.analyze_item_from_image(
+        photo((1600, 1200), 90), "image/jpeg", user_preferences={"use_cache": False}
+    )
+    assert create.await_count == 3
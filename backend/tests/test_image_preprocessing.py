@@ -0,0 +1,68 @@
+"""
+Tests for vision image preprocessing.
+"""
+
+import asyncio
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from app.services.image_preprocessing import ImagePreprocessor, ImagePreprocessorBusy, preprocess_image
+
+
+def photo(width=4000, height=3000, orientation=None, mode="RGB", fmt="JPEG"):
+    image = Image.new(mode, (width, height), "red" if mode == "RGB" else (255, 0, 0, 0))
+    exif = Image.Exif()
+    exif[0x010F] = "CameraMaker"
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    image.save(output, format=fmt, exif=exif)
+    return output.getvalue()
+
+
+def test_photos_are_oriented_downscaled_and_stripped():
+    """Rotated photos come out upright, within the vision envelope and without EXIF."""
+    data, info = preprocess_image(photo(orientation=6))
+    result = Image.open(io.BytesIO(data))
+
+    # Orientation 6 is a 90 degree rotation: the landscape photo becomes portrait
+    assert result.size == (768, 1024)
+    assert result.format == "JPEG"
+    assert not result.getexif()
+    assert info["original_dimensions"] == [4000, 3000]
+    assert info["processed_bytes"] == len(data) < info["original_bytes"]
+
+    # Small images are not upscaled; transparency is flattened to white
+    data, info = preprocess_image(photo(300, 200, mode="RGBA", fmt="PNG"))
+    result = Image.open(io.BytesIO(data))
+    assert result.size == (300, 200)
+    assert result.getpixel((0, 0)) == pytest.approx((255, 255, 255), abs=2)
+
+
+def test_invalid_images_are_rejected():
+    with pytest.raises(ValueError):
+        preprocess_image(b"not an image")
+
+
+@pytest.mark.asyncio
+async def test_preprocessor_runs_in_process_pool_with_bounded_queue():
+    """Work runs off the event loop; requests beyond max_pending fail fast."""
+    preprocessor = ImagePreprocessor(max_workers=1, max_pending=1)
+    try:
+        data, image_format, info = await preprocessor.process(photo(orientation=3), "image/heic")
+        assert image_format == "image/jpeg"
+        assert info["processed_dimensions"] == [1024, 768]
+
+        first = asyncio.create_task(preprocessor.process(photo(), "image/jpeg"))
+        await asyncio.sleep(0)
+        with pytest.raises(ImagePreprocessorBusy):
+            await preprocessor.process(photo(), "image/jpeg")
+        await first
+
+        stats = preprocessor.get_stats()
+        assert stats["processed"] == 2 and stats["rejected"] == 1 and stats["pending"] == 0
+    finally:
+        preprocessor.close()
@@ -0,0 +1,90 @@
+"""
+Tests for the pg_stat_statements and EXPLAIN based index advisor.
+"""
+
+import pytest
+from app.performance.index_advisor import (
+    IndexAdvisor, build_recommendations, filter_columns, index_name, plan_candidates
+)
+
+COLUMNS = {
+    "items": {"id", "name", "status", "item_type", "category_id", "created_at"},
+    "item_movement_history_2026_10": {"id", "item_id", "created_at", "movement_type"},
+}
+
+
+def seq_scan(table, rows, cost, filter_expression=None):
+    node = {"Node Type": "Seq Scan", "Relation Name": table, "Plan Rows": rows, "Total Cost": cost}
+    if filter_expression:
+        node["Filter"] = filter_expression
+    return node
+
+
+def test_filter_columns_and_plan_candidates():
+    """Equality columns come first, then one range or LIMITed sort column; function calls are ignored."""
+    assert filter_columns(
+        "(((status)::text = 'available'::text) AND (created_at >= $2) AND (lower((name)::text) = $3) "
+        "AND (item_type <> 'x = y'::text) AND (category_id = $1))",
+        COLUMNS["items"]
+    ) == (["status", "category_id"], ["created_at"])
+
+    plan = {
+        "Node Type": "Limit", "Total Cost": 100.0, "Plans": [{
+            "Node Type": "Sort", "Total Cost": 99.0, "Sort Key": ["items.created_at DESC"], "Plans": [
+                seq_scan("items", 40, 80.0, "((status)::text = $1)")
+            ]
+        }]
+    }
+    [candidate] = plan_candidates(plan, COLUMNS)
+    assert (candidate["table"], candidate["columns"], candidate["cost_share"]) == (
+        "items", ["status", "created_at"], 0.8
+    )
+    # Without a LIMIT the sort cannot stop early, and an unfiltered scan needs no index
+    assert plan_candidates(plan["Plans"][0], COLUMNS)[0]["columns"] == ["status"]
+    assert plan_candidates(seq_scan("items", 5000, 50.0), COLUMNS) == []
+    assert len(index_name("a" * 40, ["b" * 20, "c" * 20])) == 63
+
+
+def test_build_recommendations_ranks_uncovered_indexes_by_benefit():
+    """Partitions roll up to their parent, covered or small tables are skipped, benefit is summed."""
+    statements = [
+        {"queryid": 1, "query": "SELECT * FROM items WHERE status = $1", "calls": 500, "total_exec_time": 2000.0},
+        {"queryid": 2, "query": "SELECT * FROM item_movement_history WHERE item_id = $1",
+         "calls": 100, "total_exec_time": 1000.0},
+        {"queryid": 3, "query": "SELECT * FROM items WHERE category_id = $1", "calls": 50, "total_exec_time": 900.0},
+    ]
+    plans = {
+        1: seq_scan("items", 100, 50.0, "((status)::text = $1)"),
+        2: {"Node Type": "Append", "Total Cost": 100.0, "Plans": [
+            seq_scan("item_movement_history_2026_10", 10, 100.0, "(item_id = $1)")
+        ]},
+        3: seq_scan("items", 100, 50.0, "(category_id = $1)"),
+    }
+    table_stats = {
+        "items": {"n_live_tup": 10000, "seq_scan": 90, "idx_scan": 10},
+        "item_movement_history": {"n_live_tup": 0, "seq_scan": 0, "idx_scan": 0},
+        "item_movement_history_2026_10": {"n_live_tup": 20000, "seq_scan": 40, "idx_scan": 0},
+    }
+    recommendations = build_recommendations(
+        statements, plans, table_stats, COLUMNS,
+        existing_indexes={"items": [["category_id"]]},
+        parent_of={"item_movement_history_2026_10": "item_movement_history"},
+    )
+
+    assert [(r["table"], r["columns"]) for r in recommendations] == [
+        ("items", ["status"]), ("item_movement_history", ["item_id"])
+    ]
+    items, history = recommendations
+    assert items["estimated_benefit_ms"] == 1980.0 and items["seq_scan_ratio"] == 0.9
+    assert items["statement"] == "CREATE INDEX CONCURRENTLY ix_items_status ON items (status)"
+    assert history["partitioned"] and history["table_rows"] == 20000 and history["calls"] == 100
+    assert build_recommendations(statements, plans, table_stats, COLUMNS, {}, {}, min_table_rows=50000) == []
+
+
+@pytest.mark.asyncio
+async def test_advisor_reports_unsupported_database(test_session):
+    """Outside PostgreSQL the advisor explains why it has no recommendations."""
+    report = await IndexAdvisor(test_session).recommend()
+
+    assert report["supported"] is False
+    assert report["recommendations"] == [] and report["notes"]
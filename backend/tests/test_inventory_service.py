@@ -5,6 +5,7 @@ Tests business logic for inventory operations including CRUD, search, and report
 """
 
 import pytest
+import pytest_asyncio
 from decimal import Decimal
 
 from app.services.inventory_service import InventoryService
@@ -16,13 +17,13 @@ from app.schemas.inventory import (
 )
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def inventory_service(test_session):
     """Create an inventory service instance with test session."""
     return InventoryService(test_session)
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def test_data(test_session):
     """Create test data for inventory tests."""
     # Create locations
@@ -629,4 +630,81 @@ async def test_move_item_same_location_fails(inventory_service, test_data):
     )
 
     with pytest.raises(ValueError, match="must be different"):
-        await inventory_service.move_item(laptop.id, move_data)
\ No newline at end of file
+        await inventory_service.move_item(laptop.id, move_data)
+
+@pytest.mark.asyncio
+async def test_execute_bulk_movements(inventory_service, test_data, test_session):
+    """Test applying a batch of moves with set-based writes."""
+    from sqlalchemy import select, func
+    from app.models.item_movement_history import ItemMovementHistory
+    from app.schemas.movement_history import MovementHistoryCreate
+
+    laptop = test_data["items"]["laptop"]
+    mouse = test_data["items"]["mouse"]
+    warehouse = test_data["locations"]["warehouse"]
+    office = test_data["locations"]["office"]
+
+    await inventory_service.create_inventory_entry(
+        InventoryCreate(item_id=laptop.id, location_id=warehouse.id, quantity=3)
+    )
+    await inventory_service.create_inventory_entry(
+        InventoryCreate(item_id=mouse.id, location_id=warehouse.id, quantity=2)
+    )
+
+    movements = [
+        MovementHistoryCreate(item_id=laptop.id, from_location_id=warehouse.id,
+                              to_location_id=office.id, quantity_moved=2, movement_type="move"),
+        MovementHistoryCreate(item_id=mouse.id, from_location_id=warehouse.id,
+                              to_location_id=office.id, quantity_moved=2, movement_type="move"),
+        MovementHistoryCreate(item_id=laptop.id, from_location_id=office.id,
+                              to_location_id=warehouse.id, quantity_moved=1, movement_type="move"),
+    ]
+
+    summary = await inventory_service.execute_bulk_movements(movements, user_id="tester")
+
+    assert summary["movements_executed"] == 3
+    assert summary["history_entries_created"] == 6
+
+    rows = await test_session.execute(select(Inventory.item_id, Inventory.location_id, Inventory.quantity))
+    final = {(row.item_id, row.location_id): row.quantity for row in rows}
+    assert final == {
+        (laptop.id, warehouse.id): 2,
+        (laptop.id, office.id): 1,
+        (mouse.id, office.id): 2,
+    }
+
+    history = await test_session.execute(
+        select(func.count()).select_from(ItemMovementHistory).where(ItemMovementHistory.user_id == "tester")
+    )
+    assert history.scalar() == 6
+
+
+@pytest.mark.asyncio
+async def test_execute_bulk_movements_is_atomic(inventory_service, test_data, test_session):
+    """Test that a batch which overdraws a location applies nothing."""
+    from sqlalchemy import select, func
+    from app.models.item_movement_history import ItemMovementHistory
+    from app.schemas.movement_history import MovementHistoryCreate
+
+    laptop = test_data["items"]["laptop"]
+    warehouse = test_data["locations"]["warehouse"]
+    office = test_data["locations"]["office"]
+
+    await inventory_service.create_inventory_entry(
+        InventoryCreate(item_id=laptop.id, location_id=warehouse.id, quantity=3)
+    )
+
+    movements = [
+        MovementHistoryCreate(item_id=laptop.id, from_location_id=warehouse.id,
+                              to_location_id=office.id, quantity_moved=2, movement_type="move"),
+        MovementHistoryCreate(item_id=laptop.id, from_location_id=warehouse.id,
+                              to_location_id=office.id, quantity_moved=2, movement_type="move"),
+    ]
+
+    with pytest.raises(ValueError, match="insufficient quantity"):
+        await inventory_service.execute_bulk_movements(movements)
+
+    rows = await test_session.execute(select(Inventory.location_id, Inventory.quantity))
+    assert [(row.location_id, row.quantity) for row in rows] == [(warehouse.id, 3)]
+    history = await test_session.execute(select(func.count()).select_from(ItemMovementHistory))
+    assert history.scalar() == 0
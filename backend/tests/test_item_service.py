@@ -346,48 +346,6 @@ class TestItemService:
             assert all(item.status == ItemStatus.UNAVAILABLE for item in items)
             mock_db.commit.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_sync_to_weaviate_success(
-        self, mock_db, mock_weaviate_service, sample_item
-    ):
-        """Test successful Weaviate synchronization."""
-        # Setup
-        service = ItemService(mock_db)
-        sample_item.category = Category(id=1, name="Electronics")
-        sample_item.inventory_entries = [
-            Inventory(location=Location(name="Room 1", full_path="House > Room 1"))
-        ]
-        
-        with patch('app.services.item_service.get_weaviate_service', return_value=mock_weaviate_service):
-            # Execute
-            await service._sync_to_weaviate(sample_item)
-            
-            # Verify
-            mock_weaviate_service.create_item_embedding.assert_called_once()
-            call_args = mock_weaviate_service.create_item_embedding.call_args
-            assert call_args[0][0] == sample_item
-            assert call_args[0][1] == "Electronics"
-            assert "House > Room 1" in call_args[0][2]
-    
-    @pytest.mark.asyncio
-    async def test_sync_to_weaviate_service_unavailable(
-        self, mock_db, sample_item
-    ):
-        """Test Weaviate sync when service is unavailable."""
-        # Setup
-        service = ItemService(mock_db)
-        
-        # Mock Weaviate service not available
-        mock_weaviate = AsyncMock()
-        mock_weaviate.health_check.return_value = False
-        
-        with patch('app.services.item_service.get_weaviate_service', return_value=mock_weaviate):
-            # Execute (should not raise exception)
-            await service._sync_to_weaviate(sample_item)
-            
-            # Verify no embedding creation attempted
-            mock_weaviate.create_item_embedding.assert_not_called()
-    
     @pytest.mark.asyncio
     async def test_get_items_by_location(self, mock_db):
         """Test getting items by location."""
@@ -0,0 +1,155 @@
+"""
+Tests for the durable job runner and the Weaviate bulk sync job.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+
+from app.models.item import Item, ItemType
+from app.models.job import Job, JobStatus
+from app.models.weaviate_sync_outbox import WeaviateSyncOutbox
+from app.services.item_service import WEAVIATE_BULK_SYNC_JOB
+from app.services.job_service import JobRunner, JobService, job_handler
+
+pytestmark = pytest.mark.asyncio
+
+
+@job_handler("test_count")
+async def count_job(context):
+    """Counts to params['to'], checkpointing each step and failing once at params['fail_at']."""
+    start = context.checkpoint.get("n", 0)
+    for n in range(start + 1, context.params["to"] + 1):
+        if n == context.params.get("fail_at") and not context.checkpoint.get("failed"):
+            await context.report(n - 1, checkpoint={"n": n - 1, "failed": True})
+            raise RuntimeError("boom")
+        await context.report(n, context.params["to"], checkpoint={**context.checkpoint, "n": n})
+    return {"started_from": start}
+
+
+@pytest.fixture
+def runner():
+    return JobRunner(concurrency=1, poll_interval=0.01)
+
+
+async def fresh_job(session, job_id):
+    session.expire_all()
+    return await JobService(session).get_job(job_id)
+
+
+async def test_runner_executes_job_and_reports_progress(test_session, runner):
+    """A queued job runs to completion with its progress and result recorded."""
+    job = await JobService(test_session).create_job("test_count", {"to": 3})
+    job_id = job.id
+
+    assert await runner.run_job(job_id) == JobStatus.SUCCEEDED
+
+    job = await fresh_job(test_session, job_id)
+    assert job.to_dict()["progress"]["percent"] == 100.0
+    assert job.result == {"started_from": 0}
+    assert job.attempts == 1
+    assert job.finished_at is not None
+
+
+async def test_unknown_job_type_is_rejected(test_session):
+    with pytest.raises(ValueError):
+        await JobService(test_session).create_job("no_such_job")
+
+
+async def test_cancellation(test_session, runner):
+    """Queued jobs cancel immediately; running jobs stop at their next report."""
+    service = JobService(test_session)
+    queued = await service.create_job("test_count", {"to": 3})
+    queued_id = queued.id
+    cancelled = await service.cancel_job(queued_id)
+    assert cancelled.status == JobStatus.CANCELLED
+    assert await runner.run_job(queued_id) is None
+
+    running = await service.create_job("test_count", {"to": 3})
+    running_id = running.id
+    claimed = await runner.claim_next(running_id)
+    await service.cancel_job(running_id)
+
+    assert await runner.execute(claimed) == JobStatus.CANCELLED
+    job = await fresh_job(test_session, running_id)
+    assert job.progress_current == 1
+    with pytest.raises(ValueError):
+        await service.cancel_job(running_id)
+
+
+async def test_failed_job_resumes_from_checkpoint(test_session, runner):
+    """Retrying a failed job continues after the last checkpoint."""
+    service = JobService(test_session)
+    job = await service.create_job("test_count", {"to": 5, "fail_at": 3})
+    job_id = job.id
+
+    assert await runner.run_job(job_id) == JobStatus.FAILED
+    job = await fresh_job(test_session, job_id)
+    assert job.error == "boom"
+    assert job.checkpoint["n"] == 2
+
+    await service.retry_job(job_id)
+    assert await runner.run_job(job_id) == JobStatus.SUCCEEDED
+    job = await fresh_job(test_session, job_id)
+    assert job.result == {"started_from": 2}
+    assert job.attempts == 2
+
+
+async def test_only_expired_leases_are_requeued(test_session, runner):
+    """A job running in another live process is left alone; one whose runner died is queued again."""
+    job = await JobService(test_session).create_job("test_count", {"to": 1})
+    job_id = job.id
+    other_process = JobRunner()
+    stale = await other_process.claim_next(job_id)
+
+    assert await runner.recover_interrupted() == 0
+
+    await test_session.execute(
+        update(Job).where(Job.id == job_id).values(heartbeat_at=datetime.now(timezone.utc) - timedelta(minutes=5))
+    )
+    await test_session.commit()
+    assert await runner.recover_interrupted() == 1
+    assert await runner.run_job(job_id) == JobStatus.SUCCEEDED
+
+    # The runner that lost the lease does not overwrite the outcome
+    assert await other_process.execute(stale) == JobStatus.QUEUED
+    job = await fresh_job(test_session, job_id)
+    assert (job.status, job.attempts, job.locked_by) == (JobStatus.SUCCEEDED, 2, None)
+
+
+async def test_weaviate_bulk_sync_job_queues_outbox_pages(test_session, runner):
+    """The bulk sync job queues active items in the sync outbox page by page."""
+    test_session.add_all(
+        [Item(name=f"Item {n}", item_type=ItemType.TOOLS) for n in range(5)]
+        + [Item(name="Retired", item_type=ItemType.TOOLS, is_active=False)]
+    )
+    await test_session.commit()
+
+    job = await JobService(test_session).create_job(WEAVIATE_BULK_SYNC_JOB, {"batch_size": 2})
+    job_id = job.id
+    assert await runner.run_job(job_id) == JobStatus.SUCCEEDED
+
+    rows = (await test_session.execute(select(WeaviateSyncOutbox.item_id, WeaviateSyncOutbox.operation))).all()
+    assert len(rows) == 5 and {row.operation for row in rows} == {"upsert"}
+    job = await fresh_job(test_session, job_id)
+    assert job.result == {"queued": 5}
+    assert job.checkpoint["last_id"] == max(row.item_id for row in rows)
+    assert (job.progress_current, job.progress_total) == (5, 5)
+
+
+async def test_job_events_stream_until_done(test_session, runner):
+    """The SSE endpoint streams the job's state and ends with a done event."""
+    from fastapi import HTTPException
+    from app.api.v1.jobs import stream_job_events
+
+    job = await JobService(test_session).create_job("test_count", {"to": 2})
+    job_id = job.id
+    await runner.run_job(job_id)
+
+    response = await stream_job_events(job_id, poll_interval=0.1)
+    events = [chunk async for chunk in response.body_iterator]
+    assert len(events) == 1 and events[0].startswith("event: done\n")
+
+    with pytest.raises(HTTPException) as missing:
+        await stream_job_events(job_id + 1000, poll_interval=0.1)
+    assert missing.value.status_code == 404
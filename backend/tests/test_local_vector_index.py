@@ -0,0 +1,102 @@
+"""
+Tests for the local memory-mapped vector index and the Weaviate fallback.
+"""
+
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock, patch
+
+from app.services.local_vector_index import LocalVectorIndex
+from app.services.weaviate_service import WeaviateService, WeaviateConfig
+
+
+@pytest.fixture
+def index(tmp_path):
+    return LocalVectorIndex(str(tmp_path / "index"), dimensions=8, initial_capacity=4, chunk_rows=3)
+
+
+def random_vectors(count, dimensions=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimensions)).astype(np.float32)
+
+
+def test_search_matches_brute_force(index):
+    """Chunked top-k returns the same neighbours as a full cosine ranking."""
+    vectors = random_vectors(20)
+    for postgres_id, vector in enumerate(vectors, start=1):
+        index.upsert(postgres_id, vector)
+    query = random_vectors(1, seed=1)[0]
+
+    results = index.search(query, limit=5)
+
+    normalised = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = list(np.argsort(-(normalised @ (query / np.linalg.norm(query))))[:5] + 1)
+    assert [postgres_id for postgres_id, _ in results] == expected
+    assert all(0.0 <= score <= 1.0 for _, score in results)
+    assert index.capacity >= 20
+
+
+def test_upsert_replaces_and_delete_frees_rows(index):
+    """Re-indexing an item overwrites its row and deleted rows are reused."""
+    vectors = random_vectors(3)
+    index.upsert(1, vectors[0])
+    index.upsert(2, vectors[1])
+    index.upsert(1, vectors[2])
+    assert len(index) == 2
+    assert index.search(vectors[2], limit=1)[0][0] == 1
+
+    assert index.delete(2) is True
+    assert index.delete(2) is False
+    assert [postgres_id for postgres_id, _ in index.search(vectors[1], limit=5)] == [1]
+
+    index.upsert(3, vectors[1])
+    assert index.capacity == 4
+    assert index.search(vectors[1], limit=1, exclude_id=None)[0][0] == 3
+    assert [postgres_id for postgres_id, _ in index.search(vectors[1], limit=5, exclude_id=3)] == [1]
+
+
+def test_index_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "index")
+    vectors = random_vectors(6)
+    index = LocalVectorIndex(path, dimensions=8, initial_capacity=2)
+    for postgres_id, vector in enumerate(vectors, start=10):
+        index.upsert(postgres_id, vector, content_hash="abc")
+    index.delete(11)
+    index.flush()
+
+    reopened = LocalVectorIndex(path, dimensions=8)
+
+    assert len(reopened) == 5
+    assert reopened.search(vectors[3], limit=1)[0][0] == 13
+    assert [state[0] for state in reopened.iter_states()] == [10, 12, 13, 14, 15]
+    assert next(reopened.iter_states())[1] == "abc"
+
+    with pytest.raises(ValueError):
+        reopened.upsert(1, [1.0, 2.0])
+
+
+@pytest.mark.asyncio
+async def test_weaviate_service_falls_back_to_local_index(tmp_path):
+    """Semantic and similar-item searches are served locally while Weaviate is down."""
+    config = WeaviateConfig()
+    config.embedding_dimensions = 8
+    config.local_index_path = str(tmp_path / "index")
+    service = WeaviateService(config)
+    service._open_local_index()
+
+    vectors = random_vectors(5)
+    for postgres_id, vector in enumerate(vectors, start=1):
+        service._local_index.upsert(postgres_id, vector)
+
+    with patch.object(service, "health_check", AsyncMock(return_value=False)), \
+         patch.object(service, "_create_embedding", AsyncMock(return_value=list(vectors[2]))):
+        assert await service.search_available() is True
+        results = await service.semantic_search("anything", limit=3, certainty=0.01)
+        similar = await service.get_similar_items(3, limit=2)
+        stats = await service.get_stats()
+
+    assert results[0].postgres_id == 3
+    assert results[0].score == pytest.approx(1.0, abs=1e-3)
+    assert 3 not in [result.postgres_id for result in similar]
+    assert len(similar) == 2
+    assert stats["status"] == "degraded"
+    assert stats["item_count"] == 5
@@ -0,0 +1,50 @@
+"""
+Tests for the Prometheus metrics and the /metrics endpoint.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.performance.metrics import (
+    DB_STATEMENT_DURATION, HTTP_REQUEST_DURATION, Counter, Histogram, MetricsRegistry
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative with inclusive upper bounds; label values are escaped."""
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("calls_total", "Calls.", ("name",)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, route="/items")
+    counter.inc(2, name='say "hi"')
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/items",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/items",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/items",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/items"} 3.65' in lines
+    assert 'latency_seconds_count{route="/items"} 4' in lines
+    assert 'calls_total{name="say \\"hi\\""} 2' in lines
+
+
+@pytest.mark.asyncio
+async def test_requests_and_statements_are_recorded(test_session):
+    """Requests are labelled by route template and their SQL statements are timed."""
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/api/v1/items/{item_id}", "status": "404"}
+    requests_before = HTTP_REQUEST_DURATION.count(**labels)
+    selects_before = DB_STATEMENT_DURATION.count(operation="SELECT")
+
+    assert client.get("/api/v1/items/987654").status_code == 404
+
+    assert HTTP_REQUEST_DURATION.count(**labels) == requests_before + 1
+    assert DB_STATEMENT_DURATION.count(operation="SELECT") > selects_before
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/items/{item_id}",status="404"}' in response.text
+    assert "db_pool_checkout_wait_seconds_count" in response.text
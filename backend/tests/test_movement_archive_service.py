@@ -0,0 +1,179 @@
+"""
+Tests for the Movement Archive Service.
+
+Covers month arithmetic, archival of cold months into NDJSON files, and
+reading archived rows back through MovementService.get_movement_history.
+"""
+
+import gzip
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import select, func
+
+from app.models.item import Item, ItemType
+from app.models.location import Location, LocationType
+from app.models.item_movement_history import ItemMovementHistory
+from app.models.movement_history_archive import MovementHistoryArchive
+from app.schemas.movement_history import MovementHistorySearch
+from app.services.movement_archive_service import (
+    MovementArchiveService, month_start, add_months, partition_name, row_matches_search
+)
+from app.services.movement_service import MovementService
+
+
+@pytest_asyncio.fixture
+async def history_data(test_session):
+    """Create an item, two locations and movements spread over three months."""
+    garage = Location(name="Garage", location_type=LocationType.ROOM)
+    attic = Location(name="Attic", location_type=LocationType.ROOM)
+    drill = Item(name="Drill", item_type=ItemType.TOOLS)
+    test_session.add_all([garage, attic, drill])
+    await test_session.commit()
+
+    timestamps = [
+        datetime(2025, 1, 10, 12, 0),
+        datetime(2025, 1, 20, 12, 0),
+        datetime(2025, 2, 5, 12, 0),
+        datetime(2025, 3, 15, 12, 0),
+    ]
+    for i, created_at in enumerate(timestamps):
+        test_session.add(ItemMovementHistory(
+            item_id=drill.id,
+            from_location_id=garage.id,
+            to_location_id=attic.id,
+            quantity_moved=i + 1,
+            movement_type="move",
+            created_at=created_at
+        ))
+    await test_session.commit()
+
+    return {"item": drill, "garage": garage, "attic": attic}
+
+
+def test_month_helpers():
+    """Month truncation and arithmetic wrap across years."""
+    start = month_start(datetime(2025, 12, 17, 8, 30))
+    assert start == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert add_months(start, 1) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert add_months(start, -12) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+    assert partition_name(start) == "item_movement_history_y2025m12"
+
+
+def test_row_matches_search_filters():
+    """Archived rows are filtered with the same rules as the SQL query."""
+    row = {
+        "item_id": 1,
+        "from_location_id": 2,
+        "to_location_id": 3,
+        "movement_type": "move",
+        "user_id": None,
+        "quantity_moved": 4,
+        "created_at": datetime(2025, 1, 10, tzinfo=timezone.utc),
+    }
+    assert row_matches_search(row, MovementHistorySearch(item_id=1, location_id=3))
+    assert not row_matches_search(row, MovementHistorySearch(item_id=2))
+    assert not row_matches_search(row, MovementHistorySearch(min_quantity=5))
+    assert not row_matches_search(row, MovementHistorySearch(start_date=datetime(2025, 2, 1)))
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_noop_without_postgres(test_session):
+    """Partition management is skipped on non-partitioned backends."""
+    service = MovementArchiveService(test_session)
+    assert await service.is_partitioned() is False
+    assert await service.ensure_partitions() == []
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_skips_while_another_process_holds_the_lock(test_session):
+    """Only the process holding the advisory lock creates partitions."""
+    service = MovementArchiveService(test_session)
+    test_session.scalar = AsyncMock(return_value=False)
+
+    with patch.object(service, "is_partitioned", AsyncMock(return_value=True)), \
+            patch.object(service, "list_partitions", AsyncMock()) as list_partitions:
+        assert await service.ensure_partitions() == []
+
+    assert "pg_try_advisory_xact_lock" in str(test_session.scalar.await_args.args[0])
+    list_partitions.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_archive_before_moves_cold_months_to_files(test_session, history_data, tmp_path):
+    """Months before the cutoff are exported, recorded and removed from the live table."""
+    service = MovementArchiveService(test_session, archive_path=str(tmp_path))
+
+    archives = await service.archive_before(datetime(2025, 3, 1))
+
+    assert [a.partition_name for a in archives] == [
+        "item_movement_history_y2025m01",
+        "item_movement_history_y2025m02",
+    ]
+    assert [a.row_count for a in archives] == [2, 1]
+
+    remaining = await test_session.execute(select(func.count()).select_from(ItemMovementHistory))
+    assert remaining.scalar() == 1
+
+    with gzip.open(archives[0].file_path, "rt") as archive_file:
+        rows = [json.loads(line) for line in archive_file]
+    assert [row["quantity_moved"] for row in rows] == [2, 1]  # newest first
+
+    # Re-running does not archive the same month twice
+    assert await service.archive_before(datetime(2025, 3, 1)) == []
+    manifest = await test_session.execute(select(func.count()).select_from(MovementHistoryArchive))
+    assert manifest.scalar() == 2
+
+
+@pytest.mark.asyncio
+async def test_get_movement_history_reads_archives_when_live_rows_run_out(
+    test_session, history_data, tmp_path, monkeypatch
+):
+    """History pages continue seamlessly from live rows into archived months."""
+    monkeypatch.setenv("MOVEMENT_ARCHIVE_PATH", str(tmp_path))
+    await MovementArchiveService(test_session).archive_before(datetime(2025, 3, 1))
+
+    service = MovementService(test_session)
+    search = MovementHistorySearch(item_id=history_data["item"].id)
+
+    movements = await service.get_movement_history(search, skip=0, limit=10)
+    assert [m.quantity_moved for m in movements] == [4, 3, 2, 1]
+    assert movements[-1].item.name == "Drill"
+    assert movements[-1].from_location.name == "Garage"
+    assert movements[-1].movement_description == "Moved 1 item(s) from Garage to Attic"
+
+    page = await service.get_movement_history(search, skip=2, limit=1)
+    assert [m.quantity_moved for m in page] == [2]
+
+    # A range that ends after the archive horizon never opens archive files
+    recent = await service.get_movement_history(
+        MovementHistorySearch(start_date=datetime(2025, 3, 1)), skip=0, limit=10
+    )
+    assert [m.quantity_moved for m in recent] == [4]
+
+
+@pytest.mark.asyncio
+async def test_item_history_skips_archives_without_the_item(
+    test_session, history_data, tmp_path, monkeypatch
+):
+    """Archived months that never held an item are not opened for its history."""
+    monkeypatch.setenv("MOVEMENT_ARCHIVE_PATH", str(tmp_path))
+    archive_service = MovementArchiveService(test_session)
+    await archive_service.archive_before(datetime(2025, 3, 1))
+
+    ladder = Item(name="Ladder", item_type=ItemType.TOOLS)
+    test_session.add(ladder)
+    await test_session.commit()
+
+    assert len(await archive_service.get_archives(item_id=history_data["item"].id)) == 2
+    assert await archive_service.get_archives(item_id=ladder.id) == []
+
+    with patch("app.services.movement_archive_service.scan_archive_file") as scan:
+        movements = await MovementService(test_session).get_movement_history(
+            MovementHistorySearch(item_id=ladder.id), skip=0, limit=10
+        )
+    assert movements == []
+    scan.assert_not_called()
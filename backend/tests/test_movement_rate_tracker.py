@@ -0,0 +1,145 @@
+"""
+Tests for the in-memory movement rate tracker and its use by MovementValidator.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.item import Item, ItemType
+from app.models.location import Location, LocationType
+from app.schemas.movement_history import MovementHistoryCreate
+from app.services.movement_service import MovementService
+from app.services.movement_rate_tracker import MovementRateTracker
+from app.services.movement_validator import MovementValidator, MovementValidationResult
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_movement(item_id=1, quantity=2):
+    return MovementHistoryCreate(
+        item_id=item_id,
+        from_location_id=1,
+        to_location_id=2,
+        quantity_moved=quantity,
+        movement_type="move"
+    )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def tracker(clock):
+    return MovementRateTracker(clock=clock)
+
+
+def test_tracker_is_cold_until_window_elapses(tracker, clock):
+    """A fresh tracker cannot answer for a window it has not observed."""
+    assert tracker.is_warm(60) is False
+    clock.now += 60
+    assert tracker.is_warm(60) is True
+    assert tracker.is_warm(300) is False
+
+
+def test_duplicate_detection_expires(tracker, clock):
+    """Identical movements are duplicates only inside the window."""
+    tracker.record(make_movement())
+
+    assert tracker.has_recent_duplicate(make_movement()) is True
+    assert tracker.has_recent_duplicate(make_movement(quantity=3)) is False
+
+    clock.now += 301
+    assert tracker.has_recent_duplicate(make_movement()) is False
+
+
+def test_recent_count_slides(tracker, clock):
+    """Per-item counts only include movements inside the frequency window."""
+    for _ in range(3):
+        tracker.record(make_movement())
+        clock.now += 30
+    tracker.record(make_movement(item_id=2))
+
+    # At t=90 the event at t=0 has left the 60s window
+    assert tracker.recent_count(1) == 2
+    assert tracker.recent_count(2) == 1
+    assert tracker.recent_count(3) == 0
+
+
+def test_signatures_are_evicted(tracker, clock):
+    """Expired signatures do not accumulate in memory."""
+    for quantity in range(1, 6):
+        tracker.record(make_movement(quantity=quantity))
+    clock.now += 400
+    tracker.record(make_movement(quantity=99))
+
+    assert len(tracker._signatures) == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_tracker_answers_without_database(tracker, clock):
+    """Once warm, duplicate and frequency checks skip the database."""
+    db = AsyncMock(spec=AsyncSession)
+    validator = MovementValidator(db, rate_tracker=tracker)
+    clock.now += 600
+    for _ in range(11):
+        tracker.record(make_movement())
+
+    result = MovementValidationResult(is_valid=True)
+    await validator._validate_duplicate_prevention(make_movement(), result)
+    await validator._validate_performance_constraints(make_movement(), result)
+
+    db.execute.assert_not_called()
+    assert any("possible duplicate" in w for w in result.warnings)
+    assert any("High frequency" in w for w in result.warnings)
+
+
+@pytest.mark.asyncio
+async def test_cold_tracker_falls_back_to_database(test_session, tracker):
+    """Before the window is covered, checks query movement history."""
+    validator = MovementValidator(test_session, rate_tracker=tracker)
+    result = MovementValidationResult(is_valid=True)
+
+    await validator._validate_duplicate_prevention(make_movement(), result)
+    await validator._validate_performance_constraints(make_movement(), result)
+
+    assert result.warnings == []
+    assert "duplicate_movement_prevention" in result.business_rules_applied
+
+
+@pytest.mark.asyncio
+async def test_only_committed_movements_are_recorded(test_session, tracker):
+    """Movements rolled back with their transaction never reach the tracker."""
+    item = Item(name="Drill", item_type=ItemType.TOOLS)
+    garage = Location(name="Garage", location_type=LocationType.ROOM)
+    attic = Location(name="Attic", location_type=LocationType.ROOM)
+    test_session.add_all([item, garage, attic])
+    await test_session.commit()
+    item_id = item.id
+    movement = MovementHistoryCreate(
+        item_id=item_id, from_location_id=garage.id, to_location_id=attic.id,
+        quantity_moved=2, movement_type="move"
+    )
+    service = MovementService(test_session)
+
+    with patch("app.services.movement_rate_tracker._movement_rate_tracker", tracker):
+        await service.record_movements_batch([movement])
+        assert tracker.recent_count(item_id) == 0
+        await test_session.rollback()
+        assert tracker.recent_count(item_id) == 0
+        assert tracker.has_recent_duplicate(movement) is False
+
+        await service.record_movements_batch([movement])
+        await test_session.commit()
+        assert tracker.recent_count(item_id) == 1
+        assert tracker.has_recent_duplicate(movement) is True
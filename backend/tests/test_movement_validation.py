@@ -5,6 +5,7 @@ Tests business rule validation, movement validation scenarios, and validation re
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
@@ -166,8 +167,9 @@ class TestMovementValidator:
             )
         ]
         
-        # Mock individual validations
-        with patch.object(validator, 'validate_movement_create') as mock_validate:
+        # Mock prefetch and individual validations
+        with patch.object(validator, '_prefetch_bulk_context', new_callable=AsyncMock, return_value=Mock()) as mock_prefetch, \
+             patch.object(validator, '_validate_movement_in_context') as mock_validate:
             mock_validate.side_effect = [
                 MovementValidationResult(is_valid=True),
                 MovementValidationResult(is_valid=False, errors=["Test error"])
@@ -179,6 +181,8 @@ class TestMovementValidator:
             assert individual_results[0].is_valid is True
             assert individual_results[1].is_valid is False
             assert overall_result.is_valid is False  # One failure makes overall invalid
+            # Bulk context is loaded once for the whole batch
+            mock_prefetch.assert_awaited_once_with(movements)
     
     @pytest.mark.asyncio
     async def test_validate_bulk_movement_atomic(self, validator):
@@ -193,7 +197,8 @@ class TestMovementValidator:
             )
         ]
         
-        with patch.object(validator, 'validate_movement_create') as mock_validate:
+        with patch.object(validator, '_prefetch_bulk_context', new_callable=AsyncMock, return_value=Mock()) as mock_prefetch, \
+             patch.object(validator, '_validate_movement_in_context') as mock_validate:
             mock_validate.return_value = MovementValidationResult(is_valid=True)
             
             overall_result, individual_results = await validator.validate_bulk_movement(
@@ -203,6 +208,7 @@ class TestMovementValidator:
             
             assert overall_result.is_valid is True
             assert len(individual_results) == 1
+            mock_prefetch.assert_awaited_once_with(movements)
     
     @pytest.mark.asyncio
     async def test_get_validation_report(self, validator):
@@ -476,4 +482,124 @@ class TestBusinessRuleValidation:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
+
+class TestPrefetchedBulkValidation:
+    """Test bulk validation against prefetched database state."""
+    
+    @pytest_asyncio.fixture
+    async def bulk_setup(self, test_session):
+        """Create an item stocked in one location and an empty second location."""
+        from app.models.item import Item, ItemType
+        from app.models.location import Location, LocationType
+        from app.models.inventory import Inventory
+        
+        shelf = Location(name="Shelf", location_type=LocationType.ROOM)
+        bin_ = Location(name="Bin", location_type=LocationType.ROOM)
+        screws = Item(name="Screws", item_type=ItemType.TOOLS)
+        test_session.add_all([shelf, bin_, screws])
+        await test_session.commit()
+        
+        test_session.add(Inventory(item_id=screws.id, location_id=shelf.id, quantity=10))
+        await test_session.commit()
+        return {"item": screws, "shelf": shelf, "bin": bin_}
+    
+    def _move(self, setup, quantity, from_key="shelf", to_key="bin"):
+        return MovementHistoryCreate(
+            item_id=setup["item"].id,
+            from_location_id=setup[from_key].id,
+            to_location_id=setup[to_key].id,
+            quantity_moved=quantity,
+            movement_type="move"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_cumulative_overdraw_is_rejected(self, test_session, bulk_setup):
+        """Movements that individually fit but together overdraw a location fail."""
+        validator = MovementValidator(test_session)
+        movements = [self._move(bulk_setup, 6), self._move(bulk_setup, 6)]
+        
+        overall_result, individual_results = await validator.validate_bulk_movement(movements)
+        
+        assert individual_results[0].is_valid is True
+        assert individual_results[1].is_valid is False
+        assert any("Insufficient quantity" in e for e in individual_results[1].errors)
+        assert overall_result.is_valid is False
+    
+    @pytest.mark.asyncio
+    async def test_later_movements_see_earlier_effects(self, test_session, bulk_setup):
+        """Stock moved in earlier in the batch can be moved on later in the batch."""
+        validator = MovementValidator(test_session)
+        movements = [
+            self._move(bulk_setup, 4),
+            self._move(bulk_setup, 3, from_key="bin", to_key="shelf"),
+        ]
+        
+        overall_result, individual_results = await validator.validate_bulk_movement(movements)
+        
+        assert [r.is_valid for r in individual_results] == [True, True]
+        assert overall_result.is_valid is True
+    
+    @pytest.mark.asyncio
+    async def test_prefetch_uses_constant_queries(self, test_session, bulk_setup):
+        """Validating a batch issues a fixed number of queries regardless of size."""
+        validator = MovementValidator(test_session)
+        movements = [self._move(bulk_setup, 1) for _ in range(5)]
+        
+        with patch.object(test_session, 'execute', wraps=test_session.execute) as mock_execute:
+            overall_result, individual_results = await validator.validate_bulk_movement(movements)
+        
+        assert mock_execute.call_count == 4
+        assert all(r.is_valid for r in individual_results)
+        # Repeats within the batch are flagged as possible duplicates
+        assert any("possible duplicate" in w for w in individual_results[1].warnings)
+    
+    @pytest.mark.asyncio
+    async def test_missing_entities_reported(self, test_session, bulk_setup):
+        """Unknown items and locations fail without extra queries per movement."""
+        validator = MovementValidator(test_session)
+        movements = [MovementHistoryCreate(
+            item_id=9999,
+            to_location_id=bulk_setup["bin"].id,
+            quantity_moved=1,
+            movement_type="create"
+        )]
+        
+        overall_result, individual_results = await validator.validate_bulk_movement(movements)
+        
+        assert individual_results[0].is_valid is False
+        assert "Item with ID 9999 does not exist" in individual_results[0].errors
+    
+    @pytest.mark.asyncio
+    async def test_timezone_aware_history_is_compared(self, test_session, bulk_setup):
+        """Recent movements read back timezone-aware (as on PostgreSQL) count towards the rules."""
+        from types import SimpleNamespace
+        from datetime import timezone
+        from app.services.movement_validator import BulkValidationContext
+        
+        validator = MovementValidator(test_session)
+        move = self._move(bulk_setup, 1)
+        now = datetime.now(timezone.utc)
+        recent = [
+            SimpleNamespace(
+                item_id=move.item_id, movement_type="move", from_location_id=move.from_location_id,
+                to_location_id=move.to_location_id, quantity_moved=1, created_at=now - timedelta(seconds=5)
+            )
+            for _ in range(11)
+        ]
+        # SQLite returns naive UTC values; both kinds must compare
+        recent.append(SimpleNamespace(**{**vars(recent[0]), "created_at": (now - timedelta(seconds=5)).replace(tzinfo=None)}))
+        context = BulkValidationContext(
+            items={move.item_id: bulk_setup["item"]},
+            locations={bulk_setup["shelf"].id: bulk_setup["shelf"], bulk_setup["bin"].id: bulk_setup["bin"]},
+            inventory={(move.item_id, move.from_location_id): 10},
+            recent_movements=recent,
+            now=now
+        )
+        
+        result = await validator._validate_movement_in_context(move, context)
+        
+        assert result.is_valid is True
+        assert not any("Validation system error" in e for e in result.errors)
+        assert any("possible duplicate" in w for w in result.warnings)
+        assert any("High frequency" in w for w in result.warnings)
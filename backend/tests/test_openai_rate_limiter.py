@@ -0,0 +1,110 @@
+"""
+Tests for the shared OpenAI rate limiter.
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import httpx
+import openai
+import pytest
+
+from app.services.openai_rate_limiter import (
+    PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, OpenAIRateLimiter, openai_priority, parse_reset_duration
+)
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_are_served_before_queued_background_work():
+    """While the queue is paused, a later interactive request overtakes background ones."""
+    limiter = OpenAIRateLimiter()
+    limiter.on_rate_limited({"retry-after-ms": "50"})
+    order = []
+
+    async def request(name, priority):
+        with openai_priority(priority):
+            await limiter.acquire(tokens=10)
+        order.append(name)
+
+    tasks = [asyncio.create_task(request("sync-1", PRIORITY_BACKGROUND)),
+             asyncio.create_task(request("sync-2", PRIORITY_BACKGROUND))]
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queues"]["background"]["depth"] == 2
+    tasks.append(asyncio.create_task(request("user", PRIORITY_INTERACTIVE)))
+    await asyncio.gather(*tasks)
+
+    assert order == ["user", "sync-1", "sync-2"]
+    stats = limiter.stats()
+    assert stats["queues"]["interactive"]["granted"] == 1
+    assert stats["queues"]["background"]["wait_avg_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_token_budget_refills_and_usage_corrections():
+    """Requests wait for tokens; reported usage refunds over-estimates."""
+    limiter = OpenAIRateLimiter(tokens_per_minute=60000)
+    await limiter.acquire(tokens=60000)
+
+    started = time.monotonic()
+    await limiter.acquire(tokens=50)
+    assert time.monotonic() - started >= 0.03
+
+    limiter.record_usage(reserved=60000, used=100)
+    started = time.monotonic()
+    await limiter.acquire(tokens=1000)
+    assert time.monotonic() - started < 0.02
+
+    # Cancelled waiters leave the queue
+    await limiter.acquire(tokens=limiter.stats()["tokens_available"])
+    waiter = asyncio.create_task(limiter.acquire(tokens=30000))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.stats()["queues"]["interactive"]["depth"] == 0
+
+
+def test_rate_limit_headers_drive_backoff():
+    """Reset headers are parsed; 429s back off exponentially until a success."""
+    assert parse_reset_duration("6m0s") == 360
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("1.5") == 1.5
+    assert parse_reset_duration("soon") is None
+
+    limiter = OpenAIRateLimiter(max_backoff_seconds=3)
+    assert [limiter.on_rate_limited() for _ in range(4)] == [1, 2, 3, 3]
+    assert limiter.on_rate_limited({"retry-after": "7"}) == 7
+
+    limiter = OpenAIRateLimiter(requests_per_minute=100)
+    limiter.update_from_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"})
+    stats = limiter.stats()
+    assert stats["requests_available"] < 1
+    assert 1 < stats["paused_seconds"] <= 2
+    assert limiter.on_rate_limited() == 1
+
+
+@pytest.mark.asyncio
+async def test_call_retries_rate_limited_requests():
+    """A 429 pauses the queue and the request is retried; usage is recorded."""
+    limiter = OpenAIRateLimiter(tokens_per_minute=1000)
+    rate_limited = openai.RateLimitError(
+        "Rate limit reached",
+        response=httpx.Response(429, headers={"retry-after-ms": "10"}, request=httpx.Request("POST", "http://api")),
+        body=None
+    )
+    parsed = Mock(usage=Mock(total_tokens=40))
+    raw = Mock(headers={"x-ratelimit-remaining-tokens": "500"}, parse=Mock(return_value=parsed))
+    attempts = []
+
+    async def request():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise rate_limited
+        return raw
+
+    assert await limiter.call(request, tokens=200) is parsed
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.009
+    assert limiter.stats()["rate_limited"] == 1
+    assert limiter.stats()["tokens_available"] == pytest.approx(500 + 200 - 40, abs=5)
@@ -54,31 +54,28 @@ class TestQueryOptimizer:
     
     @pytest.mark.asyncio
     async def test_check_missing_indexes(self, optimizer):
-        """Test missing index detection."""
+        """Test missing index detection outside PostgreSQL."""
         missing_indexes = await optimizer._check_missing_indexes()
         
-        assert isinstance(missing_indexes, list)
-        assert len(missing_indexes) > 0
-        
-        # Check structure of returned indexes
-        for index in missing_indexes:
-            assert "table" in index
-            assert "columns" in index
-            assert "type" in index
-            assert "reason" in index
+        # Recommendations come from PostgreSQL statistics; other databases get none
+        assert missing_indexes == []
     
     @pytest.mark.asyncio
     async def test_create_recommended_indexes(self, optimizer):
-        """Test index creation."""
-        # Mock successful index creation
-        optimizer.db.execute.return_value = None
-        optimizer.db.commit.return_value = None
-        
-        created_indexes = await optimizer.create_recommended_indexes()
-        
-        assert isinstance(created_indexes, list)
-        # Should attempt to create multiple indexes
-        assert len(created_indexes) >= 0
+        """Test index creation queues a build job for the given indexes."""
+        with patch('app.services.job_service.JobService') as mock_job_service:
+            mock_job_service.return_value.create_job = AsyncMock(return_value=Mock(id=7))
+            
+            job = await optimizer.create_recommended_indexes(
+                [{"table": "items", "columns": ["status"]}]
+            )
+        
+        assert job.id == 7
+        mock_job_service.return_value.create_job.assert_awaited_once_with(
+            "index_build", {"indexes": [{"table": "items", "columns": ["status"]}]}
+        )
+        # Nothing is queued when nothing is recommended
+        assert await optimizer.create_recommended_indexes() is None
 
 
 class TestPerformanceCache:
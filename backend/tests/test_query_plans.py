@@ -0,0 +1,349 @@
+"""
+Query-plan regression tests for the hot read paths.
+
+Seeds a realistic dataset, runs the InventoryService, MovementService and
+ItemService methods and the search endpoints' database queries against it,
+records every statement they execute and checks its plan:
+
+* no statement may read a large table with a full scan (an index walk that
+  stops at a LIMIT is fine);
+* cases can require indexes by name, so losing ``ix_inventory_item_location``
+  or the movement history index fails here instead of in production;
+* on PostgreSQL, the rows the plan's scans are estimated to read must stay
+  within the case's budget. SQLite's ``EXPLAIN QUERY PLAN`` has no row
+  estimates, so there only the first two checks apply.
+
+The cases run on in-memory SQLite. Set ``QUERY_PLAN_POSTGRES_URL`` to a
+scratch PostgreSQL database (``postgresql+asyncpg://...``) to run them there as
+well; its tables are dropped and recreated.
+"""
+
+import json
+import os
+import random
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.search import hybrid_search, semantic_search
+from app.database.base import Base
+from app.models import Category, Inventory, Item, ItemType, Location, LocationType
+from app.models.item import ItemCondition, ItemStatus
+from app.models.item_movement_history import ItemMovementHistory
+from app.schemas.inventory import InventoryMove, InventorySearch
+from app.schemas.item import HybridSearchRequest, ItemSearch, SemanticSearchRequest
+from app.schemas.movement_history import MovementHistorySearch
+from app.services.inventory_service import InventoryService
+from app.services.item_service import ItemService
+from app.services.movement_service import MovementService
+
+pytestmark = pytest.mark.asyncio
+
+POSTGRES_URL = os.getenv("QUERY_PLAN_POSTGRES_URL")
+
+ITEMS = 5000
+LOCATIONS_PER_ROOM = 6
+MOVEMENTS = 15000
+# Tables with at least this many seeded rows must never be read by a full scan
+LARGE_TABLE_ROWS = 500
+
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?")
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+_EXPLAINED = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+async def _seed(session_factory) -> Dict[str, Any]:
+    """Insert a house of rooms and containers, categorized items, their inventory and movements."""
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        house = Location(name="House", location_type=LocationType.HOUSE)
+        session.add(house)
+        await session.flush()
+        rooms = [Location(name=f"Room {n}", location_type=LocationType.ROOM, parent_id=house.id) for n in range(10)]
+        session.add_all(rooms)
+        await session.flush()
+        containers = [
+            Location(name=f"{room.name} shelf {n}", location_type=LocationType.SHELF, parent_id=room.id)
+            for room in rooms for n in range(LOCATIONS_PER_ROOM)
+        ]
+        session.add_all(containers)
+        categories = [Category(name=f"Category {n}") for n in range(12)]
+        session.add_all(categories)
+        await session.flush()
+        location_ids = [location.id for location in rooms + containers]
+        category_ids = [category.id for category in categories]
+
+        item_types = list(ItemType)
+        await session.execute(insert(Item), [
+            {
+                "name": f"Item {n}",
+                "description": f"Seeded item {n}",
+                "item_type": item_types[n % len(item_types)],
+                "condition": rng.choice(list(ItemCondition)),
+                "status": ItemStatus.AVAILABLE if n % 10 else ItemStatus.IN_USE,
+                "brand": f"Brand {n % 40}",
+                "category_id": category_ids[n % len(category_ids)],
+                "current_value": Decimal(rng.randint(1, 2000)),
+                "is_active": n % 50 != 49,
+                "version": 1,
+            }
+            for n in range(ITEMS)
+        ])
+        item_ids = list((await session.execute(select(Item.id).order_by(Item.id))).scalars())
+
+        inventory = []
+        for item_id in item_ids:
+            for location_id in rng.sample(location_ids, 2 if item_id % 5 == 0 else 1):
+                inventory.append({"item_id": item_id, "location_id": location_id, "quantity": rng.randint(1, 5)})
+        await session.execute(insert(Inventory), inventory)
+
+        await session.execute(insert(ItemMovementHistory), [
+            {
+                "item_id": rng.choice(item_ids),
+                "from_location_id": rng.choice(location_ids),
+                "to_location_id": rng.choice(location_ids),
+                "quantity_moved": 1,
+                "movement_type": "move",
+                "created_at": now - timedelta(minutes=n),
+            }
+            for n in range(MOVEMENTS)
+        ])
+        await session.commit()
+
+        # An item stored in two places, to move between them
+        moved = (await session.execute(
+            select(Inventory.item_id).group_by(Inventory.item_id).having(func.count() > 1).limit(1)
+        )).scalar_one()
+        moved_locations = list((await session.execute(
+            select(Inventory.location_id).where(Inventory.item_id == moved)
+        )).scalars())
+
+    return {
+        "item_id": item_ids[len(item_ids) // 2],
+        "item_ids": item_ids[100:120],
+        "location_id": containers[3].id,
+        "category_id": category_ids[2],
+        "moved_item_id": moved,
+        "moved_locations": moved_locations,
+    }
+
+
+@pytest_asyncio.fixture(scope="module", params=["sqlite", "postgresql"])
+async def plan_db(request):
+    """Seeded database, with the tables large enough that a full scan is a regression."""
+    if request.param == "sqlite":
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    elif POSTGRES_URL:
+        engine = create_async_engine(POSTGRES_URL)
+    else:
+        pytest.skip("Set QUERY_PLAN_POSTGRES_URL to check plans on PostgreSQL")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    data = await _seed(session_factory)
+    async with engine.begin() as conn:
+        # Planner statistics, as a maintained production database has them
+        await conn.exec_driver_sql("ANALYZE")
+        counts = {
+            table.name: (await conn.execute(select(func.count()).select_from(table))).scalar()
+            for table in Base.metadata.sorted_tables
+        }
+
+    yield SimpleNamespace(
+        engine=engine,
+        dialect=engine.dialect.name,
+        session_factory=session_factory,
+        large_tables={name for name, count in counts.items() if count >= LARGE_TABLE_ROWS},
+        **data
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+class FakeWeaviate:
+    """Vector search returning fixed item IDs."""
+
+    def __init__(self, item_ids: Optional[List[int]]):
+        self.item_ids = item_ids
+
+    async def search_available(self) -> bool:
+        return self.item_ids is not None
+
+    async def semantic_search(self, **kwargs):
+        return [SimpleNamespace(postgres_id=item_id, score=0.9) for item_id in self.item_ids or []]
+
+
+@dataclass
+class PlanCase:
+    """A hot code path and what its statements' plans must look like."""
+
+    name: str
+    run: Callable[[Any, SimpleNamespace], Awaitable[Any]]
+    # Index names that must appear in some plan; "a|b" accepts either
+    indexes: Tuple[str, ...] = ()
+    # PostgreSQL only: most rows the scans of any one statement may be estimated to read
+    row_budget: int = 500
+    # Large tables this path is expected to scan (e.g. substring search)
+    allow_full_scans: Tuple[str, ...] = ()
+
+
+CASES = [
+    PlanCase(
+        "inventory_item_locations",
+        lambda session, db: InventoryService(session).get_item_locations(db.item_id),
+        indexes=("ix_inventory_item_location|ix_inventory_item_id",),
+    ),
+    PlanCase(
+        "inventory_location_items",
+        lambda session, db: InventoryService(session).get_location_items(db.location_id),
+        indexes=("ix_inventory_location_id",),
+    ),
+    PlanCase(
+        "inventory_search_by_location",
+        lambda session, db: InventoryService(session).search_inventory(InventorySearch(location_id=db.location_id)),
+        indexes=("ix_inventory_location_id",),
+    ),
+    PlanCase(
+        "inventory_move",
+        lambda session, db: InventoryService(session).move_item(
+            db.moved_item_id,
+            InventoryMove(from_location_id=db.moved_locations[0], to_location_id=db.moved_locations[1], quantity=1)
+        ),
+        indexes=("ix_inventory_item_location",),
+    ),
+    PlanCase(
+        "movement_history_for_item",
+        lambda session, db: MovementService(session).get_movement_history(MovementHistorySearch(item_id=db.item_id)),
+        indexes=("ix_item_movement_history_item_timestamp|ix_item_movement_history_item_id",),
+    ),
+    PlanCase(
+        "movement_timeline",
+        lambda session, db: MovementService(session).get_item_movement_timeline(db.item_id),
+        indexes=("ix_item_movement_history_item_timestamp|ix_item_movement_history_item_id",
+                 "ix_inventory_item_location|ix_inventory_item_id"),
+    ),
+    PlanCase(
+        "item_by_id",
+        lambda session, db: ItemService(session).get_item_by_id(db.item_id),
+        indexes=("ix_inventory_item_location|ix_inventory_item_id",),
+    ),
+    PlanCase(
+        "item_search_by_category",
+        lambda session, db: ItemService(session).search_items(
+            ItemSearch(category_id=db.category_id, limit=50)
+        ),
+        indexes=("ix_items_category_id",),
+    ),
+    PlanCase(
+        "semantic_search_items",
+        lambda session, db: semantic_search(
+            SemanticSearchRequest(query="drill"), session=session, weaviate_service=FakeWeaviate(db.item_ids)
+        ),
+        indexes=("ix_inventory_item_location|ix_inventory_item_id",),
+    ),
+    PlanCase(
+        "hybrid_search_text_fallback",
+        lambda session, db: hybrid_search(
+            HybridSearchRequest(query="seeded", filters=ItemSearch(category_id=db.category_id)),
+            session=session, weaviate_service=FakeWeaviate(None)
+        ),
+        indexes=("ix_items_category_id",),
+    ),
+]
+
+
+async def _record(db: SimpleNamespace, case: PlanCase) -> List[Tuple[str, Any]]:
+    """Run a case and return the statements it executed with their parameters."""
+    statements: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(_EXPLAINED):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        async with db.session_factory() as session:
+            await case.run(session, db)
+    finally:
+        event.remove(db.engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def _check_sqlite_plan(details: List[str], statement: str, db, case) -> Tuple[List[str], List[str]]:
+    problems, indexes = [], []
+    for detail in details:
+        indexes.extend(_SQLITE_INDEX.findall(detail))
+        scan = _SQLITE_SCAN.match(detail)
+        if scan is None or scan.group(1) not in db.large_tables or scan.group(1) in case.allow_full_scans:
+            continue
+        # Walking an index in order is fine when a LIMIT stops it early
+        if scan.group(2) and re.search(r"\bLIMIT\b", statement, re.IGNORECASE):
+            continue
+        problems.append(f"full scan: {detail}")
+    return problems, indexes
+
+
+def _check_postgres_plan(plan: Dict[str, Any], db, case) -> Tuple[List[str], List[str]]:
+    problems, indexes = [], []
+    scanned_rows = 0
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("Plans", []))
+        if "Index Name" in node:
+            indexes.append(node["Index Name"])
+        if node["Node Type"].endswith("Scan"):
+            scanned_rows += node.get("Plan Rows", 0)
+        table = node.get("Relation Name")
+        if node["Node Type"] in ("Seq Scan", "Parallel Seq Scan") and table in db.large_tables \
+                and table not in case.allow_full_scans:
+            problems.append(f"full scan: Seq Scan on {table}")
+    if scanned_rows > case.row_budget:
+        problems.append(f"scans estimated to read {scanned_rows} rows (budget {case.row_budget})")
+    return problems, indexes
+
+
+async def _explain(db: SimpleNamespace, statements: List[Tuple[str, Any]], case: PlanCase):
+    problems: List[str] = []
+    used_indexes: set = set()
+    async with db.engine.connect() as conn:
+        for statement, parameters in statements:
+            if db.dialect == "sqlite":
+                rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+                found, indexes = _check_sqlite_plan([row[-1] for row in rows], statement, db, case)
+            else:
+                output = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+                output = json.loads(output) if isinstance(output, str) else output
+                found, indexes = _check_postgres_plan(output[0]["Plan"], db, case)
+            used_indexes.update(indexes)
+            problems.extend(f"{problem}\n    in: {' '.join(statement.split())[:300]}" for problem in found)
+        await conn.rollback()
+    return problems, used_indexes
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+async def test_hot_query_plans(plan_db, case):
+    """Hot paths keep using their indexes and never fall back to full scans of large tables."""
+    statements = await _record(plan_db, case)
+    assert statements, f"{case.name} executed no statements"
+
+    problems, used_indexes = await _explain(plan_db, statements, case)
+    for required in case.indexes:
+        if not used_indexes.intersection(required.split("|")):
+            problems.append(f"expected index {required} is not used (used: {', '.join(sorted(used_indexes)) or 'none'})")
+
+    assert not problems, f"{case.name} on {plan_db.dialect}:\n" + "\n".join(problems)
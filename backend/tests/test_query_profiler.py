@@ -0,0 +1,57 @@
+"""
+Tests for the per-request query profiler.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.database.base import async_session, engine
+from app.models.item import Item, ItemType
+from app.performance.query_profiler import (
+    QueryProfileStore, QueryProfilerMiddleware, normalize_sql, profile_engine
+)
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    """Statements differing only in values share one fingerprint."""
+    assert normalize_sql("SELECT * FROM items WHERE id = 12 AND name = 'O''Brien'") == \
+        "SELECT * FROM items WHERE id = ? AND name = ?"
+    assert normalize_sql("SELECT *\n  FROM items WHERE id IN ($1, $2, $3) LIMIT :limit_1") == \
+        "SELECT * FROM items WHERE id IN (?) LIMIT ?"
+    assert normalize_sql("SELECT t1.id FROM items t1 WHERE t1.id IN (?, ?)") == \
+        "SELECT t1.id FROM items t1 WHERE t1.id IN (?)"
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_flagged_as_n_plus_one(test_session):
+    """Each request reports its statements in a header and the store flags repeated fingerprints."""
+    test_session.add_all([Item(name=f"Item {index}", item_type=ItemType.TOOLS) for index in range(6)])
+    await test_session.commit()
+
+    app = FastAPI()
+    store = QueryProfileStore(window=10)
+    app.add_middleware(QueryProfilerMiddleware, store=store, n_plus_one_threshold=5)
+    profile_engine(engine)
+
+    @app.get("/items/{count}")
+    async def load_items(count: int):
+        async with async_session() as session:
+            for item_id in range(1, count + 1):
+                await session.execute(select(Item).where(Item.id == item_id))
+        return {"loaded": count}
+
+    client = TestClient(app)
+    many = client.get("/items/6")
+    few = client.get("/items/2")
+
+    assert many.headers["x-query-profile"].startswith("statements=6;")
+    assert many.headers["x-query-profile"].endswith(";n_plus_one=1")
+    assert few.headers["x-query-profile"].endswith(";n_plus_one=0")
+
+    [row] = store.report()
+    assert row["endpoint"] == "GET /items/{count}"
+    assert (row["requests"], row["max_statements"], row["n_plus_one_requests"]) == (2, 6, 1)
+    [pattern] = row["n_plus_one_patterns"]
+    assert pattern["max_count"] == 6 and pattern["statement"].endswith("WHERE items.id = ?")
@@ -0,0 +1,35 @@
+"""
+Tests for the offline search evaluation harness.
+"""
+
+import pytest
+from benchmarks.corpus import generate_items, generate_queries
+from benchmarks.search_eval import reciprocal_rank, run_evaluation
+
+
+def test_corpus_labels_follow_filters():
+    """Filtered queries only label items matching the brand filter."""
+    items = generate_items(seed=1, items_per_concept=3)
+    assert [item.fields["name"] for item in items] == [item.fields["name"] for item in generate_items(1, 3)]
+    for index, item in enumerate(items):
+        item.id = index + 1
+
+    for query in generate_queries(items, filtered=True):
+        assert query.relevant
+        assert all(item.fields["brand"] == query.filters.get("brand", item.fields["brand"]) for item in query.relevant)
+    assert reciprocal_rank([5, 3, 9], [9, 3]) == 0.5
+
+
+@pytest.mark.asyncio
+async def test_run_evaluation_reports_both_endpoints():
+    """The harness runs the real endpoints offline and scores them."""
+    report = await run_evaluation(items_per_concept=2, runs=1, certainty=0.55)
+
+    assert report["corpus"]["items"] == 50
+    assert [row["endpoint"] for row in report["endpoints"]] == ["semantic", "hybrid"]
+    for row in report["endpoints"]:
+        assert 0.0 <= row["recall_at_k"] <= 1.0
+        assert 0.0 <= row["mrr"] <= 1.0
+        assert row["latency_p95_ms"] >= row["latency_p50_ms"] > 0
+    # Exact-name queries alone make lexical retrieval far better than chance
+    assert report["endpoints"][0]["mrr"] > 0.5
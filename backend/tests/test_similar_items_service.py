@@ -0,0 +1,144 @@
+"""
+Tests for precomputed similar-items lists and their incremental refresh.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from sqlalchemy import select
+
+from app.models.item import Item, ItemType
+from app.models.item_similarity import ItemSimilarity
+from app.services.similar_items_service import SimilarItemsService
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeVectorIndex:
+    """Weaviate double answering similarity queries from a symmetric score table."""
+
+    def __init__(self):
+        self.scores = {}
+        self.queries = []
+        self.unavailable = False
+
+    def set_score(self, a, b, score):
+        self.scores[frozenset((a, b))] = score
+
+    async def find_similar_items(self, item_id, limit=5):
+        if self.unavailable:
+            raise ConnectionError("index unavailable")
+        self.queries.append(item_id)
+        matches = [
+            (next(iter(pair - {item_id})), score)
+            for pair, score in self.scores.items() if item_id in pair
+        ]
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return [Mock(postgres_id=pid, score=score) for pid, score in matches[:limit]]
+
+
+async def seed_items(session, count):
+    items = [Item(name=f"Item {i}", item_type=ItemType.TOOLS) for i in range(count)]
+    session.add_all(items)
+    await session.commit()
+    return [item.id for item in items]
+
+
+async def stored_lists(session):
+    result = await session.execute(
+        select(ItemSimilarity.item_id, ItemSimilarity.similar_item_id)
+        .order_by(ItemSimilarity.item_id, ItemSimilarity.rank)
+    )
+    lists = {}
+    for owner, neighbour in result:
+        lists.setdefault(owner, []).append(neighbour)
+    return lists
+
+
+async def test_refresh_builds_list_and_serves_in_rank_order(test_session):
+    """An item's list is stored by score and read back with the items loaded."""
+    a, b, c, d = await seed_items(test_session, 4)
+    index = FakeVectorIndex()
+    index.set_score(a, b, 0.7)
+    index.set_score(a, c, 0.9)
+    index.set_score(a, d, 0.8)
+    service = SimilarItemsService(test_session, index, k=2)
+
+    await service.refresh_item(a)
+
+    similar = await service.get_similar_items(a, limit=5)
+    assert [s.similar_item_id for s in similar] == [c, d]
+    assert similar[0].similar_item.name == "Item 2"
+    assert [s.similar_item_id for s in await service.get_similar_items(a, limit=1)] == [c]
+
+
+async def test_refresh_updates_only_affected_lists(test_session):
+    """A changed item is merged into neighbours' lists and only dropped owners are re-queried."""
+    a, b, c, d = await seed_items(test_session, 4)
+    index = FakeVectorIndex()
+    index.set_score(a, b, 0.9)
+    index.set_score(b, c, 0.8)
+    index.set_score(c, d, 0.7)
+    index.set_score(b, d, 0.2)
+    service = SimilarItemsService(test_session, index, k=2)
+    for item_id in (a, b, c, d):
+        await service.refresh_item(item_id)
+    assert (await stored_lists(test_session))[b] == [a, c]
+
+    # a's embedding moves: now close to d and far from b
+    index.scores.clear()
+    index.set_score(a, d, 0.95)
+    index.set_score(a, b, 0.1)
+    index.set_score(b, c, 0.8)
+    index.set_score(c, d, 0.7)
+    index.set_score(b, d, 0.2)
+    index.queries.clear()
+
+    await service.refresh_item(a)
+
+    lists = await stored_lists(test_session)
+    assert lists[a] == [d, b]
+    assert lists[d] == [a, c]
+    assert lists[b] == [c, d]
+    # d was updated from the known score; b's score for a dropped, so b was re-queried
+    assert sorted(index.queries) == sorted([a, b])
+
+
+async def test_remove_item_recomputes_owner_lists(test_session):
+    """Deleting an item drops it from every list and backfills the owners."""
+    a, b, c = await seed_items(test_session, 3)
+    index = FakeVectorIndex()
+    index.set_score(a, b, 0.9)
+    index.set_score(a, c, 0.5)
+    index.set_score(b, c, 0.4)
+    service = SimilarItemsService(test_session, index, k=1)
+    for item_id in (a, b, c):
+        await service.refresh_item(item_id)
+
+    del index.scores[frozenset((a, b))]
+    del index.scores[frozenset((a, c))]
+    await service.apply_embedding_changes([], [a])
+
+    lists = await stored_lists(test_session)
+    assert a not in lists
+    assert lists[b] == [c]
+    assert lists[c] == [b]
+
+
+async def test_failed_vector_query_keeps_stored_lists(test_session):
+    """An index outage during a refresh leaves existing lists as they were."""
+    a, b, c = await seed_items(test_session, 3)
+    index = FakeVectorIndex()
+    index.set_score(a, b, 0.9)
+    index.set_score(a, c, 0.5)
+    service = SimilarItemsService(test_session, index, k=2)
+    for item_id in (a, b, c):
+        await service.refresh_item(item_id)
+    before = await stored_lists(test_session)
+
+    index.unavailable = True
+    with pytest.raises(ConnectionError):
+        await service.apply_embedding_changes([a], [])
+    await test_session.rollback()
+
+    assert await stored_lists(test_session) == before
@@ -0,0 +1,40 @@
+"""
+Tests for vector dimension reduction helpers and the index benchmark metrics.
+"""
+
+import json
+
+import pytest
+
+from app.services.vector_index_benchmark import load_labeled_queries, parse_settings, recall_at_k
+from app.services.weaviate_service import truncate_embedding
+
+
+def test_truncate_embedding_renormalises():
+    """Truncated vectors keep the leading values and unit length."""
+    vector = truncate_embedding([3.0, 4.0, 12.0], 2)
+    assert vector == pytest.approx([0.6, 0.8])
+    with pytest.raises(ValueError):
+        truncate_embedding([1.0, 0.0], 3)
+
+
+def test_recall_at_k():
+    """Recall counts relevant hits in the top k, capped at k relevant items."""
+    assert recall_at_k([1, 2, 3], [2, 9], k=3) == 0.5
+    assert recall_at_k([1, 2], [1, 2, 3, 4], k=2) == 1.0
+    assert recall_at_k([5, 1], [1], k=1) == 0.0
+    assert recall_at_k([1, 2], [], k=2) is None
+
+
+def test_parse_settings_and_queries(tmp_path):
+    """Settings specs and query files are parsed and validated."""
+    assert parse_settings("1536:none, 512:pq,256") == [(1536, "none"), (512, "pq"), (256, "none")]
+    with pytest.raises(ValueError):
+        parse_settings("512:sq")
+
+    path = tmp_path / "queries.json"
+    path.write_text(json.dumps([{"query": "cordless drill", "relevant_ids": [4, "7"]}, {"query": "tent"}]))
+    queries = load_labeled_queries(str(path))
+    assert [q.query for q in queries] == ["cordless drill", "tent"]
+    assert queries[0].relevant_ids == [4, 7]
+    assert queries[1].relevant_ids == []
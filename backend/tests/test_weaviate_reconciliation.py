@@ -0,0 +1,125 @@
+"""
+Tests for reconciling the items table with the Weaviate index.
+"""
+
+import pytest
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+from sqlalchemy import select
+
+from app.models.inventory import Inventory
+from app.models.item import Item, ItemType
+from app.models.job import Job
+from app.models.weaviate_sync_outbox import WeaviateSyncOutbox
+from app.services.weaviate_reconciliation_service import (
+    WEAVIATE_RECONCILE_JOB, WeaviateReconciler, run_reconciliation_schedule
+)
+from app.services.weaviate_service import item_content_hash
+
+pytestmark = pytest.mark.asyncio
+
+
+def fake_weaviate_with(states):
+    """Weaviate double whose index holds the given (postgres_id, hash, updated_at) states."""
+    async def iter_item_states(page_size=500):
+        for state in sorted(states, key=lambda s: s[0]):
+            yield state
+
+    service = Mock()
+    service.health_check = AsyncMock(return_value=True)
+    service.iter_item_states = iter_item_states
+    return service
+
+
+def reconciler_for(service, **kwargs):
+    async def get_service():
+        return service
+    return WeaviateReconciler(weaviate_service_getter=get_service, **kwargs)
+
+
+async def seed_items(session):
+    items = [Item(name=name, item_type=ItemType.TOOLS) for name in ["Drill", "Saw", "Hammer", "Level"]]
+    items.append(Item(name="Retired", item_type=ItemType.TOOLS, is_active=False))
+    session.add_all(items)
+    await session.commit()
+    return [(item.id, item_content_hash(item), item.updated_at) for item in items]
+
+
+async def test_reconcile_queues_only_drift(test_session):
+    """Missing and stale objects are upserted, orphans deleted, matches left alone."""
+    drill, saw, hammer, level, retired = await seed_items(test_session)
+    index = [
+        drill,                                   # in sync
+        (saw[0], "outdated-hash", saw[2]),       # stale content
+        (hammer[0], hammer[1], hammer[2] - timedelta(minutes=5)),  # missed update
+        (retired[0], retired[1], retired[2]),    # deactivated item
+        (level[0] + 1000, "x", None),            # deleted item
+    ]
+
+    counts = await reconciler_for(fake_weaviate_with(index), page_size=2).reconcile()
+
+    assert counts["in_sync"] == 1
+    assert counts["stale"] == 2
+    assert counts["missing"] == 1
+    assert counts["orphaned"] == 2
+    test_session.expire_all()
+    rows = (await test_session.execute(select(WeaviateSyncOutbox))).scalars().all()
+    assert sorted((row.item_id, row.operation) for row in rows) == sorted([
+        (saw[0], "upsert"), (hammer[0], "upsert"), (level[0], "upsert"),
+        (retired[0], "delete"), (level[0] + 1000, "delete"),
+    ])
+
+
+async def test_dry_run_and_duplicates(test_session):
+    """Dry runs queue nothing; repeated objects for one item are counted as duplicates."""
+    drill, saw, hammer, level, _ = await seed_items(test_session)
+    index = [drill, drill, saw, hammer, level]
+
+    counts = await reconciler_for(fake_weaviate_with(index)).reconcile(dry_run=True)
+
+    assert counts["in_sync"] == 4
+    assert counts["duplicates"] == 1
+    assert counts["upserts_queued"] == counts["deletes_queued"] == 0
+    rows = (await test_session.execute(select(WeaviateSyncOutbox))).scalars().all()
+    assert rows == []
+
+
+async def test_reconcile_requires_weaviate(test_session):
+    service = fake_weaviate_with([])
+    service.health_check.return_value = False
+    with pytest.raises(RuntimeError):
+        await reconciler_for(service).reconcile()
+
+
+async def test_category_and_location_renames_are_stale(test_session, sample_category, sample_location):
+    """Names stored in the embedding text are hashed, so renaming them marks the object stale."""
+    item = Item(name="Laptop", item_type=ItemType.ELECTRONICS, category_id=sample_category.id)
+    test_session.add(item)
+    await test_session.commit()
+    test_session.add(Inventory(item_id=item.id, location_id=sample_location.id, quantity=1))
+    await test_session.commit()
+    indexed = (item.id, item_content_hash(item, "Electronics", ["Test Room"]), item.updated_at)
+
+    counts = await reconciler_for(fake_weaviate_with([indexed])).reconcile(dry_run=True)
+    assert counts["in_sync"] == 1
+
+    sample_location.name = "Office"
+    await test_session.commit()
+    counts = await reconciler_for(fake_weaviate_with([indexed])).reconcile(dry_run=True)
+    assert counts["stale"] == 1
+
+    sample_location.name = "Test Room"
+    sample_category.name = "Computers"
+    await test_session.commit()
+    counts = await reconciler_for(fake_weaviate_with([indexed])).reconcile(dry_run=True)
+    assert counts["stale"] == 1
+
+
+async def test_schedule_queues_a_run_at_startup(test_session):
+    """The first reconciliation is queued immediately rather than after one interval."""
+    with patch("app.services.weaviate_reconciliation_service.asyncio.sleep", AsyncMock(side_effect=RuntimeError)):
+        with pytest.raises(RuntimeError):
+            await run_reconciliation_schedule(interval_hours=24)
+
+    rows = (await test_session.execute(select(Job))).scalars().all()
+    assert [row.job_type for row in rows] == [WEAVIATE_RECONCILE_JOB]
@@ -6,6 +6,7 @@ import pytest
 import asyncio
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
+from types import SimpleNamespace
 import sys
 
 # Mock weaviate module before importing service
@@ -14,7 +15,7 @@ sys.modules['weaviate.exceptions'] = MagicMock()
 sys.modules['sentence_transformers'] = MagicMock()
 
 from app.services.weaviate_service import (
-    WeaviateService, WeaviateConfig, WeaviateSearchResult
+    WeaviateService, WeaviateConfig, WeaviateSearchResult, item_object_uuid, quantization_name
 )
 from app.models.item import Item, ItemType
 from app.models.location import Location, LocationType
@@ -187,7 +188,7 @@ class TestWeaviateService:
         
         # Mock collection methods
         collection = Mock()
-        collection.data.insert = Mock()
+        collection.data.replace = Mock()
         mock_weaviate_client.collections.get.return_value = collection
         
         # Mock health check
@@ -200,7 +201,8 @@ class TestWeaviateService:
             
             assert result is True
             mock_embedding_model.encode.assert_called_once()
-            collection.data.insert.assert_called_once()
+            collection.data.replace.assert_called_once()
+            assert collection.data.replace.call_args.kwargs["uuid"] == item_object_uuid(sample_item.id)
     
     @pytest.mark.asyncio
     async def test_create_item_embedding_health_check_fail(
@@ -319,8 +321,6 @@ class TestWeaviateService:
         # Mock target item fetch
         target_obj = Mock()
         target_obj.vector = [0.1, 0.2, 0.3]
-        target_response = Mock()
-        target_response.objects = [target_obj]
         
         # Mock similar items response
         similar_obj = Mock()
@@ -333,7 +333,7 @@ class TestWeaviateService:
         similar_response.objects = [similar_obj]
         
         collection = Mock()
-        collection.query.fetch_objects.return_value = target_response
+        collection.query.fetch_object_by_id.return_value = target_obj
         collection.query.near_vector.return_value = similar_response
         mock_weaviate_client.collections.get.return_value = collection
         
@@ -351,43 +351,161 @@ class TestWeaviateService:
         service = WeaviateService(weaviate_config)
         service._client = mock_weaviate_client
         
-        # Mock finding and deleting item
-        mock_obj = Mock()
-        mock_obj.uuid = "test-uuid"
-        mock_response = Mock()
-        mock_response.objects = [mock_obj]
-        
         collection = Mock()
-        collection.query.fetch_objects.return_value = mock_response
-        collection.data.delete_by_id = Mock()
+        collection.data.delete_by_id = Mock(return_value=True)
         mock_weaviate_client.collections.get.return_value = collection
         
         with patch.object(service, 'health_check', return_value=True):
             result = await service.delete_item_embedding(1)
             
             assert result is True
-            collection.data.delete_by_id.assert_called_once_with("test-uuid")
+            # Deletes go straight to the deterministic UUID without a lookup
+            collection.data.delete_by_id.assert_called_once_with(item_object_uuid(1))
+            collection.query.fetch_objects.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_batch_create_embeddings(
-        self, weaviate_config, sample_item
+        self, weaviate_config, mock_weaviate_client, sample_item
     ):
         """Test batch embedding creation."""
         service = WeaviateService(weaviate_config)
+        service._client = mock_weaviate_client
         
         items_data = [
             (sample_item, "Electronics", ["Room 1"]),
             (sample_item, "Electronics", ["Room 2"])
         ]
         
-        # Mock health check and create_item_embedding
+        collection = Mock()
+        collection.data.insert_many.return_value = Mock(errors={})
+        mock_weaviate_client.collections.get.return_value = collection
+        
+        # Mock health check and embedding generation
         with patch.object(service, 'health_check', return_value=True):
-            with patch.object(service, 'create_item_embedding', return_value=True):
+            with patch.object(service, '_create_embeddings', AsyncMock(return_value=[[0.1, 0.2], [0.1, 0.2]])) as create:
                 stats = await service.batch_create_embeddings(items_data)
                 
+                # Texts are embedded in one provider call
+                create.assert_awaited_once()
+                
                 assert stats["success"] == 2
                 assert stats["failed"] == 0
                 assert stats["skipped"] == 0
+                # All objects are written in one batch request
+                collection.data.insert_many.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_semantic_search_pushes_filters_into_near_vector(
+        self, weaviate_config, mock_weaviate_client
+    ):
+        """Item filters are applied by Weaviate during the vector search."""
+        service = WeaviateService(weaviate_config)
+        service._client = mock_weaviate_client
+        
+        collection = Mock()
+        collection.query.near_vector.return_value = Mock(objects=[])
+        mock_weaviate_client.collections.get.return_value = collection
+        
+        with patch.object(service, 'health_check', return_value=True):
+            with patch.object(service, '_create_embedding', AsyncMock(return_value=[0.1, 0.2])):
+                await service.semantic_search("drill", limit=5, certainty=0.7)
+                assert collection.query.near_vector.call_args.kwargs["filters"] is None
+                
+                await service.semantic_search(
+                    "drill", limit=5, certainty=0.7, filters={"condition": "good", "max_value": 50}
+                )
+                assert collection.query.near_vector.call_args.kwargs["filters"] is not None
+                assert collection.query.near_vector.call_args.kwargs["limit"] == 5
+                
+                # Objects missing newly added properties would never match a filter
+                service.filter_backfill_pending = True
+                await service.semantic_search(
+                    "drill", limit=5, certainty=0.7, filters={"condition": "good", "max_value": 50}
+                )
+                assert collection.query.near_vector.call_args.kwargs["filters"] is None
+                assert collection.query.near_vector.call_args.kwargs["limit"] == 50
+    
+    def test_build_item_properties_includes_filterable_fields(self, weaviate_config, sample_item):
+        """Filterable properties are stored with every object; unset numbers are omitted."""
+        service = WeaviateService(weaviate_config)
+        
+        properties = service._build_item_properties(sample_item)
+        assert properties["brand_key"] == "testbrand"
+        assert "category_id" not in properties
+        assert "current_value" not in properties
+        
+        sample_item.category_id = 3
+        sample_item.current_value = 12.5
+        properties = service._build_item_properties(sample_item)
+        assert properties["category_id"] == 3
+        assert properties["current_value"] == 12.5
+    
+    def test_quantization_name_reads_public_fields(self):
+        """Stored quantizer configs are told apart by their fields, not their class names."""
+        assert quantization_name(None) == "none"
+        assert quantization_name(SimpleNamespace(segments=0, centroids=256, training_limit=10000)) == "pq"
+        assert quantization_name(SimpleNamespace(cache=False, rescore_limit=-1)) == "bq"
+        assert quantization_name(SimpleNamespace(rescore_limit=20, training_limit=100000)) == "other"
+    
+    def test_item_object_uuid_is_deterministic(self):
+        """Each item maps to one stable object UUID."""
+        assert item_object_uuid(7) == item_object_uuid(7)
+        assert item_object_uuid(7) != item_object_uuid(8)
+    
+    @pytest.mark.asyncio
+    async def test_migrate_to_deterministic_uuids(self, weaviate_config, mock_weaviate_client):
+        """Duplicates are removed and the newest copy is re-keyed to the item UUID."""
+        service = WeaviateService(weaviate_config)
+        service._client = mock_weaviate_client
+        
+        def obj(obj_uuid, postgres_id, updated_at):
+            return Mock(uuid=obj_uuid, properties={"postgres_id": postgres_id, "updated_at": updated_at})
+        
+        collection = Mock()
+        collection.iterator.return_value = [
+            obj("old-1", 1, datetime(2024, 1, 1)),
+            obj("new-1", 1, datetime(2024, 6, 1)),
+            obj(item_object_uuid(2), 2, datetime(2024, 1, 1)),
+        ]
+        collection.query.fetch_object_by_id.return_value = Mock(properties={"postgres_id": 1}, vector=[0.1])
+        mock_weaviate_client.collections.get.return_value = collection
+        
+        stats = await service.migrate_to_deterministic_uuids()
+        
+        assert stats == {"objects": 3, "items": 2, "duplicates_removed": 1, "rekeyed": 1}
+        collection.query.fetch_object_by_id.assert_called_once_with("new-1", include_vector=True)
+        assert collection.data.replace.call_args.kwargs["uuid"] == item_object_uuid(1)
+        deleted = {call.args[0] for call in collection.data.delete_by_id.call_args_list}
+        assert deleted == {"old-1", "new-1"}
+    
+    @pytest.mark.asyncio
+    async def test_iter_item_states_keeps_duplicates_across_pages(self, weaviate_config, mock_weaviate_client):
+        """Copies of one item split by a page boundary are all streamed, each once."""
+        service = WeaviateService(weaviate_config)
+        service._client = mock_weaviate_client
+        
+        objects = [
+            Mock(uuid=f"uuid-{n}", properties={"postgres_id": postgres_id, "content_hash": f"h{n}"})
+            for n, postgres_id in enumerate([1, 2, 2, 2, 3])
+        ]
+        
+        def fetch_objects(filters, limit, **kwargs):
+            op, from_id = filters
+            matching = [o for o in objects if o.properties["postgres_id"] >= from_id
+                        and (op == "gte" or o.properties["postgres_id"] > from_id)]
+            return Mock(objects=matching[:limit])
+        
+        mock_weaviate_client.collections.get.return_value.query.fetch_objects.side_effect = fetch_objects
+        with patch("app.services.weaviate_service.weaviate") as weaviate_module:
+            id_filter = weaviate_module.classes.query.Filter.by_property.return_value
+            id_filter.greater_than.side_effect = lambda value: ("gt", value)
+            id_filter.greater_or_equal.side_effect = lambda value: ("gte", value)
+            
+            states = [state async for state in service.iter_item_states(page_size=2)]
+        
+        assert [(state[0], state[1]) for state in states] == [
+            (1, "h0"), (2, "h1"), (2, "h2"), (2, "h3"), (3, "h4")
+        ]
     
     @pytest.mark.asyncio
     async def test_get_stats_success(
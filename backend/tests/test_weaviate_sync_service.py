@@ -0,0 +1,191 @@
+"""
+Tests for the Weaviate sync outbox and its background worker.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from sqlalchemy import select, update
+
+from app.models.item import Item, ItemType
+from app.models.weaviate_sync_outbox import WeaviateSyncOutbox
+from app.schemas.item import ItemCreate, ItemUpdate
+from app.services.item_service import ItemService
+from app.services.weaviate_sync_service import WeaviateSyncWorker, enqueue_item_sync, DELETE
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def fake_weaviate():
+    service = AsyncMock()
+    service.health_check.return_value = True
+    service.create_item_embedding.return_value = True
+    service.delete_item_embedding.return_value = True
+    service.migration_in_progress.return_value = False
+    service.filter_backfill_pending = False
+    return service
+
+
+@pytest.fixture
+def worker(fake_weaviate):
+    async def get_service():
+        return fake_weaviate
+    return WeaviateSyncWorker(max_attempts=2, backoff_seconds=0, weaviate_service_getter=get_service)
+
+
+async def outbox_rows(session):
+    session.expire_all()
+    result = await session.execute(select(WeaviateSyncOutbox).order_by(WeaviateSyncOutbox.id))
+    return result.scalars().all()
+
+
+async def test_item_writes_queue_outbox_entries(test_session, fake_weaviate):
+    """Creates, updates and deletes queue sync entries instead of calling Weaviate."""
+    service = ItemService(test_session)
+    item = await service.create_item(ItemCreate(name="Drill", item_type=ItemType.TOOLS))
+    item_id = item.id
+    await service.update_item(item_id, ItemUpdate(name="Cordless Drill"))
+    await service.delete_item(item_id)
+
+    rows = await outbox_rows(test_session)
+    assert [(row.item_id, row.operation, row.status) for row in rows] == [
+        (item_id, "upsert", "pending"),
+        (item_id, "upsert", "pending"),
+        (item_id, "delete", "pending"),
+    ]
+    fake_weaviate.create_item_embedding.assert_not_called()
+
+
+async def test_worker_applies_latest_operation_per_item(test_session, worker, fake_weaviate):
+    """A batch collapses repeated changes to one item and removes applied entries."""
+    drill = Item(name="Drill", item_type=ItemType.TOOLS)
+    saw = Item(name="Saw", item_type=ItemType.TOOLS)
+    test_session.add_all([drill, saw])
+    await test_session.flush()
+    enqueue_item_sync(test_session, [drill.id, saw.id, drill.id])
+    enqueue_item_sync(test_session, [saw.id], DELETE)
+    await test_session.commit()
+
+    handled = await worker.process_batch()
+
+    assert handled == 4
+    assert fake_weaviate.create_item_embedding.await_count == 1
+    assert fake_weaviate.create_item_embedding.await_args.args[0].name == "Drill"
+    fake_weaviate.delete_item_embedding.assert_awaited_once_with(saw.id)
+    assert await outbox_rows(test_session) == []
+
+
+async def test_worker_retries_then_dead_letters(test_session, worker, fake_weaviate):
+    """Failures are retried with backoff and dead-lettered after max attempts."""
+    drill = Item(name="Drill", item_type=ItemType.TOOLS)
+    test_session.add(drill)
+    await test_session.flush()
+    enqueue_item_sync(test_session, [drill.id])
+    await test_session.commit()
+    fake_weaviate.create_item_embedding.return_value = False
+
+    await worker.process_batch()
+    rows = await outbox_rows(test_session)
+    assert [(row.status, row.attempts) for row in rows] == [("pending", 1)]
+    assert rows[0].last_error == "Embedding creation failed"
+
+    await worker.process_batch()
+    rows = await outbox_rows(test_session)
+    assert [(row.status, row.attempts) for row in rows] == [("dead", 2)]
+
+    # Dead letters are not picked up again until explicitly retried
+    assert await worker.process_batch() == 0
+    assert await worker.retry_dead_letters() == 1
+    status = await worker.get_status()
+    assert status["queue"] == {"pending": 1}
+    assert status["worker"]["dead_lettered"] == 1
+
+
+async def test_worker_leaves_queue_when_weaviate_down(test_session, worker, fake_weaviate):
+    """Nothing is claimed while Weaviate is unhealthy."""
+    drill = Item(name="Drill", item_type=ItemType.TOOLS)
+    test_session.add(drill)
+    await test_session.flush()
+    enqueue_item_sync(test_session, [drill.id])
+    await test_session.commit()
+    fake_weaviate.health_check.return_value = False
+
+    assert await worker.process_batch() == 0
+    rows = await outbox_rows(test_session)
+    assert [(row.status, row.attempts) for row in rows] == [("pending", 0)]
+
+
+async def test_worker_pauses_during_vector_index_migration(test_session, worker, fake_weaviate):
+    """Nothing is claimed while the Item collection is being rebuilt."""
+    drill = Item(name="Drill", item_type=ItemType.TOOLS)
+    test_session.add(drill)
+    await test_session.flush()
+    enqueue_item_sync(test_session, [drill.id])
+    await test_session.commit()
+    fake_weaviate.migration_in_progress.return_value = True
+
+    assert await worker.process_batch() == 0
+    fake_weaviate.create_item_embedding.assert_not_called()
+    rows = await outbox_rows(test_session)
+    assert [(row.status, row.attempts) for row in rows] == [("pending", 0)]
+
+    fake_weaviate.migration_in_progress.return_value = False
+    assert await worker.process_batch() == 1
+
+
+async def test_only_expired_claims_are_recovered(test_session, worker):
+    """Entries another live worker is applying stay claimed; abandoned claims are re-queued."""
+    drill = Item(name="Drill", item_type=ItemType.TOOLS)
+    test_session.add(drill)
+    await test_session.flush()
+    enqueue_item_sync(test_session, [drill.id])
+    await test_session.commit()
+    [claimed] = await worker._claim_batch()
+
+    assert await worker.recover_stale() == 0
+
+    await test_session.execute(
+        update(WeaviateSyncOutbox).where(WeaviateSyncOutbox.id == claimed.id)
+        .values(claimed_at=datetime.now(timezone.utc) - timedelta(seconds=worker.claim_timeout_seconds + 1))
+    )
+    await test_session.commit()
+    assert await worker.recover_stale() == 1
+    rows = await outbox_rows(test_session)
+    assert [(row.status, row.claimed_at) for row in rows] == [("pending", None)]
+
+
+async def test_filter_backfill_keeps_sql_filtering_until_drained(test_session, worker, fake_weaviate):
+    """New filterable properties queue every active item; filters return to the index once drained."""
+    inactive = Item(name="Old Saw", item_type=ItemType.TOOLS, is_active=False)
+    test_session.add_all([Item(name="Drill", item_type=ItemType.TOOLS), inactive])
+    await test_session.commit()
+    await test_session.execute(WeaviateSyncOutbox.__table__.delete())
+    await test_session.commit()
+
+    fake_weaviate.filter_backfill_pending = True
+    assert await worker.start_filter_backfill() == 1
+
+    assert await worker.process_batch() == 1
+    assert fake_weaviate.filter_backfill_pending is True
+    assert await worker.process_batch() == 0
+    assert fake_weaviate.filter_backfill_pending is False
+
+    # After a restart, entries left over from an unfinished backfill keep SQL filtering on
+    enqueue_item_sync(test_session, [inactive.id])
+    await test_session.commit()
+    assert await worker.start_filter_backfill() == 0
+    assert fake_weaviate.filter_backfill_pending is True
+
+
+async def test_queue_weaviate_sync_for_active_items(test_session):
+    """Bulk sync queues one entry per active item in a single statement."""
+    inactive = Item(name="Old Saw", item_type=ItemType.TOOLS, is_active=False)
+    test_session.add_all([Item(name="Drill", item_type=ItemType.TOOLS), inactive])
+    await test_session.commit()
+
+    queued = await ItemService(test_session).queue_weaviate_sync()
+
+    assert queued == 1
+    rows = await outbox_rows(test_session)
+    assert [(row.operation, row.status) for row in rows] == [("upsert", "pending")]
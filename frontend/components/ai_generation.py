@@ -148,29 +148,36 @@ def _perform_generation(
 ) -> Optional[str]:
     """Perform the actual AI content generation."""
     
-    with st.spinner("🤖 Generating content with AI..."):
-        try:
-            if generation_type == "item_description":
-                result = safe_api_call(
-                    lambda: api_client.generate_item_description(context),
-                    "Failed to generate item description"
-                )
-            else:
-                result = safe_api_call(
-                    lambda: api_client.generate_ai_content(generation_type, context),
-                    f"Failed to generate {generation_type} content"
-                )
+    placeholder = st.empty()
+    placeholder.info("🤖 Generating content with AI...")
+    try:
+        if generation_type == "item_description":
+            events = api_client.stream_item_description(context)
+        else:
+            events = api_client.stream_ai_content(generation_type, context)
+        
+        # Show the text as it is generated instead of waiting for all of it
+        result = None
+        streamed = ""
+        for event in events:
+            if event["event"] == "delta":
+                streamed += event["content"]
+                placeholder.markdown(streamed + "▌")
+            elif event["event"] == "done":
+                result = event
+        placeholder.empty()
+        
+        if result:
+            st.session_state[f"{modal_key}_result"] = result
+            show_success("Content generated successfully!")
+            st.rerun()
+        else:
+            show_error("Failed to generate content. Please try again.")
             
-            if result:
-                st.session_state[f"{modal_key}_result"] = result
-                show_success("Content generated successfully!")
-                st.rerun()
-            else:
-                show_error("Failed to generate content. Please try again.")
-                
-        except Exception as e:
-            logger.error(f"AI generation error: {e}")
-            handle_api_error(e, "generate AI content")
+    except Exception as e:
+        placeholder.empty()
+        logger.error(f"AI generation error: {e}")
+        handle_api_error(e, "generate AI content")
     
     return None
 
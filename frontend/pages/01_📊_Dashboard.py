@@ -801,8 +801,10 @@ def main():
                 result = api_client.create_performance_indexes()
                 if result.get("status") == "unavailable":
                     st.warning("⚠️ Performance index creation is currently unavailable")
+                elif result.get("job_id") is None:
+                    st.info(result.get("message", "No indexes are recommended"))
                 else:
-                    st.success("Performance indexes created!")
+                    st.success(f"Index build started (job {result['job_id']})")
                     st.json(result)
         
         with perf_actions_col3:
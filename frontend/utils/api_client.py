@@ -6,7 +6,9 @@ import requests
 import logging
 import time
 import hashlib
-from typing import List, Dict, Any, Optional, Union, Callable
+import json
+import uuid
+from typing import List, Dict, Any, Optional, Union, Callable, Iterator
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
@@ -127,6 +129,8 @@ class APIClient:
         correlation_id = self._generate_correlation_id()
         circuit_breaker = self._get_circuit_breaker(endpoint)
         timeout = timeout_override or self.timeout
+        # One key per logical mutation, so retries of it are replayed rather than re-applied
+        idempotency_key = str(uuid.uuid4()) if method.upper() in ("POST", "PUT") else None
         
         # Check circuit breaker
         if not circuit_breaker.can_execute():
@@ -141,6 +145,8 @@ class APIClient:
             try:
                 # Add correlation ID to headers
                 headers = {'X-Correlation-ID': correlation_id}
+                if idempotency_key:
+                    headers['Idempotency-Key'] = idempotency_key
                 
                 logger.info(f"API Request: {method} {url} [ID: {correlation_id}]")
                 if data:
@@ -1025,6 +1031,33 @@ class APIClient:
         params = {"enforce_atomic": enforce_atomic}
         return self._make_request("POST", "inventory/validate/bulk-movement", data=movements, params=params)
     
+    def execute_bulk_movement(
+        self, 
+        movements: List[Dict[str, Any]], 
+        user_id: Optional[str] = None,
+        reason: Optional[str] = None
+    ) -> dict:
+        """
+        Validate and execute multiple moves in a single transaction.
+        
+        Args:
+            movements: List of moves (item_id, from_location_id, to_location_id, quantity_moved)
+            user_id: User performing the operation
+            reason: Reason applied to movements without their own
+            
+        Returns:
+            Execution summary with final quantities of the touched entries
+            
+        Raises:
+            APIError: If validation fails; no movement is applied in that case
+        """
+        params = {}
+        if user_id:
+            params["user_id"] = user_id
+        if reason:
+            params["reason"] = reason
+        return self._make_request("POST", "inventory/execute/bulk-movement", data=movements, params=params)
+    
     def get_validation_report(self, item_id: Optional[int] = None) -> dict:
         """
         Get comprehensive validation system report.
@@ -1134,10 +1167,11 @@ class APIClient:
     
     def create_performance_indexes(self) -> dict:
         """
-        Create recommended database indexes for performance optimization.
+        Start a background build of the recommended database indexes.
         
         Returns:
-            Result of index creation with list of created indexes
+            Job details (job_id, indexes, status_url), or job_id None if no
+            indexes are recommended
         """
         try:
             return self._make_request("POST", "performance/optimize/indexes", max_retries=1, silent=True)
@@ -1337,6 +1371,18 @@ class APIClient:
                 "error": str(e)
             }
     
+    def get_job(self, job_id: int) -> dict:
+        """
+        Get status and progress of a background job.
+        
+        Args:
+            job_id: Job ID returned when the operation was started
+            
+        Returns:
+            Job status, progress and result
+        """
+        return self._make_request("GET", f"jobs/{job_id}")
+    
     def search_suggestions(self, partial_query: str, limit: int = 5) -> List[str]:
         """
         Get search suggestions based on partial query input.
@@ -1407,6 +1453,77 @@ class APIClient:
             
         return self._make_request("POST", "ai/generate-item-description", data=data)
     
+    def _stream_events(self, endpoint: str, data: dict) -> Iterator[Dict[str, Any]]:
+        """
+        POST to a Server-Sent Events endpoint and yield its events as they arrive.
+        
+        Each event is the decoded ``data`` payload with its name under ``"event"``.
+        
+        Raises:
+            APIError: If the request fails or the stream reports an error
+        """
+        url = AppConfig.get_api_url(endpoint)
+        headers = {'X-Correlation-ID': self._generate_correlation_id(), 'Accept': 'text/event-stream'}
+        try:
+            response = self.session.post(url, json=data, timeout=self.timeout, headers=headers, stream=True)
+        except requests.exceptions.RequestException as e:
+            raise APIError(f"Unable to connect to the API server: {e}")
+        
+        with response:
+            if not response.ok:
+                try:
+                    detail = response.json().get('detail', f"HTTP {response.status_code}")
+                except ValueError:
+                    detail = f"HTTP {response.status_code}"
+                raise APIError(detail, response.status_code)
+            
+            event_name = "message"
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event_name = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    event = json.loads(line[len("data:"):])
+                    event["event"] = event_name
+                    if event_name == "error":
+                        raise APIError(event.get("detail", "Streaming failed"))
+                    yield event
+    
+    def stream_ai_content(self, template_type: str, context: Dict[str, Any], user_preferences: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generate content using AI, yielding it as it is produced.
+        
+        Yields ``delta`` events with pieces of text and a final ``done`` event
+        with the full content and the same metadata as ``generate_ai_content``.
+        """
+        data = {
+            "template_type": template_type,
+            "context": context
+        }
+        
+        if user_preferences:
+            data["user_preferences"] = user_preferences
+            
+        return self._stream_events("ai/generate/stream", data)
+    
+    def stream_item_description(self, context: Dict[str, Any], user_preferences: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generate an item description using AI, yielding it as it is produced.
+        
+        Yields the same events as ``stream_ai_content``.
+        """
+        data = {
+            "name": context.get("name", ""),
+            "category": context.get("category"),
+            "item_type": context.get("item_type"),
+            "brand": context.get("brand"),
+            "model": context.get("model")
+        }
+        
+        if user_preferences:
+            data["user_preferences"] = user_preferences
+            
+        return self._stream_events("ai/generate-item-description/stream", data)
+    
     def get_ai_templates(self) -> List[str]:
         """
         Get list of available AI content generation templates.
@@ -1457,7 +1574,31 @@ class APIClient:
             data["user_preferences"] = user_preferences
             
         return self._make_request("POST", "ai/enrich-item-data", data=data)
-    
+
+    def start_item_enrichment(
+        self,
+        item_ids: List[int],
+        fields: Optional[List[str]] = None,
+        min_confidence: float = 0.7,
+        overwrite: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Start a background job enriching existing items with AI-generated data.
+
+        Args:
+            item_ids: Items to enrich
+            fields: Item fields to fill in (server default: description, brand, model)
+            min_confidence: Minimum confidence for a field to be written
+            overwrite: Replace fields that already have a value
+
+        Returns:
+            Job ID and status URLs; follow progress with ``get_job``
+        """
+        data = {"item_ids": item_ids, "min_confidence": min_confidence, "overwrite": overwrite}
+        if fields:
+            data["fields"] = fields
+        return self._make_request("POST", "ai/enrich-items", data=data)
+
     def analyze_item_image(
         self, 
         image_data: bytes, 